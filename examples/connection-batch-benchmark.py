@@ -0,0 +1,111 @@
+"""Compare per-call latency of a :class:`DirectDiscretizationConnection`
+when all of its interpolation batches are applied by a single merged kernel
+versus one kernel launch per batch, as a function of the number of batches.
+"""
+
+import logging
+from time import perf_counter
+
+import numpy as np
+
+from meshmode.discretization.connection.direct import (
+    DirectDiscretizationConnection,
+    DiscretizationConnectionElementGroup,
+    InterpolationBatch,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def split_batches(actx, conn, nchunks):
+    """Return a connection equivalent to *conn* in which every batch has been
+    split into *nchunks* batches along its target elements.
+    """
+    groups = []
+    for cgrp in conn.groups:
+        batches = []
+        for batch in cgrp.batches:
+            from_el = actx.to_numpy(batch.from_element_indices)
+            to_el = actx.to_numpy(batch.to_element_indices)
+
+            for idx in np.array_split(np.arange(len(to_el)), nchunks):
+                if not len(idx):
+                    continue
+
+                batches.append(InterpolationBatch(
+                    from_group_index=batch.from_group_index,
+                    from_element_indices=actx.freeze(
+                        actx.from_numpy(from_el[idx])),
+                    to_element_indices=actx.freeze(actx.from_numpy(to_el[idx])),
+                    result_unit_nodes=batch.result_unit_nodes,
+                    to_element_face=batch.to_element_face))
+
+        groups.append(DiscretizationConnectionElementGroup(batches))
+
+    return DirectDiscretizationConnection(
+        from_discr=conn.from_discr, to_discr=conn.to_discr,
+        groups=groups, is_surjective=conn.is_surjective)
+
+
+def time_call(actx, conn, vec, ncalls, **kwargs):
+    # warm up (compiles the kernels)
+    actx.freeze(conn(vec, **kwargs))
+    actx.queue.finish()
+
+    t_start = perf_counter()
+    for _ in range(ncalls):
+        actx.freeze(conn(vec, **kwargs))
+    actx.queue.finish()
+
+    return (perf_counter() - t_start) / ncalls
+
+
+def main(*, dim: int = 2, order: int = 3, nelements: int = 32,
+        ncalls: int = 20) -> None:
+    logging.basicConfig(level=logging.INFO)
+
+    from meshmode import _acf
+    actx = _acf()
+
+    import meshmode.mesh.generation as mgen
+    mesh = mgen.generate_regular_rect_mesh(
+        a=(-0.5,)*dim, b=(0.5,)*dim,
+        nelements_per_axis=(nelements,)*dim)
+
+    from meshmode.discretization import Discretization
+    from meshmode.discretization.poly_element import (
+        InterpolatoryQuadratureSimplexGroupFactory,
+    )
+    discr = Discretization(actx, mesh,
+            InterpolatoryQuadratureSimplexGroupFactory(order))
+
+    to_discr = Discretization(actx, mesh,
+            InterpolatoryQuadratureSimplexGroupFactory(order + 1))
+
+    # raising the order requires an actual interpolation matrix, so the
+    # connection cannot be applied as a pure gather
+    from meshmode.discretization.connection import make_same_mesh_connection
+    base_conn = make_same_mesh_connection(actx, to_discr, discr)
+
+    vec = actx.thaw(actx.freeze(discr.zeros(actx) + 1))
+
+    logger.info("%d elements", mesh.nelements)
+    logger.info("%8s %12s %12s %8s",
+            "nbatches", "merged [ms]", "batched [ms]", "speedup")
+
+    for nchunks in [1, 2, 4, 8, 16, 32]:
+        conn = split_batches(actx, base_conn, nchunks)
+        nbatches = sum(len(cgrp.batches) for cgrp in conn.groups)
+
+        t_merged = time_call(actx, conn, vec, ncalls)
+        t_batched = time_call(actx, conn, vec, ncalls,
+                _force_no_merged_batches=True)
+
+        logger.info("%8d %12.3f %12.3f %8.2f",
+                nbatches, 1.0e3 * t_merged, 1.0e3 * t_batched,
+                t_batched / t_merged)
+
+
+if __name__ == "__main__":
+    main()
@@ -36,7 +36,7 @@ logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
-def plot_solution(actx, vis, filename, discr, t, x):
+def plot_solution(actx, writer, vis, discr, t, x):
     names_and_fields = []
 
     try:
@@ -46,7 +46,8 @@ def plot_solution(actx, vis, filename, discr, t, x):
     except ImportError:
         pass
 
-    vis.write_vtk_file(filename, names_and_fields, overwrite=True)
+    # NOTE: the writer only appends the points if the geometry has moved
+    writer.write_step(t, names_and_fields, vis=vis)
 
 
 def reconstruct_discr_from_nodes(actx, discr, x):
@@ -176,6 +177,8 @@ def run(actx, *,
                 # NOTE: setting this to True will add some unnecessary
                 # resampling in Discretization.nodes for the vis_discr underneath
                 force_equidistant=False)
+        writer = vis.make_vtkhdf_time_series_writer(
+                "moving-geometry.hdf", overwrite=True)
 
     # }}}
 
@@ -221,8 +224,7 @@ def run(actx, *,
     t = 0.0
 
     if visualize:
-        filename = f"moving-geometry-{0:09d}.vtu"
-        plot_solution(actx, vis, filename, discr0, t, x)
+        plot_solution(actx, writer, vis, discr0, t, x)
 
     for n in range(1, maxiter + 1):
         x = advance(actx, dt, t, x, source)
@@ -230,15 +232,16 @@ def run(actx, *,
 
         if visualize:
             discr = reconstruct_discr_from_nodes(actx, discr0, x)
-            vis = make_visualizer(actx, discr, vis_order=target_order)
-            # vis = vis.copy_with_same_connectivity(actx, discr)
+            vis = vis.copy_with_same_connectivity(actx, discr)
 
-            filename = f"moving-geometry-{n:09d}.vtu"
-            plot_solution(actx, vis, filename, discr, t, x)
+            plot_solution(actx, writer, vis, discr, t, x)
 
         logger.info("[%05d/%05d] t = %.5e/%.5e dt = %.5e",
                 n, maxiter, t, tmax, dt)
 
+    if visualize:
+        writer.close()
+
     # }}}
 
 
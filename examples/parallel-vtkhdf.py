@@ -1,4 +1,10 @@
+"""Write a distributed discretization into VTK HDF5 files, either into a
+single file shared by all ranks or into one file per node, and time it. Run
+with, e.g., ``mpirun -n 8 python parallel-vtkhdf.py``.
+"""
+
 import logging
+from time import perf_counter
 
 import numpy as np
 
@@ -76,14 +82,50 @@ def main(*, ambient_dim: int) -> None:
     vis = make_visualizer(actx, discr, force_equidistant=False)
     logger.info("[%4d] make_visualizer: finished", comm.rank)
 
-    filename = f"parallel-vtkhdf-example-{ambient_dim}d.hdf"
-    vis.write_vtkhdf_file(filename, [
+    names_and_fields = [
         ("scalar", scalar_field),
         ("vector", vector_field),
         ("part_id", part_id)
-        ], comm=comm, overwrite=True, use_high_order=False)
+        ]
+
+    # {{{ single step
+
+    for aggregate in [None, "node"]:
+        filename = f"parallel-vtkhdf-example-{ambient_dim}d.hdf"
+
+        comm.Barrier()
+        t_start = perf_counter()
+        vis.write_vtkhdf_file(filename, names_and_fields,
+            comm=comm, aggregate=aggregate, overwrite=True, use_high_order=False)
+        comm.Barrier()
+
+        if comm.rank == 0:
+            logger.info("write (aggregate %s): %.3fs",
+                        aggregate, perf_counter() - t_start)
+
+    # }}}
+
+    # {{{ time series
+
+    nsteps = 10
+    for aggregate in [None, "node"]:
+        filename = f"parallel-vtkhdf-example-{ambient_dim}d-series.hdf"
+
+        comm.Barrier()
+        t_start = perf_counter()
+        with vis.make_vtkhdf_time_series_writer(filename,
+                comm=comm, aggregate=aggregate, overwrite=True) as writer:
+            for n in range(nsteps):
+                writer.write_step(n / nsteps, names_and_fields)
+        comm.Barrier()
+
+        if comm.rank == 0:
+            logger.info("write %d steps (aggregate %s): %.3fs",
+                        nsteps, aggregate, perf_counter() - t_start)
+
+    # }}}
 
-    logger.info("[%4d] write: finished: %s", comm.rank, filename)
+    logger.info("[%4d] write: finished", comm.rank)
 
 
 if __name__ == "__main__":
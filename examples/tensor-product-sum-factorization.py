@@ -0,0 +1,86 @@
+"""Compare the cost of applying reference derivatives on tensor product
+(hexahedral) elements with a dense ``(nunit_dofs, nunit_dofs)`` matrix per
+element versus by sum factorization (one-dimensional operators applied along
+each reference axis), as used by
+:func:`meshmode.discretization.num_reference_derivative`.
+"""
+
+import logging
+from time import perf_counter
+
+import numpy as np
+
+import modepy as mp
+
+from meshmode.transform_metadata import FirstAxisIsElementsTag
+
+
+logger = logging.getLogger(__name__)
+
+
+def time_call(actx, func, ncalls):
+    # warm up (compiles the kernels)
+    actx.freeze(func())
+    actx.queue.finish()
+
+    t_start = perf_counter()
+    for _ in range(ncalls):
+        actx.freeze(func())
+    actx.queue.finish()
+
+    return (perf_counter() - t_start) / ncalls
+
+
+def main(*, dim: int = 3, nelements: int = 8, ncalls: int = 10) -> None:
+    logging.basicConfig(level=logging.INFO)
+
+    from meshmode import _acf
+    actx = _acf()
+
+    from meshmode.discretization import Discretization, num_reference_derivative
+    from meshmode.discretization.poly_element import (
+        LegendreGaussLobattoTensorProductGroupFactory,
+    )
+    from meshmode.mesh import TensorProductElementGroup
+    from meshmode.mesh.generation import generate_regular_rect_mesh
+
+    logger.info("%5s %10s %14s %14s %12s %12s",
+            "order", "nelements", "dense [GFLOP]", "sumfac [GFLOP]",
+            "dense [ms]", "sumfac [ms]")
+
+    for order in range(1, 8):
+        mesh = generate_regular_rect_mesh(
+                a=(-0.5,)*dim, b=(0.5,)*dim,
+                nelements_per_axis=(nelements,)*dim,
+                group_cls=TensorProductElementGroup)
+        discr = Discretization(actx, mesh,
+                LegendreGaussLobattoTensorProductGroupFactory(order))
+        grp = discr.groups[0]
+
+        vec = actx.thaw(actx.freeze(discr.nodes()[0]))
+        dense_mat = actx.from_numpy(
+                mp.diff_matrices(grp.basis_obj(), grp.unit_nodes)[0])
+
+        def dense(dense_mat=dense_mat, vec=vec):
+            return actx.einsum("ij,ej->ei", dense_mat, vec[0],
+                    tagged=(FirstAxisIsElementsTag(),))
+
+        def sumfac(discr=discr, vec=vec):
+            return num_reference_derivative(discr, (0,), vec)[0]
+
+        assert np.allclose(
+                actx.to_numpy(dense()), actx.to_numpy(sumfac()))
+
+        ndofs_1d = order + 1
+        dense_flops = 2 * grp.nelements * grp.nunit_dofs**2
+        sumfac_flops = 2 * grp.nelements * grp.nunit_dofs * ndofs_1d
+
+        logger.info("%5d %10d %14.3f %14.3f %12.3f %12.3f",
+                order, grp.nelements,
+                dense_flops * 1.0e-9, sumfac_flops * 1.0e-9,
+                time_call(actx, dense, ncalls) * 1.0e3,
+                time_call(actx, sumfac, ncalls) * 1.0e3)
+
+
+if __name__ == "__main__":
+    main()
@@ -24,7 +24,7 @@ THE SOFTWARE.
 """
 
 from abc import ABC, abstractmethod
-from collections.abc import Hashable, Iterable
+from collections.abc import Hashable, Iterable, Sequence
 from typing import Protocol, runtime_checkable
 from warnings import warn
 
@@ -32,12 +32,13 @@ import numpy as np
 
 import loopy as lp
 import modepy as mp
-from arraycontext import ArrayContext, make_loopy_program, tag_axes
+from arraycontext import ArrayContext, ArrayT, make_loopy_program, tag_axes
 from pytools import keyed_memoize_in, memoize_in, memoize_method
 from pytools.obj_array import make_obj_array
 
 # underscored because it shouldn't be imported from here.
 from meshmode.dof_array import DOFArray as _DOFArray
+from meshmode.instrumentation import annotate_stage, setup_stage
 from meshmode.mesh import Mesh as _Mesh, MeshElementGroup as _MeshElementGroup
 from meshmode.transform_metadata import (
     ConcurrentDOFInameTag,
@@ -326,6 +327,135 @@ class ModalElementGroupBase(ElementGroupWithBasis):
 # }}}
 
 
+# {{{ sum factorization for tensor product groups
+
+def _get_tensor_product_bases_1d(basis: mp.Basis) -> tuple[mp.Basis, ...] | None:
+    """
+    :returns: the one-dimensional bases making up *basis*, in order of the
+        reference axes, or *None* if *basis* is not a tensor product of
+        one-dimensional bases.
+    """
+    if isinstance(basis, mp.TensorProductBasis):
+        if any(b._dim != 1 for b in basis.bases):
+            return None
+
+        return tuple(basis.bases)
+    elif basis._dim == 1:
+        return (basis,)
+    else:
+        return None
+
+
+def _get_tensor_product_nodes_1d(
+        unit_nodes: np.ndarray) -> tuple[np.ndarray, ...] | None:
+    """
+    :returns: the one-dimensional nodes along each reference axis, such that
+        :func:`modepy.tensor_product_nodes` reproduces *unit_nodes* exactly
+        (with the first axis varying fastest), or *None* if *unit_nodes*
+        are not of this form.
+    """
+    dim, nnodes = unit_nodes.shape
+    if dim == 0:
+        return None
+
+    nodes_1d = []
+    stride = 1
+    for iaxis in range(dim):
+        n = len(np.unique(unit_nodes[iaxis]))
+        nodes_1d.append(unit_nodes[iaxis, :n*stride:stride])
+        stride *= n
+
+    if stride != nnodes:
+        return None
+
+    if not np.array_equal(mp.tensor_product_nodes(nodes_1d), unit_nodes):
+        return None
+
+    return tuple(nodes_1d)
+
+
+def _get_tensor_product_resampling_matrices(
+        basis: mp.Basis,
+        to_unit_nodes: np.ndarray,
+        from_unit_nodes: np.ndarray | None,
+        ) -> tuple[np.ndarray, ...] | None:
+    """
+    :arg from_unit_nodes: if *None*, the one-dimensional Vandermonde matrices
+        of *basis* at *to_unit_nodes* are returned, i.e. the factors of the
+        modal-to-nodal map.
+    :returns: a tuple of one-dimensional matrices, one per reference axis,
+        whose Kronecker product is the resampling matrix from
+        *from_unit_nodes* to *to_unit_nodes*, or *None* if *basis* or the
+        nodes do not have a tensor product structure.
+    """
+    bases_1d = _get_tensor_product_bases_1d(basis)
+    to_nodes_1d = _get_tensor_product_nodes_1d(to_unit_nodes)
+    if bases_1d is None or to_nodes_1d is None:
+        return None
+
+    if len(bases_1d) != len(to_nodes_1d):
+        return None
+
+    if from_unit_nodes is None:
+        return tuple(
+                mp.vandermonde(b.functions, tn.reshape(1, -1))
+                for b, tn in zip(bases_1d, to_nodes_1d, strict=True))
+
+    from_nodes_1d = _get_tensor_product_nodes_1d(from_unit_nodes)
+    if from_nodes_1d is None or len(from_nodes_1d) != len(bases_1d):
+        return None
+
+    if any(len(b.functions) != len(fn)
+            for b, fn in zip(bases_1d, from_nodes_1d, strict=True)):
+        return None
+
+    return tuple(
+            mp.resampling_matrix(b.functions,
+                tn.reshape(1, -1), fn.reshape(1, -1))
+            for b, tn, fn in zip(bases_1d, to_nodes_1d, from_nodes_1d,
+                strict=True))
+
+
+def _apply_tensor_product_matrices(
+        actx: ArrayContext,
+        matrices: Sequence[ArrayT | None],
+        shape: Sequence[int],
+        ary: ArrayT,
+        ) -> ArrayT:
+    """Apply the Kronecker product of *matrices* to each element of *ary*
+    one reference axis at a time (i.e. by sum factorization).
+
+    :arg matrices: a sequence of one-dimensional operators, one for each
+        reference axis. An entry of *None* stands for the identity.
+    :arg shape: the number of input DOFs along each reference axis.
+    :arg ary: an array of shape ``(nelements, ndofs)``, where the DOFs are
+        ordered as produced by :func:`modepy.tensor_product_nodes`.
+    """
+    dim = len(matrices)
+    nelements = ary.shape[0]
+
+    # NOTE: the first reference axis varies fastest, so it is the last
+    # axis of the reshaped array
+    result = ary.reshape(nelements, *shape[::-1])
+    for iaxis, mat in enumerate(matrices):
+        if mat is None:
+            continue
+
+        in_indices = list("klmn"[:dim])
+        out_indices = list(in_indices)
+        in_indices[dim - 1 - iaxis] = "j"
+        out_indices[dim - 1 - iaxis] = "i"
+
+        result = actx.einsum(
+                "ij,e{}->e{}".format("".join(in_indices), "".join(out_indices)),
+                mat, result,
+                tagged=(FirstAxisIsElementsTag(),))
+
+    return result.reshape(nelements, -1)
+
+# }}}
+
+
 # {{{ discretization
 
 class Discretization:
@@ -350,6 +480,7 @@ class Discretization:
     .. automethod:: quad_weights
     """
 
+    @setup_stage("Discretization")
     def __init__(self,
                  actx: ArrayContext,
                  mesh: _Mesh,
@@ -397,6 +528,8 @@ class Discretization:
         self._group_factory = group_factory
         self._cached_nodes = None
 
+        annotate_stage(nelements=mesh.nelements, ndofs=self.ndofs)
+
     def copy(self,
              actx: ArrayContext | None = None,
              mesh: _Mesh | None = None,
@@ -573,6 +706,24 @@ class Discretization:
                     and np.linalg.norm(grp_unit_nodes - meg_unit_nodes) < tol):
                 return actx.tag(NameHint(name_hint), nodes)
 
+            from meshmode.mesh import TensorProductElementGroup
+
+            # sum factorization: resample one reference axis at a time
+            meg = grp.mesh_el_group
+            tp_matrices = None
+            if isinstance(meg, TensorProductElementGroup):
+                tp_matrices = _get_tensor_product_resampling_matrices(
+                        mp.basis_for_space(meg.space, meg.shape),
+                        grp.unit_nodes, meg.unit_nodes)
+
+            if tp_matrices is not None:
+                return actx.tag(NameHint(name_hint),
+                        _apply_tensor_product_matrices(
+                            actx,
+                            [actx.from_numpy(mat) for mat in tp_matrices],
+                            [mat.shape[1] for mat in tp_matrices],
+                            nodes))
+
             return actx.einsum("ij,ej->ei",
                                actx.tag_axis(
                                    0,
@@ -583,10 +734,12 @@ class Discretization:
                                    FirstAxisIsElementsTag(),
                                    NameHint(name_hint)))
 
-        result = make_obj_array([
-            _DOFArray(None, tuple(actx.freeze(resample_mesh_nodes(grp, iaxis))
-                      for grp in self.groups))
-            for iaxis in range(self.ambient_dim)])
+        with setup_stage("Discretization.nodes", ndofs=self.ndofs):
+            result = make_obj_array([
+                _DOFArray(None, tuple(actx.freeze(resample_mesh_nodes(grp, iaxis))
+                          for grp in self.groups))
+                for iaxis in range(self.ambient_dim)])
+
         if cached:
             self._cached_nodes = result
         return result
@@ -639,13 +792,50 @@ def num_reference_derivative(
 
         return actx.from_numpy(mat)
 
+    @keyed_memoize_in(actx,
+            (num_reference_derivative, "num_reference_derivative_matrices_1d"),
+            lambda grp, gref_axes: grp.discretization_key() + gref_axes)
+    def get_tensor_product_mats(grp: ElementGroupBase, gref_axes):
+        bases_1d = _get_tensor_product_bases_1d(grp.basis_obj())
+        nodes_1d = _get_tensor_product_nodes_1d(grp.unit_nodes)
+        if bases_1d is None or nodes_1d is None or len(bases_1d) != grp.dim:
+            return None
+
+        matrices = [None] * grp.dim
+        for ref_axis in gref_axes:
+            next_mat, = mp.diff_matrices(
+                    bases_1d[ref_axis], nodes_1d[ref_axis].reshape(1, -1))
+            if matrices[ref_axis] is None:
+                matrices[ref_axis] = next_mat
+            else:
+                matrices[ref_axis] = next_mat @ matrices[ref_axis]
+
+        return (
+                tuple(len(n) for n in nodes_1d),
+                tuple(None if mat is None else actx.from_numpy(mat)
+                    for mat in matrices))
+
+    def apply_to_group(igrp, grp):
+        # tensor product groups only need to differentiate along each
+        # requested axis, one axis at a time
+        tp_info = (
+                get_tensor_product_mats(grp, ref_axes)
+                if isinstance(grp.basis_obj(), mp.TensorProductBasis)
+                else None)
+        if tp_info is not None:
+            shape, matrices = tp_info
+            return _apply_tensor_product_matrices(
+                    actx, matrices, shape, vec[igrp])
+
+        return actx.einsum("ij,ej->ei",
+                           actx.tag_axis(0,
+                                         DiscretizationDOFAxisTag(),
+                                         get_mat(grp, ref_axes)),
+                           vec[igrp],
+                           tagged=(FirstAxisIsElementsTag(),))
+
     return _DOFArray(actx, tuple(
-            actx.einsum("ij,ej->ei",
-                        actx.tag_axis(0,
-                                      DiscretizationDOFAxisTag(),
-                                      get_mat(grp, ref_axes)),
-                        vec[igrp],
-                        tagged=(FirstAxisIsElementsTag(),))
+            apply_to_group(igrp, grp)
             for igrp, grp in enumerate(discr.groups)))
 
 # }}}
@@ -53,9 +53,14 @@ from meshmode.discretization.connection.opposite_face import (
     make_partition_connection,
 )
 from meshmode.discretization.connection.projection import (
+    L2ProjectionCoarseningConnection,
     L2ProjectionInverseDiscretizationConnection,
 )
-from meshmode.discretization.connection.refinement import make_refinement_connection
+from meshmode.discretization.connection.refinement import (
+    make_coarsening_connection,
+    make_mesh_hierarchy_connection,
+    make_refinement_connection,
+)
 from meshmode.discretization.connection.same_mesh import make_same_mesh_connection
 
 
@@ -71,12 +76,15 @@ __all__ = [
     "DiscretizationConnectionElementGroup",
     "IdentityDiscretizationConnection",
     "InterpolationBatch",
+    "L2ProjectionCoarseningConnection",
     "L2ProjectionInverseDiscretizationConnection",
     "ModalToNodalDiscretizationConnection",
     "NodalToModalDiscretizationConnection",
     "flatten_chained_connection",
+    "make_coarsening_connection",
     "make_face_restriction",
     "make_face_to_all_faces_embedding",
+    "make_mesh_hierarchy_connection",
     "make_opposite_face_connection",
     "make_partition_connection",
     "make_refinement_connection",
@@ -90,6 +98,7 @@ Base classes
 .. autoclass:: IdentityDiscretizationConnection
 .. autoclass:: ChainedDiscretizationConnection
 .. autoclass:: L2ProjectionInverseDiscretizationConnection
+.. autoclass:: L2ProjectionCoarseningConnection
 .. autoclass:: DirectDiscretizationConnection
 
 Mapping between modal and nodal representations
@@ -115,6 +124,8 @@ Restriction to faces
 Refinement
 ----------
 .. autofunction:: make_refinement_connection
+.. autofunction:: make_mesh_hierarchy_connection
+.. autofunction:: make_coarsening_connection
 
 Flattening a :class:`ChainedDiscretizationConnection`
 -----------------------------------------------------
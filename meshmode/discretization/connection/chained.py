@@ -311,4 +311,54 @@ def make_full_resample_matrix(actx, connection):
 # }}}
 
 
+# {{{ build chained sparse resample matrix
+
+def make_sparse_resample_matrix(actx, connection, format="csr"):
+    """Build a sparse matrix representing the discretization connection.
+
+    This is based on
+    :func:`~meshmode.discretization.connection.direct.make_direct_sparse_resample_matrix`.
+    If a chained connection is given, the sparse matrices of each connection
+    in the chain are multiplied left to right, which results in the same
+    operator as the one obtained from :func:`flatten_chained_connection`.
+
+    :arg actx: a :class:`arraycontext.ArrayContext`.
+    :arg connection: a
+        :class:`~meshmode.discretization.connection.DiscretizationConnection`.
+    :arg format: one of ``"csr"`` or ``"bsr"``.
+    :return: a :class:`scipy.sparse.csr_matrix` or
+        :class:`scipy.sparse.bsr_matrix` of shape
+        `(connection.to_discr.ndofs, connection.from_discr.ndofs)`.
+
+    .. versionadded:: 2024.1
+    """
+    from meshmode.discretization.connection.direct import (
+        DirectDiscretizationConnection,
+        IdentityDiscretizationConnection,
+        _convert_sparse_resample_matrix,
+        make_direct_sparse_resample_matrix,
+    )
+
+    if isinstance(connection, DirectDiscretizationConnection):
+        return make_direct_sparse_resample_matrix(actx, connection, format=format)
+
+    import scipy.sparse as sps
+
+    if isinstance(connection, IdentityDiscretizationConnection):
+        acc = sps.identity(connection.to_discr.ndofs)
+    elif not isinstance(connection, ChainedDiscretizationConnection):
+        raise TypeError("only 'ChainedDiscretizationConnection's are supported")
+    elif not connection.connections:
+        acc = sps.identity(connection.to_discr.ndofs)
+    else:
+        acc = make_sparse_resample_matrix(actx, connection.connections[0])
+        for conn in connection.connections[1:]:
+            acc = make_sparse_resample_matrix(actx, conn) @ acc
+
+    return _convert_sparse_resample_matrix(
+            acc, connection.to_discr, connection.from_discr, format)
+
+# }}}
+
+
 # vim: foldmethod=marker
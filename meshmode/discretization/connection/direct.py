@@ -41,7 +41,13 @@ from arraycontext import (
 from arraycontext.metadata import NameHint
 from pytools import keyed_memoize_method, memoize_in, memoize_method
 
-from meshmode.discretization import Discretization, ElementGroupBase
+from meshmode.discretization import (
+    Discretization,
+    ElementGroupBase,
+    InterpolatoryElementGroupBase,
+    _apply_tensor_product_matrices,
+    _get_tensor_product_resampling_matrices,
+)
 from meshmode.dof_array import DOFArray
 from meshmode.transform_metadata import (
     ConcurrentDOFInameTag,
@@ -247,6 +253,87 @@ class _FromGroupPickData(Generic[ArrayT]):
 # }}}
 
 
+# {{{ _FromGroupMatrixData
+
+@dataclass
+class _FromGroupMatrixData(Generic[ArrayT]):
+    r"""Represents information needed to resample DOFs from one source element
+    group to a target element group in a single kernel, by combining all
+    :class:`InterpolationBatch`\ es between the two groups. Each target element
+    is resampled from its source element using one of the
+    :attr:`resample_mats`, chosen via :attr:`resample_mat_indices`.
+
+    .. attribute:: from_group_index
+
+        The element group index in the
+        :attr:`DirectDiscretizationConnection.from_discr` from which information
+        is retrieved.
+
+    .. attribute:: resample_mats
+
+        A frozen array of shape ``(nmats, ntgt_dofs, nsrc_dofs)`` of a type
+        controlled by the array context, containing the distinct resampling
+        matrices of the batches.
+
+    .. attribute:: resample_mat_indices
+
+        A frozen array of shape ``(nelements_tgt)`` of a type controlled
+        by the array context, indicating which resampling matrix each element
+        should use.
+
+    .. attribute:: from_el_present
+
+        See :attr:`_FromGroupPickData.from_el_present`.
+
+    .. attribute:: from_element_indices
+
+        See :attr:`_FromGroupPickData.from_element_indices`.
+
+    .. attribute:: is_surjective
+    """
+
+    from_group_index: int
+    resample_mats: ArrayT
+    resample_mat_indices: ArrayT
+    from_el_present: ArrayT
+    from_element_indices: ArrayT
+    is_surjective: bool
+
+# }}}
+
+
+# {{{ _FromGroupTensorProductData
+
+@dataclass
+class _FromGroupTensorProductData(Generic[ArrayT]):
+    """Represents information needed to resample DOFs between two tensor
+    product element groups with identical element ordering by applying
+    one-dimensional resampling matrices along each reference axis.
+
+    .. attribute:: from_group_index
+
+        The element group index in the
+        :attr:`DirectDiscretizationConnection.from_discr` from which information
+        is retrieved.
+
+    .. attribute:: resample_mats_1d
+
+        A tuple of frozen arrays, one per reference axis, of a type
+        controlled by the array context. Their Kronecker product is the
+        resampling matrix of the (single) batch.
+
+    .. attribute:: from_shape
+
+        The number of source DOFs along each reference axis.
+    """
+
+    from_group_index: int
+    resample_mats_1d: tuple[ArrayT, ...]
+    from_shape: tuple[int, ...]
+
+# }}}
+
+
 # {{{ connection element group
 
 class DiscretizationConnectionElementGroup:
@@ -367,6 +454,8 @@ class DirectDiscretizationConnection(DiscretizationConnection):
 
         self.groups = groups
         self._global_point_pick_info_cache = None
+        self._global_matrix_info_cache = None
+        self._global_tensor_product_info_cache = None
 
     # {{{ _resample_matrix
 
@@ -374,6 +463,15 @@ class DirectDiscretizationConnection(DiscretizationConnection):
             (to_group_index, ibatch_index))
     def _resample_matrix(self, actx: ArrayContext, to_group_index: int,
             ibatch_index: int):
+        result = self._resample_matrix_numpy(to_group_index, ibatch_index)
+
+        # freeze, attach metadata
+        return actx.freeze(
+                tag_axes(actx, {1: DiscretizationDOFAxisTag()},
+                    actx.from_numpy(result)))
+
+    def _resample_matrix_numpy(self, to_group_index: int,
+            ibatch_index: int) -> np.ndarray:
         import modepy as mp
         ibatch = self.groups[to_group_index].batches[ibatch_index]
         from_grp = self.from_discr.groups[ibatch.from_group_index]
@@ -399,10 +497,11 @@ class DirectDiscretizationConnection(DiscretizationConnection):
                     from_grp_basis_fcts,
                     ibatch.result_unit_nodes, from_grp.unit_nodes)
 
-        # freeze, attach metadata
-        return actx.freeze(
-                tag_axes(actx, {1: DiscretizationDOFAxisTag()},
-                    actx.from_numpy(result)))
+        return result
+
+    @keyed_memoize_method(key=lambda actx: ())
+    def _sparse_resample_matrix(self, actx: ArrayContext):
+        return _make_sparse_resample_matrix_numpy(actx, self, format="csr")
 
     # }}}
 
@@ -564,10 +663,177 @@ class DirectDiscretizationConnection(DiscretizationConnection):
 
     # }}}
 
+    # {{{ _global_matrix_info_cache
+
+    def _per_target_group_matrix_info(
+            self, actx: ArrayContext, i_tgrp: int
+            ) -> Sequence[_FromGroupMatrixData] | None:
+        """Returns a list of :class:`_FromGroupMatrixData`, one per source group
+        from which data is to be transferred, or *None*, if the batches of the
+        target group cannot be merged.
+        """
+        cgrp = self.groups[i_tgrp]
+        tgrp = self.to_discr.groups[i_tgrp]
+
+        batch_source_groups = sorted({
+            batch.from_group_index for batch in cgrp.batches
+            if len(batch.from_element_indices)})
+
+        # no source data
+        if not batch_source_groups:
+            return None
+
+        result: list[_FromGroupMatrixData] = []
+        for source_group_index in batch_source_groups:
+            batch_indices_for_this_source_group = [
+                    i for i, batch in enumerate(cgrp.batches)
+                    if batch.from_group_index == source_group_index
+                    and len(batch.from_element_indices)]
+
+            # {{{ find and weed out duplicate resampling matrices
+
+            # NOTE: batches with the same unit nodes share a resampling matrix
+            unit_nodes_to_mat_index: dict[tuple[tuple[int, ...], bytes], int] = {}
+            mat_batch_indices = []
+            batch_mat_indices = []
+            for bi in batch_indices_for_this_source_group:
+                unit_nodes = np.ascontiguousarray(cgrp.batches[bi].result_unit_nodes)
+                key = (unit_nodes.shape, unit_nodes.tobytes())
+
+                if key not in unit_nodes_to_mat_index:
+                    unit_nodes_to_mat_index[key] = len(mat_batch_indices)
+                    mat_batch_indices.append(bi)
+                batch_mat_indices.append(unit_nodes_to_mat_index[key])
+
+            # shape: (number of matrices, nunit_dofs_tgt, nunit_dofs_src)
+            resample_mats = np.array([
+                self._resample_matrix_numpy(i_tgrp, bi)
+                for bi in mat_batch_indices])
+
+            # }}}
+
+            from_el_indices = np.empty(
+                    tgrp.nelements, dtype=self.from_discr.mesh.element_id_dtype)
+            from_el_indices.fill(-1)
+            resample_mat_indices = np.zeros(tgrp.nelements, dtype=np.int32)
+
+            for source_batch_index, mat_index in zip(
+                    batch_indices_for_this_source_group, batch_mat_indices,
+                    strict=True):
+                source_batch = cgrp.batches[source_batch_index]
+
+                to_el_ind = actx.to_numpy(actx.thaw(source_batch.to_element_indices))
+                if (from_el_indices[to_el_ind] != -1).any():
+                    # per-batch target elements not disjoint, so the batch
+                    # results need to be summed up
+                    return None
+
+                from_el_indices[to_el_ind] = \
+                        actx.to_numpy(actx.thaw(source_batch.from_element_indices))
+                resample_mat_indices[to_el_ind] = mat_index
+
+            from_el_present = (from_el_indices != -1)
+            from_el_indices[~from_el_present] = 0
+
+            result.append(
+                    _FromGroupMatrixData(
+                        from_group_index=source_group_index,
+                        resample_mats=actx.freeze(
+                            actx.tag(NameHint("resample_mats"),
+                                actx.from_numpy(resample_mats))),
+                        resample_mat_indices=actx.freeze(
+                            actx.tag(NameHint("resample_mat_indices"),
+                                actx.from_numpy(resample_mat_indices))),
+                        from_el_present=actx.freeze(
+                            actx.tag(NameHint("from_el_present"),
+                                actx.from_numpy(from_el_present.astype(np.int8)))),
+                        from_element_indices=actx.freeze(
+                            actx.tag(NameHint("from_el_indices"),
+                                actx.from_numpy(from_el_indices))),
+                        is_surjective=from_el_present.all()
+                        ))
+
+        return result
+
+    def _global_matrix_info(
+            self, actx: ArrayContext
+            ) -> Sequence[Sequence[_FromGroupMatrixData] | None]:
+        if self._global_matrix_info_cache is not None:
+            return self._global_matrix_info_cache
+
+        self._global_matrix_info_cache = [
+                self._per_target_group_matrix_info(actx, i_tgrp)
+                for i_tgrp in range(len(self.groups))]
+        return self._global_matrix_info_cache
+
+    # }}}
+
+    # {{{ _global_tensor_product_info_cache
+
+    def _per_target_group_tensor_product_info(
+            self, actx: ArrayContext, i_tgrp: int
+            ) -> _FromGroupTensorProductData | None:
+        """Return a :class:`_FromGroupTensorProductData` if the target group
+        is obtained from a single source group by resampling every element
+        to itself (e.g. as built by
+        :func:`~meshmode.discretization.connection.make_same_mesh_connection`)
+        and both the source basis and the target unit nodes have a tensor
+        product structure. Otherwise, return *None*.
+        """
+        cgrp = self.groups[i_tgrp]
+        if len(cgrp.batches) != 1:
+            return None
+
+        batch, = cgrp.batches
+        tgrp = self.to_discr.groups[i_tgrp]
+        fgrp = self.from_discr.groups[batch.from_group_index]
+        if not isinstance(fgrp, InterpolatoryElementGroupBase):
+            return None
+
+        import modepy as mp
+        if not isinstance(fgrp.basis_obj(), mp.TensorProductBasis):
+            return None
+
+        if not (fgrp.nelements == tgrp.nelements == batch.nelements):
+            return None
+
+        all_elements = np.arange(tgrp.nelements)
+        if not (
+                np.array_equal(
+                    actx.to_numpy(batch.from_element_indices), all_elements)
+                and np.array_equal(
+                    actx.to_numpy(batch.to_element_indices), all_elements)):
+            return None
+
+        mats = _get_tensor_product_resampling_matrices(
+                fgrp.basis_obj(), batch.result_unit_nodes, fgrp.unit_nodes)
+        if mats is None:
+            return None
+
+        return _FromGroupTensorProductData(
+                from_group_index=batch.from_group_index,
+                resample_mats_1d=tuple(
+                    actx.freeze(actx.from_numpy(mat)) for mat in mats),
+                from_shape=tuple(mat.shape[1] for mat in mats))
+
+    def _global_tensor_product_info(
+            self, actx: ArrayContext
+            ) -> Sequence[_FromGroupTensorProductData | None]:
+        if self._global_tensor_product_info_cache is not None:
+            return self._global_tensor_product_info_cache
+
+        self._global_tensor_product_info_cache = [
+                self._per_target_group_tensor_product_info(actx, i_tgrp)
+                for i_tgrp in range(len(self.groups))]
+        return self._global_tensor_product_info_cache
+
+    # }}}
+
     # {{{ __call__
 
     def __call__(
             self, ary: ArrayOrContainerT, *,
+            use_sparse_matrix: bool = False,
             _force_use_loopy: bool = False,
             _force_no_merged_batches: bool = False,
             ) -> ArrayOrContainerT:
@@ -575,7 +841,17 @@ class DirectDiscretizationConnection(DiscretizationConnection):
         :arg ary: a :class:`~meshmode.dof_array.DOFArray`, or an
             :class:`arraycontext.ArrayContainer` of them, containing nodal
             coefficient data on :attr:`from_discr`.
+        :arg use_sparse_matrix: if *True*, the connection is applied by
+            multiplying with a (cached) :mod:`scipy.sparse` matrix, as
+            obtained from :func:`make_direct_sparse_resample_matrix`. This
+            trades a one-time setup cost for faster repeated application,
+            but is only useful for array contexts that operate on
+            :class:`numpy.ndarray` data, since the data is transferred
+            to the host otherwise.
 
+        .. versionchanged:: 2024.1
+
+            Added *use_sparse_matrix*.
         """
         # _force_use_loopy, _force_no_merged_batches:
         # private arguments only used to ensure test coverage of all code paths.
@@ -593,6 +869,7 @@ class DirectDiscretizationConnection(DiscretizationConnection):
             else:
                 return deserialize_container(ary, [
                     (key, self(subary,
+                        use_sparse_matrix=use_sparse_matrix,
                         _force_use_loopy=_force_use_loopy,
                         _force_no_merged_batches=_force_no_merged_batches))
                     for key, subary in iterable
@@ -608,6 +885,9 @@ class DirectDiscretizationConnection(DiscretizationConnection):
 
         actx = ary.array_context
 
+        if use_sparse_matrix:
+            return self._apply_sparse_resample_matrix(actx, ary)
+
         # {{{ kernels
 
         @memoize_in(actx,
@@ -705,6 +985,45 @@ class DirectDiscretizationConnection(DiscretizationConnection):
                 "iel": ConcurrentElementInameTag(),
                 "idof": ConcurrentDOFInameTag()})
 
+        @memoize_in(actx,
+                (DirectDiscretizationConnection, "resample_by_mat_group_knl"))
+        def group_mat_knl(is_surjective: bool):
+
+            if is_surjective:
+                if_present = ""
+            else:
+                if_present = "if from_el_present[iel] else 0"
+
+            t_unit = make_loopy_program(
+                [
+                    "{[iel]: 0 <= iel < nelements}",
+                    "{[idof]: 0 <= idof < nunit_dofs_tgt}",
+                    "{[jdof]: 0 <= jdof < nunit_dofs_src}"
+                ],
+                f"""
+                    result[iel, idof] = (
+                        sum(jdof,
+                            resample_mats[resample_mat_indices[iel], idof, jdof]
+                            * ary[from_element_indices[iel], jdof])
+                        {if_present})
+                """,
+                [
+                    lp.GlobalArg("ary", None,
+                        shape="nelements_src, nunit_dofs_src",
+                        offset=lp.auto),
+                    lp.GlobalArg("resample_mats", None,
+                        shape="nmats, nunit_dofs_tgt, nunit_dofs_src",
+                        offset=lp.auto),
+                    lp.ValueArg("nelements_src", np.int32),
+                    lp.ValueArg("nmats", np.int32),
+                    "...",
+                ],
+                name="resample_by_mat_group",
+            )
+            return lp.tag_inames(t_unit, {
+                "iel": ConcurrentElementInameTag(),
+                "idof": ConcurrentDOFInameTag()})
+
         # }}}
 
         group_arrays = []
@@ -716,6 +1035,25 @@ class DirectDiscretizationConnection(DiscretizationConnection):
             if _force_no_merged_batches:
                 group_pick_info = None
 
+            # Same-topology resampling between tensor product groups can
+            # be done one reference axis at a time (sum factorization).
+            group_tp_info = None
+            if (group_pick_info is None
+                    and not _force_no_merged_batches
+                    and not _force_use_loopy):
+                group_tp_info = self._global_tensor_product_info(actx)[i_tgrp]
+
+            # If the batches cannot be applied by picking, they can still be
+            # applied in a single kernel per source group (instead of one
+            # kernel per batch), as long as they map to disjoint sets of
+            # target elements.
+            group_mat_info = None
+            if (group_pick_info is None
+                    and group_tp_info is None
+                    and not _force_no_merged_batches
+                    and (_force_use_loopy or not actx.permits_advanced_indexing)):
+                group_mat_info = self._global_matrix_info(actx)[i_tgrp]
+
             if group_pick_info is not None:
                 group_array_contributions = []
 
@@ -766,6 +1104,35 @@ class DirectDiscretizationConnection(DiscretizationConnection):
                                 **group_knl_kwargs)["result"])
 
                 group_array = sum(group_array_contributions)
+            elif group_tp_info is not None:
+                group_array_contributions.append(
+                    tag_axes(actx,
+                        {0: DiscretizationElementAxisTag(),
+                            1: DiscretizationDOFAxisTag()},
+                        _apply_tensor_product_matrices(
+                            actx,
+                            group_tp_info.resample_mats_1d,
+                            group_tp_info.from_shape,
+                            ary[group_tp_info.from_group_index])))
+            elif group_mat_info is not None:
+                for fgmd in group_mat_info:
+                    group_knl_kwargs = {}
+                    if not fgmd.is_surjective:
+                        group_knl_kwargs["from_el_present"] = fgmd.from_el_present
+
+                    group_array_contributions.append(
+                        tag_axes(actx,
+                            {0: DiscretizationElementAxisTag(),
+                                1: DiscretizationDOFAxisTag()},
+                            actx.call_loopy(
+                                group_mat_knl(fgmd.is_surjective),
+                                resample_mats=fgmd.resample_mats,
+                                resample_mat_indices=fgmd.resample_mat_indices,
+                                ary=ary[fgmd.from_group_index],
+                                from_element_indices=fgmd.from_element_indices,
+                                nunit_dofs_tgt=(
+                                    self.to_discr.groups[i_tgrp].nunit_dofs),
+                                **group_knl_kwargs)["result"]))
             elif cgrp.batches:
                 for i_batch, batch in enumerate(cgrp.batches):
                     if not len(batch.from_element_indices):
@@ -849,6 +1216,30 @@ class DirectDiscretizationConnection(DiscretizationConnection):
 
     # }}}
 
+    def _apply_sparse_resample_matrix(
+            self, actx: ArrayContext, ary: DOFArray) -> DOFArray:
+        mat = self._sparse_resample_matrix(actx)
+
+        if ary.size:
+            vec = np.concatenate([
+                actx.to_numpy(subary).reshape(-1) for subary in ary])
+            result = mat @ vec
+        else:
+            result = np.zeros(mat.shape[0], dtype=ary.entry_dtype)
+
+        group_arrays = []
+        istart = 0
+        for grp in self.to_discr.groups:
+            iend = istart + grp.nelements*grp.nunit_dofs
+            group_arrays.append(tag_axes(actx,
+                {0: DiscretizationElementAxisTag(),
+                    1: DiscretizationDOFAxisTag()},
+                actx.from_numpy(
+                    result[istart:iend].reshape(grp.nelements, grp.nunit_dofs))))
+            istart = iend
+
+        return DOFArray(actx, data=tuple(group_arrays))
+
 # }}}
 
 
@@ -950,4 +1341,125 @@ def make_direct_full_resample_matrix(actx, conn):
 
 # }}}
 
+
+# {{{ sparse resampling matrix
+
+def _make_sparse_resample_matrix_numpy(actx, conn, format="csr"):
+    import scipy.sparse as sps
+
+    to_group_sizes = [
+            grp.nelements*grp.nunit_dofs
+            for grp in conn.to_discr.groups]
+    to_group_starts = np.cumsum([0, *to_group_sizes])
+
+    from_group_sizes = [
+            grp.nelements*grp.nunit_dofs
+            for grp in conn.from_discr.groups]
+    from_group_starts = np.cumsum([0, *from_group_sizes])
+
+    rows = []
+    cols = []
+    data = []
+    for i_tgrp, (tgrp, cgrp) in enumerate(
+            zip(conn.to_discr.groups, conn.groups, strict=True)):
+        for i_batch, batch in enumerate(cgrp.batches):
+            if not len(batch.from_element_indices):
+                continue
+
+            fgrp = conn.from_discr.groups[batch.from_group_index]
+            mat = conn._resample_matrix_numpy(i_tgrp, i_batch)
+
+            from_element_indices = actx.to_numpy(batch.from_element_indices)
+            to_element_indices = actx.to_numpy(batch.to_element_indices)
+
+            # each batch element contributes a dense
+            # (nunit_dofs_tgt, nunit_dofs_src) block
+            row_idx = (
+                    to_group_starts[i_tgrp]
+                    + to_element_indices.reshape(-1, 1)*tgrp.nunit_dofs
+                    + np.arange(tgrp.nunit_dofs))
+            col_idx = (
+                    from_group_starts[batch.from_group_index]
+                    + from_element_indices.reshape(-1, 1)*fgrp.nunit_dofs
+                    + np.arange(fgrp.nunit_dofs))
+
+            shape = (len(to_element_indices), *mat.shape)
+            rows.append(np.broadcast_to(row_idx[:, :, None], shape).ravel())
+            cols.append(np.broadcast_to(col_idx[:, None, :], shape).ravel())
+            data.append(np.broadcast_to(mat, shape).ravel())
+
+    if rows:
+        rows = np.concatenate(rows)
+        cols = np.concatenate(cols)
+        data = np.concatenate(data)
+    else:
+        rows = cols = np.empty(0, dtype=np.int64)
+        data = np.empty(0)
+
+    result = sps.coo_matrix(
+            (data, (rows, cols)),
+            shape=(to_group_starts[-1], from_group_starts[-1]))
+
+    return _convert_sparse_resample_matrix(
+            result, conn.to_discr, conn.from_discr, format)
+
+
+def _convert_sparse_resample_matrix(mat, to_discr, from_discr, format):
+    if format == "csr":
+        return mat.tocsr()
+    elif format == "bsr":
+        to_nunit_dofs = {grp.nunit_dofs for grp in to_discr.groups}
+        from_nunit_dofs = {grp.nunit_dofs for grp in from_discr.groups}
+        if len(to_nunit_dofs) != 1 or len(from_nunit_dofs) != 1:
+            raise ValueError("'bsr' format requires all groups of 'to_discr' "
+                    "and all groups of 'from_discr' to have the same number "
+                    "of unit DOFs")
+
+        return mat.tobsr(
+                blocksize=(to_nunit_dofs.pop(), from_nunit_dofs.pop()))
+    else:
+        raise ValueError(f"unknown sparse matrix format: '{format}'")
+
+
+def make_direct_sparse_resample_matrix(actx, conn, format="csr"):
+    """Build a sparse matrix representing this discretization connection.
+
+    Unlike :func:`make_direct_full_resample_matrix`, the storage required
+    is proportional to the number of nonzeros, i.e. one dense
+    resampling block per target element. The matrix is built on the host
+    and is meant for repeated application, e.g. on a
+    :class:`numpy.ndarray`-based array context (see also the
+    *use_sparse_matrix* argument of
+    :meth:`DirectDiscretizationConnection.__call__`).
+
+    .. note::
+
+        This function assumes a flattened DOF array, as produced by
+        :class:`~arraycontext.flatten`.
+
+    :arg actx: an :class:`~arraycontext.ArrayContext`.
+    :arg conn: a :class:`DirectDiscretizationConnection`.
+    :arg format: one of ``"csr"`` or ``"bsr"``. The block-sparse ``"bsr"``
+        format uses one block per pair of elements and requires all groups
+        in :attr:`~DiscretizationConnection.from_discr` (and, respectively,
+        :attr:`~DiscretizationConnection.to_discr`) to have the same number
+        of unit DOFs.
+    :returns: a :class:`scipy.sparse.csr_matrix` or
+        :class:`scipy.sparse.bsr_matrix` of shape
+        ``(conn.to_discr.ndofs, conn.from_discr.ndofs)``.
+
+    .. versionadded:: 2024.1
+    """
+
+    if not isinstance(conn, DirectDiscretizationConnection):
+        raise TypeError("can only construct a sparse resampling matrix "
+                "for a DirectDiscretizationConnection.")
+
+    if format == "csr":
+        return conn._sparse_resample_matrix(actx)
+    else:
+        return _make_sparse_resample_matrix_numpy(actx, conn, format=format)
+
+# }}}
+
 # vim: foldmethod=marker
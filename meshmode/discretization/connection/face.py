@@ -31,6 +31,7 @@ from arraycontext.metadata import NameHint
 
 from meshmode.discretization import Discretization, ElementGroupFactory
 from meshmode.discretization.connection.direct import DirectDiscretizationConnection
+from meshmode.instrumentation import annotate_stage, setup_stage
 from meshmode.mesh import BoundaryTag, Mesh
 from meshmode.transform_metadata import DiscretizationElementAxisTag
 
@@ -159,6 +160,7 @@ def _get_face_vertices(mesh: Mesh, boundary_tag: BoundaryTag) -> np.ndarray:
 # }}}
 
 
+@setup_stage("make_face_restriction")
 def make_face_restriction(
             actx: ArrayContext,
             discr: Discretization,
@@ -196,6 +198,16 @@ def make_face_restriction(
         :attr:`meshmode.discretization.connection.DirectDiscretizationConnection.to_discr`
         attribute of the return value, and the corresponding new boundary mesh
         from that.
+
+    .. note::
+
+        For meshes with hanging faces (see
+        :class:`~meshmode.mesh.NonconformingInteriorAdjacencyGroup`),
+        :class:`FACE_RESTR_INTERIOR` contains both the fine and the coarse
+        sides of each hanging face. The coarse sides are not matched with the
+        fine faces that cover them, so
+        :func:`~meshmode.discretization.connection.make_opposite_face_connection`
+        provides no exterior values for them.
     """
 
     if boundary_tag is None:
@@ -208,6 +220,7 @@ def make_face_restriction(
             raise ValueError(f"invalid boundary tag {boundary_tag}.")
 
     logger.info("building face restriction: start")
+    annotate_stage(boundary_tag=boundary_tag)
 
     assert discr.mesh.vertices is not None
 
@@ -253,6 +266,19 @@ def make_face_restriction(
                 group_boundary_faces.extend(
                         zip(fagrp.elements, fagrp.element_faces, strict=True))
 
+            # NOTE: the coarse sides of hanging faces only appear as neighbors
+            # in the adjacency of the (fine) elements that they cover
+            from meshmode.mesh import NonconformingInteriorAdjacencyGroup
+            coarse_faces = {
+                (iel, iface)
+                for nb_fagrp_list in discr.mesh.facial_adjacency_groups
+                for fagrp in nb_fagrp_list
+                if isinstance(fagrp, NonconformingInteriorAdjacencyGroup)
+                and fagrp.ineighbor_group == igrp
+                for iel, iface in zip(
+                    fagrp.neighbors, fagrp.neighbor_faces, strict=True)}
+            group_boundary_faces.extend(sorted(coarse_faces))
+
         elif boundary_tag is FACE_RESTR_ALL:
             group_boundary_faces.extend(
                     (iel, iface)
@@ -370,6 +396,7 @@ def make_face_restriction(
             actx, discr, bdry_discr, connection_data,
             per_face_groups)
 
+    annotate_stage(nbdry_elements=bdry_mesh.nelements)
     logger.info("building face restriction: done")
 
     return connection
@@ -35,7 +35,11 @@ from arraycontext import (
 )
 from pytools import keyed_memoize_in
 
-from meshmode.discretization import InterpolatoryElementGroupBase
+from meshmode.discretization import (
+    InterpolatoryElementGroupBase,
+    _apply_tensor_product_matrices,
+    _get_tensor_product_resampling_matrices,
+)
 from meshmode.discretization.connection.direct import DiscretizationConnection
 from meshmode.discretization.poly_element import QuadratureSimplexElementGroup
 from meshmode.transform_metadata import DiscretizationDOFAxisTag, FirstAxisIsElementsTag
@@ -171,6 +175,28 @@ class NodalToModalDiscretizationConnection(DiscretizationConnection):
                     1: DiscretizationDOFAxisTag()},
                 actx.from_numpy(vdm_inv))
 
+        @keyed_memoize_in(actx, (NodalToModalDiscretizationConnection,
+                                 "vandermonde_inverses_1d"),
+                          lambda grp: grp.discretization_key())
+        def vandermonde_inverses_1d(grp):
+            vdms = _get_tensor_product_resampling_matrices(
+                    grp.basis_obj(), grp.unit_nodes, None)
+            if vdms is None:
+                return None
+
+            return tuple(
+                    actx.tag_axis(0, DiscretizationDOFAxisTag(),
+                        actx.from_numpy(la.inv(vdm)))
+                    for vdm in vdms)
+
+        if isinstance(grp.basis_obj(), mp.TensorProductBasis):
+            # sum factorization: the inverse of a Kronecker product is
+            # the Kronecker product of the inverses
+            vdm_invs = vandermonde_inverses_1d(grp)
+            if vdm_invs is not None:
+                return _apply_tensor_product_matrices(
+                        actx, vdm_invs, [mat.shape[1] for mat in vdm_invs], ary)
+
         return actx.einsum("ij,ej->ei",
                 vandermonde_inverse(grp),
                 ary, tagged=(FirstAxisIsElementsTag(),))
@@ -352,11 +378,40 @@ class ModalToNodalDiscretizationConnection(DiscretizationConnection):
                     1: DiscretizationDOFAxisTag()},
                 actx.from_numpy(vdm))
 
+        @keyed_memoize_in(actx,
+                          (ModalToNodalDiscretizationConnection, "matrices_1d"),
+                           lambda to_grp, from_grp: (
+                               to_grp.discretization_key(),
+                               from_grp.discretization_key(),
+                               ))
+        def matrices_1d(to_grp, from_grp):
+            vdms = _get_tensor_product_resampling_matrices(
+                    from_grp.basis_obj(), to_grp.unit_nodes, None)
+            if vdms is None:
+                return None
+
+            return tuple(
+                    actx.tag_axis(0, DiscretizationDOFAxisTag(),
+                        actx.from_numpy(vdm))
+                    for vdm in vdms)
+
+        def apply_to_group(igrp, grp):
+            from_grp = self.from_discr.groups[igrp]
+            if isinstance(from_grp.basis_obj(), mp.TensorProductBasis):
+                # sum factorization: evaluate one reference axis at a time
+                vdms = matrices_1d(grp, from_grp)
+                if vdms is not None:
+                    return _apply_tensor_product_matrices(
+                            actx, vdms, [mat.shape[1] for mat in vdms],
+                            ary[igrp])
+
+            return actx.einsum("ib,eb->ei",
+                               matrix(grp, from_grp),
+                               ary[igrp],
+                               tagged=(FirstAxisIsElementsTag(),))
+
         result_data = tuple(
-            actx.einsum("ib,eb->ei",
-                        matrix(grp, self.from_discr.groups[igrp]),
-                        ary[igrp],
-                        tagged=(FirstAxisIsElementsTag(),))
+            apply_to_group(igrp, grp)
             for igrp, grp in enumerate(self.to_discr.groups)
         )
         return DOFArray(actx, data=result_data)
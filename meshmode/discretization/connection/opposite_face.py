@@ -27,6 +27,7 @@ import numpy as np
 import numpy.linalg as la
 
 from meshmode.discretization.connection.direct import InterpolationBatch
+from meshmode.instrumentation import annotate_stage, setup_stage
 
 
 logger = logging.getLogger(__name__)
@@ -101,6 +102,32 @@ def _make_cross_face_batches(actx,
 # }}}
 
 
+# {{{ _make_hanging_face_batches
+
+def _make_hanging_face_batches(actx,
+        bdry_discr, i_tgt_grp, i_src_grp,
+        tgt_bdry_element_indices, src_bdry_element_indices,
+        face_map_matrices, face_map_offsets):
+    # NOTE: the unit nodes of the boundary elements are given in the reference
+    # coordinates of the volume faces, so the face maps of the adjacency
+    # directly give the source unit nodes without any geometric search
+    tgt_unit_nodes = bdry_discr.groups[i_tgt_grp].unit_nodes
+    src_unit_nodes = (
+        np.einsum("eij,jn->ien", face_map_matrices, tgt_unit_nodes)
+        + face_map_offsets.T[:, :, np.newaxis])
+
+    tol = 1e4 * np.finfo(src_unit_nodes.dtype).eps
+
+    return list(_find_src_unit_nodes_batches(
+            actx=actx, src_unit_nodes=src_unit_nodes,
+            i_src_grp=i_src_grp,
+            tgt_bdry_element_indices=tgt_bdry_element_indices,
+            src_bdry_element_indices=src_bdry_element_indices,
+            tol=tol))
+
+# }}}
+
+
 # {{{ _find_src_unit_nodes_by_matching
 
 def _find_src_unit_nodes_by_matching(
@@ -136,6 +163,7 @@ def _find_src_unit_nodes_by_matching(
 
 # {{{ _find_src_unit_nodes_via_gauss_newton
 
+@setup_stage("find_src_unit_nodes")
 def _find_src_unit_nodes_via_gauss_newton(
         tgt_bdry_nodes,
         src_bdry_nodes,
@@ -143,57 +171,48 @@ def _find_src_unit_nodes_via_gauss_newton(
         tgt_bdry_discr, src_bdry_discr,
         tol):
     dim = src_grp.dim
-    _, nelements, ntgt_unit_nodes = tgt_bdry_nodes.shape
+    ambient_dim, nelements, ntgt_unit_nodes = tgt_bdry_nodes.shape
+
+    # NOTE: all the target nodes are handled as a flat array of points, so
+    # that converged points can be dropped from the iteration
+    npoints = nelements * ntgt_unit_nodes
+    tgt_points = tgt_bdry_nodes.reshape(ambient_dim, npoints)
+    point_to_element = np.repeat(np.arange(nelements), ntgt_unit_nodes)
 
     initial_guess = np.mean(src_mesh_grp.vertex_unit_coordinates(), axis=0)
-    src_unit_nodes = np.empty((dim, nelements, ntgt_unit_nodes))
-    src_unit_nodes[:] = initial_guess.reshape(-1, 1, 1)
+    src_unit_nodes = np.empty((dim, npoints))
+    src_unit_nodes[:] = initial_guess.reshape(-1, 1)
 
     import modepy as mp
-    src_grp_basis_fcts = src_grp.basis_obj().functions
-    vdm = mp.vandermonde(src_grp_basis_fcts, src_grp.unit_nodes)
-    inv_t_vdm = la.inv(vdm.T)
-    nsrc_funcs = len(src_grp_basis_fcts)
-
-    def apply_map(unit_nodes):
-        # unit_nodes: (dim, nelements, ntgt_unit_nodes)
+    src_grp_basis = src_grp.basis_obj()
+    vdm = mp.vandermonde(src_grp_basis.functions, src_grp.unit_nodes)
 
-        # basis_at_unit_nodes
-        basis_at_unit_nodes = np.empty((nsrc_funcs, nelements, ntgt_unit_nodes))
+    # NOTE: the element maps are applied through their modal coefficients, so
+    # that the basis functions only need to be evaluated once per point
+    # shape: (nelements, ambient_dim, nsrc_funcs)
+    src_modal_nodes = np.einsum("fj,aej->eaf", la.inv(vdm), src_bdry_nodes)
 
-        for i, f in enumerate(src_grp_basis_fcts):
-            basis_at_unit_nodes[i] = (
-                    f(unit_nodes.reshape(dim, -1))
-                    .reshape(nelements, ntgt_unit_nodes))
+    def apply_map(unit_nodes, points):
+        # unit_nodes: (dim, npoints)
+        basis_at_unit_nodes = np.array([
+            f(unit_nodes) for f in src_grp_basis.functions])
 
-        intp_coeffs = np.einsum("fj,jet->fet", inv_t_vdm, basis_at_unit_nodes)
+        # shape: (ambient_dim, npoints)
+        return np.einsum("paf,fp->ap",
+                src_modal_nodes[point_to_element[points]],
+                basis_at_unit_nodes)
 
-        # If we're interpolating 1, we had better get 1 back.
-        one_deviation = np.abs(np.sum(intp_coeffs, axis=0) - 1)
-        assert (one_deviation < tol).all(), np.max(one_deviation)
+    def get_map_jacobian(unit_nodes, points):
+        # unit_nodes: (dim, npoints)
+        dbasis_at_unit_nodes = np.array([
+            df(unit_nodes) for df in src_grp_basis.gradients])
 
-        mapped = np.einsum("fet,aef->aet", intp_coeffs, src_bdry_nodes)
-        assert tgt_bdry_nodes.shape == mapped.shape
-        return mapped
+        jac = (
+            src_modal_nodes[point_to_element[points]]
+            @ dbasis_at_unit_nodes.transpose(2, 0, 1))
 
-    def get_map_jacobian(unit_nodes):
-        # unit_nodes: (dim, nelements, ntgt_unit_nodes)
-
-        # basis_at_unit_nodes
-        dbasis_at_unit_nodes = np.empty(
-                (dim, nsrc_funcs, nelements, ntgt_unit_nodes))
-
-        for i, df in enumerate(src_grp.basis_obj().gradients):
-            df_result = df(unit_nodes.reshape(dim, -1))
-
-            for rst_axis, df_r in enumerate(df_result):
-                dbasis_at_unit_nodes[rst_axis, i] = (
-                        df_r.reshape(nelements, ntgt_unit_nodes))
-
-        dintp_coeffs = np.einsum(
-                "fj,rjet->rfet", inv_t_vdm, dbasis_at_unit_nodes)
-
-        return np.einsum("rfet,aef->raet", dintp_coeffs, src_bdry_nodes)
+        # shape: (ambient_dim, dim, npoints)
+        return np.ascontiguousarray(jac.transpose(1, 2, 0))
 
     # {{{ test map applier and jacobian
 
@@ -201,15 +220,16 @@ def _find_src_unit_nodes_via_gauss_newton(
         rng = np.random.default_rng(seed=None)
 
         u = src_unit_nodes
-        f = apply_map(u)
+        all_points = np.arange(npoints)
+        f = apply_map(u, all_points)
         for h in [1e-1, 1e-2]:
             du = h*rng.normal(size=u.shape)
 
-            f_2 = apply_map(u+du)
+            f_2 = apply_map(u+du, all_points)
 
-            jf = get_map_jacobian(u)
+            jf = get_map_jacobian(u, all_points)
 
-            f2_2 = f + np.einsum("raet,ret->aet", jf, du)
+            f2_2 = f + np.einsum("arp,rp->ap", jf, du)
 
             print(h, la.norm((f_2-f2_2).ravel()))
 
@@ -219,7 +239,7 @@ def _find_src_unit_nodes_via_gauss_newton(
 
     if 0:
         import matplotlib.pyplot as pt
-        guess = apply_map(src_unit_nodes)
+        guess = apply_map(src_unit_nodes, np.arange(npoints))
         goals = tgt_bdry_nodes
 
         from meshmode.discretization.visualization import draw_curve
@@ -238,54 +258,48 @@ def _find_src_unit_nodes_via_gauss_newton(
 
     logger.debug("_find_src_unit_nodes_via_gauss_newton: begin")
 
+    active = np.arange(npoints)
+
     niter = 0
     while True:
-        resid = apply_map(src_unit_nodes) - tgt_bdry_nodes
+        resid = (
+            apply_map(src_unit_nodes[:, active], active)
+            - tgt_points[:, active])
 
-        df = get_map_jacobian(src_unit_nodes)
-        df_inv_resid = np.empty_like(src_unit_nodes)
+        df = get_map_jacobian(src_unit_nodes[:, active], active)
 
         # For the 1D/2D accelerated versions, we'll use the normal
-        # equations and Cramer's rule. If you're looking for high-end
-        # numerics, look no further than meshmode.
+        # equations and Cramer's rule. Otherwise, the normal equations
+        # for all the remaining points are solved at once.
 
-        if dim == 1:
-            # A is df.T
-            ata = np.einsum("ikes,jkes->ijes", df, df)
-            atb = np.einsum("ikes,kes->ies", df, resid)
+        # A is df.T
+        ata = np.einsum("kip,kjp->ijp", df, df)
+        atb = np.einsum("kip,kp->ip", df, resid)
 
+        if dim == 1:
             df_inv_resid = atb / ata[0, 0]
 
         elif dim == 2:
-            # A is df.T
-            ata = np.einsum("ikes,jkes->ijes", df, df)
-            atb = np.einsum("ikes,kes->ies", df, resid)
-
             det = ata[0, 0]*ata[1, 1] - ata[0, 1]*ata[1, 0]
 
-            df_inv_resid = np.empty_like(src_unit_nodes)
+            df_inv_resid = np.empty_like(atb)
             df_inv_resid[0] = 1/det * (ata[1, 1] * atb[0] - ata[1, 0]*atb[1])
             df_inv_resid[1] = 1/det * (-ata[0, 1] * atb[0] + ata[0, 0]*atb[1])
 
         else:
-            # The boundary of a 3D mesh is 2D, so that's the
-            # highest-dimensional case we genuinely care about.
-            #
-            # This stinks, performance-wise, because it's not vectorized.
-            # But we'll only hit it for boundaries of 4+D meshes, in which
-            # case... good luck. :)
-            for e in range(nelements):
-                for t in range(ntgt_unit_nodes):
-                    df_inv_resid[:, e, t], _, _, _ = \
-                            la.lstsq(df[:, :, e, t].T, resid[:, e, t])
-
-        src_unit_nodes = src_unit_nodes - df_inv_resid
+            df_inv_resid = la.solve(
+                    ata.transpose(2, 0, 1),
+                    atb.T[:, :, np.newaxis])[:, :, 0].T
+
+        # NOTE: the update is also applied to the points that have just
+        # converged, since it makes them (quadratically) more accurate
+        src_unit_nodes[:, active] -= df_inv_resid
 
         # {{{ visualize next guess
 
         if 0:
             import matplotlib.pyplot as pt
-            guess = apply_map(src_unit_nodes)
+            guess = apply_map(src_unit_nodes, np.arange(npoints))
             goals = tgt_bdry_nodes
 
             pt.plot(guess[0].reshape(-1), guess[1].reshape(-1), "rx")
@@ -294,12 +308,15 @@ def _find_src_unit_nodes_via_gauss_newton(
 
         # }}}
 
-        max_resid = np.max(np.abs(resid))
+        is_converged = np.max(np.abs(resid), axis=0) < tol
+        max_resid = np.max(np.abs(resid), initial=0.0)
 
-        if max_resid < tol:
+        active = active[~is_converged]
+        if active.size == 0:
             logger.debug("_find_src_unit_nodes_via_gauss_newton: done, "
                     "final residual: %g", max_resid)
-            return src_unit_nodes
+            annotate_stage(npoints=npoints, niterations=niter)
+            return src_unit_nodes.reshape(dim, nelements, ntgt_unit_nodes)
 
         niter += 1
         if niter > 10:
@@ -383,16 +400,43 @@ def _make_bdry_el_lookup_table(actx, connection, igrp):
 
 # {{{ make_opposite_face_connection
 
-def make_opposite_face_connection(actx, volume_to_bdry_conn):
+@setup_stage("make_opposite_face_connection")
+def make_opposite_face_connection(actx, volume_to_bdry_conn, *,
+        allow_hanging_faces=False):
     """Given a boundary restriction connection *volume_to_bdry_conn*,
     return a :class:`DirectDiscretizationConnection` that performs data
     exchange across opposite faces.
+
+    :arg allow_hanging_faces: if *False*, a :class:`ValueError` is raised
+        for meshes with hanging faces (see
+        :class:`~meshmode.mesh.NonconformingInteriorAdjacencyGroup`).
+
+    .. warning::
+
+        For meshes with hanging faces, only the fine sides of the hanging
+        faces receive values from their (coarse) neighbors. The coarse sides
+        receive zeros, since they would need contributions from several fine
+        faces (e.g. through a mortar), and the resulting connection is not
+        surjective. This must be taken into account by the caller, e.g. when
+        computing fluxes.
     """
 
     vol_discr = volume_to_bdry_conn.from_discr
     vol_mesh = vol_discr.mesh
     bdry_discr = volume_to_bdry_conn.to_discr
 
+    from meshmode.mesh import NonconformingInteriorAdjacencyGroup
+    has_hanging_faces = any(
+        isinstance(adj, NonconformingInteriorAdjacencyGroup)
+        for adj_grps in vol_mesh.facial_adjacency_groups
+        for adj in adj_grps)
+
+    if has_hanging_faces and not allow_hanging_faces:
+        raise ValueError(
+            "mesh has hanging faces, whose coarse sides receive no values "
+            "from the opposite face connection: pass "
+            "'allow_hanging_faces=True' to build it anyway")
+
     # make sure we were handed a volume-to-boundary connection
     for i_tgrp, conn_grp in enumerate(volume_to_bdry_conn.groups):
         for batch in conn_grp.batches:
@@ -416,7 +460,10 @@ def make_opposite_face_connection(actx, volume_to_bdry_conn):
         for i_tgt_grp in range(ngrps):
             vbc_tgt_grp_batches = volume_to_bdry_conn.groups[i_tgt_grp].batches
 
-            from meshmode.mesh import InteriorAdjacencyGroup
+            from meshmode.mesh import (
+                InteriorAdjacencyGroup,
+                NonconformingInteriorAdjacencyGroup,
+            )
             adj_grps = [
                 adj for adj in vol_mesh.facial_adjacency_groups[i_tgt_grp]
                 if isinstance(adj, InteriorAdjacencyGroup)
@@ -504,12 +551,21 @@ def make_opposite_face_connection(actx, volume_to_bdry_conn):
 
                     # }}}
 
-                    batches = _make_cross_face_batches(actx,
-                            bdry_discr, bdry_discr,
-                            i_tgt_grp, i_src_grp,
-                            tgt_bdry_element_indices,
-                            src_bdry_element_indices,
-                            tgt_aff_map=adj.aff_map)
+                    if isinstance(adj, NonconformingInteriorAdjacencyGroup):
+                        batches = _make_hanging_face_batches(actx,
+                                bdry_discr,
+                                i_tgt_grp, i_src_grp,
+                                tgt_bdry_element_indices,
+                                src_bdry_element_indices,
+                                adj.face_map_matrices[adj_tgt_flags],
+                                adj.face_map_offsets[adj_tgt_flags])
+                    else:
+                        batches = _make_cross_face_batches(actx,
+                                bdry_discr, bdry_discr,
+                                i_tgt_grp, i_src_grp,
+                                tgt_bdry_element_indices,
+                                src_bdry_element_indices,
+                                tgt_aff_map=adj.aff_map)
                     groups[i_tgt_grp].extend(batches)
 
     from meshmode.discretization.connection import (
@@ -522,7 +578,7 @@ def make_opposite_face_connection(actx, volume_to_bdry_conn):
             groups=[
                 DiscretizationConnectionElementGroup(batches=batches)
                 for batches in groups],
-            is_surjective=True)
+            is_surjective=not has_hanging_faces)
 
 # }}}
 
@@ -38,7 +38,24 @@ from meshmode.discretization.connection.direct import (
     DirectDiscretizationConnection,
     DiscretizationConnection,
 )
-from meshmode.transform_metadata import FirstAxisIsElementsTag
+
+
+# {{{ quadrature weights on child elements
+
+def _get_batch_weights(grp, result_unit_nodes):
+    """Computes the quadrature weights of *grp* scaled by the Jacobian
+    (Gram) determinant of the map from its reference element to the child
+    element given by *result_unit_nodes*, at each node of *grp*.
+    """
+    matrices = np.array(mp.diff_matrices(grp.basis_obj(), grp.unit_nodes))
+
+    # shape: (nnodes, dim, ref_dim)
+    jac = np.einsum("aij,kj->ika", matrices, result_unit_nodes)
+    gram = np.einsum("ika,ikb->iab", jac, jac)
+
+    return np.sqrt(np.abs(np.linalg.det(gram))) * grp.quadrature_rule().weights
+
+# }}}
 
 
 class L2ProjectionInverseDiscretizationConnection(DiscretizationConnection):
@@ -74,8 +91,8 @@ class L2ProjectionInverseDiscretizationConnection(DiscretizationConnection):
         if conn.from_discr.dim != conn.to_discr.dim:
             raise RuntimeError("cannot transport from face to element")
 
-        if not all(g.is_orthonormal_basis() for g in conn.to_discr.groups):
-            raise RuntimeError("`to_discr` must have an orthonormal basis")
+        if not all(g.is_orthonormal_basis() for g in conn.from_discr.groups):
+            raise RuntimeError("`conn.from_discr` must have an orthonormal basis")
 
         self.conn = conn
         super().__init__(
@@ -84,47 +101,54 @@ class L2ProjectionInverseDiscretizationConnection(DiscretizationConnection):
                 is_surjective=is_surjective)
 
     @keyed_memoize_method(key=lambda actx: ())
-    def _batch_weights(self, actx):
-        """Computes scaled quadrature weights for each interpolation batch in
-        :attr:`conn`. The quadrature weights can be used to integrate over
-        child elements in the domain of the parent element, by a change of
-        variables.
+    def _batch_projection_matrices(self, actx):
+        """Computes the matrices that project the data of each interpolation
+        batch in :attr:`conn` onto the (orthonormal) basis of the parent
+        elements and evaluate the result at the nodes of the parent elements.
+        The quadrature weights used for this are scaled, so that they
+        integrate over the child elements in the domain of the parent
+        element, by a change of variables.
 
         :return: a dictionary with keys ``(group_id, batch_id)``.
         """
 
-        from functools import reduce
-        from operator import xor
-
-        from pymbolic.geometric_algebra import MultiVector
-
-        def det(v):
-            nnodes = v[0].shape[0]
-            det_v = np.empty(nnodes)
-
-            for i in range(nnodes):
-                outer_product = reduce(xor, [MultiVector(x[i, :].T) for x in v])
-                det_v[i] = abs((outer_product.I | outer_product).as_scalar())
-
-            return det_v
-
-        weights = {}
-        jac = np.empty(self.to_discr.dim, dtype=object)
-
-        for igrp, grp in enumerate(self.to_discr.groups):
-            if not isinstance(grp, InterpolatoryElementGroupBase):
-                raise ValueError("element group must be interpolatory")
-
-            matrices = mp.diff_matrices(grp.basis_obj(), grp.unit_nodes)
-
-            for ibatch, batch in enumerate(self.conn.groups[igrp].batches):
-                for iaxis in range(grp.dim):
-                    jac[iaxis] = matrices[iaxis] @ batch.result_unit_nodes.T
+        # NOTE: the matrices only depend on the reference geometry of the
+        # child elements, which is the same for all elements in a batch (and
+        # in the same batch of any other connection between the same groups)
+        @keyed_memoize_in(
+            actx, (L2ProjectionInverseDiscretizationConnection,
+                   "projection_matrix"),
+            lambda fgrp, tgrp, unit_nodes: (
+                fgrp.discretization_key(), tgrp.discretization_key(),
+                unit_nodes.shape, unit_nodes.tobytes()))
+        def projection_matrix(fgrp, tgrp, unit_nodes):
+            # NOTE: elements that are the same as their parent are copied
+            # exactly
+            if (fgrp.discretization_key() == tgrp.discretization_key()
+                    and np.array_equal(unit_nodes, tgrp.unit_nodes)):
+                return actx.freeze(actx.from_numpy(np.eye(tgrp.nunit_dofs)))
+
+            basis = tgrp.basis_obj()
+            mat = (
+                mp.vandermonde(basis.functions, tgrp.unit_nodes)
+                @ (mp.vandermonde(basis.functions, unit_nodes).T
+                   * _get_batch_weights(fgrp, unit_nodes)))
+
+            return actx.freeze(actx.from_numpy(mat))
+
+        matrices = {}
+        for igrp, cgrp in enumerate(self.conn.groups):
+            fgrp = self.from_discr.groups[igrp]
+            if not isinstance(fgrp, InterpolatoryElementGroupBase):
+                raise TypeError("element group must be interpolatory")
 
-                weights[igrp, ibatch] = actx.freeze(actx.from_numpy(
-                    det(jac) * grp.quadrature_rule().weights))
+            for ibatch, batch in enumerate(cgrp.batches):
+                matrices[igrp, ibatch] = projection_matrix(
+                    fgrp,
+                    self.to_discr.groups[batch.from_group_index],
+                    batch.result_unit_nodes)
 
-        return weights
+        return matrices
 
     def __call__(self, ary):
         """
@@ -162,17 +186,17 @@ class L2ProjectionInverseDiscretizationConnection(DiscretizationConnection):
                     "{[iel_init]: 0 <= iel_init < n_to_elements}",
                     "{[idof_init]: 0 <= idof_init < n_to_nodes}",
                     "{[iel]: 0 <= iel < nelements}",
-                    "{[i_quad]: 0 <= i_quad < n_to_nodes}",
-                    "{[ibasis]: 0 <= ibasis < n_to_nodes}"
+                    "{[i_quad]: 0 <= i_quad < n_from_nodes}",
+                    "{[idof]: 0 <= idof < n_to_nodes}"
                 ],
                 """
                     result[iel_init, idof_init] = 0 {id=init}
                     ... gbarrier {id=barrier, dep=init}
-                    result[to_element_indices[iel], ibasis] =               \
-                        result[to_element_indices[iel], ibasis] +           \
+                    result[to_element_indices[iel], idof] =                 \
+                        result[to_element_indices[iel], idof] +             \
                         sum(i_quad, ary[from_element_indices[iel], i_quad]  \
-                                    * basis_tabulation[ibasis, i_quad]      \
-                                    * weights[i_quad]) {dep=barrier}
+                                    * projection_mat[idof, i_quad])         \
+                        {dep=barrier}
                 """,
                 [
                     lp.GlobalArg("ary", None,
@@ -180,10 +204,8 @@ class L2ProjectionInverseDiscretizationConnection(DiscretizationConnection):
                     lp.GlobalArg("result", None,
                                  shape=("n_to_elements", "n_to_nodes"),
                                  is_input=False),
-                    lp.GlobalArg("basis_tabulation", None,
-                                 shape=("n_to_nodes", "n_to_nodes")),
-                    lp.GlobalArg("weights", None,
-                                 shape="n_from_nodes"),
+                    lp.GlobalArg("projection_mat", None,
+                                 shape=("n_to_nodes", "n_from_nodes")),
                     lp.ValueArg("n_from_elements", np.int32),
                     lp.ValueArg("n_from_nodes", np.int32),
                     lp.ValueArg("n_to_elements", np.int32),
@@ -200,67 +222,84 @@ class L2ProjectionInverseDiscretizationConnection(DiscretizationConnection):
                     "iel_init": ConcurrentElementInameTag(),
                     "idof_init": ConcurrentDOFInameTag(),
                     "iel": ConcurrentElementInameTag(),
-                    "ibasis": ConcurrentDOFInameTag(),
+                    "idof": ConcurrentDOFInameTag(),
                     })
 
-        # compute weights on each refinement of the reference element
-        weights = self._batch_weights(actx)
+        # get the (cached) projection matrices for each refinement of the
+        # reference element
+        projection_matrices = self._batch_projection_matrices(actx)
 
-        # perform dot product (on reference element) to get basis coefficients
-        c_group_data = []
+        # project each batch onto the parent elements and evaluate the result
+        # at their nodes
+        group_data = [[] for _ in self.to_discr.groups]
         for igrp, cgrp in enumerate(self.conn.groups):
-            c_batch_data = []
             for ibatch, batch in enumerate(cgrp.batches):
-                sgrp = self.from_discr.groups[batch.from_group_index]
-
-                # Generate the basis tabulation matrix
-                tabulations = []
-                for basis_fn in sgrp.basis_obj().functions:
-                    tabulations.append(basis_fn(batch.result_unit_nodes).flatten())
-                tabulations = actx.from_numpy(np.asarray(tabulations))
-
                 # NOTE: batch.*_element_indices are reversed here because
                 # they are from the original forward connection, but
                 # we are going in reverse here. a bit confusing, but
                 # saves on recreating the connection groups and batches.
-                c_batch_data.append(
+                tgrp = self.to_discr.groups[batch.from_group_index]
+                group_data[batch.from_group_index].append(
                     actx.call_loopy(
                         kproj(),
-                        ary=ary[batch.from_group_index],
-                        basis_tabulation=tabulations,
-                        weights=weights[igrp, ibatch],
+                        ary=ary[igrp],
+                        projection_mat=projection_matrices[igrp, ibatch],
                         from_element_indices=batch.to_element_indices,
                         to_element_indices=batch.from_element_indices,
-                        n_to_elements=self.to_discr.groups[igrp].nelements,
-                        n_to_nodes=self.to_discr.groups[igrp].nunit_dofs,
+                        n_to_elements=tgrp.nelements,
+                        n_to_nodes=tgrp.nunit_dofs,
                     )["result"]
                 )
 
-            c_group_data.append(sum(c_batch_data))
-        coefficients = DOFArray(actx, data=tuple(c_group_data))
-
-        @keyed_memoize_in(
-            actx, (L2ProjectionInverseDiscretizationConnection,
-                   "vandermonde_matrix"),
-            lambda grp: grp.discretization_key()
-        )
-        def vandermonde_matrix(grp):
-            from modepy import vandermonde
-            vdm = vandermonde(grp.basis_obj().functions,
-                              grp.unit_nodes)
-            return actx.from_numpy(vdm)
-
         return DOFArray(
             actx,
             data=tuple(
-                actx.einsum("ij,ej->ei",
-                            vandermonde_matrix(grp),
-                            c_i,
-                            arg_names=("vdm", "coeffs"),
-                            tagged=(FirstAxisIsElementsTag(),))
-                for grp, c_i in zip(self.to_discr.groups, coefficients, strict=True)
-            )
-        )
+                sum(contributions) if contributions else actx.np.zeros(
+                    (tgrp.nelements, tgrp.nunit_dofs), dtype=ary.entry_dtype)
+                for tgrp, contributions in zip(
+                    self.to_discr.groups, group_data, strict=True)))
+
+
+# {{{ L2ProjectionCoarseningConnection
+
+class L2ProjectionCoarseningConnection(L2ProjectionInverseDiscretizationConnection):
+    """Creates a conservative inverse of a refinement connection *conn*,
+    i.e. a :class:`DiscretizationConnection` that transports data from
+    the refined *to_discr* of *conn* back to its coarse *from_discr* by an
+    :math:`L^2` projection onto each coarse element.
+
+    This is a :class:`L2ProjectionInverseDiscretizationConnection` for a
+    single :class:`DirectDiscretizationConnection` obtained from refinement,
+    where every coarse element is covered by its children, so that the
+    result is surjective. The projection matrices only depend on the two
+    element groups and on the location of the child in its parent and are
+    cached on the array context, so they can be reused by all connections
+    created for the same discretizations. Elements that were not refined by
+    *conn* are copied exactly.
+
+    .. attribute:: from_discr
+    .. attribute:: to_discr
+    .. attribute:: is_surjective
+
+    .. attribute:: conn
+    .. automethod:: __call__
+
+    .. versionadded:: 2024.1
+    """
+
+    def __new__(cls, conn: DirectDiscretizationConnection):
+        # NOTE: chained connections are not split up as in the base class
+        return DiscretizationConnection.__new__(cls)
+
+    def __init__(self, conn: DirectDiscretizationConnection) -> None:
+        if not isinstance(conn, DirectDiscretizationConnection):
+            raise TypeError(
+                "'conn' must be a DirectDiscretizationConnection, "
+                f"got '{type(conn).__name__}'")
+
+        super().__init__(conn, is_surjective=True)
+
+# }}}
 
 
 # vim: foldmethod=marker
@@ -73,21 +73,22 @@ def _build_interpolation_batches_for_group(
 
     num_children = len(record.el_tess_info.children) \
                    if record.el_tess_info else 0
-    from_bins = [[] for i in range(1 + num_children)]
-    to_bins = [[] for i in range(1 + num_children)]
-    for elt_idx, refinement_result in enumerate(record.element_mapping):
-        if len(refinement_result) == 1:
-            # Not refined -> interpolates to self
-            from_bins[0].append(elt_idx)
-            to_bins[0].append(refinement_result[0])
-        else:
-            assert len(refinement_result) == num_children
-            # Refined -> interpolates to children
-            for from_bin, to_bin, child_idx in zip(
-                    from_bins[1:], to_bins[1:], refinement_result,
-                    strict=True):
-                from_bin.append(elt_idx)
-                to_bin.append(child_idx)
+
+    child_starts = record.child_element_starts
+    child_elements = np.asarray(record.child_elements, dtype=np.int64)
+    nchild_elements = np.diff(child_starts)
+
+    # Not refined -> interpolates to self
+    unrefined_elements, = np.where(nchild_elements == 1)
+
+    # Refined -> interpolates to children
+    refined_elements, = np.where(nchild_elements != 1)
+    assert (nchild_elements[refined_elements] == num_children).all()
+
+    from_bins = [unrefined_elements] + [refined_elements] * num_children
+    to_bins = [child_elements[child_starts[unrefined_elements]]] + [
+            child_elements[child_starts[refined_elements] + ichild]
+            for ichild in range(num_children)]
 
     fine_unit_nodes = fine_discr_group.unit_nodes
     fine_meg = fine_discr_group.mesh_el_group
@@ -102,12 +103,12 @@ def _build_interpolation_batches_for_group(
             to_bins,
             chain([fine_unit_nodes], mapped_unit_nodes),
             strict=True):
-        if not from_bin:
+        if not from_bin.size:
             continue
         yield InterpolationBatch(
             from_group_index=group_idx,
-            from_element_indices=actx.from_numpy(np.asarray(from_bin)),
-            to_element_indices=actx.from_numpy(np.asarray(to_bin)),
+            from_element_indices=actx.from_numpy(from_bin.astype(np.int64)),
+            to_element_indices=actx.from_numpy(to_bin),
             result_unit_nodes=unit_nodes,
             to_element_face=None)
 
@@ -136,6 +137,9 @@ def make_refinement_connection(actx, refiner, coarse_discr, group_factory):
         DiscretizationConnectionElementGroup,
     )
 
+    if refiner.group_refinement_records is None:
+        raise ValueError("the last operation of the refiner was not a refinement")
+
     coarse_mesh = refiner.get_previous_mesh()
     fine_mesh = refiner.get_current_mesh()
 
@@ -168,4 +172,129 @@ def make_refinement_connection(actx, refiner, coarse_discr, group_factory):
         is_surjective=True)
 
 
+@log_process(logger)
+def make_mesh_hierarchy_connection(
+        actx, hierarchy, from_discr, group_factory, to_level, *,
+        from_level=0):
+    """Return a
+    :class:`meshmode.discretization.connection.DiscretizationConnection`
+    connecting *from_discr* directly to a discretization on the mesh at
+    level *to_level* of *hierarchy*, without going through the intermediate
+    levels.
+
+    :arg hierarchy: An instance of
+        :class:`meshmode.mesh.refinement.MeshHierarchy`.
+    :arg from_discr: An instance of
+        :class:`meshmode.discretization.Discretization` associated with
+        the mesh at level *from_level* of *hierarchy*.
+    :arg group_factory: An instance of
+        :class:`meshmode.discretization.ElementGroupFactory`. Used
+        for discretizing the fine mesh.
+
+    .. versionadded:: 2024.1
+    """
+    from meshmode.discretization.connection import (
+        DirectDiscretizationConnection,
+        DiscretizationConnectionElementGroup,
+    )
+
+    if from_discr.mesh != hierarchy.get_mesh(from_level):
+        raise ValueError(
+            f"from_discr does not live on the mesh at level {from_level} "
+            "of the hierarchy")
+
+    records = hierarchy.get_group_refinement_records(
+        to_level, from_level=from_level)
+    to_discr = from_discr.copy(
+        actx=actx,
+        mesh=hierarchy.get_mesh(to_level),
+        group_factory=group_factory,
+        )
+
+    groups = []
+    for group_idx, (from_discr_group, to_discr_group, record) in \
+            enumerate(zip(from_discr.groups,
+                          to_discr.groups,
+                          records,
+                          strict=True)):
+        groups.append(
+            DiscretizationConnectionElementGroup(
+                list(_build_interpolation_batches_for_group(
+                        actx, group_idx, from_discr_group,
+                        to_discr_group, record))))
+
+    return DirectDiscretizationConnection(
+        from_discr=from_discr,
+        to_discr=to_discr,
+        groups=groups,
+        is_surjective=True)
+
+
+@log_process(logger)
+def make_coarsening_connection(actx, refiner, fine_discr, group_factory):
+    """Return a conservative
+    :class:`meshmode.discretization.connection.DiscretizationConnection`
+    connecting *fine_discr* to a discretization on the mesh obtained by the
+    last call to :meth:`meshmode.mesh.refinement.AdaptiveRefiner.coarsen`.
+
+    The data on the merged elements is :math:`L^2`-projected onto their
+    parents (see :class:`L2ProjectionCoarseningConnection`), while the data
+    on all other elements is carried over.
+
+    :arg refiner: An instance of
+        :class:`meshmode.mesh.refinement.AdaptiveRefiner`.
+    :arg fine_discr: An instance of
+        :class:`meshmode.discretization.Discretization` associated
+        with the mesh before coarsening.
+    :arg group_factory: An instance of
+        :class:`meshmode.discretization.ElementGroupFactory`. Used
+        for discretizing the coarse mesh. The resulting element groups
+        must have an orthonormal basis.
+
+    .. versionadded:: 2024.1
+    """
+    from meshmode.discretization.connection import (
+        DirectDiscretizationConnection,
+        DiscretizationConnectionElementGroup,
+        L2ProjectionCoarseningConnection,
+    )
+
+    if refiner.group_coarsening_records is None:
+        raise ValueError("the last operation of the refiner was not a coarsening")
+
+    fine_mesh = refiner.get_previous_mesh()
+    coarse_mesh = refiner.get_current_mesh()
+
+    if fine_discr.mesh != fine_mesh:
+        raise ValueError(
+            "fine_discr does not live on the mesh before the last coarsening")
+
+    coarse_discr = fine_discr.copy(
+        actx=actx,
+        mesh=coarse_mesh,
+        group_factory=group_factory,
+        )
+
+    # NOTE: this is the interpolation from the coarse to the fine mesh, as
+    # if the coarse mesh had been refined to obtain the fine mesh
+    groups = []
+    for group_idx, (coarse_discr_group, fine_discr_group, record) in \
+            enumerate(zip(coarse_discr.groups,
+                          fine_discr.groups,
+                          refiner.group_coarsening_records,
+                          strict=True)):
+        groups.append(
+            DiscretizationConnectionElementGroup(
+                list(_build_interpolation_batches_for_group(
+                        actx, group_idx, coarse_discr_group,
+                        fine_discr_group, record))))
+
+    return L2ProjectionCoarseningConnection(
+        DirectDiscretizationConnection(
+            from_discr=coarse_discr,
+            to_discr=fine_discr,
+            groups=groups,
+            is_surjective=True))
+
+
 # vim: foldmethod=marker
@@ -44,8 +44,11 @@ logger = logging.getLogger(__name__)
 __doc__ = """
 
 .. autofunction:: make_visualizer
+.. autofunction:: make_lod_visualizer
 
 .. autoclass:: Visualizer
+.. autoclass:: VTKHDFTimeSeriesWriter
+.. autoclass:: AsyncVisualizer
 
 .. autofunction:: write_nodal_adjacency_vtk_file
 """
@@ -119,6 +122,13 @@ def _resample_to_numpy(conn, vis_discr, vec, *, stack=False, by_group=False):
 
         return _stack_object_array(r, by_group=by_group) if stack else r
 
+    if isinstance(vec, _HostField):
+        if by_group:
+            group_starts = np.cumsum([grp.ndofs for grp in vis_discr.groups])
+            return make_obj_array(np.split(vec.data, group_starts[:-1]))
+        else:
+            return vec.data
+
     if isinstance(vec, DOFArray):
         actx = vec.array_context
         vec = conn(vec)
@@ -155,6 +165,23 @@ def _resample_to_numpy(conn, vis_discr, vec, *, stack=False, by_group=False):
             raise TypeError(f"unsupported array type: {type(vec).__name__}")
 
 
+@dataclass(frozen=True)
+class _HostField:
+    """A field that has already been resampled to the visualization
+    discretization and copied to the host (see :class:`AsyncVisualizer`).
+    """
+
+    data: np.ndarray
+
+
+def _wrap_host_fields(vec):
+    if isinstance(vec, np.ndarray) and vec.dtype.char == "O":
+        from pytools.obj_array import obj_array_vectorize
+        return obj_array_vectorize(_wrap_host_fields, vec)
+
+    return _HostField(vec)
+
+
 def preprocess_fields(names_and_fields):
     """Gets arrays out of dataclasses and removes empty arrays."""
     from dataclasses import fields, is_dataclass
@@ -165,7 +192,7 @@ def preprocess_fields(names_and_fields):
 
     result = []
     for name, field in names_and_fields:
-        if is_dataclass(field):
+        if is_dataclass(field) and not isinstance(field, _HostField):
             for attr in fields(field):
                 value = getattr(field, attr.name)
                 if not is_empty(value):
@@ -500,6 +527,7 @@ class Visualizer:
     .. automethod:: write_vtk_file
     .. automethod:: write_parallel_vtk_file
     .. automethod:: write_vtkhdf_file
+    .. automethod:: make_vtkhdf_time_series_writer
     .. automethod:: write_xdmf_file
 
     .. automethod:: copy_with_same_connectivity
@@ -538,6 +566,11 @@ class Visualizer:
             discretizations are performed.
         """
 
+        if self.vis_discr.mesh is not self.discr.mesh:
+            raise ValueError(
+                "copying is only supported for visualizers on the same mesh "
+                "as their discretization (e.g. from 'make_visualizer')")
+
         if not skip_tests:
             if not _check_discr_same_connectivity(discr, self.discr):
                 raise ValueError("'discr' does not have matching group structures")
@@ -567,6 +600,147 @@ class Visualizer:
             for ary in self.vis_discr.nodes()
             ])
 
+    # {{{ batched resampling
+
+    @memoize_method
+    def _has_elementwise_connection(self) -> bool:
+        """*True* if every target element of :attr:`connection` is resampled
+        from the source element with the same index, using a single
+        resampling matrix per group (as for :func:`make_visualizer`).
+        """
+        from meshmode.discretization.connection import (
+            DirectDiscretizationConnection,
+        )
+        if not isinstance(self.connection, DirectDiscretizationConnection):
+            return False
+
+        actx = self.vis_discr._setup_actx
+        for igrp, (cgrp, tgrp) in enumerate(
+                zip(self.connection.groups, self.vis_discr.groups, strict=True)):
+            if len(cgrp.batches) != 1:
+                return False
+
+            batch, = cgrp.batches
+            if batch.from_group_index != igrp:
+                return False
+
+            fgrp = self.discr.groups[igrp]
+            if not (fgrp.nelements == tgrp.nelements == batch.nelements):
+                return False
+
+            all_elements = np.arange(tgrp.nelements)
+            if not (
+                    np.array_equal(
+                        actx.to_numpy(batch.from_element_indices), all_elements)
+                    and np.array_equal(
+                        actx.to_numpy(batch.to_element_indices), all_elements)):
+                return False
+
+        return True
+
+    def _resample_dof_arrays_to_numpy(self, vecs):
+        """Resample all the :class:`~meshmode.dof_array.DOFArray` instances in
+        *vecs* to the visualization discretization and flatten them into
+        :mod:`numpy` arrays, using a single kernel per group and a single
+        transfer for all arrays of the same type.
+        """
+        if len(vecs) < 2 or not self._has_elementwise_connection():
+            return [_resample_to_numpy(self.connection, self.vis_discr, vec)
+                    for vec in vecs]
+
+        conn = self.connection
+        actx = vecs[0].array_context
+
+        if __debug__:
+            from meshmode.dof_array import check_dofarray_against_discr
+            for vec in vecs:
+                check_dofarray_against_discr(self.discr, vec)
+
+        buckets: dict[np.dtype, list[int]] = {}
+        for i, vec in enumerate(vecs):
+            buckets.setdefault(vec.entry_dtype, []).append(i)
+
+        from meshmode.transform_metadata import FirstAxisIsElementsTag
+
+        result = [None] * len(vecs)
+        for indices in buckets.values():
+            nfields = len(indices)
+
+            # NOTE: the fields are moved to the last axis so that the kernel
+            # is parallelized over elements and DOFs as usual
+            flat = actx.np.concatenate([
+                actx.einsum("ij,fej->eif",
+                        conn._resample_matrix(actx, igrp, 0),
+                        actx.np.stack([vecs[i][igrp] for i in indices]),
+                        tagged=(FirstAxisIsElementsTag(),)
+                        ).reshape(-1)
+                for igrp in range(len(self.vis_discr.groups))])
+            host = actx.to_numpy(flat)
+
+            group_results = []
+            group_start = 0
+            for tgrp in self.vis_discr.groups:
+                group_end = group_start + tgrp.ndofs * nfields
+                group_results.append(
+                        host[group_start:group_end]
+                        .reshape(tgrp.nelements, tgrp.nunit_dofs, nfields)
+                        .transpose(2, 0, 1)
+                        .reshape(nfields, tgrp.ndofs))
+                group_start = group_end
+
+            host = np.concatenate(group_results, axis=1)
+            for k, i in enumerate(indices):
+                result[i] = host[k]
+
+        return result
+
+    def _resample_fields_to_numpy(self, names_and_fields, *,
+            stack=False, by_group=False):
+        """Batched equivalent of applying :func:`_resample_to_numpy` to each
+        field in *names_and_fields*.
+        """
+        from pytools.obj_array import obj_array_vectorize
+
+        vecs = []
+
+        def collect(vec):
+            if isinstance(vec, DOFArray):
+                vecs.append(vec)
+
+            return vec
+
+        for _, field in names_and_fields:
+            if isinstance(field, np.ndarray) and field.dtype.char == "O":
+                obj_array_vectorize(collect, field)
+            else:
+                collect(field)
+
+        host_fields = {
+                id(vec): _HostField(host_vec)
+                for vec, host_vec in zip(
+                    vecs, self._resample_dof_arrays_to_numpy(vecs), strict=True)}
+
+        def replace(vec):
+            if isinstance(vec, DOFArray):
+                return host_fields[id(vec)]
+
+            return vec
+
+        result = []
+        for name, field in names_and_fields:
+            if isinstance(field, np.ndarray) and field.dtype.char == "O":
+                field = obj_array_vectorize(replace, field)
+            else:
+                field = replace(field)
+
+            result.append((name, _resample_to_numpy(
+                self.connection, self.vis_discr, field,
+                stack=stack, by_group=by_group)))
+
+        return result
+
+    # }}}
+
     # {{{ mayavi
 
     def show_scalar_in_mayavi(self, field, **kwargs):
@@ -758,16 +932,15 @@ class Visualizer:
 
         nodes = self._vis_nodes_numpy()
 
-        names_and_fields = preprocess_fields(names_and_fields)
-        names_and_fields = [
-                (name, _resample_to_numpy(
-                    self.connection, self.vis_discr, fld))
-                for name, fld in names_and_fields
-                ]
+        names_and_fields = self._resample_fields_to_numpy(
+                preprocess_fields(names_and_fields))
 
         # {{{ shrink elements
 
         if abs(self.element_shrink_factor - 1.0) > 1.0e-14:
+            # NOTE: the nodes are cached, so they must not be modified in place
+            nodes = nodes.copy()
+
             node_nr_base = 0
             for vgrp in self.vis_discr.groups:
                 nodes_view = (
@@ -861,9 +1034,53 @@ class Visualizer:
 
     # {{{ vtkhdf
 
+    @memoize_method
+    def _vtkhdf_connectivity(self, use_high_order: bool = False):
+        connectivity = self._vtk_connectivity(use_high_order)
+        cell_types = connectivity.cell_types
+
+        try:
+            cell_count, cell_connectivity, cell_offsets = connectivity.cells
+            cell_offsets = np.append([0], cell_offsets)
+        except ValueError:
+            from pyvisfile.vtk import CELL_NODE_COUNT
+            cell_count = cell_types.size
+            cell_connectivity = connectivity.cells
+            cell_offsets = np.cumsum(np.append([0],
+                    np.vectorize(CELL_NODE_COUNT.get)(cell_types)),
+                    dtype=cell_connectivity.dtype)
+
+        return cell_count, cell_connectivity, cell_offsets, cell_types
+
+    def make_vtkhdf_time_series_writer(self,
+            file_name: str, *,
+            comm=None,
+            aggregate: str | None = None,
+            use_high_order: bool = False,
+            real_only: bool = False,
+            overwrite: bool = False,
+            h5_file_options: dict[str, Any] | None = None,
+            dset_options: dict[str, Any] | None = None,
+            ) -> "VTKHDFTimeSeriesWriter":
+        """Create a :class:`VTKHDFTimeSeriesWriter` that writes a time series
+        of fields on this visualizer into a single VTK HDF5 file. The
+        arguments have the same meaning as for :meth:`write_vtkhdf_file`.
+
+        .. versionadded:: 2024.1
+        """
+        return VTKHDFTimeSeriesWriter(self, file_name,
+                comm=comm,
+                aggregate=aggregate,
+                use_high_order=use_high_order,
+                real_only=real_only,
+                overwrite=overwrite,
+                h5_file_options=h5_file_options,
+                dset_options=dset_options)
+
     def write_vtkhdf_file(self,
             file_name: str, names_and_fields: list[tuple[str, Any]], *,
             comm=None,
+            aggregate: str | None = None,
             use_high_order: bool = False,
             real_only: bool = False,
             overwrite: bool = False,
@@ -876,9 +1093,15 @@ class Visualizer:
         through ``mpi4py``.
 
         :arg comm: an ``mpi4py.Comm``-like interface that supports
-            ``Get_rank``, ``Get_size``, ``scan`` and ``reduce``. The last two
-            are required to gather global information about the points and
-            cells in the discretizations.
+            ``Get_rank``, ``Get_size`` and ``allgather``. The latter is
+            used to gather global information about the points and
+            cells in the discretizations. Each rank writes its part of the
+            datasets using collective I/O.
+        :arg aggregate: if ``"node"``, the ranks in *comm* that share a
+            (compute) node write to a separate file for each node, named
+            ``{file_name}-{node:04d}.hdf``, instead of a single shared file.
+            This can be faster on file systems where writing a single shared
+            file from many ranks is slow.
         :arg h5_file_options: a :class:`dict` passed directly to
             :class:`h5py.File` that allows controlling chunking, compatibility, etc.
         :arg dataset_options: a :class:`dict` passed directly to
@@ -894,15 +1117,10 @@ class Visualizer:
         if h5_file_options is None:
             h5_file_options = {}
 
-        if comm is not None:
-            h5_file_options["comm"] = comm
-            if "driver" not in h5_file_options:
-                h5_file_options["driver"] = "mpio"
-            else:
-                if h5_file_options["driver"] != "mpio":
-                    raise ValueError(
-                        "parallel HDF5 requires the 'mpio' driver: "
-                        f"driver is '{h5_file_options['driver']}'")
+        if comm is not None and h5_file_options.get("driver", "mpio") != "mpio":
+            raise ValueError(
+                "parallel HDF5 requires the 'mpio' driver: "
+                f"driver is '{h5_file_options['driver']}'")
 
         import os
         if os.path.splitext(file_name)[-1] != ".hdf":
@@ -911,19 +1129,21 @@ class Visualizer:
         if dset_options is None:
             dset_options = {}
 
-        names_and_fields = preprocess_fields(names_and_fields)
-        names_and_fields = [
-                (name, _resample_to_numpy(
-                    self.connection, self.vis_discr, fld))
-                for name, fld in names_and_fields
-                ]
+        names_and_fields = self._resample_fields_to_numpy(
+                preprocess_fields(names_and_fields))
 
-        if comm is None:
-            mpisize = 1
-            mpirank = 0
-        else:
-            mpisize = comm.Get_size()
-            mpirank = comm.Get_rank()
+        nodes = np.stack(self._vis_nodes_numpy()).T
+
+        cell_count, cell_connectivity, cell_offsets, cell_types = (
+                self._vtkhdf_connectivity(use_high_order))
+
+        partition = _make_vtkhdf_partition(file_name, comm,
+                counts=(cell_count, nodes.shape[0], cell_connectivity.size),
+                aggregate=aggregate)
+
+        if partition.is_parallel:
+            h5_file_options = {
+                **h5_file_options, "comm": partition.comm, "driver": "mpio"}
 
         # }}}
 
@@ -941,67 +1161,29 @@ class Visualizer:
                 shape = (shape[0], 3)
 
             dset = grp.create_dataset(name, shape, dtype=data.dtype, **dset_options)
-            dset[offset:offset + data.shape[0]] = data
+            _vtkhdf_write_rows(partition, dset, offset, data)
 
             return dset
 
-        with h5py.File(file_name, "w", **h5_file_options) as h5:
+        with h5py.File(partition.file_name, "w", **h5_file_options) as h5:
             root = h5.create_group("VTKHDF")
             root.attrs.create("Version", [1, 0])
 
-            nodes = np.stack(self._vis_nodes_numpy()).T
-
-            # {{{ local connectivity
-
-            connectivity = self._vtk_connectivity(use_high_order)
-            cell_types = connectivity.cell_types
-
-            try:
-                cell_count, cell_connectivity, cell_offsets = connectivity.cells
-                cell_offsets = np.append([0], cell_offsets)
-            except ValueError:
-                from pyvisfile.vtk import CELL_NODE_COUNT
-                cell_count = cell_types.size
-                cell_connectivity = connectivity.cells
-                cell_offsets = np.cumsum(np.append([0],
-                        np.vectorize(CELL_NODE_COUNT.get)(cell_types)),
-                        dtype=cell_connectivity.dtype)
-
-            # }}}
-
-            # {{{ determine partitions
-
-            node_count = nodes.shape[0]
-            conn_count = cell_connectivity.size
-
-            if comm is None:
-                global_cell_offset = 0
-                global_node_offset = 0
-                global_conn_offset = 0
-                global_cell_count = cell_count
-                global_node_count = node_count
-                global_conn_count = conn_count
-            else:
-                from mpi4py import MPI
-
-                # FIXME: should be able to do all these in one go
-                global_cell_offset = comm.scan(cell_count) - cell_count
-                global_node_offset = comm.scan(node_count) - node_count
-                global_conn_offset = comm.scan(conn_count) - conn_count
-                global_cell_count = comm.allreduce(cell_count, op=MPI.SUM)
-                global_node_count = comm.allreduce(node_count, op=MPI.SUM)
-                global_conn_count = comm.allreduce(conn_count, op=MPI.SUM)
-
-            # }}}
+            nparts, part = partition.nparts, partition.part
+            global_cell_count, global_node_count, global_conn_count = (
+                    partition.global_counts)
+            global_cell_offset, global_node_offset, global_conn_offset = (
+                    partition.offsets)
 
             # {{{ write mesh
 
             create_dataset(root, "NumberOfCells", np.array([cell_count]),
-                           shape=(mpisize,), offset=mpirank)
-            create_dataset(root, "NumberOfPoints", np.array([node_count]),
-                           shape=(mpisize,), offset=mpirank)
-            create_dataset(root, "NumberOfConnectivityIds", np.array([conn_count]),
-                           shape=(mpisize,), offset=mpirank)
+                           shape=(nparts,), offset=part)
+            create_dataset(root, "NumberOfPoints", np.array([nodes.shape[0]]),
+                           shape=(nparts,), offset=part)
+            create_dataset(root, "NumberOfConnectivityIds",
+                           np.array([cell_connectivity.size]),
+                           shape=(nparts,), offset=part)
 
             create_dataset(root, "Points", nodes,
                            shape=(global_node_count, nodes.shape[1]),
@@ -1009,8 +1191,8 @@ class Visualizer:
             create_dataset(root, "Connectivity", cell_connectivity,
                            shape=(global_conn_count,), offset=global_conn_offset)
             create_dataset(root, "Offsets", cell_offsets,
-                           shape=(global_cell_count + mpisize,),
-                           offset=global_cell_offset + mpirank)
+                           shape=(global_cell_count + nparts,),
+                           offset=global_cell_offset + part)
             create_dataset(root, "Types", cell_types,
                            shape=(global_cell_count,), offset=global_cell_offset)
 
@@ -1097,13 +1279,9 @@ class Visualizer:
 
         # {{{ expand -> filter -> resample -> to_numpy fields
 
-        names_and_fields = preprocess_fields(names_and_fields)
-        names_and_fields = [
-                (name, _resample_to_numpy(
-                    self.connection, self.vis_discr, field,
-                    stack=True, by_group=True))
-                for name, field in names_and_fields
-                ]
+        names_and_fields = self._resample_fields_to_numpy(
+                preprocess_fields(names_and_fields),
+                stack=True, by_group=True)
 
         # }}}
 
@@ -1288,6 +1466,546 @@ class Visualizer:
 # }}}
 
 
+# {{{ vtkhdf partitioning
+
+@dataclass(frozen=True)
+class _VTKHDFPartition:
+    """Location of the part owned by the current rank in the (global)
+    datasets of a VTK HDF5 file.
+
+    The local and global counts are given as ``(cells, points,
+    connectivity ids)`` tuples.
+    """
+
+    file_name: str
+    comm: Any
+
+    nparts: int
+    part: int
+
+    counts: tuple[int, int, int]
+    offsets: tuple[int, int, int]
+    global_counts: tuple[int, int, int]
+
+    @property
+    def is_parallel(self) -> bool:
+        return self.comm is not None
+
+
+def _make_vtkhdf_partition(
+        file_name: str, comm, *,
+        counts: tuple[int, int, int],
+        aggregate: str | None = None) -> _VTKHDFPartition:
+    """Determine the hyperslabs in which each rank in *comm* writes its part.
+
+    :arg aggregate: if *None*, all the ranks in *comm* write to a single
+        shared file. If ``"node"``, the ranks on each (shared memory) node
+        write to a separate file named ``{file_name}-{node:04d}.hdf``.
+    """
+    if comm is None:
+        if aggregate is not None:
+            raise ValueError("'aggregate' requires a communicator")
+
+        return _VTKHDFPartition(
+                file_name=file_name, comm=None,
+                nparts=1, part=0,
+                counts=counts, offsets=(0, 0, 0), global_counts=counts)
+
+    if aggregate is None:
+        pass
+    elif aggregate == "node":
+        from mpi4py import MPI
+        node_comm = comm.Split_type(
+                MPI.COMM_TYPE_SHARED, key=comm.Get_rank())
+
+        # NOTE: the lowest global rank on each node is its local rank 0, so
+        # counting those gives a unique index for each node
+        is_leader = int(node_comm.Get_rank() == 0)
+        node_index = node_comm.bcast(comm.scan(is_leader) - 1, root=0)
+
+        import os
+        root, ext = os.path.splitext(file_name)
+        file_name = f"{root}-{node_index:04d}{ext}"
+        comm = node_comm
+    else:
+        raise ValueError(f"unknown 'aggregate' value: '{aggregate}'")
+
+    # NOTE: a single collective operation gathers everything we need
+    all_counts = np.array(comm.allgather(counts), dtype=np.int64)
+    all_offsets = np.cumsum(all_counts, axis=0) - all_counts
+    part = comm.Get_rank()
+
+    return _VTKHDFPartition(
+            file_name=file_name, comm=comm,
+            nparts=comm.Get_size(), part=part,
+            counts=counts,
+            offsets=tuple(int(n) for n in all_offsets[part]),
+            global_counts=tuple(int(n) for n in np.sum(all_counts, axis=0)))
+
+
+def _vtkhdf_chunks(nrows: int, row_shape: tuple[int, ...],
+        dtype: np.dtype, *, max_chunk_bytes: int = 2**26):
+    """Chunk shape such that each chunk along the first axis covers the rows
+    of a complete time step (i.e. the rows written by all the parts), if that
+    fits in *max_chunk_bytes*. This keeps the steps aligned to chunks, so
+    that no chunk is shared between two steps.
+    """
+    nbytes = nrows * int(np.prod(row_shape, dtype=np.int64)) * dtype.itemsize
+    if nrows == 0 or nbytes > max_chunk_bytes:
+        return True
+
+    return (nrows, *row_shape)
+
+
+def _vtkhdf_write_rows(partition: _VTKHDFPartition, dset,
+        offset: int, data: np.ndarray) -> None:
+    if partition.is_parallel:
+        with dset.collective:
+            dset[offset:offset + data.shape[0]] = data
+    else:
+        dset[offset:offset + data.shape[0]] = data
+
+# }}}
+
+
+# {{{ vtkhdf time series
+
+class VTKHDFTimeSeriesWriter:
+    """Writes a time series of fields into a single (transient) VTK HDF5
+    file. The geometry and connectivity are written once, when the writer is
+    created, and each call to :meth:`write_step` only appends the point data.
+    The points are written again only if the nodes of the visualizer passed
+    to :meth:`write_step` differ from the last written ones, e.g. for a moving
+    geometry.
+
+    In parallel, each rank writes its own part of the datasets. The offsets
+    of these parts are determined once, when the writer is created, and all
+    the data is written using collective I/O. The datasets are chunked such
+    that each time step is aligned to a chunk boundary.
+
+    Instances are obtained from
+    :meth:`Visualizer.make_vtkhdf_time_series_writer` and can be used as a
+    context manager, which calls :meth:`close` on exit.
+
+    .. attribute:: nsteps
+
+        Number of steps written so far.
+
+    .. attribute:: file_name
+
+        Name of the file written by the current rank. This differs from the
+        name given to the constructor if *aggregate* is ``"node"``.
+
+    .. automethod:: write_step
+    .. automethod:: close
+
+    .. versionadded:: 2024.1
+    """
+
+    def __init__(self, vis: Visualizer, file_name: str, *,
+            comm=None,
+            aggregate: str | None = None,
+            use_high_order: bool = False,
+            real_only: bool = False,
+            overwrite: bool = False,
+            h5_file_options: dict[str, Any] | None = None,
+            dset_options: dict[str, Any] | None = None) -> None:
+        try:
+            import h5py
+        except ImportError as exc:
+            raise ImportError(
+                "'VTKHDFTimeSeriesWriter' requires 'h5py'") from exc
+
+        import os
+        if os.path.splitext(file_name)[-1] != ".hdf":
+            raise ValueError(f"'file_name' extension must be '.hdf': {file_name}")
+
+        if h5_file_options is None:
+            h5_file_options = {}
+
+        if dset_options is None:
+            dset_options = {}
+
+        cell_count, cell_connectivity, cell_offsets, cell_types = (
+                vis._vtkhdf_connectivity(use_high_order))
+        nodes = self._get_nodes(vis)
+
+        partition = _make_vtkhdf_partition(file_name, comm,
+                counts=(cell_count, nodes.shape[0], cell_connectivity.size),
+                aggregate=aggregate)
+
+        if partition.is_parallel:
+            h5_file_options = {**h5_file_options, "comm": partition.comm}
+            if h5_file_options.setdefault("driver", "mpio") != "mpio":
+                raise ValueError(
+                    "parallel HDF5 requires the 'mpio' driver: "
+                    f"driver is '{h5_file_options['driver']}'")
+
+        self.vis = vis
+        self.real_only = real_only
+        self.nsteps = 0
+        self.file_name = partition.file_name
+
+        self._partition = partition
+        self._dset_options = dset_options
+        self._field_names: list[str] | None = None
+        self._point_offset = 0
+        self._nodes = nodes
+        self._h5 = h5py.File(partition.file_name, "w" if overwrite else "w-",
+                **h5_file_options)
+
+        # https://docs.vtk.org/en/latest/design_documents/VTKFileFormats.html#transient-data
+
+        root = self._h5.create_group("VTKHDF")
+        root.attrs.create("Version", [2, 0])
+        type_name = b"UnstructuredGrid"
+        root.attrs.create("Type", type_name,
+                dtype=h5py.string_dtype("ascii", len(type_name)))
+
+        # {{{ write connectivity
+
+        global_cell_count, global_node_count, global_conn_count = (
+                partition.global_counts)
+        cell_offset, node_offset, conn_offset = partition.offsets
+
+        for name, count in [
+                ("NumberOfCells", cell_count),
+                ("NumberOfPoints", nodes.shape[0]),
+                ("NumberOfConnectivityIds", cell_connectivity.size)]:
+            self._write_part(root, name,
+                    np.array([count]), partition.nparts, partition.part)
+
+        self._write_part(root, "Points", nodes, global_node_count, node_offset)
+        self._write_part(root, "Connectivity", cell_connectivity,
+                global_conn_count, conn_offset)
+        self._write_part(root, "Offsets", cell_offsets,
+                global_cell_count + partition.nparts,
+                cell_offset + partition.part)
+        self._write_part(root, "Types", cell_types,
+                global_cell_count, cell_offset)
+
+        # }}}
+
+        # {{{ create steps
+
+        steps = root.create_group("Steps")
+        steps.attrs.create("NSteps", 0)
+
+        self._create_dataset(steps, "Values", (0,), np.float64)
+        for name in ["PartOffsets", "NumberOfParts", "PointOffsets"]:
+            self._create_dataset(steps, name, (0,), np.int64)
+
+        for name in ["CellOffsets", "ConnectivityIdOffsets"]:
+            self._create_dataset(steps, name, (0, 1), np.int64)
+
+        steps.create_group("PointDataOffsets")
+        root.create_group("PointData")
+
+        # }}}
+
+    def _get_nodes(self, vis: Visualizer) -> np.ndarray:
+        nodes = np.stack(vis._vis_nodes_numpy()).T
+        if nodes.shape[1] < 3:
+            # NOTE: see write_vtkhdf_file for why this is padded
+            nodes = np.pad(nodes, ((0, 0), (0, 3 - nodes.shape[1])))
+
+        return nodes
+
+    def _create_dataset(self, grp, name: str,
+            shape: tuple[int, ...], dtype, *, nrows_per_step: int = 0):
+        dtype = np.dtype(dtype)
+        options = {
+            "chunks": _vtkhdf_chunks(nrows_per_step, shape[1:], dtype),
+            **self._dset_options,
+            }
+
+        return grp.create_dataset(name, shape, dtype=dtype,
+                maxshape=(None, *shape[1:]),
+                **options)
+
+    def _write_part(self, grp, name: str,
+            data: np.ndarray, nrows: int, offset: int):
+        """Create a dataset with *nrows* rows, in which the current rank
+        writes *data* starting at row *offset*.
+        """
+        dset = self._create_dataset(grp, name, (nrows, *data.shape[1:]),
+                data.dtype, nrows_per_step=nrows)
+        _vtkhdf_write_rows(self._partition, dset, offset, data)
+
+        return dset
+
+    def _append_parts(self, dset, data: np.ndarray) -> int:
+        """Append the point-based *data* of all the ranks to *dset*."""
+        _, global_node_count, _ = self._partition.global_counts
+        _, node_offset, _ = self._partition.offsets
+
+        offset = dset.shape[0]
+        dset.resize(offset + global_node_count, axis=0)
+        _vtkhdf_write_rows(self._partition, dset, offset + node_offset, data)
+
+        return offset
+
+    def _append(self, dset, data: np.ndarray) -> int:
+        """Append *data*, which must be the same on all the ranks, to *dset*."""
+        offset = dset.shape[0]
+        dset.resize(offset + data.shape[0], axis=0)
+        if self._partition.part == 0:
+            dset[offset:] = data
+
+        return offset
+
+    def write_step(self,
+            time: float,
+            names_and_fields: list[tuple[str, Any]], *,
+            vis: Visualizer | None = None) -> None:
+        """Append the fields in *names_and_fields* as a new time step. In
+        parallel, this must be called collectively by all the ranks.
+
+        :arg time: the time value associated with this step.
+        :arg names_and_fields: a list of ``(name, field)`` tuples, as for
+            :meth:`Visualizer.write_vtkhdf_file`. The same names must be
+            given at every step.
+        :arg vis: a :class:`Visualizer` with the same connectivity as the one
+            used to create the writer (e.g. obtained from
+            :meth:`Visualizer.copy_with_same_connectivity`), used to resample
+            the fields. If its nodes differ from the last written ones, they
+            are appended to the file and used from this step on.
+        """
+        if self._h5 is None:
+            raise RuntimeError("cannot write to a closed time series writer")
+
+        root = self._h5["VTKHDF"]
+        steps = root["Steps"]
+
+        # {{{ geometry
+
+        if vis is not None and vis is not self.vis:
+            if vis.vis_discr.ndofs != self.vis.vis_discr.ndofs:
+                raise ValueError(
+                    "'vis' does not have the same connectivity as the "
+                    "visualizer used to create the writer")
+
+            nodes = self._get_nodes(vis)
+            nodes_changed = not np.array_equal(nodes, self._nodes)
+            if self._partition.is_parallel:
+                # NOTE: appending is collective, so all ranks must agree
+                from mpi4py import MPI
+                nodes_changed = self._partition.comm.allreduce(
+                        nodes_changed, op=MPI.LOR)
+
+            if nodes_changed:
+                self._point_offset = self._append_parts(root["Points"], nodes)
+                self._nodes = nodes
+
+            self.vis = vis
+
+        # }}}
+
+        # {{{ point data
+
+        names_and_fields = self.vis._resample_fields_to_numpy(
+                preprocess_fields(names_and_fields))
+        names_and_fields = list(separate_by_real_and_imag(
+                names_and_fields, self.real_only))
+
+        field_names = [name for name, _ in names_and_fields]
+        if self._field_names is None:
+            self._field_names = field_names
+        elif sorted(field_names) != sorted(self._field_names):
+            raise ValueError("fields must have the same names at every step: "
+                    f"expected {self._field_names}, got {field_names}")
+
+        _, global_node_count, _ = self._partition.global_counts
+
+        point_data = root["PointData"]
+        point_data_offsets = steps["PointDataOffsets"]
+        for name, field in names_and_fields:
+            if field.dtype.char == "O":
+                field = np.stack(field).T
+
+            if field.ndim == 2 and field.shape[1] < 3:
+                field = np.pad(field, ((0, 0), (0, 3 - field.shape[1])))
+
+            if name not in point_data:
+                self._create_dataset(point_data, name,
+                        (0, *field.shape[1:]), field.dtype,
+                        nrows_per_step=global_node_count)
+                self._create_dataset(point_data_offsets, name, (0,), np.int64)
+
+            offset = self._append_parts(point_data[name], field)
+            self._append(point_data_offsets[name],
+                    np.array([offset], dtype=np.int64))
+
+        # }}}
+
+        # {{{ steps
+
+        self._append(steps["Values"], np.array([time], dtype=np.float64))
+        self._append(steps["PartOffsets"], np.array([0], dtype=np.int64))
+        self._append(steps["NumberOfParts"],
+                np.array([self._partition.nparts], dtype=np.int64))
+        self._append(steps["PointOffsets"],
+                np.array([self._point_offset], dtype=np.int64))
+        self._append(steps["CellOffsets"], np.zeros((1, 1), dtype=np.int64))
+        self._append(steps["ConnectivityIdOffsets"],
+                np.zeros((1, 1), dtype=np.int64))
+
+        self.nsteps += 1
+        steps.attrs["NSteps"] = self.nsteps
+
+        # }}}
+
+    def close(self) -> None:
+        """Close the underlying file. No further steps can be written."""
+        if self._h5 is not None:
+            self._h5.close()
+            self._h5 = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+# }}}
+
+
+# {{{ asynchronous output
+
+class AsyncVisualizer:
+    """Wraps a :class:`Visualizer` to write visualization files on a
+    background thread.
+
+    Each ``write_*`` method resamples the fields and copies them to the host
+    on the calling thread (i.e. the only cost paid by the caller is the
+    device-to-host transfer) and then hands the host data off to a writer
+    thread, which serializes the file using the corresponding method of
+    :attr:`vis`. Files are written in the order in which they were submitted.
+
+    At most *max_pending* snapshots are kept in flight: submitting another
+    one waits for the oldest write to finish. Exceptions raised while writing
+    are re-raised by :meth:`flush`, by a later write that waits on the failed
+    one, or by the :class:`~concurrent.futures.Future` returned for the write.
+
+    Instances can be used as a context manager, which calls :meth:`close`
+    on exit.
+
+    .. attribute:: vis
+
+        The wrapped :class:`Visualizer`.
+
+    .. automethod:: write_vtk_file
+    .. automethod:: write_vtkhdf_file
+    .. automethod:: write_xdmf_file
+    .. automethod:: flush
+    .. automethod:: close
+
+    .. versionadded:: 2024.1
+    """
+
+    def __init__(self, vis: Visualizer, *, max_pending: int = 2) -> None:
+        if max_pending < 1:
+            raise ValueError(f"'max_pending' must be positive: {max_pending}")
+
+        from collections import deque
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.vis = vis
+        self.max_pending = max_pending
+
+        self._pending: deque = deque()
+        self._executor: ThreadPoolExecutor | None = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="meshmode-vis")
+
+    def _submit(self, method, file_name, names_and_fields, kwargs):
+        if self._executor is None:
+            raise RuntimeError("cannot write using a closed AsyncVisualizer")
+
+        while self._pending and self._pending[0].done():
+            self._pending.popleft().result()
+
+        while len(self._pending) >= self.max_pending:
+            self._pending.popleft().result()
+
+        vis = self.vis
+        names_and_fields = [
+                (name, _wrap_host_fields(fld))
+                for name, fld in vis._resample_fields_to_numpy(
+                    preprocess_fields(names_and_fields))]
+
+        # NOTE: these are memoized and use the array context, so they should
+        # be computed on this thread and not on the writer thread
+        if method is Visualizer.write_xdmf_file:
+            vis._xdmf_nodes_numpy()
+        else:
+            vis._vis_nodes_numpy()
+
+        future = self._executor.submit(
+                method, vis, file_name, names_and_fields, **kwargs)
+        self._pending.append(future)
+
+        return future
+
+    def write_vtk_file(self, file_name, names_and_fields, **kwargs):
+        """Asynchronous version of :meth:`Visualizer.write_vtk_file`.
+
+        :returns: a :class:`~concurrent.futures.Future` that completes once
+            the file is written.
+        """
+        return self._submit(Visualizer.write_vtk_file,
+                file_name, names_and_fields, kwargs)
+
+    def write_vtkhdf_file(self, file_name, names_and_fields, **kwargs):
+        """Asynchronous version of :meth:`Visualizer.write_vtkhdf_file`.
+
+        .. note::
+
+            If *comm* is given, the collective HDF5 operations happen on the
+            writer thread, so MPI must be initialized with (at least)
+            ``MPI_THREAD_SERIALIZED`` support.
+
+        :returns: a :class:`~concurrent.futures.Future` that completes once
+            the file is written.
+        """
+        return self._submit(Visualizer.write_vtkhdf_file,
+                file_name, names_and_fields, kwargs)
+
+    def write_xdmf_file(self, file_name, names_and_fields, **kwargs):
+        """Asynchronous version of :meth:`Visualizer.write_xdmf_file`.
+
+        :returns: a :class:`~concurrent.futures.Future` that completes once
+            the file is written.
+        """
+        return self._submit(Visualizer.write_xdmf_file,
+                file_name, names_and_fields, kwargs)
+
+    def flush(self) -> None:
+        """Wait for all submitted writes to finish."""
+        while self._pending:
+            self._pending.popleft().result()
+
+    def close(self) -> None:
+        """Wait for all submitted writes to finish and stop the writer
+        thread. No further writes can be submitted.
+        """
+        if self._executor is None:
+            return
+
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+# }}}
+
+
 # {{{ make_visualizer
 
 def make_visualizer(actx, discr, vis_order=None,
@@ -1338,6 +2056,241 @@ def make_visualizer(actx, discr, vis_order=None,
 # }}}
 
 
+# {{{ make_lod_visualizer
+
+def _get_element_variation(actx, discr, field) -> np.ndarray:
+    """Difference between the largest and smallest value of *field* on each
+    element of *discr*, as an array with one entry per element.
+    """
+    if isinstance(field, np.ndarray) and field.dtype.char == "O":
+        return np.max([
+            _get_element_variation(actx, discr, component)
+            for component in field], axis=0)
+
+    if not isinstance(field, DOFArray):
+        raise TypeError(f"unsupported field type: '{type(field).__name__}'")
+
+    def variation(ary):
+        if np.iscomplexobj(ary):
+            return np.maximum(variation(ary.real), variation(ary.imag))
+
+        return np.ptp(ary, axis=1)
+
+    return np.concatenate([
+        variation(actx.to_numpy(subary)) for subary in field])
+
+
+def make_lod_visualizer(actx, discr, vis_order=None, *,
+        boundary_tag=None,
+        element_stride=None,
+        bbox=None,
+        adaptive_field=None,
+        adaptive_vis_orders=None,
+        element_shrink_factor=None,
+        force_equidistant=False) -> Visualizer:
+    """Create a (level of detail) :class:`Visualizer` that only writes a
+    subset of the elements in *discr*, possibly at different orders. This
+    can be used to write quick-look outputs that cost a fraction of the
+    full output created by :func:`make_visualizer`.
+
+    The selection criteria below are combined, i.e. an element is visualized
+    only if it satisfies all of them.
+
+    :arg vis_order: order of the visualization DOFs. If not given, the order of
+        each group in *discr* is used.
+    :arg boundary_tag: if given, only the faces of the elements on this
+        boundary are visualized (see
+        :func:`~meshmode.discretization.connection.make_face_restriction`).
+        The remaining selection criteria then apply to the faces.
+    :arg element_stride: if given, only every *element_stride*-th element
+        (in the global element numbering) is visualized.
+    :arg bbox: a tuple ``(a, b)`` of the lower and upper corners of a box. If
+        given, only the elements whose nodes have a bounding box that
+        intersects the box are visualized.
+    :arg adaptive_field: a :class:`~meshmode.dof_array.DOFArray` (or an object
+        array of them) on *discr*. If given, the visualization order of each
+        element is chosen from *adaptive_vis_orders* based on the variation
+        of the field over the element, relative to the largest variation
+        over all elements. The variations are split into equal bins, one for
+        each order, so that elements in which the field varies the most
+        get the highest order.
+    :arg adaptive_vis_orders: an increasing sequence of visualization orders
+        used with *adaptive_field*.
+    :arg element_shrink_factor: see :func:`make_visualizer`.
+    :arg force_equidistant: see :func:`make_visualizer`.
+
+    The resulting visualizer does not support
+    :meth:`Visualizer.copy_with_same_connectivity`.
+
+    .. versionadded:: 2024.1
+    """
+    if force_equidistant:
+        from meshmode.discretization.poly_element import (
+            InterpolatoryEquidistantGroupFactory as VisGroupFactory,
+        )
+    else:
+        from meshmode.discretization.poly_element import (
+            InterpolatoryEdgeClusteredGroupFactory as VisGroupFactory,
+        )
+
+    if (adaptive_field is None) != (adaptive_vis_orders is None):
+        raise ValueError(
+            "'adaptive_field' and 'adaptive_vis_orders' must be given together")
+
+    if adaptive_vis_orders is not None:
+        adaptive_vis_orders = np.array(adaptive_vis_orders, dtype=np.int64)
+        if adaptive_vis_orders.size == 0 or np.any(
+                np.diff(adaptive_vis_orders) <= 0):
+            raise ValueError("'adaptive_vis_orders' must be strictly increasing")
+
+        if vis_order is not None:
+            raise ValueError(
+                "cannot give both 'vis_order' and 'adaptive_vis_orders'")
+
+    if element_stride is not None and element_stride < 1:
+        raise ValueError(
+            f"'element_stride' must be positive: got {element_stride}")
+
+    # {{{ restrict to boundary
+
+    from meshmode.discretization.connection import (
+        ChainedDiscretizationConnection,
+        DirectDiscretizationConnection,
+        DiscretizationConnectionElementGroup,
+        InterpolationBatch,
+        make_face_restriction,
+    )
+
+    if boundary_tag is not None:
+        if adaptive_vis_orders is not None:
+            bdry_order = adaptive_vis_orders[-1]
+        elif vis_order is not None:
+            bdry_order = vis_order
+        else:
+            bdry_order = max(grp.order for grp in discr.groups)
+
+        bdry_connection = make_face_restriction(
+                actx, discr, VisGroupFactory(bdry_order), boundary_tag)
+        base_discr = bdry_connection.to_discr
+
+        if adaptive_field is not None:
+            adaptive_field = bdry_connection(adaptive_field)
+    else:
+        bdry_connection = None
+        base_discr = discr
+
+    # }}}
+
+    # {{{ select elements
+
+    mesh = base_discr.mesh
+    selected = np.ones(mesh.nelements, dtype=bool)
+
+    if element_stride is not None:
+        selected &= (np.arange(mesh.nelements) % element_stride) == 0
+
+    if bbox is not None:
+        a, b = bbox
+        a = np.array(a, dtype=np.float64).reshape(-1, 1)
+        b = np.array(b, dtype=np.float64).reshape(-1, 1)
+        if a.shape[0] != mesh.ambient_dim or b.shape[0] != mesh.ambient_dim:
+            raise ValueError(
+                f"'bbox' corners must have {mesh.ambient_dim} coordinates")
+
+        selected &= np.concatenate([
+            np.all(np.min(mgrp.nodes, axis=-1) <= b, axis=0)
+            & np.all(np.max(mgrp.nodes, axis=-1) >= a, axis=0)
+            for mgrp in mesh.groups])
+
+    if adaptive_field is not None:
+        variation = _get_element_variation(actx, base_discr, adaptive_field)
+        max_variation = np.max(variation, initial=0.0)
+        if max_variation > 0:
+            variation = variation / max_variation
+
+        nbins = len(adaptive_vis_orders)
+        element_orders = adaptive_vis_orders[np.minimum(
+            (variation * nbins).astype(np.int64), nbins - 1)]
+    elif vis_order is not None:
+        element_orders = np.full(mesh.nelements, vis_order)
+    else:
+        element_orders = np.concatenate([
+            np.full(grp.nelements, grp.order) for grp in base_discr.groups])
+
+    if not np.any(selected):
+        raise ValueError("no elements were selected for visualization")
+
+    # }}}
+
+    # {{{ build visualization discretization
+
+    from dataclasses import replace
+
+    vis_mesh_groups = []
+    vis_group_sources = []
+    for igrp, mgrp in enumerate(mesh.groups):
+        el_slice = slice(mesh.base_element_nrs[igrp],
+                mesh.base_element_nrs[igrp] + mgrp.nelements)
+        grp_selected = selected[el_slice]
+        grp_orders = element_orders[el_slice]
+
+        for order in np.unique(grp_orders[grp_selected]):
+            elements, = np.nonzero(grp_selected & (grp_orders == order))
+            vis_mesh_groups.append(replace(mgrp,
+                vertex_indices=None,
+                nodes=mgrp.nodes[:, elements].copy()))
+            vis_group_sources.append((igrp, elements, int(order)))
+
+    from meshmode.mesh import make_mesh
+    vis_mesh = make_mesh(None, vis_mesh_groups, skip_tests=True)
+
+    vis_group_factories = {
+        id(mgrp): VisGroupFactory(order)
+        for mgrp, (_, _, order) in zip(
+            vis_mesh.groups, vis_group_sources, strict=True)}
+
+    def vis_group_factory(mgrp):
+        return vis_group_factories[id(mgrp)](mgrp)
+
+    from meshmode.discretization import Discretization
+    vis_discr = Discretization(actx, vis_mesh, vis_group_factory,
+            real_dtype=base_discr.real_dtype)
+
+    # }}}
+
+    # {{{ build connection
+
+    def to_device(ary):
+        return actx.freeze(actx.from_numpy(ary.astype(np.intp)))
+
+    groups = [
+        DiscretizationConnectionElementGroup([
+            InterpolationBatch(
+                from_group_index=igrp,
+                from_element_indices=to_device(elements),
+                to_element_indices=to_device(np.arange(elements.size)),
+                result_unit_nodes=vgrp.unit_nodes,
+                to_element_face=None)
+            ])
+        for vgrp, (igrp, elements, _) in zip(
+            vis_discr.groups, vis_group_sources, strict=True)]
+
+    connection = DirectDiscretizationConnection(
+            base_discr, vis_discr, groups, is_surjective=True)
+
+    if bdry_connection is not None:
+        connection = ChainedDiscretizationConnection(
+                [bdry_connection, connection])
+
+    # }}}
+
+    return Visualizer(connection,
+            element_shrink_factor=element_shrink_factor,
+            is_equidistant=force_equidistant)
+
+# }}}
+
+
 # {{{ draw_curve
 
 def draw_curve(discr):
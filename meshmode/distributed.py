@@ -2,6 +2,8 @@
 .. autoclass:: InterRankBoundaryInfo
 .. autoclass:: MPIBoundaryCommSetupHelper
 
+.. autofunction:: distribute_mesh_slabs
+
 .. autofunction:: get_partition_by_pymetis
 .. autofunction:: membership_list_to_map
 .. autofunction:: get_connected_parts
@@ -35,6 +37,7 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 THE SOFTWARE.
 """
 
+import sys
 from collections.abc import Hashable, Mapping, Sequence
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, cast
@@ -46,6 +49,7 @@ from arraycontext import ArrayContext
 
 from meshmode.discretization import ElementGroupFactory
 from meshmode.discretization.connection import DirectDiscretizationConnection
+from meshmode.instrumentation import setup_stage
 from meshmode.mesh import InteriorAdjacencyGroup, InterPartAdjacencyGroup, Mesh, PartID
 
 
@@ -63,6 +67,89 @@ logger = logging.getLogger(__name__)
 
 TAG_BASE = 83411
 TAG_DISTRIBUTE_MESHES = TAG_BASE + 1
+TAG_SEND_ARRAY_BUFFERS = TAG_BASE + 2
+TAG_EXCHANGE_BOUNDARY_DATA = TAG_BASE + 5
+
+# Upper bound on the size of a single message used to send raw array data.
+# Larger arrays are split into several messages, which avoids the 2 GiB limit
+# imposed by MPI's 'int' element counts.
+_MAX_BUFFER_CHUNK_NBYTES = 2**30
+
+
+# {{{ buffer-based object transfer
+
+def _get_buffer_chunks(ary, max_chunk_nbytes):
+    buf = ary.reshape(-1).view(np.uint8)
+    return [
+        buf[start:start + max_chunk_nbytes]
+        for start in range(0, len(buf), max_chunk_nbytes)]
+
+
+def _isend_with_buffers(mpi_comm, obj, dest, tag, *,
+        max_chunk_nbytes=_MAX_BUFFER_CHUNK_NBYTES):
+    """Send *obj* (e.g. a :class:`~meshmode.mesh.Mesh`) to *dest* as a small
+    pickled header followed by the raw data of the (large) :mod:`numpy` arrays
+    contained in it. The arrays are sent without copying (unless they are not
+    contiguous) using the buffer-based :meth:`mpi4py.MPI.Comm.Isend`, in chunks
+    of at most *max_chunk_nbytes* bytes.
+
+    Use :func:`_recv_with_buffers` to receive the object.
+
+    :returns: a list of :class:`mpi4py.MPI.Request` instances, all of which
+        must be completed.
+    """
+    from mpi4py import MPI
+
+    from meshmode.mesh.tools import _pickle_with_out_of_band_arrays
+    pickled_obj, arrays = _pickle_with_out_of_band_arrays(obj)
+    arrays = [np.ascontiguousarray(ary) for ary in arrays]
+
+    header = (
+        pickled_obj,
+        [(ary.shape, ary.dtype.str) for ary in arrays],
+        max_chunk_nbytes)
+    reqs = [mpi_comm.isend(header, dest=dest, tag=tag)]
+
+    for ary in arrays:
+        for chunk in _get_buffer_chunks(ary, max_chunk_nbytes):
+            reqs.append(mpi_comm.Isend(
+                [chunk, MPI.BYTE], dest=dest, tag=TAG_SEND_ARRAY_BUFFERS))
+
+    return reqs
+
+
+def _recv_with_buffers(mpi_comm, source, tag, status=None):
+    """Receive an object sent by :func:`_isend_with_buffers`. The arrays are
+    received directly into their final memory.
+
+    :returns: a tuple ``(obj, nbytes)``, where *nbytes* is the total size of
+        the received array data.
+    """
+    from mpi4py import MPI
+
+    if status is None:
+        status = MPI.Status()
+
+    pickled_obj, array_descrs, max_chunk_nbytes = mpi_comm.recv(
+        source=source, tag=tag, status=status)
+    source = status.Get_source()
+
+    arrays = [np.empty(shape, dtype=np.dtype(dtype)) for shape, dtype in array_descrs]
+
+    # NOTE: messages between a pair of ranks are non-overtaking, so the chunks
+    # are matched in the same order in which they were sent.
+    reqs = [
+        mpi_comm.Irecv([chunk, MPI.BYTE], source=source, tag=TAG_SEND_ARRAY_BUFFERS)
+        for ary in arrays
+        for chunk in _get_buffer_chunks(ary, max_chunk_nbytes)]
+    MPI.Request.Waitall(reqs)
+
+    from meshmode.mesh.tools import _unpickle_with_out_of_band_arrays
+    return (
+        _unpickle_with_out_of_band_arrays(pickled_obj, arrays),
+        sum(ary.nbytes for ary in arrays))
+
+# }}}
 
 
 # {{{ mesh distributor
@@ -94,15 +181,19 @@ class MPIMeshDistributor:
     def is_manager_rank(self):
         return self.mpi_comm.Get_rank() == self.manager_rank
 
-    def send_mesh_parts(self, mesh, part_per_element, num_parts):
+    def send_mesh_parts(self, mesh, part_per_element, num_parts, *,
+            max_workers=None):
         """
         :arg mesh: A :class:`~meshmode.mesh.Mesh` to distribute to other ranks.
         :arg part_per_element: A :class:`numpy.ndarray` containing one
             integer per element of *mesh* indicating which part of the
             partitioned mesh the element is to become a part of.
         :arg num_parts: The number of parts to divide the mesh into.
+        :arg max_workers: If not *None*, the number of processes used to build
+            the parts concurrently. See
+            :func:`~meshmode.mesh.processing.generate_mesh_parts`.
 
-        Sends each part to a different rank.
+        Sends each part to a different rank as soon as it is built.
         Returns one part that was not sent to any other rank.
         """
         mpi_comm = self.mpi_comm
@@ -113,21 +204,23 @@ class MPIMeshDistributor:
 
         part_num_to_elements = membership_list_to_map(part_per_element)
 
-        from meshmode.mesh.processing import partition_mesh
-        parts = partition_mesh(mesh, part_num_to_elements)
+        from meshmode.mesh.processing import generate_mesh_parts
 
         local_part = None
 
         reqs = []
-        for r, part in parts.items():
+        for r, part in generate_mesh_parts(
+                mesh, part_num_to_elements, max_workers=max_workers):
             if r == self.manager_rank:
                 local_part = part
             else:
-                reqs.append(mpi_comm.isend(part, dest=r, tag=TAG_DISTRIBUTE_MESHES))
+                reqs.extend(_isend_with_buffers(
+                    mpi_comm, part, dest=r, tag=TAG_DISTRIBUTE_MESHES))
 
         logger.info("rank %d: sent all mesh parts", rank)
-        for req in reqs:
-            req.wait()
+
+        from mpi4py import MPI
+        MPI.Request.Waitall(reqs)
 
         return local_part
 
@@ -140,18 +233,359 @@ class MPIMeshDistributor:
 
         assert not self.is_manager_rank(), "Manager rank cannot receive mesh"
 
-        from mpi4py import MPI
-        status = MPI.Status()
-        result = self.mpi_comm.recv(
-                source=self.manager_rank, tag=TAG_DISTRIBUTE_MESHES,
-                status=status)
-        logger.info("rank %d: received local mesh (size = %d)", rank, status.count)
+        result, nbytes = _recv_with_buffers(
+                self.mpi_comm, source=self.manager_rank, tag=TAG_DISTRIBUTE_MESHES)
+        logger.info("rank %d: received local mesh (size = %d)", rank, nbytes)
 
         return result
 
 # }}}
 
 
+# {{{ manager-free mesh distribution
+
+def _get_slab_boundary_tags(slab_mesh):
+    """
+    :returns: a list with one entry per group of *slab_mesh*, each a list of
+        ``(elements, element_faces, boundary_tag)`` for the user-defined
+        boundary tags in the (explicitly given) facial adjacency of
+        *slab_mesh*.
+    """
+    from meshmode.mesh import (
+        BTAG_ALL,
+        BTAG_NONE,
+        BTAG_REALLY_ALL,
+        BoundaryAdjacencyGroup,
+    )
+
+    fagrps_per_group = slab_mesh._facial_adjacency_groups
+    if fagrps_per_group is None or fagrps_per_group is False:
+        return [[] for _ in slab_mesh.groups]
+
+    return [
+        [(fagrp.elements, fagrp.element_faces, fagrp.boundary_tag)
+            for fagrp in fagrp_list
+            if type(fagrp) is BoundaryAdjacencyGroup
+            and fagrp.boundary_tag not in (BTAG_ALL, BTAG_REALLY_ALL, BTAG_NONE)]
+        for fagrp_list in fagrps_per_group]
+
+
+def distribute_mesh_slabs(
+        mpi_comm: "mpi4py.MPI.Intracomm",
+        slab_mesh: Mesh,
+        slab_vertex_ids: np.ndarray,
+        part_per_element: np.ndarray) -> Mesh:
+    """Build the local part of a distributed mesh collectively, without
+    ever assembling the global mesh on a single rank.
+
+    Each rank provides a *slab*, i.e. some subset of the elements of the
+    global mesh (for example, a contiguous range of elements read from a
+    file), together with the part (i.e. the rank) that each of these elements
+    should end up on. Elements are sent directly to their destination rank,
+    where the facial adjacency of the local part is computed. Faces that are
+    not matched locally are matched across ranks by exchanging their
+    (globally numbered) vertex indices with a rank determined by the face's
+    smallest vertex, which is used to construct the
+    :class:`~meshmode.mesh.InterPartAdjacencyGroup` instances of the part.
+
+    This must be called collectively on all ranks of *mpi_comm*.
+
+    :arg slab_mesh: a :class:`~meshmode.mesh.Mesh` containing the elements
+        in this rank's slab. All ranks must provide the same number and kind of
+        element groups (some of which may be empty). Boundary tags other than
+        :class:`~meshmode.mesh.BTAG_ALL` in an explicitly given facial
+        adjacency of *slab_mesh* are carried over to the parts.
+    :arg slab_vertex_ids: an integer :class:`numpy.ndarray` of shape
+        ``(slab_mesh.nvertices,)`` giving the global index of each vertex of
+        *slab_mesh*. Vertices shared by different slabs must have the same
+        global index.
+    :arg part_per_element: a :class:`numpy.ndarray` containing the part
+        (i.e. the destination rank) for each element of *slab_mesh*.
+
+    :returns: a :class:`~meshmode.mesh.Mesh` containing the part of the global
+        mesh with part identifier equal to the rank of this process. Elements
+        within each group are ordered by the rank of their slab and then by
+        their order in the slab.
+
+    .. versionadded:: 2024.1
+    """
+    from dataclasses import replace
+
+    from meshmode.mesh import (
+        BTAG_ALL,
+        BTAG_PARTITION,
+        BoundaryAdjacencyGroup,
+        InteriorAdjacencyGroup,
+        _compute_facial_adjacency_from_vertices,
+        make_mesh,
+    )
+    from meshmode.mesh.tools import AffineMap
+
+    rank = mpi_comm.Get_rank()
+    nranks = mpi_comm.Get_size()
+
+    if slab_mesh.vertices is None:
+        raise ValueError("slab mesh must have vertices")
+
+    part_per_element = np.asarray(part_per_element)
+    if part_per_element.shape != (slab_mesh.nelements,):
+        raise ValueError("'part_per_element' must have one entry per element")
+    if np.any((part_per_element < 0) | (part_per_element >= nranks)):
+        raise ValueError("parts must be numbered by rank")
+
+    slab_vertex_ids = np.asarray(slab_vertex_ids, dtype=np.int64)
+    slab_bdry_tags = _get_slab_boundary_tags(slab_mesh)
+
+    # {{{ send elements to their destination ranks
+
+    send_data: list[list[Any]] = [[] for _ in range(nranks)]
+    for igrp, grp in enumerate(slab_mesh.groups):
+        assert grp.vertex_indices is not None
+
+        base_element_nr = slab_mesh.base_element_nrs[igrp]
+        grp_parts = part_per_element[base_element_nr:base_element_nr+grp.nelements]
+
+        # position of each element among the elements sent to its destination
+        grp_dest_index = np.empty(grp.nelements, dtype=np.int64)
+
+        for dest in range(nranks):
+            dest_elements, = np.where(grp_parts == dest)
+            grp_dest_index[dest_elements] = np.arange(len(dest_elements))
+
+            send_data[dest].append((
+                slab_vertex_ids[grp.vertex_indices[dest_elements]],
+                grp.nodes[:, dest_elements, :],
+                []))
+
+        for elements, element_faces, btag in slab_bdry_tags[igrp]:
+            el_parts = grp_parts[elements]
+            for dest in np.unique(el_parts):
+                is_dest = el_parts == dest
+                send_data[dest][igrp][2].append((
+                    grp_dest_index[elements[is_dest]],
+                    element_faces[is_dest],
+                    btag))
+
+    for dest in range(nranks):
+        used_vertices = np.unique(np.concatenate(
+            [vertex_ids.reshape(-1) for vertex_ids, _, _ in send_data[dest]]))
+        is_used = np.isin(slab_vertex_ids, used_vertices)
+        send_data[dest] = (
+            slab_vertex_ids[is_used],
+            slab_mesh.vertices[:, is_used],
+            send_data[dest])
+
+    recv_data = mpi_comm.alltoall(send_data)
+    del send_data
+
+    # }}}
+
+    # {{{ assemble local part
+
+    vertex_ids = np.concatenate([ids for ids, _, _ in recv_data])
+    vertex_coords = np.concatenate([coords for _, coords, _ in recv_data], axis=1)
+    part_vertex_ids, first_index = np.unique(vertex_ids, return_index=True)
+    part_vertices = vertex_coords[:, first_index]
+    del vertex_ids
+    del vertex_coords
+
+    part_groups = []
+    # (igrp, element, face) -> list of boundary tags
+    face_to_btags: dict[tuple[int, int, int], list[Any]] = {}
+
+    for igrp, grp in enumerate(slab_mesh.groups):
+        grp_vertex_ids = [grp_data[igrp][0] for _, _, grp_data in recv_data]
+        grp_nodes = [grp_data[igrp][1] for _, _, grp_data in recv_data]
+
+        src_base_elements = np.cumsum([0] + [len(ids) for ids in grp_vertex_ids])
+        for src, (_, _, grp_data) in enumerate(recv_data):
+            for elements, element_faces, btag in grp_data[igrp][2]:
+                for iel, iface in zip(
+                        elements + src_base_elements[src], element_faces,
+                        strict=True):
+                    face_to_btags.setdefault(
+                        (igrp, int(iel), int(iface)), []).append(btag)
+
+        vertex_indices = np.searchsorted(
+            part_vertex_ids, np.concatenate(grp_vertex_ids)
+            ).astype(slab_mesh.vertex_id_dtype)
+
+        part_groups.append(replace(grp,
+            vertex_indices=vertex_indices.reshape(-1, grp.nvertices),
+            nodes=np.concatenate(grp_nodes, axis=1)))
+
+    del recv_data
+
+    part_base_element_nrs = np.cumsum(
+        [0] + [grp.nelements for grp in part_groups[:-1]])
+
+    # }}}
+
+    # {{{ local facial adjacency
+
+    local_fagrps = _compute_facial_adjacency_from_vertices(
+        part_groups, slab_mesh.element_id_dtype, slab_mesh.face_id_dtype)
+
+    interior_grps = [
+        [fagrp for fagrp in fagrp_list
+            if isinstance(fagrp, InteriorAdjacencyGroup)]
+        for fagrp_list in local_fagrps]
+    unmatched_faces = [
+        next(fagrp for fagrp in fagrp_list
+            if isinstance(fagrp, BoundaryAdjacencyGroup)
+            and fagrp.boundary_tag is BTAG_ALL)
+        for fagrp_list in local_fagrps]
+    del local_fagrps
+
+    # }}}
+
+    # {{{ match unmatched faces across ranks
+
+    max_face_vertices = max(
+        len(ref_fvi)
+        for grp in part_groups
+        for ref_fvi in grp.face_vertex_indices())
+
+    face_keys = []
+    face_groups = []
+    face_elements = []
+    face_faces = []
+    for igrp, grp in enumerate(part_groups):
+        bdry = unmatched_faces[igrp]
+        keys = np.full((len(bdry.elements), max_face_vertices), -1, dtype=np.int64)
+        for fid, ref_fvi in enumerate(grp.face_vertex_indices()):
+            is_face = bdry.element_faces == fid
+            keys[is_face, :len(ref_fvi)] = part_vertex_ids[
+                grp.vertex_indices[bdry.elements[is_face]][:, ref_fvi]]
+
+        face_keys.append(np.sort(keys, axis=1))
+        face_groups.append(np.full(len(bdry.elements), igrp))
+        face_elements.append(bdry.elements.astype(np.int64))
+        face_faces.append(bdry.element_faces.astype(np.int64))
+
+    face_keys_ary = np.concatenate(face_keys)
+    face_groups_ary = np.concatenate(face_groups)
+    face_elements_ary = np.concatenate(face_elements)
+    face_faces_ary = np.concatenate(face_faces)
+    del face_keys, face_groups, face_elements, face_faces
+
+    # matching faces share their smallest vertex, which determines the rank
+    # on which they are matched up
+    smallest_vertex = np.where(
+        face_keys_ary >= 0, face_keys_ary, np.iinfo(np.int64).max).min(axis=1)
+    rendezvous_rank = smallest_vertex % nranks
+
+    # part-wide element numbers identify the face on the neighboring part
+    face_part_elements = part_base_element_nrs[face_groups_ary] + face_elements_ary
+
+    send_faces = []
+    for dest in range(nranks):
+        is_dest, = np.where(rendezvous_rank == dest)
+        send_faces.append((
+            face_keys_ary[is_dest],
+            np.stack([is_dest, face_part_elements[is_dest], face_faces_ary[is_dest]]),
+            ))
+
+    recv_faces = mpi_comm.alltoall(send_faces)
+    del send_faces
+
+    rv_keys = np.concatenate([keys for keys, _ in recv_faces])
+    rv_info = np.concatenate([info for _, info in recv_faces], axis=1)
+    rv_ranks = np.concatenate([
+        np.full(len(keys), src) for src, (keys, _) in enumerate(recv_faces)])
+    del recv_faces
+
+    order = np.lexsort(rv_keys.T)
+    is_match, = np.where(~np.any(np.diff(rv_keys[order], axis=0), axis=1))
+    first = order[is_match]
+    second = order[is_match+1]
+
+    # tell each side about its neighbor: (local face index on the receiving
+    # rank, neighbor rank, neighbor part-wide element, neighbor face)
+    reply_dest = np.concatenate([rv_ranks[first], rv_ranks[second]])
+    reply_info = np.stack([
+        np.concatenate([rv_info[0, first], rv_info[0, second]]),
+        np.concatenate([rv_ranks[second], rv_ranks[first]]),
+        np.concatenate([rv_info[1, second], rv_info[1, first]]),
+        np.concatenate([rv_info[2, second], rv_info[2, first]]),
+        ])
+    del rv_keys, rv_info, rv_ranks
+
+    recv_replies = mpi_comm.alltoall([
+        reply_info[:, reply_dest == dest] for dest in range(nranks)])
+    remote_matches = np.concatenate(recv_replies, axis=1)
+    del recv_replies
+
+    # }}}
+
+    # {{{ build facial adjacency groups
+
+    is_remote = np.zeros(len(face_keys_ary), dtype=bool)
+    is_remote[remote_matches[0]] = True
+
+    facial_adjacency_groups = []
+    for igrp in range(len(part_groups)):
+        fagrp_list = list(interior_grps[igrp])
+
+        grp_matches = remote_matches[:, face_groups_ary[remote_matches[0]] == igrp]
+        for neighbor_part in np.unique(grp_matches[1]):
+            matches = grp_matches[:, grp_matches[1] == neighbor_part]
+            matches = matches[:, np.argsort(matches[0])]
+            fagrp_list.append(InterPartAdjacencyGroup(
+                igroup=igrp,
+                boundary_tag=BTAG_PARTITION(int(neighbor_part)),
+                part_id=int(neighbor_part),
+                elements=face_elements_ary[matches[0]].astype(
+                    slab_mesh.element_id_dtype),
+                element_faces=face_faces_ary[matches[0]].astype(
+                    slab_mesh.face_id_dtype),
+                neighbors=matches[2].astype(slab_mesh.element_id_dtype),
+                neighbor_faces=matches[3].astype(slab_mesh.face_id_dtype),
+                aff_map=AffineMap()))
+
+        is_true_bdry, = np.where((face_groups_ary == igrp) & ~is_remote)
+        bdry_elements = face_elements_ary[is_true_bdry].astype(
+            slab_mesh.element_id_dtype)
+        bdry_element_faces = face_faces_ary[is_true_bdry].astype(
+            slab_mesh.face_id_dtype)
+
+        btag_to_faces: dict[Any, list[int]] = {}
+        for i, (iel, iface) in enumerate(
+                zip(bdry_elements, bdry_element_faces, strict=True)):
+            for btag in face_to_btags.get((igrp, int(iel), int(iface)), []):
+                btag_to_faces.setdefault(btag, []).append(i)
+
+        for btag, indices in btag_to_faces.items():
+            fagrp_list.append(BoundaryAdjacencyGroup(
+                igroup=igrp,
+                boundary_tag=btag,
+                elements=bdry_elements[indices],
+                element_faces=bdry_element_faces[indices]))
+
+        fagrp_list.append(BoundaryAdjacencyGroup(
+            igroup=igrp,
+            boundary_tag=BTAG_ALL,
+            elements=bdry_elements,
+            element_faces=bdry_element_faces))
+
+        facial_adjacency_groups.append(fagrp_list)
+
+    # }}}
+
+    logger.info("rank %d: assembled local mesh part from slabs "
+                "(%d elements, %d neighbor parts)",
+                rank, sum(grp.nelements for grp in part_groups),
+                len(np.unique(remote_matches[1])))
+
+    return make_mesh(
+            part_vertices,
+            part_groups,
+            facial_adjacency_groups=facial_adjacency_groups,
+            is_conforming=slab_mesh.is_conforming)
+
+# }}}
+
+
 # {{{ remote group info
 
 # FIXME: "Remote" is perhaps not the best naming convention for this. For example,
@@ -244,10 +678,22 @@ class MPIBoundaryCommSetupHelper:
                 # old-timey, for compatibility
                 | Mapping[int, DirectDiscretizationConnection]
                 ),
-            bdry_grp_factory: ElementGroupFactory):
+            bdry_grp_factory: ElementGroupFactory,
+            *,
+            deterministic: bool = False,
+            max_workers: int | None = None):
         """
         :arg bdry_grp_factory: Group factory to use when creating the remote-to-local
             boundary connections
+        :arg deterministic: If *True*, :meth:`complete_some` waits for the
+            boundary data from all remote parts to arrive and then builds and
+            returns all connections at once, in the order given by
+            *inter_rank_bdry_info*. Otherwise, connections are built and
+            returned as soon as the data from their remote part has arrived.
+        :arg max_workers: If not *None*, the number of threads used to build
+            the remote-to-local connections, overlapping connection setup with
+            receiving further boundary data. This requires *actx* to be safe
+            to use from multiple threads.
         """
         self.mpi_comm = mpi_comm
         self.array_context = actx
@@ -279,42 +725,128 @@ class MPIBoundaryCommSetupHelper:
                 Sequence[InterRankBoundaryInfo], inter_rank_bdry_info)
 
         self.bdry_grp_factory = bdry_grp_factory
+        self.deterministic = deterministic
+        self.max_workers = max_workers
 
     def __enter__(self):
-        self._internal_mpi_comm = self.mpi_comm.Dup()
-
-        logger.info("bdry comm rank %d comm begin", self.i_local_rank)
-
-        # Not using irecv because mpi4py only allocates 32KB per receive buffer
-        # when receiving pickled objects. We could pass buffers to irecv explicitly,
-        # but in order to know the required buffer sizes we would have to do all of
-        # the pickling ourselves.
-
-        # to know when we're done
-        self.pending_recv_identifiers = {
-                (irbi.local_part_id, irbi.remote_part_id): i
-                for i, irbi in enumerate(self.inter_rank_bdry_info)}
-
-        assert len(self.pending_recv_identifiers) \
-                == len(self.inter_rank_bdry_info)
-
-        self.send_reqs = [
-            self._internal_mpi_comm.isend(
-                (
-                    irbi.local_part_id,
-                    irbi.remote_part_id,
-                    irbi.local_boundary_connection.to_discr.mesh,
-                    make_remote_group_infos(
-                        self.array_context, irbi.remote_part_id,
-                        irbi.local_boundary_connection)),
-                dest=irbi.remote_rank)
-            for irbi in self.inter_rank_bdry_info]
+        # NOTE: this stage spans the whole 'with' block, until __exit__
+        self._setup_stage = setup_stage("MPIBoundaryCommSetupHelper",
+                rank=self.i_local_rank,
+                nremote_parts=len(self.inter_rank_bdry_info))
+        self._setup_stage.__enter__()
+
+        try:
+            self._internal_mpi_comm = self.mpi_comm.Dup()
+
+            logger.info("bdry comm rank %d comm begin", self.i_local_rank)
+
+            # The boundary meshes are sent as a small pickled header, followed by
+            # the raw array data (see _isend_with_buffers). Only the header is
+            # received as a pickled object, so the 32KB receive buffer limit of
+            # mpi4py's irecv does not apply to the (potentially large) meshes.
+
+            self._part_ids_to_irbi_index = {
+                    (irbi.local_part_id, irbi.remote_part_id): i
+                    for i, irbi in enumerate(self.inter_rank_bdry_info)}
+            if len(self._part_ids_to_irbi_index) < len(self.inter_rank_bdry_info):
+                raise ValueError(
+                    "duplicate local/remote part pair in inter_rank_bdry_info")
+
+            # to know when we're done
+            self.pending_recv_identifiers = set(self._part_ids_to_irbi_index)
+
+            # maps futures of connections being built to the index of their
+            # entry in inter_rank_bdry_info
+            self._pending_builds = {}
+
+            if self.max_workers is not None:
+                from concurrent.futures import ThreadPoolExecutor
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = None
+
+            self.send_reqs = [
+                req
+                for irbi in self.inter_rank_bdry_info
+                for req in _isend_with_buffers(
+                    self._internal_mpi_comm,
+                    (
+                        irbi.local_part_id,
+                        irbi.remote_part_id,
+                        irbi.local_boundary_connection.to_discr.mesh,
+                        make_remote_group_infos(
+                            self.array_context, irbi.remote_part_id,
+                            irbi.local_boundary_connection)),
+                    dest=irbi.remote_rank,
+                    tag=TAG_EXCHANGE_BOUNDARY_DATA)]
+        except BaseException:
+            self._setup_stage.__exit__(*sys.exc_info())
+            raise
 
         return self
 
     def __exit__(self, type, value, traceback):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
         self._internal_mpi_comm.Free()
 
+        self._setup_stage.__exit__(type, value, traceback)
+
+    def _receive_available(self, block):
+        """Receive boundary data from remote parts that has already arrived.
+        If *block* is *True*, wait until data from at least one remote part
+        is available.
+
+        :returns: a :class:`list` of tuples ``(i_irbi, remote_bdry_mesh,
+            remote_group_infos)``.
+        """
+        from mpi4py import MPI
+
+        status = MPI.Status()
+        received = []
+
+        while self.pending_recv_identifiers:
+            if block and not received:
+                source = MPI.ANY_SOURCE
+            elif self._internal_mpi_comm.Iprobe(
+                    source=MPI.ANY_SOURCE, tag=TAG_EXCHANGE_BOUNDARY_DATA,
+                    status=status):
+                source = status.Get_source()
+            else:
+                break
+
+            (remote_part_id, local_part_id,
+                    remote_bdry_mesh, remote_group_infos), _ = _recv_with_buffers(
+                        self._internal_mpi_comm,
+                        source=source, tag=TAG_EXCHANGE_BOUNDARY_DATA,
+                        status=status)
+            i_src_rank = status.Get_source()
+
+            logger.debug("rank %d: Received part id '%s' data from rank %d",
+                         self.i_local_rank, remote_part_id, i_src_rank)
+
+            self.pending_recv_identifiers.remove((local_part_id, remote_part_id))
+            i_irbi = self._part_ids_to_irbi_index[local_part_id, remote_part_id]
+            assert i_src_rank == self.inter_rank_bdry_info[i_irbi].remote_rank
+
+            received.append((i_irbi, remote_bdry_mesh, remote_group_infos))
+
+        return received
+
+    def _make_remote_to_local_bdry_conn(
+            self, i_irbi, remote_bdry_mesh, remote_group_infos):
+        from meshmode.discretization.connection import make_partition_connection
+
+        irbi = self.inter_rank_bdry_info[i_irbi]
+        return make_partition_connection(
+                self.array_context,
+                local_bdry_conn=irbi.local_boundary_connection,
+                remote_bdry_discr=irbi.local_boundary_connection.to_discr.copy(
+                    actx=self.array_context,
+                    mesh=remote_bdry_mesh,
+                    group_factory=self.bdry_grp_factory),
+                remote_group_infos=remote_group_infos)
+
     def complete_some(self):
         """
         Returns a :class:`dict` mapping a subset of remote parts to
@@ -323,73 +855,62 @@ class MPIBoundaryCommSetupHelper:
         :class:`~meshmode.discretization.connection.DirectDiscretizationConnection`
         that performs data exchange across faces from part `i_remote_part` to the
         local mesh. When an empty dictionary is returned, setup is complete.
+
+        Unless *deterministic* was passed to :meth:`__init__`, this only
+        waits for as much boundary data as is needed to return at least one
+        connection.
         """
         from mpi4py import MPI
 
-        if not self.pending_recv_identifiers:
+        if not self.pending_recv_identifiers and not self._pending_builds:
             # Already completed, nothing more to do
             return {}
 
-        status = MPI.Status()
-
-        # Wait for all receives
-        # Note: This is inefficient, but ensures a deterministic order of
-        # boundary setup.
-        nrecvs = len(self.pending_recv_identifiers)
-        data = [None] * nrecvs
-        source_ranks = [None] * nrecvs
-
-        while nrecvs > 0:
-            r = self._internal_mpi_comm.recv(status=status)
-            key = (r[1], r[0])
-            loc = self.pending_recv_identifiers[key]
-            assert data[loc] is None
-            assert source_ranks[loc] is None
-            data[loc] = r
-            source_ranks[loc] = status.source
-            nrecvs -= 1
+        if self.deterministic:
+            received = []
+            while self.pending_recv_identifiers:
+                received.extend(self._receive_available(block=True))
+            received.sort(key=lambda r: r[0])
+        else:
+            # Only wait for more data if there are no connections in progress
+            # that could be returned instead.
+            received = self._receive_available(block=not self._pending_builds)
+
+        if self._executor is None:
+            built = [
+                (i_irbi, self._make_remote_to_local_bdry_conn(
+                    i_irbi, remote_bdry_mesh, remote_group_infos))
+                for i_irbi, remote_bdry_mesh, remote_group_infos in received]
+        else:
+            from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, wait
+
+            for i_irbi, remote_bdry_mesh, remote_group_infos in received:
+                future = self._executor.submit(
+                        self._make_remote_to_local_bdry_conn,
+                        i_irbi, remote_bdry_mesh, remote_group_infos)
+                self._pending_builds[future] = i_irbi
+
+            done, _ = wait(
+                    self._pending_builds,
+                    return_when=(
+                        ALL_COMPLETED if self.deterministic else FIRST_COMPLETED))
+            built = sorted(
+                    (self._pending_builds.pop(future), future.result())
+                    for future in done)
 
         remote_to_local_bdry_conns = {}
-
-        part_ids_to_irbi = {
-                (irbi.local_part_id, irbi.remote_part_id): irbi
-                for irbi in self.inter_rank_bdry_info}
-        if len(part_ids_to_irbi) < len(self.inter_rank_bdry_info):
-            raise ValueError(
-                "duplicate local/remote part pair in inter_rank_bdry_info")
-
-        for i_src_rank, recvd in zip(source_ranks, data, strict=True):
-            (remote_part_id, local_part_id,
-                    remote_bdry_mesh, remote_group_infos) = recvd
-
-            logger.debug("rank %d: Received part id '%s' data from rank %d",
-                         self.i_local_rank, remote_part_id, i_src_rank)
-
-            # Connect local_mesh to remote_mesh
-            from meshmode.discretization.connection import make_partition_connection
-            irbi = part_ids_to_irbi[local_part_id, remote_part_id]
-            assert i_src_rank == irbi.remote_rank
-
+        for i_irbi, conn in built:
+            irbi = self.inter_rank_bdry_info[i_irbi]
             if self._using_old_timey_interface:
-                key = remote_part_id
+                key = irbi.remote_part_id
             else:
-                key = (remote_part_id, local_part_id)
-
-            remote_to_local_bdry_conns[key] = (
-                make_partition_connection(
-                    self.array_context,
-                    local_bdry_conn=irbi.local_boundary_connection,
-                    remote_bdry_discr=irbi.local_boundary_connection.to_discr.copy(
-                        actx=self.array_context,
-                        mesh=remote_bdry_mesh,
-                        group_factory=self.bdry_grp_factory),
-                    remote_group_infos=remote_group_infos))
-
-            del self.pending_recv_identifiers[local_part_id, remote_part_id]
-
-        assert not self.pending_recv_identifiers
-        MPI.Request.waitall(self.send_reqs)
-        logger.info("bdry comm rank %d comm end", self.i_local_rank)
+                key = (irbi.remote_part_id, irbi.local_part_id)
+
+            remote_to_local_bdry_conns[key] = conn
+
+        if not self.pending_recv_identifiers and not self._pending_builds:
+            MPI.Request.Waitall(self.send_reqs)
+            logger.info("bdry comm rank %d comm end", self.i_local_rank)
 
         return remote_to_local_bdry_conns
 
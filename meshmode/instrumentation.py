@@ -0,0 +1,473 @@
+from __future__ import annotations
+
+
+__copyright__ = "Copyright (C) 2024 Andreas Kloeckner"
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import json
+import logging
+import sys
+import threading
+import time
+import tracemalloc
+from abc import ABC, abstractmethod
+from collections.abc import Generator, Mapping
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import IO, Any
+
+
+__doc__ = """
+The expensive setup stages in :mod:`meshmode` (e.g. :func:`~meshmode.mesh.make_mesh`,
+computing the facial adjacency, constructing a
+:class:`~meshmode.discretization.Discretization`,
+:func:`~meshmode.discretization.connection.make_face_restriction`,
+:func:`~meshmode.discretization.connection.make_opposite_face_connection`,
+:func:`~meshmode.mesh.processing.partition_mesh` or
+:class:`~meshmode.distributed.MPIBoundaryCommSetupHelper`) are wrapped in
+:func:`setup_stage`. Whenever at least one sink is registered (see
+:func:`add_instrumentation_sink`), each stage reports a :class:`StageRecord`
+with its wall and CPU time and its memory high-water marks to all the sinks.
+Without any registered sinks, the instrumentation does (almost) nothing.
+
+Stages nest: a stage started while another one is active is reported under
+the name ``"outer/inner"``. Records are emitted when a stage finishes, so an
+inner stage is reported before its enclosing stage.
+
+Peak memory is measured in two ways:
+
+* If :mod:`tracemalloc` is tracing (e.g. by running with
+  ``python -X tracemalloc``), :attr:`StageRecord.peak_traced_memory` is the
+  peak memory traced during the stage. This includes :mod:`numpy` arrays,
+  but not memory allocated on compute devices. To do this,
+  :func:`tracemalloc.reset_peak` is called at the start of every stage.
+  Since the traced peak is shared by the whole process, it is only tracked
+  for stages that run on the main thread (stages on other threads, e.g. in
+  the thread pool of :class:`~meshmode.distributed.MPIBoundaryCommSetupHelper`,
+  report *None*). It also includes allocations made by other threads while
+  the stage is active.
+* :attr:`StageRecord.max_rss` is the high-water mark of the resident set size
+  of the whole process at the end of the stage, as reported by
+  :func:`resource.getrusage`.
+
+.. versionadded:: 2024.1
+
+.. autoclass:: StageRecord
+.. autofunction:: setup_stage
+.. autofunction:: annotate_stage
+
+Sinks
+-----
+
+.. autoclass:: InstrumentationSink
+.. autoclass:: LoggingSink
+.. autoclass:: JSONLinesSink
+.. autoclass:: CollectingSink
+
+.. autofunction:: add_instrumentation_sink
+.. autofunction:: remove_instrumentation_sink
+.. autofunction:: instrumentation_sinks
+"""
+
+
+logger = logging.getLogger(__name__)
+
+
+# {{{ stage records
+
+@dataclass(frozen=True)
+class StageRecord:
+    """
+    .. attribute:: name
+
+        The name of the stage, prefixed by the names of all the stages
+        enclosing it, separated by ``"/"``.
+
+    .. attribute:: depth
+
+        The number of stages enclosing this one.
+
+    .. attribute:: wall_time
+
+        Elapsed wall clock time of the stage, in seconds.
+
+    .. attribute:: process_time
+
+        CPU time (of all threads of the process) spent in the stage, in seconds.
+
+    .. attribute:: peak_traced_memory
+
+        Peak memory traced by :mod:`tracemalloc` during the stage, in bytes,
+        or *None* if :mod:`tracemalloc` was not tracing or the stage did not
+        run on the main thread.
+
+    .. attribute:: max_rss
+
+        High-water mark of the resident set size of the process at the end
+        of the stage, in bytes, or *None* if not available.
+
+    .. attribute:: metadata
+
+        A :class:`dict` of additional information about the stage, see
+        :func:`annotate_stage`.
+
+    .. automethod:: to_json_dict
+    """
+
+    name: str
+    depth: int
+    wall_time: float
+    process_time: float
+    peak_traced_memory: int | None
+    max_rss: int | None
+    metadata: Mapping[str, Any] = field(default_factory=dict)
+
+    def to_json_dict(self) -> dict[str, Any]:
+        """Return a :class:`dict` representation of the record that can be
+        serialized to JSON. Metadata values that are not JSON-serializable
+        are converted to strings.
+        """
+        result = asdict(self)
+        result["metadata"] = {
+            key: (value
+                  if isinstance(value, (str, int, float, bool, type(None)))
+                  else str(value))
+            for key, value in self.metadata.items()}
+
+        return result
+
+
+def _get_max_rss() -> int | None:
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # NOTE: macOS reports bytes, everybody else reports kilobytes
+    if sys.platform == "darwin":
+        return max_rss
+    else:
+        return 1024 * max_rss
+
+# }}}
+
+
+# {{{ sinks
+
+class InstrumentationSink(ABC):
+    """Receives the :class:`StageRecord` of every finished stage.
+
+    .. automethod:: emit
+    """
+
+    @abstractmethod
+    def emit(self, record: StageRecord) -> None:
+        pass
+
+
+class LoggingSink(InstrumentationSink):
+    """Logs every finished stage as a single line to a :class:`logging.Logger`.
+    """
+
+    def __init__(self,
+            logger: logging.Logger | None = None,
+            level: int = logging.INFO) -> None:
+        """
+        :arg logger: defaults to the logger of this module.
+        """
+        if logger is None:
+            logger = globals()["logger"]
+
+        self.logger = logger
+        self.level = level
+
+    def emit(self, record: StageRecord) -> None:
+        if not self.logger.isEnabledFor(self.level):
+            return
+
+        mem_info = []
+        if record.peak_traced_memory is not None:
+            mem_info.append(
+                f"peak traced {record.peak_traced_memory / 2**20:.1f} MiB")
+        if record.max_rss is not None:
+            mem_info.append(f"max rss {record.max_rss / 2**20:.1f} MiB")
+
+        self.logger.log(self.level, "%s%s: %.3fs wall, %.3fs cpu%s%s",
+                "  " * record.depth, record.name,
+                record.wall_time, record.process_time,
+                "".join(f", {info}" for info in mem_info),
+                "".join(f", {key}={value}"
+                        for key, value in record.metadata.items()))
+
+
+class JSONLinesSink(InstrumentationSink):
+    """Writes every finished stage as a line of JSON (see
+    :meth:`StageRecord.to_json_dict`) to a file.
+    """
+
+    def __init__(self, file: str | IO[str]) -> None:
+        """
+        :arg file: a file name or a text stream. A file of the given name is
+            opened for appending every time a record is written, so that
+            records from processes that terminate abnormally are not lost.
+        """
+        self.file = file
+        self._lock = threading.Lock()
+
+    def emit(self, record: StageRecord) -> None:
+        line = json.dumps(record.to_json_dict()) + "\n"
+
+        with self._lock:
+            if isinstance(self.file, str):
+                with open(self.file, "a") as outf:
+                    outf.write(line)
+            else:
+                self.file.write(line)
+                self.file.flush()
+
+
+class CollectingSink(InstrumentationSink):
+    """Keeps all the finished stages in memory, e.g. to be forwarded to a
+    log manager (such as :mod:`logpyle`) at a later point.
+
+    .. attribute:: records
+
+        A :class:`list` of all the :class:`StageRecord` instances received so
+        far, in the order the stages finished.
+
+    .. automethod:: summary
+    .. automethod:: clear
+    """
+
+    def __init__(self) -> None:
+        self.records: list[StageRecord] = []
+        self._lock = threading.Lock()
+
+    def emit(self, record: StageRecord) -> None:
+        with self._lock:
+            self.records.append(record)
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """Aggregate the records by stage name.
+
+        :returns: a mapping from stage name to a :class:`dict` with the
+            number of times the stage was run (``"count"``), the total wall and
+            CPU time (``"wall_time"`` and ``"process_time"``) and the largest
+            memory high-water marks (``"peak_traced_memory"`` and
+            ``"max_rss"``) over all runs.
+        """
+        def max_or_none(a: int | None, b: int | None) -> int | None:
+            if a is None:
+                return b
+            if b is None:
+                return a
+            return max(a, b)
+
+        result: dict[str, dict[str, Any]] = {}
+        with self._lock:
+            for record in self.records:
+                entry = result.setdefault(record.name, {
+                    "count": 0,
+                    "wall_time": 0.0,
+                    "process_time": 0.0,
+                    "peak_traced_memory": None,
+                    "max_rss": None,
+                    })
+
+                entry["count"] += 1
+                entry["wall_time"] += record.wall_time
+                entry["process_time"] += record.process_time
+                entry["peak_traced_memory"] = max_or_none(
+                    entry["peak_traced_memory"], record.peak_traced_memory)
+                entry["max_rss"] = max_or_none(entry["max_rss"], record.max_rss)
+
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self.records.clear()
+
+
+_SINKS: list[InstrumentationSink] = []
+_SINKS_LOCK = threading.Lock()
+
+
+def add_instrumentation_sink(sink: InstrumentationSink) -> None:
+    """Start sending the records of all finished stages to *sink*."""
+    global _SINKS
+
+    with _SINKS_LOCK:
+        if any(s is sink for s in _SINKS):
+            raise ValueError("sink is already registered")
+
+        # NOTE: the list is replaced instead of modified, so that stages can
+        # iterate over it without holding the lock
+        _SINKS = [*_SINKS, sink]
+
+
+def remove_instrumentation_sink(sink: InstrumentationSink) -> None:
+    """Stop sending records to a sink added by :func:`add_instrumentation_sink`.
+    """
+    global _SINKS
+
+    with _SINKS_LOCK:
+        if not any(s is sink for s in _SINKS):
+            raise ValueError("sink is not registered")
+
+        _SINKS = [s for s in _SINKS if s is not sink]
+
+
+@contextmanager
+def instrumentation_sinks(
+        *sinks: InstrumentationSink,
+        ) -> Generator[tuple[InstrumentationSink, ...], None, None]:
+    """A context manager that registers *sinks* (see
+    :func:`add_instrumentation_sink`) for the duration of the ``with`` block.
+
+    .. code-block:: python
+
+        collector = CollectingSink()
+        with instrumentation_sinks(LoggingSink(), collector):
+            mesh = make_mesh(...)
+            discr = Discretization(actx, mesh, group_factory)
+
+        print(collector.summary())
+    """
+    for sink in sinks:
+        add_instrumentation_sink(sink)
+
+    try:
+        yield sinks
+    finally:
+        for sink in sinks:
+            remove_instrumentation_sink(sink)
+
+# }}}
+
+
+# {{{ stages
+
+@dataclass
+class _ActiveStage:
+    name: str
+    metadata: dict[str, Any]
+    peak_traced_memory: int | None
+
+
+class _StageStack(threading.local):
+    def __init__(self) -> None:
+        self.stages: list[_ActiveStage] = []
+
+
+_STACK = _StageStack()
+
+
+@contextmanager
+def setup_stage(name: str, **metadata: Any) -> Generator[None, None, None]:
+    """A context manager that measures the enclosed code as a setup stage
+    called *name* and reports it to all registered sinks. It can also be used
+    as a function decorator.
+
+    :arg metadata: initial value of :attr:`StageRecord.metadata`. More
+        entries can be added with :func:`annotate_stage`.
+    """
+    if not _SINKS:
+        yield
+        return
+
+    stack = _STACK.stages
+    if stack:
+        name = f"{stack[-1].name}/{name}"
+
+    # NOTE: the traced peak is process-wide, so stages running concurrently
+    # on other threads would reset each other's peaks
+    is_tracing = (
+        tracemalloc.is_tracing()
+        and threading.current_thread() is threading.main_thread())
+    if is_tracing:
+        current_memory, peak_memory = tracemalloc.get_traced_memory()
+        if stack and stack[-1].peak_traced_memory is not None:
+            stack[-1].peak_traced_memory = max(
+                stack[-1].peak_traced_memory, peak_memory)
+
+        tracemalloc.reset_peak()
+
+    stage = _ActiveStage(
+        name=name,
+        metadata=dict(metadata),
+        peak_traced_memory=current_memory if is_tracing else None)
+    stack.append(stage)
+
+    t_wall_start = time.perf_counter()
+    t_process_start = time.process_time()
+
+    try:
+        yield
+    finally:
+        wall_time = time.perf_counter() - t_wall_start
+        process_time = time.process_time() - t_process_start
+
+        popped_stage = stack.pop()
+        assert popped_stage is stage
+
+        if is_tracing and tracemalloc.is_tracing():
+            _, peak_memory = tracemalloc.get_traced_memory()
+            assert stage.peak_traced_memory is not None
+            stage.peak_traced_memory = max(stage.peak_traced_memory, peak_memory)
+
+            if stack and stack[-1].peak_traced_memory is not None:
+                stack[-1].peak_traced_memory = max(
+                    stack[-1].peak_traced_memory, stage.peak_traced_memory)
+        else:
+            stage.peak_traced_memory = None
+
+        record = StageRecord(
+            name=name,
+            depth=len(stack),
+            wall_time=wall_time,
+            process_time=process_time,
+            peak_traced_memory=stage.peak_traced_memory,
+            max_rss=_get_max_rss(),
+            metadata=stage.metadata)
+
+        for sink in _SINKS:
+            try:
+                sink.emit(record)
+            except Exception:
+                logger.exception("failed to emit instrumentation record "
+                        "for stage '%s'", name)
+
+
+def annotate_stage(**metadata: Any) -> None:
+    """Add *metadata* to the :attr:`StageRecord.metadata` of the innermost
+    active stage (of the current thread). Does nothing if there is no active
+    stage, e.g. because no sinks are registered.
+    """
+    stack = _STACK.stages
+    if stack:
+        stack[-1].metadata.update(metadata)
+
+# }}}
+
+# vim: foldmethod=marker
@@ -44,6 +44,7 @@ import numpy.linalg as la
 import modepy as mp
 from pytools import memoize_method, module_getattr_for_deprecations
 
+from meshmode.instrumentation import annotate_stage, setup_stage
 from meshmode.mesh.tools import AffineMap, optional_array_equal
 
 
@@ -61,6 +62,7 @@ __doc__ = """
 .. autoclass:: NodalAdjacency
 .. autoclass:: FacialAdjacencyGroup
 .. autoclass:: InteriorAdjacencyGroup
+.. autoclass:: NonconformingInteriorAdjacencyGroup
 .. autoclass:: BoundaryAdjacencyGroup
 .. autoclass:: InterPartAdjacencyGroup
 
@@ -628,6 +630,63 @@ class InteriorAdjacencyGroup(FacialAdjacencyGroup):
 # }}}
 
 
+# {{{ nonconforming interior adjacency
+
+@dataclass(frozen=True, eq=False)
+class NonconformingInteriorAdjacencyGroup(InteriorAdjacencyGroup):
+    """Describes interior facial element adjacency across hanging faces, i.e.
+    faces of an element that only cover part of the face of their neighbor.
+
+    Only the finer side of each hanging face is listed in :attr:`elements`,
+    so that the face of ``elements[i]`` is always contained in the face
+    of ``neighbors[i]``. A coarse face is usually the neighbor of several
+    fine faces and does not appear in :attr:`elements` at all.
+
+    .. autoattribute:: face_map_matrices
+    .. autoattribute:: face_map_offsets
+
+    .. versionadded:: 2024.1
+    """
+
+    face_map_matrices: np.ndarray
+    """``[nfagrp_elements, dim - 1, dim - 1]``. Together with
+    :attr:`face_map_offsets`, ``face_map_matrices[i]`` describes the affine
+    map from the reference coordinates of face ``element_faces[i]`` to the
+    reference coordinates of face ``neighbor_faces[i]`` of the neighbor,
+    where the reference coordinates of a face are the ones used by
+    :attr:`modepy.Face.map_to_volume`.
+    """
+
+    face_map_offsets: np.ndarray
+    """``[nfagrp_elements, dim - 1]``. See :attr:`face_map_matrices`."""
+
+    def __eq__(self, other: object) -> bool:
+        if not super().__eq__(other):
+            return False
+        assert isinstance(other, NonconformingInteriorAdjacencyGroup)
+
+        return (
+            np.array_equal(self.face_map_matrices, other.face_map_matrices)
+            and np.array_equal(self.face_map_offsets, other.face_map_offsets))
+
+    def as_python(self) -> str:
+        if type(self) is not NonconformingInteriorAdjacencyGroup:
+            raise NotImplementedError(f"Not implemented for {type(self)}.")
+
+        return self._as_python(
+            igroup=self.igroup,
+            ineighbor_group=self.ineighbor_group,
+            elements=_numpy_array_as_python(self.elements),
+            element_faces=_numpy_array_as_python(self.element_faces),
+            neighbors=_numpy_array_as_python(self.neighbors),
+            neighbor_faces=_numpy_array_as_python(self.neighbor_faces),
+            aff_map=_affine_map_as_python(self.aff_map),
+            face_map_matrices=_numpy_array_as_python(self.face_map_matrices),
+            face_map_offsets=_numpy_array_as_python(self.face_map_offsets))
+
+# }}}
+
+
 # {{{ boundary adjacency
 
 @dataclass(frozen=True, eq=False)
@@ -780,6 +839,7 @@ NodalAdjacencyLike = (
 FacialAdjacencyLike = (
     Literal[False] | Sequence[Sequence[FacialAdjacencyGroup]]
     )
+FaceMatchingMethod = Literal["sort", "hash"]
 
 
 def check_mesh_consistency(
@@ -956,6 +1016,7 @@ def is_mesh_consistent(
         return True
 
 
+@setup_stage("make_mesh")
 def make_mesh(
         vertices: np.ndarray | None,
         groups: Iterable[MeshElementGroup],
@@ -963,6 +1024,7 @@ def make_mesh(
         nodal_adjacency: NodalAdjacencyLike | None = None,
         facial_adjacency_groups: FacialAdjacencyLike | None = None,
         is_conforming: bool | None = None,
+        face_matching: FaceMatchingMethod | None = None,
         # dtypes
         vertex_id_dtype: DTypeLike = np.dtype("int32"),  # noqa: B008
         element_id_dtype: DTypeLike = np.dtype("int32"),  # noqa: B008
@@ -1005,6 +1067,18 @@ def make_mesh(
         * an iterable of :class:`FacialAdjacencyGroup` objects.
 
     :arg is_conforming: *True* if the mesh is known to be conforming.
+    :arg face_matching: the algorithm used to match up faces when deducing
+        the facial adjacency from the vertices. This can be one of
+
+        * ``"sort"``, which lexicographically sorts the vertex indices of all
+          faces in the mesh at once. This is the default.
+        * ``"hash"``, which packs (or hashes) the vertex indices of each face
+          into a single integer key and matches faces in chunks, so that the
+          peak memory use does not grow with the total number of faces. This
+          is recommended for very large meshes.
+
+        If given (and not *None*), the facial adjacency is computed eagerly
+        on construction, instead of on demand.
 
     :arg vertex_id_dtype: an integer :class:`~numpy.dtype` for the vertex indices.
     :arg element_id_dtype: an integer :class:`~numpy.dtype` for the element indices
@@ -1069,8 +1143,15 @@ def make_mesh(
             face_id_dtype)
         facial_adjacency_groups = tuple(tuple(grps) for grps in facial_adjacency_groups)
 
+    groups = tuple(groups)
+    if face_matching is not None and facial_adjacency_groups is None:
+        facial_adjacency_groups = tuple(
+            tuple(grps) for grps in _compute_facial_adjacency_from_vertices(
+                groups, element_id_dtype, face_id_dtype,
+                face_matching=face_matching))
+
     mesh = Mesh(
-        groups=tuple(groups),
+        groups=groups,
         vertices=vertices,
         is_conforming=is_conforming,
         vertex_id_dtype=vertex_id_dtype,
@@ -1100,6 +1181,8 @@ def make_mesh(
             node_vertex_consistency_tolerance=node_vertex_consistency_tolerance,
             skip_element_orientation_test=skip_element_orientation_test)
 
+    annotate_stage(nelements=mesh.nelements)
+
     return mesh
 
 
@@ -1580,42 +1663,145 @@ def _test_node_vertex_consistency(
 
 # {{{ vertex-based nodal adjacency
 
-def _compute_nodal_adjacency_from_vertices(mesh: Mesh) -> NodalAdjacency:
-    # FIXME Native code would make this faster
+# Upper bound on the number of (element, element) candidate pairs that are
+# materialized at once while computing the nodal adjacency. Each pair takes
+# up 8 bytes (as an ``int64`` key) plus some sorting overhead.
+_NODAL_ADJACENCY_MAX_CHUNK_PAIRS = 2**22
+
+
+@setup_stage("compute_nodal_adjacency")
+def _compute_nodal_adjacency_from_vertices(
+        mesh: Mesh, *,
+        max_chunk_pairs: int | None = None) -> NodalAdjacency:
+    """Compute the nodal adjacency of *mesh* based on its vertex indices.
 
+    The element-to-element relation is obtained from the (sorted) vertex-element
+    incidence by enumerating all pairs of elements that share a vertex. To bound
+    the memory use, the elements are processed in contiguous chunks such that
+    at most *max_chunk_pairs* candidate pairs are formed at a time. Since the
+    chunks partition the rows of the resulting CSR structure, the results can
+    simply be concatenated.
+
+    :arg max_chunk_pairs: maximum number of candidate element pairs that are
+        stored at once. Defaults to ``_NODAL_ADJACENCY_MAX_CHUNK_PAIRS``.
+    """
     if mesh.vertices is None:
         raise ValueError("unable to compute nodal adjacency without vertices")
 
+    if max_chunk_pairs is None:
+        max_chunk_pairs = _NODAL_ADJACENCY_MAX_CHUNK_PAIRS
+
+    if max_chunk_pairs <= 0:
+        raise ValueError(
+            f"'max_chunk_pairs' must be positive: {max_chunk_pairs}")
+
     _, nvertices = mesh.vertices.shape
-    vertex_to_element: list[list[int]] = [[] for i in range(nvertices)]
+    nelements = mesh.nelements
+
+    # {{{ element -> vertex incidence (CSR, ordered by element)
 
-    for base_element_nr, grp in zip(mesh.base_element_nrs, mesh.groups, strict=True):
+    el_vertex_indices = []
+    el_nvertices = []
+    for grp in mesh.groups:
         if grp.vertex_indices is None:
             raise ValueError("unable to compute nodal adjacency without vertices")
 
-        for iel_grp in range(grp.nelements):
-            for ivertex in grp.vertex_indices[iel_grp]:
-                vertex_to_element[ivertex].append(base_element_nr + iel_grp)
+        el_vertex_indices.append(grp.vertex_indices.reshape(-1))
+        el_nvertices.append(np.full(grp.nelements, grp.nvertices, dtype=np.int64))
 
-    element_to_element: list[set[int]] = [set() for i in range(mesh.nelements)]
-    for base_element_nr, grp in zip(mesh.base_element_nrs, mesh.groups, strict=True):
-        assert grp.vertex_indices is not None
+    incident_vertices = np.concatenate(el_vertex_indices).astype(np.int64)
+    el_incidence_starts = np.zeros(nelements + 1, dtype=np.int64)
+    np.cumsum(np.concatenate(el_nvertices), out=el_incidence_starts[1:])
+
+    del el_vertex_indices
+    del el_nvertices
 
-        for iel_grp in range(grp.nelements):
-            for ivertex in grp.vertex_indices[iel_grp]:
-                element_to_element[base_element_nr + iel_grp].update(
-                        vertex_to_element[ivertex])
+    # }}}
+
+    # {{{ vertex -> element incidence (CSR, ordered by vertex)
 
-    for iel, neighbors in enumerate(element_to_element):
-        neighbors.remove(iel)
+    # NOTE: the element numbers are recovered from the incidence offsets, so
+    # that only a single copy of the incidence is ever stored
+    order = np.argsort(incident_vertices, kind="stable")
+    vertex_to_element = np.searchsorted(el_incidence_starts, order, side="right") - 1
+    vertex_starts = np.zeros(nvertices + 1, dtype=np.int64)
+    np.cumsum(
+            np.bincount(incident_vertices, minlength=nvertices),
+            out=vertex_starts[1:])
 
-    lengths = [len(el_list) for el_list in element_to_element]
-    neighbors_starts = np.cumsum(
-            np.array([0, *lengths], dtype=mesh.element_id_dtype))
-    from pytools import flatten
-    neighbors_ary = np.array(
-            list(flatten(element_to_element)),
-            dtype=mesh.element_id_dtype)
+    del order
+
+    # }}}
+
+    # {{{ enumerate element pairs sharing a vertex, chunked by element
+
+    incidence_npairs = (
+            vertex_starts[incident_vertices + 1]
+            - vertex_starts[incident_vertices])
+    el_pair_starts = np.zeros(nelements + 1, dtype=np.int64)
+    if nelements:
+        np.cumsum(
+                np.add.reduceat(incidence_npairs, el_incidence_starts[:-1]),
+                out=el_pair_starts[1:])
+
+    neighbors_list = []
+    nneighbors = np.zeros(nelements, dtype=np.int64)
+
+    el_start = 0
+    while el_start < nelements:
+        # find the largest chunk of elements that fits into the pair budget,
+        # but always make progress by at least one element
+        el_end = int(np.searchsorted(
+            el_pair_starts, el_pair_starts[el_start] + max_chunk_pairs,
+            side="right")) - 1
+        el_end = min(max(el_end, el_start + 1), nelements)
+
+        inc_start = el_incidence_starts[el_start]
+        inc_end = el_incidence_starts[el_end]
+        chunk_vertices = incident_vertices[inc_start:inc_end]
+        chunk_npairs = incidence_npairs[inc_start:inc_end]
+        chunk_elements = np.repeat(
+                np.arange(el_start, el_end, dtype=np.int64),
+                np.diff(el_incidence_starts[el_start:el_end + 1]))
+
+        # for each incidence (iel, ivertex), gather all elements adjacent
+        # to ivertex as partners of iel
+        pair_offsets = np.cumsum(chunk_npairs) - chunk_npairs
+        partner_ptr = (
+                np.arange(int(chunk_npairs.sum()), dtype=np.int64)
+                - np.repeat(pair_offsets - vertex_starts[chunk_vertices],
+                            chunk_npairs))
+
+        keys = (
+                np.repeat(chunk_elements, chunk_npairs) * nelements
+                + vertex_to_element[partner_ptr])
+        keys.sort()
+
+        # drop duplicates (elements sharing more than one vertex)
+        is_first = np.empty(len(keys), dtype=bool)
+        is_first[:1] = True
+        np.not_equal(keys[1:], keys[:-1], out=is_first[1:])
+        sources, targets = np.divmod(keys[is_first], nelements)
+
+        not_self = sources != targets
+        sources = sources[not_self]
+        targets = targets[not_self]
+
+        nneighbors[el_start:el_end] = np.bincount(
+                sources - el_start, minlength=el_end - el_start)
+        neighbors_list.append(targets)
+
+        el_start = el_end
+
+    # }}}
+
+    neighbors_starts = np.zeros(nelements + 1, dtype=mesh.element_id_dtype)
+    np.cumsum(nneighbors, out=neighbors_starts[1:])
+
+    if neighbors_list:
+        neighbors_ary = np.concatenate(neighbors_list).astype(mesh.element_id_dtype)
+    else:
+        neighbors_ary = np.empty(0, dtype=mesh.element_id_dtype)
 
     assert neighbors_starts[-1] == len(neighbors_ary)
 
@@ -1727,16 +1913,213 @@ def _match_faces_by_vertices(
     return np.stack((order[match_indices], order[match_indices+1]))
 
 
+# Maximum number of faces processed at once by
+# :func:`_match_faces_by_vertices_hashed`.
+_FACE_MATCHING_MAX_CHUNK_FACES = 2**20
+
+
+def _gather_face_vertex_indices(
+            groups: Sequence[MeshElementGroup],
+            face_ids: _FaceIDs,
+            indices: np.ndarray,
+            vertex_index_map_func: Callable[[np.ndarray], np.ndarray],
+            max_face_vertices: int,
+        ) -> np.ndarray:
+    """
+    :returns: an array of shape ``(len(indices), max_face_vertices)`` containing
+        the (mapped) vertex indices of the faces ``face_ids[indices]``, sorted
+        in increasing order and padded with ``-1`` for faces with fewer
+        vertices.
+    """
+    result = np.full((len(indices), max_face_vertices), -1, dtype=np.int64)
+
+    sel_groups = face_ids.groups[indices]
+    sel_elements = face_ids.elements[indices]
+    sel_faces = face_ids.faces[indices]
+
+    for igrp, grp in enumerate(groups):
+        assert grp.vertex_indices is not None
+
+        in_group = sel_groups == igrp
+        if not in_group.any():
+            continue
+
+        for fid, ref_fvi in enumerate(grp.face_vertex_indices()):
+            is_face, = np.where(in_group & (sel_faces == fid))
+            grp_fvi = grp.vertex_indices[sel_elements[is_face], :][:, ref_fvi]
+            result[is_face, :len(ref_fvi)] = vertex_index_map_func(grp_fvi)
+
+    result.sort(axis=1)
+    return result
+
+
+def _hash_face_vertex_indices(
+        face_vertex_indices: np.ndarray) -> tuple[np.ndarray, bool]:
+    """Combine the (sorted) vertex indices of each face into a single ``uint64``
+    key. If the indices fit, they are packed exactly, otherwise a (non-unique)
+    64-bit hash is returned.
+
+    :returns: a tuple ``(keys, is_exact)``.
+    """
+    nfaces, max_face_vertices = face_vertex_indices.shape
+
+    # shift by one to make the '-1' padding non-negative
+    fvi = (face_vertex_indices + 1).astype(np.uint64)
+    nbits = int(fvi.max(initial=0)).bit_length()
+
+    keys = np.zeros(nfaces, dtype=np.uint64)
+    if nbits * max_face_vertices <= 64:
+        for i in range(max_face_vertices):
+            keys = (keys << np.uint64(nbits)) | fvi[:, i]
+
+        return keys, True
+
+    # FNV-1a style mixing followed by a splitmix64 finalizer
+    keys[:] = np.uint64(0xCBF29CE484222325)
+    for i in range(max_face_vertices):
+        keys ^= fvi[:, i]
+        keys *= np.uint64(0x100000001B3)
+
+    keys ^= keys >> np.uint64(30)
+    keys *= np.uint64(0xBF58476D1CE4E5B9)
+    keys ^= keys >> np.uint64(27)
+    keys *= np.uint64(0x94D049BB133111EB)
+    keys ^= keys >> np.uint64(31)
+
+    return keys, False
+
+
+def _match_faces_by_vertices_hashed(
+            groups: Sequence[MeshElementGroup],
+            face_ids: _FaceIDs,
+            vertex_index_map_func: Callable[[np.ndarray], np.ndarray] | None = None,
+            *,
+            max_chunk_faces: int | None = None,
+        ) -> np.ndarray:
+    """
+    Return matching faces in *face_ids* (expressed as pairs of indices into
+    *face_ids*), where two faces match if they have the same vertices.
+
+    Unlike :func:`_match_faces_by_vertices`, this never forms the vertex
+    indices of all faces at once. Instead, faces are partitioned by their
+    smallest vertex index (which matching faces necessarily share) into chunks
+    of at most *max_chunk_faces* faces. In each chunk, the sorted face vertex
+    indices are packed into a single integer key (or hashed, if they do not fit
+    into 64 bits) and faces are joined on that key. The peak memory use is
+    therefore proportional to the size of the chunk, with the exception of a
+    few integer arrays of size ``nfaces``.
+
+    :arg max_chunk_faces: maximum number of faces matched at once. Note that
+        all faces with the same smallest vertex always end up in the same
+        chunk, so this is exceeded if needed. Defaults to
+        ``_FACE_MATCHING_MAX_CHUNK_FACES``.
+    :returns: see :func:`_match_faces_by_vertices`.
+    """
+    if vertex_index_map_func is None:
+        def vertex_index_map_func(vertices: np.ndarray) -> np.ndarray:
+            return vertices
+
+    if max_chunk_faces is None:
+        max_chunk_faces = _FACE_MATCHING_MAX_CHUNK_FACES
+
+    if max_chunk_faces <= 0:
+        raise ValueError(
+            f"'max_chunk_faces' must be positive: {max_chunk_faces}")
+
+    nfaces = len(face_ids.groups)
+    if nfaces == 0:
+        return np.empty((2, 0), dtype=np.int64)
+
+    max_face_vertices = max(len(ref_fvi) for grp in groups
+        for ref_fvi in grp.face_vertex_indices())
+
+    # {{{ partition faces by their smallest vertex
+
+    min_vertex = np.empty(nfaces, dtype=np.int64)
+    for start in range(0, nfaces, max_chunk_faces):
+        indices = np.arange(start, min(start + max_chunk_faces, nfaces))
+        fvi = _gather_face_vertex_indices(
+            groups, face_ids, indices, vertex_index_map_func, max_face_vertices)
+        min_vertex[indices] = np.where(
+            fvi >= 0, fvi, np.iinfo(np.int64).max).min(axis=1)
+
+    order = np.argsort(min_vertex, kind="stable")
+    min_vertex = min_vertex[order]
+
+    # chunk boundaries may only occur between different smallest vertices
+    is_boundary = np.empty(nfaces + 1, dtype=bool)
+    is_boundary[0] = is_boundary[-1] = True
+    np.not_equal(min_vertex[1:], min_vertex[:-1], out=is_boundary[1:-1])
+    candidate_starts, = np.where(is_boundary)
+
+    del min_vertex
+    del is_boundary
+
+    # }}}
+
+    # {{{ join faces on their keys, chunk by chunk
+
+    matches = []
+
+    ichunk_start = 0
+    while ichunk_start < len(candidate_starts) - 1:
+        start = candidate_starts[ichunk_start]
+        ichunk_end = int(np.searchsorted(
+            candidate_starts, start + max_chunk_faces, side="right")) - 1
+        ichunk_end = max(ichunk_end, ichunk_start + 1)
+        end = candidate_starts[ichunk_end]
+
+        indices = order[start:end]
+        fvi = _gather_face_vertex_indices(
+            groups, face_ids, indices, vertex_index_map_func, max_face_vertices)
+
+        keys, is_exact = _hash_face_vertex_indices(fvi)
+        key_order = np.argsort(keys, kind="stable")
+        match_indices, = np.where(keys[key_order[1:]] == keys[key_order[:-1]])
+
+        if not is_exact:
+            is_same = np.all(
+                fvi[key_order[match_indices]] == fvi[key_order[match_indices+1]],
+                axis=1)
+
+            if not np.all(is_same):
+                # hash collision: fall back to an exact lexicographic sort
+                key_order = np.lexsort(fvi.T)
+                match_indices, = np.where(~np.any(
+                    np.diff(fvi[key_order], axis=0), axis=1))
+
+        matches.append(np.stack((
+            indices[key_order[match_indices]],
+            indices[key_order[match_indices+1]])))
+
+        ichunk_start = ichunk_end
+
+    # }}}
+
+    # NOTE: *order* was a stable sort, so within each matching pair the face
+    # that occurs first in *face_ids* comes first
+    return np.concatenate(matches, axis=1)
+
+
+@setup_stage("compute_facial_adjacency")
 def _compute_facial_adjacency_from_vertices(
         groups: Sequence[MeshElementGroup],
         element_id_dtype: np.dtype,
         face_id_dtype: np.dtype,
         face_vertex_indices_to_tags: Mapping[
             frozenset[int], Sequence[BoundaryTag]] | None = None,
+        *,
+        face_matching: FaceMatchingMethod | None = None,
         ) -> Sequence[Sequence[FacialAdjacencyGroup]]:
     if not groups:
         return []
 
+    if face_matching is None:
+        face_matching = "sort"
+
+    annotate_stage(face_matching=face_matching,
+            nelements=sum(grp.nelements for grp in groups))
+
     if face_vertex_indices_to_tags is not None:
         boundary_tags = {
             tag
@@ -1759,7 +2142,12 @@ def _compute_facial_adjacency_from_vertices(
             faces=indices[0].flatten().astype(face_id_dtype)))
     face_ids = _concatenate_face_ids(face_ids_per_group)
 
-    face_index_pairs = _match_faces_by_vertices(groups, face_ids)
+    if face_matching == "sort":
+        face_index_pairs = _match_faces_by_vertices(groups, face_ids)
+    elif face_matching == "hash":
+        face_index_pairs = _match_faces_by_vertices_hashed(groups, face_ids)
+    else:
+        raise ValueError(f"unknown face matching method: '{face_matching}'")
 
     del igrp
     del grp
@@ -2011,6 +2399,7 @@ def as_python(mesh: Mesh, function_name: str = "make_mesh") -> str:
             MeshElementGroup,
             FacialAdjacencyGroup,
             InteriorAdjacencyGroup,
+            NonconformingInteriorAdjacencyGroup,
             BoundaryAdjacencyGroup,
             InterPartAdjacencyGroup,
             BTAG_NONE,
@@ -32,7 +32,7 @@ from gmsh_interop.reader import (  # noqa: F401
     ScriptWithFilesSource,
 )
 
-from meshmode.mesh import Mesh
+from meshmode.mesh import Mesh, SimplexElementGroup, TensorProductElementGroup
 
 
 __doc__ = """
@@ -47,6 +47,9 @@ __doc__ = """
 .. autofunction:: from_vertices_and_simplices
 .. autofunction:: to_json
 
+.. autofunction:: write_mesh
+.. autofunction:: read_mesh
+
 """
 
 
@@ -157,12 +160,6 @@ class GmshMeshReceiver(GmshMeshReceiverBase):
 
         # }}}
 
-        from meshmode.mesh import (
-            SimplexElementGroup,
-            TensorProductElementGroup,
-            make_mesh,
-        )
-
         bulk_el_types = set()
 
         group_base_elem_nr = 0
@@ -205,45 +202,8 @@ class GmshMeshReceiver(GmshMeshReceiverBase):
 
                 i += 1
 
-            import modepy as mp
-            if isinstance(group_el_type, GmshSimplexElementBase):
-                shape = mp.Simplex(group_el_type.dimensions)
-            elif isinstance(group_el_type, GmshTensorProductElementBase):
-                shape = mp.Hypercube(group_el_type.dimensions)
-            else:
-                raise NotImplementedError(
-                        f"gmsh element type: {type(group_el_type).__name__}")
-
-            space = mp.space_for_shape(shape, group_el_type.order)
-            unit_nodes = mp.equispaced_nodes_for_space(space, shape)
-
-            if isinstance(group_el_type, GmshSimplexElementBase):
-                group = SimplexElementGroup.make_group(
-                    group_el_type.order,
-                    vertex_indices,
-                    nodes,
-                    unit_nodes=unit_nodes
-                    )
-
-                if group.dim == 2:
-                    from meshmode.mesh.processing import flip_element_group
-                    group = flip_element_group(vertices, group,
-                            np.ones(ngroup_elements, bool))
-
-            elif isinstance(group_el_type, GmshTensorProductElementBase):
-                vertex_shuffle = type(group_el_type)(
-                        order=1).get_lexicographic_gmsh_node_indices()
-
-                group = TensorProductElementGroup.make_group(
-                    group_el_type.order,
-                    vertex_indices[:, vertex_shuffle],
-                    nodes,
-                    unit_nodes=unit_nodes
-                    )
-            else:
-                # NOTE: already checked above
-                raise AssertionError()
-
+            group = _make_group_from_gmsh_elements(
+                    group_el_type, vertices, vertex_indices, nodes)
             groups.append(group)
 
             group_base_elem_nr += group.nelements
@@ -251,26 +211,533 @@ class GmshMeshReceiver(GmshMeshReceiverBase):
         for tag in tag_to_elements.keys():
             tag_to_elements[tag] = np.array(tag_to_elements[tag], dtype=np.int32)
 
-        # FIXME: This is heuristic.
-        if len(bulk_el_types) == 1:
-            is_conforming = True
+        mesh = _make_mesh_from_gmsh_groups(
+                vertices, groups, mesh_bulk_dim, len(bulk_el_types),
+                face_vertex_indices_to_tags if self.tags else None,
+                self.mesh_construction_kwargs)
+
+        return (mesh, tag_to_elements) if return_tag_to_elements_map else mesh
+
+
+def _make_group_from_gmsh_elements(el_type, vertices, vertex_indices, nodes):
+    import modepy as mp
+
+    from meshmode.mesh import SimplexElementGroup, TensorProductElementGroup
+
+    if isinstance(el_type, GmshSimplexElementBase):
+        shape = mp.Simplex(el_type.dimensions)
+    elif isinstance(el_type, GmshTensorProductElementBase):
+        shape = mp.Hypercube(el_type.dimensions)
+    else:
+        raise NotImplementedError(
+                f"gmsh element type: {type(el_type).__name__}")
+
+    space = mp.space_for_shape(shape, el_type.order)
+    unit_nodes = mp.equispaced_nodes_for_space(space, shape)
+
+    if isinstance(el_type, GmshSimplexElementBase):
+        group = SimplexElementGroup.make_group(
+            el_type.order,
+            vertex_indices,
+            nodes,
+            unit_nodes=unit_nodes
+            )
+
+        if group.dim == 2:
+            from meshmode.mesh.processing import flip_element_group
+            group = flip_element_group(vertices, group,
+                    np.ones(group.nelements, bool))
+
+    elif isinstance(el_type, GmshTensorProductElementBase):
+        vertex_shuffle = type(el_type)(
+                order=1).get_lexicographic_gmsh_node_indices()
+
+        group = TensorProductElementGroup.make_group(
+            el_type.order,
+            vertex_indices[:, vertex_shuffle],
+            nodes,
+            unit_nodes=unit_nodes
+            )
+    else:
+        # NOTE: already checked above
+        raise AssertionError()
+
+    return group
+
+
+def _make_mesh_from_gmsh_groups(
+        vertices, groups, mesh_bulk_dim, nbulk_el_types,
+        face_vertex_indices_to_tags, mesh_construction_kwargs):
+    from meshmode.mesh import make_mesh
+
+    # FIXME: This is heuristic.
+    if nbulk_el_types == 1:
+        is_conforming = True
+    else:
+        is_conforming = mesh_bulk_dim < 3
+
+    # compute facial adjacency for Mesh if there is tag information
+    facial_adjacency_groups = None
+    if is_conforming and face_vertex_indices_to_tags is not None:
+        from meshmode.mesh import _compute_facial_adjacency_from_vertices
+        facial_adjacency_groups = _compute_facial_adjacency_from_vertices(
+                groups, np.int32, np.int8, face_vertex_indices_to_tags)
+
+    return make_mesh(
+            vertices, groups,
+            is_conforming=is_conforming,
+            facial_adjacency_groups=facial_adjacency_groups,
+            **mesh_construction_kwargs)
+
+# }}}
+
+
+# {{{ bulk gmsh 4.x reader
+
+class _Gmsh4Parser:
+    """Reads sections of a Gmsh 4.1 file stored in the buffer *buf*.
+
+    Binary section data is read straight from *buf* without copying. ASCII
+    section data is converted to an array of numbers in one go, so that both
+    file types can be read through :meth:`read` in the same way.
+    """
+
+    def __init__(self, buf):
+        self.buf = buf
+        self.pos = 0
+
+        self.is_binary = False
+        self.byteorder = "<"
+
+        self.tokens = None
+        self.itoken = 0
+
+    def read_line(self) -> str:
+        end = self.buf.find(b"\n", self.pos)
+        if end < 0:
+            end = len(self.buf)
+
+        line = self.buf[self.pos:end].decode().strip()
+        self.pos = end + 1
+        return line
+
+    def has_next_section(self) -> bool:
+        while self.pos < len(self.buf) and self.buf[self.pos:self.pos+1].isspace():
+            self.pos += 1
+
+        return self.pos < len(self.buf)
+
+    def find_section_end(self, section_name: str) -> int:
+        end = self.buf.find(f"$End{section_name}".encode(), self.pos)
+        if end < 0:
+            from gmsh_interop.reader import GmshFileFormatError
+            raise GmshFileFormatError(f"Unterminated section '{section_name}'")
+
+        return end
+
+    def begin_section(self, section_name: str) -> None:
+        if not self.is_binary:
+            end = self.find_section_end(section_name)
+            self.tokens = np.fromstring(
+                    self.buf[self.pos:end], dtype=np.float64, sep=" ")
+            self.itoken = 0
+            self.pos = end
+
+    def end_section(self, section_name: str) -> None:
+        from gmsh_interop.reader import GmshFileFormatError
+
+        if self.tokens is not None:
+            if self.itoken != len(self.tokens):
+                raise GmshFileFormatError(
+                    f"Unexpected trailing data in section '{section_name}'")
+            self.tokens = None
+
+        line = ""
+        while not line and self.pos < len(self.buf):
+            line = self.read_line()
+
+        if line != f"$End{section_name}":
+            raise GmshFileFormatError(
+                f"Expected end of section '{section_name}': found '{line}'")
+
+    def skip_section(self, section_name: str) -> None:
+        self.pos = self.find_section_end(section_name)
+        self.read_line()
+
+    def read(self, dtype, count: int) -> np.ndarray:
+        """Read *count* values, where *dtype* is the type used to store them
+        in binary files (``int`` as ``"i4"``, ``size_t`` as ``"u8"`` and
+        ``double`` as ``"f8"``).
+        """
+        if self.is_binary:
+            dtype = np.dtype(dtype).newbyteorder(self.byteorder)
+            result = np.frombuffer(
+                    self.buf, dtype=dtype, count=count, offset=self.pos)
+            self.pos += result.nbytes
         else:
-            is_conforming = mesh_bulk_dim < 3
+            result = self.tokens[self.itoken:self.itoken + count]
+            if len(result) < count:
+                from gmsh_interop.reader import GmshFileFormatError
+                raise GmshFileFormatError("Unexpected end of section data")
+
+            self.itoken += count
+            if np.dtype(dtype).kind != "f":
+                result = result.astype(np.int64)
+
+        return result
+
+    def read_int(self, dtype) -> int:
+        return int(self.read(dtype, 1)[0])
+
+    # {{{ sections
+
+    def read_mesh_format(self) -> None:
+        from gmsh_interop.reader import GmshFileFormatError
+
+        version_number, file_type, data_size = self.read_line().split()
+        if version_number != "4.1":
+            raise NotImplementedError(
+                f"Unsupported mesh version number '{version_number}' "
+                "found. Convert your mesh to a v4.1 mesh using "
+                "'gmsh your_msh.msh -save -format msh41 -o your_msh-v41.msh'")
+
+        if data_size != "8":
+            raise GmshFileFormatError(f"Unsupported data size: '{data_size}'")
+
+        self.is_binary = file_type == "1"
+        if self.is_binary:
+            one = self.buf[self.pos:self.pos + 4]
+            if int.from_bytes(one, "little") == 1:
+                self.byteorder = "<"
+            elif int.from_bytes(one, "big") == 1:
+                self.byteorder = ">"
+            else:
+                raise GmshFileFormatError("Unable to determine byte order")
+            self.pos += 4
+
+    def read_physical_names(self) -> dict[tuple[int, int], str]:
+        from gmsh_interop.reader import GmshFileFormatError
+
+        name_count = int(self.read_line())
+
+        physical_names = {}
+        for _ in range(name_count):
+            dimension, number, name = self.read_line().split(" ", 2)
+            if not name[0] == '"' or not name[-1] == '"':
+                raise GmshFileFormatError(
+                    f"Expected quotes around physical name: <{name}>")
+
+            physical_names[int(dimension), int(number)] = name[1:-1]
+
+        return physical_names
+
+    def read_entities(self) -> dict[tuple[int, int], list[int]]:
+        """
+        :returns: a mapping from ``(dim, entity_tag)`` to the physical tags of
+            the entity.
+        """
+        entity_counts = self.read("u8", 4)
+
+        entity_to_physical_tags = {}
+        for dim, entity_count in enumerate(entity_counts):
+            for _ in range(entity_count):
+                entity_tag = self.read_int("i4")
+                # bounding box (or point coordinates)
+                self.read("f8", 3 if dim == 0 else 6)
+                physical_tags = self.read("i4", self.read_int("u8"))
+                if dim > 0:
+                    # bounding entities
+                    self.read("i4", self.read_int("u8"))
+
+                entity_to_physical_tags[dim, entity_tag] = [
+                        int(tag) for tag in physical_tags]
+
+        return entity_to_physical_tags
+
+    def read_nodes(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        :returns: a tuple ``(node_tags, points)`` of the node tags and
+            node coordinates of shape ``(nnodes, 3)``, in file order.
+        """
+        from gmsh_interop.reader import GmshFileFormatError
+
+        block_count, node_count, _, _ = self.read("u8", 4)
+
+        node_tags = np.empty(node_count, dtype=np.int64)
+        points = np.empty((node_count, 3), dtype=np.float64)
+
+        inode = 0
+        for _ in range(block_count):
+            entity_dim, _, parametric = self.read("i4", 3)
+            block_node_count = self.read_int("u8")
+            if inode + block_node_count > node_count:
+                raise GmshFileFormatError(
+                    f"Unexpected number of nodes found: got more than "
+                    f"the expected {node_count} nodes")
+
+            nparams = entity_dim if parametric else 0
+            node_tags[inode:inode + block_node_count] = (
+                    self.read("u8", block_node_count))
+            points[inode:inode + block_node_count] = (
+                    self.read("f8", block_node_count * (3 + nparams))
+                    .reshape(block_node_count, 3 + nparams)[:, :3])
+
+            inode += block_node_count
+
+        if inode != node_count:
+            raise GmshFileFormatError(
+                f"Unexpected number of nodes found: got {inode} nodes "
+                f"but expected {node_count} nodes")
+
+        return node_tags, points
+
+    def read_elements(self, element_type_map):
+        """
+        :returns: a :class:`list` of tuples ``(el_type, entity, element_tags,
+            node_tags)`` for each element block in the file, where *node_tags*
+            has shape ``(nelements, el_type.node_count())``.
+        """
+        from gmsh_interop.reader import GmshFileFormatError
+
+        block_count, element_count, _, _ = self.read("u8", 4)
+
+        blocks = []
+        ielement = 0
+        for _ in range(block_count):
+            entity_dim, entity_tag, el_type_num = (
+                    int(v) for v in self.read("i4", 3))
+            block_element_count = self.read_int("u8")
+
+            try:
+                el_type = element_type_map[el_type_num]
+            except KeyError:
+                raise GmshFileFormatError(
+                        f"Unexpected element type: {el_type_num}"
+                        ) from None
+
+            data = self.read(
+                    "u8", block_element_count * (1 + el_type.node_count())
+                    ).reshape(block_element_count, 1 + el_type.node_count())
+
+            blocks.append((
+                el_type, (entity_dim, entity_tag),
+                data[:, 0].astype(np.int64), data[:, 1:]))
+
+            ielement += block_element_count
+
+        if ielement != element_count:
+            raise GmshFileFormatError(
+                f"Unexpected number of elements found: got {ielement} "
+                f"elements but expected {element_count}")
+
+        return blocks
+
+    # }}}
+
+
+def _get_gmsh_version(filename) -> str | None:
+    with open(filename, "rb") as inf:
+        if inf.readline().strip() != b"$MeshFormat":
+            return None
 
-        # compute facial adjacency for Mesh if there is tag information
-        facial_adjacency_groups = None
-        if is_conforming and self.tags:
-            from meshmode.mesh import _compute_facial_adjacency_from_vertices
-            facial_adjacency_groups = _compute_facial_adjacency_from_vertices(
-                    groups, np.int32, np.int8, face_vertex_indices_to_tags)
+        return inf.readline().split()[0].decode()
 
-        mesh = make_mesh(
-                vertices, groups,
-                is_conforming=is_conforming,
-                facial_adjacency_groups=facial_adjacency_groups,
-                **self.mesh_construction_kwargs)
 
-        return (mesh, tag_to_elements) if return_tag_to_elements_map else mesh
+def _read_gmsh_v4(
+        filename, force_ambient_dim=None, mesh_construction_kwargs=None,
+        return_tag_to_elements_map=False):
+    """Read a Gmsh 4.1 (binary or ASCII) mesh file. Node and element blocks
+    are read into arrays in bulk, without creating Python objects for
+    individual nodes or elements. The result is the same as for
+    :class:`GmshMeshReceiver`.
+    """
+    import mmap
+    from warnings import warn
+
+    from gmsh_interop.reader import GmshFileFormatError
+
+    if mesh_construction_kwargs is None:
+        mesh_construction_kwargs = {}
+
+    physical_names = {}
+    entity_to_physical_tags = {}
+    node_tags = points = None
+    element_blocks = []
+
+    with (open(filename, "rb") as inf,
+            mmap.mmap(inf.fileno(), 0, access=mmap.ACCESS_READ) as buf):
+        parser = _Gmsh4Parser(buf)
+
+        while parser.has_next_section():
+            next_line = parser.read_line()
+            if not next_line.startswith("$"):
+                raise GmshFileFormatError(
+                    f"Expected start of section: found '{next_line}'")
+
+            section_name = next_line[1:]
+
+            if section_name == "MeshFormat":
+                parser.read_mesh_format()
+                parser.end_section(section_name)
+
+            elif section_name == "PhysicalNames":
+                physical_names = parser.read_physical_names()
+                parser.end_section(section_name)
+
+            elif section_name in ["Entities", "Nodes", "Elements"]:
+                parser.begin_section(section_name)
+                if section_name == "Entities":
+                    entity_to_physical_tags = parser.read_entities()
+                elif section_name == "Nodes":
+                    node_tags, points = parser.read_nodes()
+                else:
+                    element_blocks = [
+                        (el_type, entity, el_tags, el_node_tags.astype(np.int64))
+                        for el_type, entity, el_tags, el_node_tags
+                        in parser.read_elements(
+                            GmshMeshReceiver.gmsh_element_type_to_info_map)]
+                parser.end_section(section_name)
+
+            else:
+                if section_name not in ["PartitionedEntities", "Periodic",
+                        "GhostElements", "Parametrizations", "NodeData",
+                        "ElementData", "ElementNodeData", "InterpolationScheme"]:
+                    warn(f"Unrecognized section '{section_name}' in Gmsh file",
+                         stacklevel=3)
+
+                parser.skip_section(section_name)
+
+        # make sure no views into the mapped file survive
+        del parser
+
+    if not element_blocks:
+        raise RuntimeError("empty mesh in gmsh input")
+
+    if node_tags is None:
+        raise GmshFileFormatError("no nodes found in gmsh input")
+
+    # {{{ order nodes by tag
+
+    if force_ambient_dim is not None:
+        points = points[:, :force_ambient_dim]
+
+    min_node_tag = node_tags.min() if len(node_tags) else 1
+    if (len(node_tags)
+            and node_tags.max() - min_node_tag + 1 == len(node_tags)):
+        sorted_points = np.empty_like(points)
+        sorted_points[node_tags - min_node_tag] = points
+        sorted_node_tags = None
+    else:
+        node_order = np.argsort(node_tags, kind="stable")
+        sorted_points = points[node_order]
+        sorted_node_tags = node_tags[node_order]
+        if np.any(sorted_node_tags[1:] == sorted_node_tags[:-1]):
+            raise GmshFileFormatError("duplicate node tags found")
+
+    del points
+
+    def node_tags_to_indices(tags):
+        if sorted_node_tags is None:
+            indices = tags - min_node_tag
+            is_valid = (indices >= 0) & (indices < len(node_tags))
+        else:
+            indices = np.searchsorted(sorted_node_tags, tags)
+            is_valid = indices < len(sorted_node_tags)
+            is_valid[is_valid] = sorted_node_tags[indices[is_valid]] == tags[is_valid]
+
+        if not is_valid.all():
+            raise GmshFileFormatError("element refers to unknown node tag")
+
+        return indices
+
+    vertices = np.asarray(sorted_points.T, dtype=np.float64, order="C")
+    del sorted_points
+
+    # }}}
+
+    def get_entity_tag_names(entity):
+        return [physical_names[entity[0], tag]
+                for tag in entity_to_physical_tags.get(entity, [])
+                if (entity[0], tag) in physical_names]
+
+    mesh_bulk_dim = max(el_type.dimensions for el_type, _, _, _ in element_blocks)
+
+    # {{{ boundary tags
+
+    face_vertex_indices_to_tags = {}
+    for el_type, entity, _, el_node_tags in element_blocks:
+        if el_type.dimensions != mesh_bulk_dim - 1:
+            continue
+
+        el_tags = get_entity_tag_names(entity)
+        if not el_tags:
+            continue
+
+        face_vertex_indices = node_tags_to_indices(
+                el_node_tags[:, :el_type.vertex_count()])
+        for fvi in face_vertex_indices.tolist():
+            face_vertex_indices_to_tags.setdefault(frozenset(fvi), []).extend(el_tags)
+
+    # }}}
+
+    # {{{ build groups
+
+    # Elements are numbered by their tag, as in the v2 format, so groups
+    # appear in the order of the first element of their type.
+    el_type_to_blocks = {}
+    for block in sorted(
+            (block for block in element_blocks
+                if block[0].dimensions == mesh_bulk_dim),
+            key=lambda block: block[2].min(initial=np.iinfo(np.int64).max)):
+        el_type_to_blocks.setdefault(block[0], []).append(block)
+
+    del element_blocks
+
+    groups = []
+    tag_to_elements = {}
+    group_base_elem_nr = 0
+
+    for el_type, blocks in el_type_to_blocks.items():
+        el_tags = np.concatenate([el_tags for _, _, el_tags, _ in blocks])
+        el_node_indices = node_tags_to_indices(
+                np.concatenate([el_node_tags for _, _, _, el_node_tags in blocks]))
+        block_indices = np.repeat(
+                np.arange(len(blocks)),
+                [len(block_el_tags) for _, _, block_el_tags, _ in blocks])
+
+        if np.any(el_tags[1:] < el_tags[:-1]):
+            el_order = np.argsort(el_tags, kind="stable")
+            el_node_indices = el_node_indices[el_order]
+            block_indices = block_indices[el_order]
+
+        vertex_indices = el_node_indices[:, :el_type.vertex_count()].astype(np.int32)
+        nodes = vertices[
+                :, el_node_indices[:, el_type.get_lexicographic_gmsh_node_indices()]]
+        del el_node_indices
+
+        for iblock, (_, entity, _, _) in enumerate(blocks):
+            for tag in get_entity_tag_names(entity):
+                tag_to_elements.setdefault(tag, []).append(
+                        group_base_elem_nr + np.nonzero(block_indices == iblock)[0])
+
+        group = _make_group_from_gmsh_elements(
+                el_type, vertices, vertex_indices, nodes)
+        groups.append(group)
+
+        group_base_elem_nr += group.nelements
+
+    tag_to_elements = {
+        tag: np.sort(np.concatenate(elements)).astype(np.int32)
+        for tag, elements in tag_to_elements.items()}
+
+    # }}}
+
+    mesh = _make_mesh_from_gmsh_groups(
+            vertices, groups, mesh_bulk_dim, len(el_type_to_blocks),
+            face_vertex_indices_to_tags if physical_names else None,
+            mesh_construction_kwargs)
+
+    return (mesh, tag_to_elements) if return_tag_to_elements_map else mesh
 
 # }}}
 
@@ -294,7 +761,22 @@ def read_gmsh(
         a :class:`dict` that maps each volume tag in the gmsh file to a
         :class:`numpy.ndarray` containing meshwide indices of the elements that
         belong to that volume.
+
+    Files in the Gmsh 4.1 format, both ASCII and binary, are read in bulk
+    directly into arrays (binary files are memory-mapped), which is much
+    faster and uses less memory for large meshes. Files in the 2.x format
+    are read through :mod:`gmsh_interop`.
+
+    .. versionchanged:: 2024.1
+
+        Support for the Gmsh 4.1 format was added.
     """
+    if (_get_gmsh_version(filename) or "").startswith("4."):
+        return _read_gmsh_v4(filename,
+                force_ambient_dim=force_ambient_dim,
+                mesh_construction_kwargs=mesh_construction_kwargs,
+                return_tag_to_elements_map=return_tag_to_elements_map)
+
     from gmsh_interop.reader import read_gmsh
     recv = GmshMeshReceiver(mesh_construction_kwargs=mesh_construction_kwargs)
     read_gmsh(recv, filename, force_dimension=force_ambient_dim)
@@ -476,4 +958,272 @@ def to_json(mesh: Mesh) -> dict:
 # }}}
 
 
+# {{{ binary mesh format
+
+# VERSION 1:
+# - initial version
+_MESH_FORMAT_NAME = "meshmode-mesh"
+_MESH_FORMAT_VERSION = 1
+_MESH_MANIFEST_NAME = "manifest.json"
+_MESH_GROUP_TYPES = (SimplexElementGroup, TensorProductElementGroup)
+
+
+def _boundary_tag_to_json(tag):
+    from meshmode.mesh import BTAG_PARTITION, SYSTEM_TAGS
+
+    if isinstance(tag, str):
+        return {"str": tag}
+    elif isinstance(tag, int) and not isinstance(tag, bool):
+        return {"int": tag}
+    elif isinstance(tag, tuple):
+        return {"tuple": [_boundary_tag_to_json(subtag) for subtag in tag]}
+    elif isinstance(tag, type) and tag in SYSTEM_TAGS:
+        return {"btag": tag.__name__}
+    elif type(tag) is BTAG_PARTITION:
+        return {"partition": _boundary_tag_to_json(tag.part_id)}
+    else:
+        # NOTE: other tags could only be stored by pickling, which would
+        # allow reading a mesh to execute arbitrary code
+        raise TypeError(
+            f"unsupported boundary tag type: '{type(tag).__name__}' "
+            "(only strings, integers, tuples, system tags and "
+            "BTAG_PARTITION are supported)")
+
+
+def _boundary_tag_from_json(data):
+    import meshmode.mesh as mm
+
+    (kind, value), = data.items()
+    if kind in ("str", "int"):
+        return value
+    elif kind == "tuple":
+        return tuple(_boundary_tag_from_json(subtag) for subtag in value)
+    elif kind == "btag":
+        try:
+            return {tag.__name__: tag for tag in mm.SYSTEM_TAGS}[value]
+        except KeyError:
+            raise ValueError(f"unknown system boundary tag: '{value}'") from None
+    elif kind == "partition":
+        return mm.BTAG_PARTITION(_boundary_tag_from_json(value))
+    else:
+        raise ValueError(f"unknown boundary tag kind: '{kind}'")
+
+
+def write_mesh(mesh: Mesh, dirname: str, *, overwrite: bool = False) -> None:
+    """Write *mesh* to the directory *dirname* in a binary format that can be
+    read back by :func:`read_mesh`.
+
+    Each array of the mesh (vertices, group nodes and vertex indices, and the
+    adjacency data) is stored in a separate ``.npy`` file. The remaining data
+    is stored in a versioned JSON manifest. Adjacency information is only
+    stored if it is already available on *mesh*, i.e. it is not computed for
+    the purpose of writing.
+
+    Only :class:`~meshmode.mesh.SimplexElementGroup` and
+    :class:`~meshmode.mesh.TensorProductElementGroup` element groups and
+    boundary tags that are strings, integers, tuples of these, system tags
+    (e.g. :class:`~meshmode.mesh.BTAG_ALL`) or
+    :class:`~meshmode.mesh.BTAG_PARTITION` are supported. No data is stored
+    in a form that can execute code when the mesh is read.
+
+    :arg overwrite: if *True*, files in an existing *dirname* are replaced.
+        Otherwise, a :exc:`FileExistsError` is raised if *dirname* exists.
+
+    .. versionadded:: 2024.1
+    """
+    import json
+    import os
+    from dataclasses import fields
+
+    from meshmode.mesh import FacialAdjacencyGroup, NodalAdjacency
+    from meshmode.mesh.tools import AffineMap
+
+    os.makedirs(dirname, exist_ok=overwrite)
+
+    def save_array(name, ary):
+        if ary is None:
+            return None
+
+        filename = f"{name}.npy"
+        np.save(os.path.join(dirname, filename), ary, allow_pickle=False)
+        return filename
+
+    def group_to_json(igrp, group):
+        if type(group) not in _MESH_GROUP_TYPES:
+            raise TypeError(
+                f"unsupported element group type: '{type(group).__name__}'")
+
+        return {
+            "type": type(group).__name__,
+            "order": group.order,
+            "dim": group.dim,
+            "vertex_indices": save_array(
+                f"group{igrp}_vertex_indices", group.vertex_indices),
+            "nodes": save_array(f"group{igrp}_nodes", group.nodes),
+            "unit_nodes": save_array(f"group{igrp}_unit_nodes", group.unit_nodes),
+            }
+
+    def fagrp_to_json(igrp, ifagrp, fagrp):
+        assert isinstance(fagrp, FacialAdjacencyGroup)
+
+        result = {"type": type(fagrp).__name__}
+        for f in fields(fagrp):
+            value = getattr(fagrp, f.name)
+            if isinstance(value, np.ndarray):
+                value = save_array(f"facial_adjacency{igrp}_{ifagrp}_{f.name}", value)
+            elif isinstance(value, AffineMap):
+                value = {
+                    name: None if ary is None else {
+                        "data": ary.tolist(), "dtype": ary.dtype.str}
+                    for name, ary in [
+                        ("matrix", value.matrix), ("offset", value.offset)]}
+            elif f.name in ("boundary_tag", "part_id"):
+                value = _boundary_tag_to_json(value)
+            elif isinstance(value, np.integer):
+                value = int(value)
+
+            result[f.name] = value
+
+        return result
+
+    nodal_adjacency = mesh._nodal_adjacency
+    if isinstance(nodal_adjacency, NodalAdjacency):
+        nodal_adjacency = {
+            "neighbors_starts": save_array(
+                "nodal_adjacency_neighbors_starts", nodal_adjacency.neighbors_starts),
+            "neighbors": save_array(
+                "nodal_adjacency_neighbors", nodal_adjacency.neighbors),
+            }
+
+    facial_adjacency_groups = mesh._facial_adjacency_groups
+    if facial_adjacency_groups:
+        facial_adjacency_groups = [
+            [fagrp_to_json(igrp, ifagrp, fagrp)
+                for ifagrp, fagrp in enumerate(fagrps)]
+            for igrp, fagrps in enumerate(facial_adjacency_groups)]
+
+    manifest = {
+        "format": _MESH_FORMAT_NAME,
+        "version": _MESH_FORMAT_VERSION,
+        "vertices": save_array("vertices", mesh.vertices),
+        "groups": [group_to_json(igrp, group)
+                   for igrp, group in enumerate(mesh.groups)],
+        "nodal_adjacency": nodal_adjacency,
+        "facial_adjacency_groups": facial_adjacency_groups,
+        "is_conforming": mesh.is_conforming,
+        "vertex_id_dtype": mesh.vertex_id_dtype.str,
+        "element_id_dtype": mesh.element_id_dtype.str,
+        "face_id_dtype": mesh.face_id_dtype.str,
+        }
+
+    # NOTE: the manifest is written last, so that an interrupted write does
+    # not leave behind something that looks like a valid mesh
+    with open(os.path.join(dirname, _MESH_MANIFEST_NAME), "w") as outf:
+        json.dump(manifest, outf, indent=1)
+
+
+def read_mesh(dirname: str, *, mmap: bool = True) -> Mesh:
+    """Read a mesh written by :func:`write_mesh` from the directory *dirname*.
+
+    :arg mmap: if *True*, the arrays of the mesh are memory-mapped
+        read-only from their files, so that their data is only read from
+        disk once it is accessed (e.g. when only a subset of the element
+        groups is used).
+
+    .. versionadded:: 2024.1
+    """
+    import json
+    import os
+
+    import meshmode.mesh as mm
+    from meshmode.mesh.tools import AffineMap
+
+    with open(os.path.join(dirname, _MESH_MANIFEST_NAME)) as inf:
+        manifest = json.load(inf)
+
+    if manifest.get("format") != _MESH_FORMAT_NAME:
+        raise ValueError(f"'{dirname}' does not contain a meshmode mesh")
+
+    if manifest["version"] > _MESH_FORMAT_VERSION:
+        raise ValueError(
+            f"unsupported mesh format version: {manifest['version']} "
+            f"(expected at most {_MESH_FORMAT_VERSION})")
+
+    def load_array(filename):
+        if filename is None:
+            return None
+
+        return np.load(os.path.join(dirname, filename),
+                mmap_mode="r" if mmap else None, allow_pickle=False)
+
+    def group_from_json(data):
+        try:
+            cls = {cls.__name__: cls for cls in _MESH_GROUP_TYPES}[data["type"]]
+        except KeyError:
+            raise ValueError(
+                f"unsupported element group type: '{data['type']}'") from None
+
+        return cls.make_group(
+                order=data["order"],
+                vertex_indices=load_array(data["vertex_indices"]),
+                nodes=load_array(data["nodes"]),
+                unit_nodes=load_array(data["unit_nodes"]),
+                dim=data["dim"])
+
+    def fagrp_from_json(data):
+        fagrp_type = data.pop("type")
+        try:
+            cls = {
+                cls.__name__: cls for cls in (
+                    mm.FacialAdjacencyGroup, mm.InteriorAdjacencyGroup,
+                    mm.NonconformingInteriorAdjacencyGroup,
+                    mm.BoundaryAdjacencyGroup, mm.InterPartAdjacencyGroup)
+                }[fagrp_type]
+        except KeyError:
+            raise ValueError(
+                f"unsupported facial adjacency group type: '{fagrp_type}'"
+                ) from None
+
+        kwargs = {}
+        for name, value in data.items():
+            if name in ("boundary_tag", "part_id"):
+                value = _boundary_tag_from_json(value)
+            elif name == "aff_map":
+                value = AffineMap(**{
+                    name: None if ary is None else np.array(
+                        ary["data"], dtype=np.dtype(ary["dtype"]))
+                    for name, ary in value.items()})
+            elif isinstance(value, str):
+                value = load_array(value)
+
+            kwargs[name] = value
+
+        return cls(**kwargs)
+
+    nodal_adjacency = manifest["nodal_adjacency"]
+    if nodal_adjacency:
+        nodal_adjacency = mm.NodalAdjacency(
+                neighbors_starts=load_array(nodal_adjacency["neighbors_starts"]),
+                neighbors=load_array(nodal_adjacency["neighbors"]))
+
+    facial_adjacency_groups = manifest["facial_adjacency_groups"]
+    if facial_adjacency_groups:
+        facial_adjacency_groups = tuple(
+            tuple(fagrp_from_json(fagrp) for fagrp in fagrps)
+            for fagrps in facial_adjacency_groups)
+
+    return Mesh(
+            vertices=load_array(manifest["vertices"]),
+            groups=tuple(group_from_json(group) for group in manifest["groups"]),
+            is_conforming=manifest["is_conforming"],
+            vertex_id_dtype=np.dtype(manifest["vertex_id_dtype"]),
+            element_id_dtype=np.dtype(manifest["element_id_dtype"]),
+            face_id_dtype=np.dtype(manifest["face_id_dtype"]),
+            _nodal_adjacency=nodal_adjacency,
+            _facial_adjacency_groups=facial_adjacency_groups,
+            factory_constructed=True)
+
+# }}}
+
+
 # vim: foldmethod=marker
@@ -22,7 +22,7 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 THE SOFTWARE.
 """
 
-from collections.abc import Callable, Mapping, Sequence
+from collections.abc import Callable, Iterator, Mapping, Sequence
 from dataclasses import dataclass, replace
 from functools import reduce
 from typing import Any, Literal
@@ -32,6 +32,7 @@ import numpy.linalg as la
 
 import modepy as mp
 
+from meshmode.instrumentation import annotate_stage, setup_stage
 from meshmode.mesh import (
     BTAG_PARTITION,
     BoundaryAdjacencyGroup,
@@ -40,12 +41,18 @@ from meshmode.mesh import (
     InterPartAdjacencyGroup,
     Mesh,
     MeshElementGroup,
+    NonconformingInteriorAdjacencyGroup,
     PartID,
     TensorProductElementGroup,
     _FaceIDs,
     make_mesh,
 )
-from meshmode.mesh.tools import AffineMap, find_point_permutation
+from meshmode.mesh.tools import (
+    AffineMap,
+    _pickle_with_out_of_band_arrays,
+    _unpickle_with_out_of_band_arrays,
+    find_point_permutation,
+)
 
 
 __doc__ = """
@@ -53,6 +60,7 @@ __doc__ = """
 
 .. autofunction:: find_group_indices
 .. autofunction:: partition_mesh
+.. autofunction:: generate_mesh_parts
 .. autofunction:: find_volume_mesh_element_orientations
 .. autofunction:: flip_element_group
 .. autofunction:: perform_flips
@@ -451,23 +459,17 @@ def _create_boundary_groups(
     return bdry_adj_groups
 
 
-def _get_mesh_part(
+def _get_part_index_maps(
         mesh: Mesh,
         part_id_to_elements: Mapping[PartID, np.ndarray],
-        self_part_id: PartID) -> Mesh:
+        ) -> tuple[Mapping[PartID, int], np.ndarray]:
     """
-    :arg mesh: A :class:`~meshmode.mesh.Mesh` to be partitioned.
-    :arg part_id_to_elements: A :class:`dict` mapping a part identifier to
-        a sorted :class:`numpy.ndarray` of elements.
-    :arg self_part_id: The part identifier of the mesh to return.
-
-    :returns: A :class:`~meshmode.mesh.Mesh` containing a part of *mesh*.
+    Check that *part_id_to_elements* is a valid partition of *mesh* and
+    compute the mappings needed by :func:`_build_mesh_part`.
 
-    .. versionadded:: 2017.1
+    :returns: a tuple ``(part_id_to_part_index, global_elem_to_part_elem)``. See
+        :func:`_compute_global_elem_to_part_elem` for details.
     """
-    if mesh.vertices is None:
-        raise ValueError("Mesh must have vertices")
-
     element_counts = np.zeros(mesh.nelements)
     for elements in part_id_to_elements.values():
         element_counts[elements] += 1
@@ -484,6 +486,24 @@ def _get_mesh_part(
         mesh.nelements, part_id_to_elements, part_id_to_part_index,
         mesh.element_id_dtype)
 
+    return part_id_to_part_index, global_elem_to_part_elem
+
+
+def _build_mesh_part(
+        mesh: Mesh,
+        part_id_to_elements: Mapping[PartID, np.ndarray],
+        part_id_to_part_index: Mapping[PartID, int],
+        global_elem_to_part_elem: np.ndarray,
+        self_part_id: PartID) -> Mesh:
+    """
+    :arg part_id_to_part_index: see :func:`_get_part_index_maps`.
+    :arg global_elem_to_part_elem: see :func:`_get_part_index_maps`.
+
+    :returns: A :class:`~meshmode.mesh.Mesh` containing a part of *mesh*.
+    """
+    if mesh.vertices is None:
+        raise ValueError("Mesh must have vertices")
+
     # Create new mesh groups that mimic the original mesh's groups but only contain
     # the current part's elements
     self_mesh_groups, required_vertex_indices = _filter_mesh_groups(
@@ -535,16 +555,188 @@ def _get_mesh_part(
             is_conforming=mesh.is_conforming)
 
 
+def _get_mesh_part(
+        mesh: Mesh,
+        part_id_to_elements: Mapping[PartID, np.ndarray],
+        self_part_id: PartID) -> Mesh:
+    """
+    :arg mesh: A :class:`~meshmode.mesh.Mesh` to be partitioned.
+    :arg part_id_to_elements: A :class:`dict` mapping a part identifier to
+        a sorted :class:`numpy.ndarray` of elements.
+    :arg self_part_id: The part identifier of the mesh to return.
+
+    :returns: A :class:`~meshmode.mesh.Mesh` containing a part of *mesh*.
+
+    .. versionadded:: 2017.1
+    """
+    if mesh.vertices is None:
+        raise ValueError("Mesh must have vertices")
+
+    part_id_to_part_index, global_elem_to_part_elem = _get_part_index_maps(
+        mesh, part_id_to_elements)
+
+    return _build_mesh_part(
+        mesh, part_id_to_elements, part_id_to_part_index, global_elem_to_part_elem,
+        self_part_id)
+
+
+# {{{ shared-memory process pool
+
+# Arrays smaller than this are pickled along with the rest of the object
+# instead of being placed in shared memory.
+_SHARED_ARRAY_MIN_NBYTES = 4096
+
+# Per-process state of the partitioning workers, see _init_partition_worker.
+_partition_worker_state: dict[str, Any] = {}
+
+
+@dataclass(frozen=True)
+class _SharedArrayDescriptor:
+    offset: int
+    shape: tuple[int, ...]
+    dtype: np.dtype
+
+
+def _copy_to_shared_memory(
+        arrays: Sequence[np.ndarray], alignment: int = 64,
+        ) -> tuple[Any, list[_SharedArrayDescriptor]]:
+    """Copy *arrays* into a newly created
+    :class:`multiprocessing.shared_memory.SharedMemory` segment.
+
+    :returns: a tuple ``(shm, descriptors)``. The caller is responsible for
+        closing and unlinking *shm*.
+    """
+    from multiprocessing.shared_memory import SharedMemory
+
+    descriptors = []
+    offset = 0
+    for ary in arrays:
+        descriptors.append(
+            _SharedArrayDescriptor(offset=offset, shape=ary.shape, dtype=ary.dtype))
+        offset += -(-ary.nbytes // alignment) * alignment
+
+    shm = SharedMemory(create=True, size=max(offset, 1))
+    for ary, desc in zip(arrays, descriptors, strict=True):
+        shared_ary: np.ndarray = np.ndarray(
+            desc.shape, dtype=desc.dtype, buffer=shm.buf, offset=desc.offset)
+        shared_ary[...] = ary
+        del shared_ary
+
+    return shm, descriptors
+
+
+def _init_partition_worker(
+        shm_name: str,
+        pickled_state: bytes,
+        descriptors: Sequence[_SharedArrayDescriptor]) -> None:
+    from multiprocessing.shared_memory import SharedMemory
+
+    shm = SharedMemory(name=shm_name)
+
+    arrays = []
+    for desc in descriptors:
+        ary: np.ndarray = np.ndarray(
+            desc.shape, dtype=desc.dtype, buffer=shm.buf, offset=desc.offset)
+        ary.flags.writeable = False
+        arrays.append(ary)
+
+    _partition_worker_state["shm"] = shm
+    _partition_worker_state["args"] = _unpickle_with_out_of_band_arrays(
+        pickled_state, arrays)
+
+
+def _build_mesh_part_in_worker(part_id: PartID) -> tuple[PartID, Mesh]:
+    return part_id, _build_mesh_part(*_partition_worker_state["args"], part_id)
+
+# }}}
+
+
+def generate_mesh_parts(
+        mesh: Mesh,
+        part_id_to_elements: Mapping[PartID, np.ndarray],
+        return_parts: Sequence[PartID] | None = None,
+        *,
+        max_workers: int | None = None,
+        ) -> Iterator[tuple[PartID, Mesh]]:
+    """Build the parts of *mesh* one by one, yielding each part as soon as it
+    is ready. See :func:`partition_mesh` for the meaning of the arguments.
+
+    :arg max_workers: if not *None*, parts are built concurrently in a
+        :class:`concurrent.futures.ProcessPoolExecutor` with this many
+        processes. The large arrays of *mesh* (and of the partitioning) are
+        placed in shared memory once, so that they are not pickled for each
+        part, and parts are yielded in the order in which they complete.
+        Otherwise, parts are built serially in the order of *return_parts*.
+
+    :returns: an iterator over tuples ``(part_id, part_mesh)``.
+    """
+    if mesh.vertices is None:
+        raise ValueError("Mesh must have vertices")
+
+    if any(
+            isinstance(fagrp, NonconformingInteriorAdjacencyGroup)
+            for fagrp_list in mesh.facial_adjacency_groups
+            for fagrp in fagrp_list):
+        raise NotImplementedError(
+            "partitioning meshes with hanging faces is not supported")
+
+    if return_parts is None:
+        return_parts = list(part_id_to_elements.keys())
+
+    part_id_to_part_index, global_elem_to_part_elem = _get_part_index_maps(
+        mesh, part_id_to_elements)
+
+    if max_workers is None:
+        for part_id in return_parts:
+            yield part_id, _build_mesh_part(
+                mesh, part_id_to_elements, part_id_to_part_index,
+                global_elem_to_part_elem, part_id)
+
+        return
+
+    # NOTE: make sure the workers do not each compute the adjacency themselves
+    _ = mesh.facial_adjacency_groups
+
+    pickled_state, arrays = _pickle_with_out_of_band_arrays(
+        (mesh, part_id_to_elements, part_id_to_part_index, global_elem_to_part_elem),
+        min_nbytes=_SHARED_ARRAY_MIN_NBYTES)
+    shm, descriptors = _copy_to_shared_memory(arrays)
+    del arrays
+
+    try:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_partition_worker,
+                initargs=(shm.name, pickled_state, descriptors)) as executor:
+            futures = [
+                executor.submit(_build_mesh_part_in_worker, part_id)
+                for part_id in return_parts]
+
+            for future in as_completed(futures):
+                yield future.result()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+@setup_stage("partition_mesh")
 def partition_mesh(
         mesh: Mesh,
         part_id_to_elements: Mapping[PartID, np.ndarray],
-        return_parts: Sequence[PartID] | None = None) -> Mapping[PartID, Mesh]:
+        return_parts: Sequence[PartID] | None = None,
+        *,
+        max_workers: int | None = None,
+        ) -> Mapping[PartID, Mesh]:
     """
     :arg mesh: A :class:`~meshmode.mesh.Mesh` to be partitioned.
     :arg part_id_to_elements: A :class:`dict` mapping a part identifier to
         a sorted :class:`numpy.ndarray` of elements.
     :arg return_parts: An optional list of parts to return. By default, returns all
         parts.
+    :arg max_workers: An optional number of processes used to build the parts
+        concurrently. See :func:`generate_mesh_parts`.
 
     :returns: A :class:`dict` mapping part identifiers to instances of
         :class:`~meshmode.mesh.Mesh` that represent the corresponding part of
@@ -553,9 +745,12 @@ def partition_mesh(
     if return_parts is None:
         return_parts = list(part_id_to_elements.keys())
 
-    return {
-        part_id: _get_mesh_part(mesh, part_id_to_elements, part_id)
-        for part_id in return_parts}
+    annotate_stage(nelements=mesh.nelements, nparts=len(return_parts))
+
+    parts = dict(generate_mesh_parts(
+        mesh, part_id_to_elements, return_parts, max_workers=max_workers))
+
+    return {part_id: parts[part_id] for part_id in return_parts}
 
 # }}}
 
@@ -1022,32 +1217,140 @@ def split_mesh_groups(
 
 # {{{ vertex matching
 
+def _match_vertices_grid(
+        mapped_src_vertices: np.ndarray,
+        tgt_vertices: np.ndarray,
+        tol: float) -> np.ndarray:
+    r"""Match each vertex in *mapped_src_vertices* to the closest vertex in
+    *tgt_vertices* that is within a box of half-width *tol* around it.
+
+    The target vertices are hashed by quantizing their coordinates on a grid
+    with a cell size of at least *tol*, so that all the matches of a source
+    vertex are in the :math:`3^d` cells around its own. Everything is
+    vectorized, with an overall cost of :math:`O(n \log n)`.
+
+    :returns: an array with the index of the matched target vertex (or *-1*)
+        for each source vertex.
+    """
+    ambient_dim, nsrc_vertices = mapped_src_vertices.shape
+    matched_tgt_vertices = np.full(nsrc_vertices, -1)
+    if nsrc_vertices == 0 or tgt_vertices.shape[1] == 0:
+        return matched_tgt_vertices
+
+    # {{{ hash target vertices
+
+    origin = np.min(tgt_vertices, axis=1, keepdims=True) - tol
+    extent = np.max(tgt_vertices, axis=1, keepdims=True) + tol - origin
+
+    # NOTE: cells smaller than this would overflow the integer coordinates
+    cell_size = max(tol, float(np.max(extent)) / 2**40)
+
+    def get_cells(vertices):
+        # NOTE: vertices far outside the grid cannot match anything, so they
+        # are clipped to avoid overflowing the integer coordinates
+        cells = np.clip(np.floor((vertices - origin) / cell_size), -2, 2**41)
+        return cells.astype(np.int64)
+
+    def get_keys(cells):
+        # NOTE: this can wrap around and produce hash collisions, which only
+        # result in extra candidates that are rejected below
+        primes = np.array([73856093, 19349663, 83492791], dtype=np.uint64)
+        keys = np.zeros(cells.shape[1], dtype=np.uint64)
+        for iaxis in range(ambient_dim):
+            keys ^= cells[iaxis].astype(np.uint64) * primes[iaxis % 3]
+
+        return keys
+
+    tgt_keys = get_keys(get_cells(tgt_vertices))
+    tgt_order = np.argsort(tgt_keys, kind="stable")
+    tgt_keys = tgt_keys[tgt_order]
+
+    # }}}
+
+    # {{{ gather candidates from neighboring cells
+
+    from itertools import product
+
+    from meshmode.mesh.tools import _expand_ranges
+
+    src_cells = get_cells(mapped_src_vertices)
+
+    src_indices = []
+    tgt_indices = []
+    for offset in product((-1, 0, 1), repeat=ambient_dim):
+        keys = get_keys(src_cells + np.array(offset).reshape(-1, 1))
+        starts = np.searchsorted(tgt_keys, keys, side="left")
+        counts = np.searchsorted(tgt_keys, keys, side="right") - starts
+
+        src_indices.append(np.repeat(np.arange(nsrc_vertices), counts))
+        tgt_indices.append(tgt_order[_expand_ranges(starts, counts)])
+
+    src_indices = np.concatenate(src_indices)
+    tgt_indices = np.concatenate(tgt_indices)
+
+    # }}}
+
+    # {{{ pick closest candidate in tolerance
+
+    displacements = (
+        mapped_src_vertices[:, src_indices] - tgt_vertices[:, tgt_indices])
+    in_bbox = np.all(np.abs(displacements) <= tol, axis=0)
+
+    src_indices = src_indices[in_bbox]
+    tgt_indices = tgt_indices[in_bbox]
+    distances_sq = np.sum(displacements[:, in_bbox]**2, axis=0)
+
+    order = np.lexsort((distances_sq, src_indices))
+    src_indices = src_indices[order]
+    tgt_indices = tgt_indices[order]
+
+    _, first = np.unique(src_indices, return_index=True)
+    matched_tgt_vertices[src_indices[first]] = tgt_indices[first]
+
+    # }}}
+
+    return matched_tgt_vertices
+
+
 def _match_vertices(
         mesh: Mesh,
         src_vertex_indices: np.ndarray,
         tgt_vertex_indices: np.ndarray, *,
         aff_map: AffineMap | None = None,
         tol: float = 1e-12,
-        use_tree: bool | None = None) -> np.ndarray:
+        use_tree: bool | None = None,
+        method: Literal["dense", "tree", "grid"] | None = None) -> np.ndarray:
     if mesh.vertices is None:
         raise ValueError("Mesh must have vertices")
 
     if aff_map is None:
         aff_map = AffineMap()
 
-    if use_tree is None:
-        # Empirically, the tree version becomes faster at 2**13.
-        # The temporary (displacements) below at that size requires
-        # 1.6GB, which seems like a lot. Capping at 2**11 instead,
-        # which requires a more reasonable 100M.
-        use_tree = len(tgt_vertex_indices) >= 2**11
+    if use_tree is not None:
+        if method is not None:
+            raise ValueError("cannot pass both 'use_tree' and 'method'")
+
+        method = "tree" if use_tree else "dense"
+
+    if method is None:
+        # The temporary (displacements) in the dense version requires 100M
+        # at 2**11, so the vectorized grid version is used above that.
+        method = "grid" if len(tgt_vertex_indices) >= 2**11 else "dense"
 
     src_vertices = mesh.vertices[:, src_vertex_indices]
     tgt_vertices = mesh.vertices[:, tgt_vertex_indices]
 
     mapped_src_vertices = aff_map(src_vertices)
 
-    if use_tree:
+    if method == "grid":
+        matched_tgt_vertices = _match_vertices_grid(
+            mapped_src_vertices, tgt_vertices, tol)
+        matched_tgt_vertices = np.where(
+            matched_tgt_vertices >= 0,
+            tgt_vertex_indices[matched_tgt_vertices],
+            -1)
+
+    elif method == "tree":
         tgt_vertex_bboxes = np.stack((
             tgt_vertices - tol,
             tgt_vertices + tol))
@@ -1059,8 +1362,7 @@ def _match_vertices(
         for ivertex in range(len(tgt_vertex_indices)):
             tree.insert(ivertex, tgt_vertex_bboxes[:, :, ivertex])
 
-        matched_tgt_vertices: np.ndarray[tuple[int, ...], np.dtype[Any]] \
-            = np.full(len(src_vertex_indices), -1)
+        matched_tgt_vertices = np.full(len(src_vertex_indices), -1)
         for ivertex in range(len(src_vertex_indices)):
             mapped_src_vertex = mapped_src_vertices[:, ivertex]
             matches = np.array(list(tree.generate_matches(mapped_src_vertex)))
@@ -1079,10 +1381,10 @@ def _match_vertices(
             matched_tgt_vertices[ivertex] = (
                 tgt_vertex_indices[candidate_indices[np.argmin(distances_sq)]])
 
-    else:
+    elif method == "dense":
         displacements = (
-            mapped_src_vertices.reshape(mesh.dim, -1, 1)
-            - tgt_vertices.reshape(mesh.dim, 1, -1))
+            mapped_src_vertices.reshape(mesh.ambient_dim, -1, 1)
+            - tgt_vertices.reshape(mesh.ambient_dim, 1, -1))
         distances_sq = np.sum(displacements**2, axis=0)
 
         vertex_indices, = np.indices((len(src_vertex_indices),))
@@ -1094,6 +1396,9 @@ def _match_vertices(
             tgt_vertex_indices[min_distance_sq_indices],
             -1)
 
+    else:
+        raise ValueError(f"unknown vertex matching method: '{method}'")
+
     return matched_tgt_vertices
 
 # }}}
@@ -1171,7 +1476,9 @@ def _get_face_vertex_indices(mesh: Mesh, face_ids: _FaceIDs) -> np.ndarray:
 
 def _match_boundary_faces(
         mesh: Mesh, bdry_pair_mapping: BoundaryPairMapping, tol: float, *,
-        use_tree: bool | None = None) -> tuple[_FaceIDs, _FaceIDs]:
+        use_tree: bool | None = None,
+        method: Literal["dense", "tree", "grid"] | None = None,
+        ) -> tuple[_FaceIDs, _FaceIDs]:
     """
     Given a :class:`BoundaryPairMapping` *bdry_pair_mapping*, return the
     correspondence between faces of the two boundaries (expressed as a pair of
@@ -1184,6 +1491,7 @@ def _match_boundary_faces(
         the first boundary and the vertex coordinates of the second boundary.
     :arg use_tree: Optional argument indicating whether to use a spatial binary
         search tree or a (quadratic) numpy algorithm when matching vertices.
+    :arg method: see :func:`glue_mesh_boundaries`.
     :returns: A pair of :class:`meshmode.mesh._FaceIDs`, each having a number of
         entries equal to the number of faces in the boundary, that represents the
         correspondence between the two boundaries' faces. The first element in the
@@ -1219,7 +1527,8 @@ def _match_boundary_faces(
 
     matched_bdry_n_vertex_indices = _match_vertices(
         mesh, bdry_m_vertex_indices, bdry_n_vertex_indices,
-        aff_map=bdry_pair_mapping.aff_map, tol=tol, use_tree=use_tree)
+        aff_map=bdry_pair_mapping.aff_map, tol=tol,
+        use_tree=use_tree, method=method)
 
     unmatched_bdry_m_vertex_indices = bdry_m_vertex_indices[
         np.where(matched_bdry_n_vertex_indices < 0)[0]]
@@ -1273,7 +1582,8 @@ def _match_boundary_faces(
 def glue_mesh_boundaries(
         mesh: Mesh,
         bdry_pair_mappings_and_tols: Sequence[tuple[BoundaryPairMapping, float]], *,
-        use_tree: bool | None = None) -> Mesh:
+        use_tree: bool | None = None,
+        method: Literal["dense", "tree", "grid"] | None = None) -> Mesh:
     """
     Create a new mesh from *mesh* in which one or more pairs of boundaries are
     "glued" together such that the boundary surfaces become part of the interior
@@ -1293,6 +1603,16 @@ def glue_mesh_boundaries(
         unique (order-independent) pair of boundaries.
     :arg use_tree: Optional argument indicating whether to use a spatial binary
         search tree or a (quadratic) numpy algorithm when matching vertices.
+        Equivalent to passing ``method="tree"`` or ``method="dense"``.
+    :arg method: the algorithm used to match vertices. One of ``"dense"``
+        (quadratic in the number of vertices), ``"tree"`` (a spatial binary
+        search tree, queried one vertex at a time) or ``"grid"`` (a
+        vectorized hash of the quantized vertex coordinates). By default,
+        ``"dense"`` is used for small boundaries and ``"grid"`` otherwise.
+
+    .. versionchanged:: 2024.1
+
+        Added *method*.
     """
     if any(grp.vertex_indices is None for grp in mesh.groups):
         raise ValueError(
@@ -1320,7 +1640,8 @@ def glue_mesh_boundaries(
         glued_btag_pairs.add(btag_pair)
 
     face_id_pairs_for_mapping = [
-        _match_boundary_faces(mesh, mapping, tol, use_tree=use_tree)
+        _match_boundary_faces(mesh, mapping, tol,
+            use_tree=use_tree, method=method)
         for mapping, tol in bdry_pair_mappings_and_tols]
 
     facial_adjacency_groups = []
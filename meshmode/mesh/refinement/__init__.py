@@ -22,6 +22,8 @@ THE SOFTWARE.
 
 import logging
 
+from meshmode.mesh.refinement.adaptive import AdaptiveRefiner
+from meshmode.mesh.refinement.hierarchy import MeshHierarchy
 from meshmode.mesh.refinement.no_adjacency import RefinerWithoutAdjacency
 from meshmode.mesh.refinement.utils import Refiner
 
@@ -32,15 +34,33 @@ __doc__ = """
 .. autoclass:: Refiner
 .. autoclass :: RefinerWithoutAdjacency
 .. autofunction :: refine_uniformly
+.. autoclass:: MeshHierarchy
+.. autoclass:: AdaptiveRefiner
 """
 
 __all__ = [
+    "AdaptiveRefiner",
+    "MeshHierarchy",
     "Refiner",
     "RefinerWithoutAdjacency", "refine_uniformly"
 ]
 
 
 def refine_uniformly(mesh, iterations, with_adjacency=False):
+    """Refine all elements of *mesh* *iterations* times.
+
+    :returns: the refined :class:`~meshmode.mesh.Mesh`.
+
+    .. versionchanged:: 2024.1
+
+        The refined mesh is built directly from *mesh* using a
+        :class:`MeshHierarchy`. The elements are numbered as before (the
+        children of each element are contiguous), but the vertices of the
+        refined mesh are numbered differently than by repeated refinement
+        with :class:`RefinerWithoutAdjacency`. Use a
+        :class:`RefinerWithoutAdjacency` directly if the previous vertex
+        numbering is needed.
+    """
     if with_adjacency:
         # For conforming meshes, even RefinerWithoutAdjacency will reconstruct
         # adjacency from vertex identity.
@@ -48,12 +68,12 @@ def refine_uniformly(mesh, iterations, with_adjacency=False):
         if not mesh.is_conforming:
             raise ValueError("mesh must be conforming if adjacency is desired")
 
-    refiner = RefinerWithoutAdjacency(mesh)
-
-    for _ in range(iterations):
-        refiner.refine_uniformly()
+    if iterations == 0:
+        return mesh
 
-    return refiner.get_current_mesh()
+    # NOTE: this builds the refined mesh directly from the coarse mesh,
+    # without constructing any of the intermediate levels
+    return MeshHierarchy(mesh, iterations).get_mesh(iterations)
 
 
 # vim: foldmethod=marker
@@ -0,0 +1,1125 @@
+__copyright__ = "Copyright (C) 2024 Andreas Kloeckner"
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.linalg as la
+
+import modepy as mp
+
+from meshmode.mesh import (
+    BoundaryAdjacencyGroup,
+    InteriorAdjacencyGroup,
+    InterPartAdjacencyGroup,
+    Mesh,
+    ModepyElementGroup,
+    NonconformingInteriorAdjacencyGroup,
+)
+from meshmode.mesh.refinement.no_adjacency import RefinerWithoutAdjacency
+from meshmode.mesh.refinement.tessellate import (
+    ElementTessellationInfo,
+    get_group_tessellation_info,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# {{{ per-group tables
+
+@dataclass(frozen=True)
+class _GroupAdaptivityInfo:
+    el_tess_info: ElementTessellationInfo
+
+    # shape: (nfaces, nface_vertices)
+    face_vertex_indices: np.ndarray
+    # shape: (nchildren, nfaces), the face of the parent that contains the
+    # face of the child, or -1 if the face is in the interior of the parent
+    child_face_to_parent_face: np.ndarray
+
+    # affine maps from the reference coordinates of each child to the
+    # reference coordinates of its parent
+    # shape: (nchildren, dim, dim) and (nchildren, dim)
+    child_map_matrices: np.ndarray
+    child_map_offsets: np.ndarray
+
+    # affine maps from the reference coordinates of each face to the
+    # reference coordinates of the element, as in modepy.Face.map_to_volume
+    # shape: (nfaces, dim, dim - 1) and (nfaces, dim)
+    face_map_matrices: np.ndarray
+    face_map_offsets: np.ndarray
+
+    # shape: (nvertices, dim)
+    vertex_unit_coordinates: np.ndarray
+    # shape: (nvertices, nvertices), the inverse of the Vandermonde matrix of
+    # the (multi)linear basis at the vertices
+    vertex_inv_vdm: np.ndarray
+    vertex_basis: mp.Basis
+
+    # shape: (nunit_nodes,) and (nunit_nodes, nunit_nodes), a child that
+    # contains each unit node of the parent and the interpolation weights
+    # from the nodes of that child
+    parent_node_child_indices: np.ndarray
+    parent_node_resampling: np.ndarray
+
+
+def _get_affine_map_from_points(
+        ref_points: np.ndarray, points: np.ndarray) -> tuple[np.ndarray, ...]:
+    """
+    :arg ref_points: an array of shape ``(n, n + 1)`` of affinely independent
+        points.
+    :arg points: an array of shape ``(..., dim, n + 1)`` containing the
+        images of *ref_points*.
+    :returns: a tuple ``(matrices, offsets)`` of the corresponding affine maps.
+    """
+    n = ref_points.shape[0]
+    inv_ref_points = la.inv(np.concatenate([ref_points, np.ones((1, n + 1))]))
+
+    maps = points @ inv_ref_points
+    return maps[..., :n], maps[..., n]
+
+
+def _get_interior_points(shape: mp.Shape) -> np.ndarray:
+    """
+    :returns: an array of shape ``(dim, dim + 1)`` of affinely independent
+        points in the interior of the reference element of *shape*. Unlike
+        the vertices, these can be used with any basis.
+    """
+    centroid = np.mean(mp.unit_vertices_for_shape(shape), axis=1)
+    return centroid[:, np.newaxis] + 0.25 * np.concatenate(
+        [np.zeros((shape.dim, 1)), np.eye(shape.dim)], axis=1)
+
+
+def _get_reference_element_distance(
+        shape: mp.Shape, points: np.ndarray) -> np.ndarray:
+    """
+    :returns: a measure of how far *points* lie outside of the reference
+        element of *shape*, which is not positive for points inside of it.
+    """
+    if isinstance(shape, mp.Simplex):
+        return np.maximum(
+            np.max(-1 - points, axis=-2),
+            np.sum(points, axis=-2) - (2 - shape.dim))
+    elif isinstance(shape, mp.Hypercube):
+        return np.max(np.abs(points) - 1, axis=-2)
+    else:
+        raise TypeError(f"unsupported shape: {type(shape).__name__}")
+
+
+def _get_group_adaptivity_info(meg: ModepyElementGroup) -> _GroupAdaptivityInfo:
+    from meshmode.mesh.refinement.hierarchy import _get_lattice_vertex_weights
+    from meshmode.mesh.refinement.utils import map_unit_nodes_to_children
+
+    el_tess_info = get_group_tessellation_info(meg)
+    children = np.array(el_tess_info.children)
+    face_vertex_indices = np.array(meg.face_vertex_indices())
+
+    # {{{ find parent faces
+
+    # NOTE: a lattice point is on a face of the parent if the weights of all
+    # vertices that are not on the face vanish
+    weights = _get_lattice_vertex_weights(meg, el_tess_info, 1)
+    is_off_face = np.ones((meg.nfaces, meg.nvertices), dtype=bool)
+    is_off_face[np.arange(meg.nfaces)[:, np.newaxis], face_vertex_indices] = False
+
+    # shape: (nchildren, nfaces, nface_vertices, nvertices)
+    child_face_weights = weights[children[:, face_vertex_indices]]
+
+    # shape: (nchildren, nfaces, nparent_faces)
+    is_on_parent_face = np.all(
+        (child_face_weights[:, :, np.newaxis, :, :] == 0)
+        | ~is_off_face[np.newaxis, np.newaxis, :, np.newaxis, :],
+        axis=(-2, -1))
+    assert (np.sum(is_on_parent_face, axis=-1) <= 1).all()
+
+    child_face_to_parent_face = np.where(
+        is_on_parent_face.any(axis=-1),
+        np.argmax(is_on_parent_face, axis=-1),
+        -1)
+
+    # }}}
+
+    ref_points = _get_interior_points(meg.shape)
+    child_map_matrices, child_map_offsets = _get_affine_map_from_points(
+        ref_points,
+        np.array(list(map_unit_nodes_to_children(
+            meg, ref_points, el_tess_info))))
+
+    faces = mp.faces_for_shape(meg.shape)
+    face_ref_points = _get_interior_points(faces[0])
+    face_map_matrices, face_map_offsets = _get_affine_map_from_points(
+        face_ref_points,
+        np.array([face.map_to_volume(face_ref_points) for face in faces]))
+
+    vertex_basis = mp.basis_for_space(mp.space_for_shape(meg.shape, 1), meg.shape)
+    vertex_unit_coordinates = meg.vertex_unit_coordinates()
+
+    # {{{ find parent nodes in the children
+
+    # shape: (nchildren, dim, nunit_nodes)
+    child_unit_nodes = np.einsum(
+        "cij,cjn->cin",
+        la.inv(child_map_matrices),
+        meg.unit_nodes - child_map_offsets[:, :, np.newaxis])
+
+    parent_node_child_indices = np.argmin(
+        _get_reference_element_distance(meg.shape, child_unit_nodes), axis=0)
+    parent_node_resampling = mp.resampling_matrix(
+        mp.basis_for_space(meg.space, meg.shape).functions,
+        child_unit_nodes[
+            parent_node_child_indices, :, np.arange(meg.nunit_nodes)].T,
+        meg.unit_nodes)
+
+    # }}}
+
+    return _GroupAdaptivityInfo(
+        el_tess_info=el_tess_info,
+        face_vertex_indices=face_vertex_indices,
+        child_face_to_parent_face=child_face_to_parent_face,
+        child_map_matrices=child_map_matrices,
+        child_map_offsets=child_map_offsets,
+        face_map_matrices=face_map_matrices,
+        face_map_offsets=face_map_offsets,
+        vertex_unit_coordinates=vertex_unit_coordinates,
+        vertex_inv_vdm=la.inv(mp.vandermonde(
+            vertex_basis.functions, vertex_unit_coordinates.T)),
+        vertex_basis=vertex_basis,
+        parent_node_child_indices=parent_node_child_indices,
+        parent_node_resampling=parent_node_resampling)
+
+# }}}
+
+
+# {{{ face arrays
+
+@dataclass(frozen=True)
+class _FaceArray:
+    """A collection of element faces, given by their element group, the
+    element number within the group and the face index.
+    """
+
+    groups: np.ndarray
+    elements: np.ndarray
+    faces: np.ndarray
+
+    def __len__(self):
+        return len(self.elements)
+
+    def __getitem__(self, idx):
+        return _FaceArray(
+            groups=self.groups[idx],
+            elements=self.elements[idx],
+            faces=self.faces[idx])
+
+    @staticmethod
+    def concatenate(face_arrays):
+        return _FaceArray(
+            groups=np.concatenate([fa.groups for fa in face_arrays]),
+            elements=np.concatenate([fa.elements for fa in face_arrays]),
+            faces=np.concatenate([fa.faces for fa in face_arrays]))
+
+    @staticmethod
+    def empty():
+        return _FaceArray(
+            groups=np.empty(0, dtype=np.int64),
+            elements=np.empty(0, dtype=np.int64),
+            faces=np.empty(0, dtype=np.int64))
+
+# }}}
+
+
+# {{{ adaptive refiner
+
+class AdaptiveRefiner(RefinerWithoutAdjacency):
+    """A refiner for the local (adaptive) refinement of conforming meshes
+    that keeps track of the facial adjacency of the resulting non-conforming
+    meshes.
+
+    Faces of neighboring elements that match exactly are described by
+    :class:`~meshmode.mesh.InteriorAdjacencyGroup` instances. Faces that
+    only cover part of the face of their neighbor (because the neighbor was
+    refined fewer times) are described by
+    :class:`~meshmode.mesh.NonconformingInteriorAdjacencyGroup` instances,
+    which also contain the map between the reference coordinates of the
+    two faces.
+
+    The refiner keeps the tree of all elements created so far. The adjacency
+    is updated incrementally: only the faces of the new elements and of
+    their neighbors are matched up again on each call to :meth:`refine`
+    or :meth:`coarsen`.
+
+    Elements can also be merged back into their parents by :meth:`coarsen`,
+    which undoes (parts of) previous refinements.
+
+    .. attribute:: group_refinement_records
+
+        See :class:`RefinerWithoutAdjacency`.
+
+    .. attribute:: group_coarsening_records
+
+        A list of
+        :class:`~meshmode.mesh.refinement.tessellate.GroupRefinementRecord`
+        (one for each group of the current mesh) describing the last
+        coarsening, i.e. the elements of the previous mesh are the children
+        of the elements of the current mesh. This is *None* if the last
+        operation was a refinement.
+
+    .. automethod:: __init__
+    .. automethod:: refine
+    .. automethod:: coarsen
+    .. automethod:: get_element_levels
+
+    .. versionadded:: 2024.1
+    """
+
+    def __init__(self, mesh: Mesh) -> None:
+        """
+        :arg mesh: a conforming mesh. Periodic and distributed meshes (with
+            non-trivial :attr:`~meshmode.mesh.InteriorAdjacencyGroup.aff_map`
+            or :class:`~meshmode.mesh.InterPartAdjacencyGroup` instances)
+            are not supported.
+        """
+        if mesh.vertices is None:
+            raise ValueError("mesh must have vertices")
+
+        if not mesh.is_conforming:
+            raise ValueError("mesh must be conforming")
+
+        for grp in mesh.groups:
+            if not isinstance(grp, ModepyElementGroup):
+                raise TypeError(
+                    f"unsupported element group type: {type(grp).__name__}")
+
+        super().__init__(mesh)
+        self.group_coarsening_records = None
+
+        self._group_infos = [_get_group_adaptivity_info(grp) for grp in mesh.groups]
+        self._max_nface_vertices = max(
+            info.face_vertex_indices.shape[1] for info in self._group_infos)
+
+        # {{{ refinement tree
+
+        # NOTE: every element that was ever created is a node in the tree of
+        # its group. The roots of the tree are the elements of *mesh*, so
+        # their node numbers match their element numbers.
+        self._node_parents = [
+            np.full(grp.nelements, -1, dtype=np.int64) for grp in mesh.groups]
+        self._node_child_indices = [
+            np.full(grp.nelements, -1, dtype=np.int64) for grp in mesh.groups]
+        self._node_levels = [
+            np.zeros(grp.nelements, dtype=np.int64) for grp in mesh.groups]
+        self._node_vertex_indices = [
+            grp.vertex_indices.astype(np.int64) for grp in mesh.groups]
+
+        # the node of each element in the current mesh
+        self._leaf_nodes = [
+            np.arange(grp.nelements, dtype=np.int64) for grp in mesh.groups]
+
+        # }}}
+
+        # {{{ facial adjacency
+
+        interior_faces = []
+        interior_neighbor_faces = []
+        boundary_faces = []
+        self._boundary_tag_root_faces = [[] for _ in mesh.groups]
+
+        for igrp, fagrp_list in enumerate(mesh.facial_adjacency_groups):
+            nfaces = mesh.groups[igrp].nfaces
+            for fagrp in fagrp_list:
+                faces = _FaceArray(
+                    groups=np.full(len(fagrp.elements), igrp, dtype=np.int64),
+                    elements=fagrp.elements.astype(np.int64),
+                    faces=fagrp.element_faces.astype(np.int64))
+
+                if isinstance(fagrp, InterPartAdjacencyGroup):
+                    raise NotImplementedError("distributed meshes are not supported")
+                elif isinstance(fagrp, BoundaryAdjacencyGroup):
+                    boundary_faces.append(faces)
+                    self._boundary_tag_root_faces[igrp].append((
+                        fagrp.boundary_tag,
+                        np.unique(faces.elements * nfaces + faces.faces)))
+                elif isinstance(fagrp, InteriorAdjacencyGroup):
+                    from meshmode.mesh.tools import AffineMap
+                    if fagrp.aff_map != AffineMap():
+                        raise NotImplementedError(
+                            "periodic meshes are not supported")
+
+                    interior_faces.append(faces)
+                    interior_neighbor_faces.append(_FaceArray(
+                        groups=np.full(
+                            len(fagrp.elements), fagrp.ineighbor_group,
+                            dtype=np.int64),
+                        elements=fagrp.neighbors.astype(np.int64),
+                        faces=fagrp.neighbor_faces.astype(np.int64)))
+                else:
+                    raise TypeError(
+                        "unsupported facial adjacency group type: "
+                        f"{type(fagrp).__name__}")
+
+        # conforming interior faces (in both directions)
+        self._interior_faces = _FaceArray.concatenate(
+            [_FaceArray.empty(), *interior_faces])
+        self._interior_neighbor_faces = _FaceArray.concatenate(
+            [_FaceArray.empty(), *interior_neighbor_faces])
+
+        # hanging faces (from the fine to the coarse side only)
+        dim = mesh.dim
+        self._hanging_faces = _FaceArray.empty()
+        self._hanging_neighbor_faces = _FaceArray.empty()
+        self._hanging_face_map_matrices = np.empty((0, dim - 1, dim - 1))
+        self._hanging_face_map_offsets = np.empty((0, dim - 1))
+
+        # boundary faces, along with the face of the root of the tree they
+        # are contained in (as ``element * nfaces + face``)
+        boundary_faces = _FaceArray.concatenate(
+            [_FaceArray.empty(), *boundary_faces])
+        _, idx = np.unique(
+            boundary_faces.groups
+            + len(mesh.groups) * (
+                boundary_faces.elements * max(grp.nfaces for grp in mesh.groups)
+                + boundary_faces.faces),
+            return_index=True)
+        self._boundary_faces = boundary_faces[idx]
+        self._boundary_root_faces = (
+            self._boundary_faces.elements
+            * np.array([grp.nfaces for grp in mesh.groups])[
+                self._boundary_faces.groups]
+            + self._boundary_faces.faces)
+
+        # }}}
+
+    def get_element_levels(self) -> list[np.ndarray]:
+        """
+        :returns: a :class:`list` of arrays (one for each group) containing
+            the number of times each element of the current mesh was refined
+            starting from the mesh given to :meth:`__init__`.
+        """
+        return [
+            node_levels[leaf_nodes]
+            for node_levels, leaf_nodes in zip(
+                self._node_levels, self._leaf_nodes, strict=True)]
+
+    # {{{ faces
+
+    def _get_node_faces(self, faces, nodes):
+        # NOTE: this makes use of the fact that nodes never change groups
+
+        keys = np.full((len(faces), self._max_nface_vertices), -1, dtype=np.int64)
+        for igrp, info in enumerate(self._group_infos):
+            in_grp, = np.where(faces.groups == igrp)
+            if not in_grp.size:
+                continue
+
+            face_vertex_indices = info.face_vertex_indices[faces.faces[in_grp]]
+            keys[in_grp, self._max_nface_vertices - face_vertex_indices.shape[1]:] = (
+                np.sort(np.take_along_axis(
+                    self._node_vertex_indices[igrp][nodes[in_grp]],
+                    face_vertex_indices, axis=1), axis=1))
+
+        return keys
+
+    def _get_leaf_nodes(self, faces):
+        nodes = np.empty(len(faces), dtype=np.int64)
+        for igrp, leaf_nodes in enumerate(self._leaf_nodes):
+            in_grp = faces.groups == igrp
+            nodes[in_grp] = leaf_nodes[faces.elements[in_grp]]
+
+        return nodes
+
+    def _get_parent_faces(self, faces, nodes):
+        """
+        :returns: a tuple ``(parent_nodes, parent_faces)``, where
+            ``parent_faces`` is -1 if the face of the node is not contained
+            in a face of its parent (or if the node is a root).
+        """
+        parent_nodes = np.full(len(faces), -1, dtype=np.int64)
+        parent_faces = np.full(len(faces), -1, dtype=np.int64)
+        for igrp, info in enumerate(self._group_infos):
+            in_grp, = np.where(faces.groups == igrp)
+            grp_nodes = nodes[in_grp]
+
+            parent_nodes[in_grp] = self._node_parents[igrp][grp_nodes]
+
+            has_parent = parent_nodes[in_grp] >= 0
+            parent_faces[in_grp[has_parent]] = info.child_face_to_parent_face[
+                self._node_child_indices[igrp][grp_nodes[has_parent]],
+                faces.faces[in_grp[has_parent]]]
+
+        return parent_nodes, parent_faces
+
+    # }}}
+
+    # {{{ face matching
+
+    def _match_faces(self, faces):
+        """Find the neighbors of the leaf *faces*. All the faces that are
+        affected by a refinement must be given at once.
+        """
+        nodes = self._get_leaf_nodes(faces)
+        keys = self._get_node_faces(faces, nodes)
+
+        _, key_ids, counts = np.unique(
+            keys, axis=0, return_inverse=True, return_counts=True)
+        key_ids = key_ids.reshape(-1)
+
+        if (counts > 2).any():
+            raise ValueError("mesh is not a manifold: faces shared by more "
+                             "than two elements")
+
+        # {{{ conforming faces
+
+        order = np.argsort(key_ids, kind="stable")
+        is_pair, = np.where(key_ids[order[1:]] == key_ids[order[:-1]])
+        pairs = np.stack([order[is_pair], order[is_pair + 1]])
+
+        interior_faces = faces[np.concatenate([pairs[0], pairs[1]])]
+        interior_neighbor_faces = faces[np.concatenate([pairs[1], pairs[0]])]
+
+        # }}}
+
+        # {{{ hanging faces
+
+        # NOTE: a face that does not have a matching neighbor face is either
+        # on the boundary, or it is a hanging face on the fine side (then a
+        # face of one of its ancestors matches the coarse face), or it is
+        # on the coarse side of some hanging faces.
+
+        unmatched, = np.where(counts[key_ids] == 1)
+        unmatched_keys = keys[unmatched]
+
+        fine_indices = []
+        coarse_indices = []
+        ancestor_nodes = []
+
+        active = unmatched
+        cur_nodes = nodes[active]
+        cur_faces = faces.faces[active]
+        while active.size:
+            cur_nodes, cur_faces = self._get_parent_faces(
+                _FaceArray(
+                    groups=faces.groups[active],
+                    elements=faces.elements[active],
+                    faces=cur_faces),
+                cur_nodes)
+
+            has_parent_face = cur_faces >= 0
+            active = active[has_parent_face]
+            cur_nodes = cur_nodes[has_parent_face]
+            cur_faces = cur_faces[has_parent_face]
+            if not active.size:
+                break
+
+            parent_keys = self._get_node_faces(
+                _FaceArray(
+                    groups=faces.groups[active],
+                    elements=faces.elements[active],
+                    faces=cur_faces),
+                cur_nodes)
+
+            _, parent_key_ids = np.unique(
+                np.concatenate([unmatched_keys, parent_keys]),
+                axis=0, return_inverse=True)
+            parent_key_ids = parent_key_ids.reshape(-1)
+
+            key_id_to_unmatched = np.full(len(parent_key_ids), -1, dtype=np.int64)
+            key_id_to_unmatched[parent_key_ids[:len(unmatched)]] = unmatched
+            coarse = key_id_to_unmatched[parent_key_ids[len(unmatched):]]
+
+            # NOTE: in 1D, faces are not subdivided, so they can match themselves
+            is_hanging = (coarse >= 0) & (coarse != active)
+            fine_indices.append(active[is_hanging])
+            coarse_indices.append(coarse[is_hanging])
+            ancestor_nodes.append(cur_nodes[is_hanging])
+
+            active = active[~is_hanging]
+            cur_nodes = cur_nodes[~is_hanging]
+            cur_faces = cur_faces[~is_hanging]
+
+        fine_indices = np.concatenate([np.empty(0, dtype=np.int64), *fine_indices])
+        coarse_indices = np.concatenate(
+            [np.empty(0, dtype=np.int64), *coarse_indices])
+        ancestor_nodes = np.concatenate(
+            [np.empty(0, dtype=np.int64), *ancestor_nodes])
+
+        # }}}
+
+        # {{{ boundary faces
+
+        is_boundary = np.zeros(len(faces), dtype=bool)
+        is_boundary[unmatched] = True
+        is_boundary[fine_indices] = False
+        is_boundary[coarse_indices] = False
+        boundary_indices, = np.where(is_boundary)
+
+        boundary_faces = faces[boundary_indices]
+        boundary_root_faces = self._get_root_faces(
+            boundary_faces, nodes[boundary_indices])
+
+        # }}}
+
+        hanging_faces = faces[fine_indices]
+        hanging_neighbor_faces = faces[coarse_indices]
+        face_map_matrices, face_map_offsets = self._get_hanging_face_maps(
+            hanging_faces, nodes[fine_indices], ancestor_nodes,
+            hanging_neighbor_faces, nodes[coarse_indices])
+
+        return (
+            (interior_faces, interior_neighbor_faces),
+            (hanging_faces, hanging_neighbor_faces,
+                face_map_matrices, face_map_offsets),
+            (boundary_faces, boundary_root_faces))
+
+    def _get_root_faces(self, faces, nodes):
+        cur_nodes = nodes.copy()
+        cur_faces = faces.faces.copy()
+
+        active = np.arange(len(faces))
+        while active.size:
+            parent_nodes, parent_faces = self._get_parent_faces(
+                _FaceArray(
+                    groups=faces.groups[active],
+                    elements=faces.elements[active],
+                    faces=cur_faces[active]),
+                cur_nodes[active])
+
+            has_parent = parent_nodes >= 0
+            assert (parent_faces[has_parent] >= 0).all()
+
+            active = active[has_parent]
+            cur_nodes[active] = parent_nodes[has_parent]
+            cur_faces[active] = parent_faces[has_parent]
+
+        nfaces = np.array([info.face_vertex_indices.shape[0]
+                           for info in self._group_infos])
+        return cur_nodes * nfaces[faces.groups] + cur_faces
+
+    def _get_hanging_face_maps(self,
+            faces, nodes, ancestor_nodes, neighbor_faces, neighbor_nodes):
+        dim = self._current_mesh.dim
+        face_map_matrices = np.empty((len(faces), dim - 1, dim - 1))
+        face_map_offsets = np.empty((len(faces), dim - 1))
+
+        # NOTE: the map between the faces is found from the images of a few
+        # points in the interior of the fine face. These are first mapped
+        # to the fine element, then up the tree to the ancestor whose face
+        # matches the coarse face and then, using the weights of the shared
+        # vertices, to the coarse element and its face.
+
+        for igrp, (grp, info) in enumerate(
+                zip(self._current_mesh.groups, self._group_infos, strict=True)):
+            in_grp, = np.where(faces.groups == igrp)
+            if not in_grp.size:
+                continue
+
+            face_points = _get_interior_points(grp._modepy_faces[0])
+
+            # shape: (nfaces, dim, npoints)
+            points = (
+                np.einsum("fij,jp->fip",
+                          info.face_map_matrices[faces.faces[in_grp]],
+                          face_points)
+                + info.face_map_offsets[faces.faces[in_grp]][:, :, np.newaxis])
+
+            cur_nodes = nodes[in_grp]
+            while True:
+                active, = np.where(cur_nodes != ancestor_nodes[in_grp])
+                if not active.size:
+                    break
+
+                child_indices = self._node_child_indices[igrp][cur_nodes[active]]
+                points[active] = (
+                    np.einsum("fij,fjp->fip",
+                              info.child_map_matrices[child_indices],
+                              points[active])
+                    + info.child_map_offsets[child_indices][:, :, np.newaxis])
+                cur_nodes[active] = self._node_parents[igrp][cur_nodes[active]]
+
+            # shape: (nfaces, npoints, nvertices)
+            vdm = np.array([
+                func(points.transpose(1, 0, 2))
+                for func in info.vertex_basis.functions]).transpose(1, 2, 0)
+            weights = vdm @ info.vertex_inv_vdm
+            vertex_indices = self._node_vertex_indices[igrp][ancestor_nodes[in_grp]]
+
+            for inb_grp, nb_info in enumerate(self._group_infos):
+                is_nb_grp = neighbor_faces.groups[in_grp] == inb_grp
+                if not is_nb_grp.any():
+                    continue
+
+                nb_indices = in_grp[is_nb_grp]
+                nb_vertex_indices = \
+                    self._node_vertex_indices[inb_grp][neighbor_nodes[nb_indices]]
+
+                # shape: (nfaces, nvertices, nb_nvertices)
+                is_same_vertex = (
+                    vertex_indices[is_nb_grp][:, :, np.newaxis]
+                    == nb_vertex_indices[:, np.newaxis, :])
+
+                nb_points = np.einsum("fpa,fab,bi->fip",
+                                      weights[is_nb_grp],
+                                      is_same_vertex.astype(weights.dtype),
+                                      nb_info.vertex_unit_coordinates)
+
+                nb_faces = neighbor_faces.faces[nb_indices]
+                nb_face_points = np.einsum(
+                    "fij,fjp->fip",
+                    la.pinv(nb_info.face_map_matrices[nb_faces]),
+                    nb_points - nb_info.face_map_offsets[nb_faces][:, :, np.newaxis])
+
+                face_map_matrices[nb_indices], face_map_offsets[nb_indices] = \
+                    _get_affine_map_from_points(face_points, nb_face_points)
+
+        return face_map_matrices, face_map_offsets
+
+    # }}}
+
+    # {{{ refinement
+
+    def refine(self, refine_flags):
+        """
+        :arg refine_flags: an :class:`~numpy.ndarray` of :class:`~numpy.dtype`
+            :class:`bool` and length :attr:`meshmode.mesh.Mesh.nelements`
+            indicating which elements should be split.
+        """
+        mesh = self._current_mesh
+        refine_flags = np.asarray(refine_flags, dtype=bool)
+        new_mesh = super().refine(refine_flags)
+
+        # {{{ update tree
+
+        new_element_nrs = []
+        child_faces = []
+        for igrp, (base_element_nr, grp, new_grp, record) in enumerate(zip(
+                mesh.base_element_nrs, mesh.groups, new_mesh.groups,
+                self.group_refinement_records, strict=True)):
+            grp_flags = refine_flags[base_element_nr:base_element_nr + grp.nelements]
+            nchildren = len(record.el_tess_info.children)
+            child_starts = record.child_element_starts.astype(np.int64)
+
+            refined_els, = np.where(grp_flags)
+            child_els = (
+                child_starts[refined_els][:, np.newaxis]
+                + np.arange(nchildren)).reshape(-1)
+
+            parent_nodes = self._leaf_nodes[igrp][refined_els]
+            nnodes = len(self._node_parents[igrp])
+            child_nodes = nnodes + np.arange(len(child_els))
+
+            self._node_parents[igrp] = np.concatenate([
+                self._node_parents[igrp], np.repeat(parent_nodes, nchildren)])
+            self._node_child_indices[igrp] = np.concatenate([
+                self._node_child_indices[igrp],
+                np.tile(np.arange(nchildren), len(refined_els))])
+            self._node_levels[igrp] = np.concatenate([
+                self._node_levels[igrp],
+                np.repeat(self._node_levels[igrp][parent_nodes] + 1, nchildren)])
+            self._node_vertex_indices[igrp] = np.concatenate([
+                self._node_vertex_indices[igrp],
+                new_grp.vertex_indices[child_els].astype(np.int64)])
+
+            # old element number -> new element number (or -1 if refined)
+            grp_new_element_nrs = np.where(grp_flags, -1, child_starts[:-1])
+            new_element_nrs.append(grp_new_element_nrs)
+
+            leaf_nodes = np.empty(new_grp.nelements, dtype=np.int64)
+            leaf_nodes[grp_new_element_nrs[~grp_flags]] = \
+                self._leaf_nodes[igrp][~grp_flags]
+            leaf_nodes[child_els] = child_nodes
+            self._leaf_nodes[igrp] = leaf_nodes
+
+            child_faces.append(_FaceArray(
+                groups=np.full(len(child_els) * grp.nfaces, igrp, dtype=np.int64),
+                elements=np.repeat(child_els, grp.nfaces),
+                faces=np.tile(np.arange(grp.nfaces), len(child_els))))
+
+        # }}}
+
+        self._current_mesh = self._update_adjacency(
+            new_mesh, new_element_nrs, _FaceArray.concatenate(child_faces))
+        self.group_coarsening_records = None
+
+        return self._current_mesh
+
+    # }}}
+
+    # {{{ coarsening
+
+    def coarsen(self, coarsen_flags):
+        """
+        :arg coarsen_flags: an :class:`~numpy.ndarray` of :class:`~numpy.dtype`
+            :class:`bool` and length :attr:`meshmode.mesh.Mesh.nelements`
+            indicating which elements should be merged back into their
+            parent. An element is only merged if all of its siblings are
+            elements of the current mesh and are flagged as well.
+
+        After coarsening, :attr:`group_coarsening_records` describes the
+        elements of the previous mesh that make up each element of the new
+        mesh and :attr:`~RefinerWithoutAdjacency.group_refinement_records`
+        is set to *None*. The vertices of the merged elements are kept, so
+        that they are reused if the parent is refined again.
+        """
+        mesh = self._current_mesh
+        coarsen_flags = np.asarray(coarsen_flags, dtype=bool)
+
+        if len(coarsen_flags) != mesh.nelements:
+            raise ValueError("length of coarsen_flags does not match "
+                    "element count of last generated mesh")
+
+        from meshmode.mesh.refinement.tessellate import GroupRefinementRecord
+
+        new_groups = []
+        new_element_nrs = []
+        parent_faces = []
+        group_coarsening_records = []
+        for igrp, (base_element_nr, grp, info) in enumerate(zip(
+                mesh.base_element_nrs, mesh.groups, self._group_infos,
+                strict=True)):
+            grp_flags = coarsen_flags[base_element_nr:base_element_nr + grp.nelements]
+            nchildren = len(info.el_tess_info.children)
+
+            # {{{ find parents with all children flagged
+
+            leaf_nodes = self._leaf_nodes[igrp]
+            parents = self._node_parents[igrp][leaf_nodes]
+            is_candidate = grp_flags & (parents >= 0)
+
+            nnodes = len(self._node_parents[igrp])
+            nflagged_children = np.bincount(
+                parents[is_candidate], minlength=nnodes)
+
+            is_merged = is_candidate & (nflagged_children[parents] == nchildren)
+            merged_els, = np.where(is_merged)
+
+            parent_nodes, parent_ids = np.unique(
+                parents[merged_els], return_inverse=True)
+
+            # shape: (nparents, nchildren), the elements of the children
+            child_els = np.empty((len(parent_nodes), nchildren), dtype=np.int64)
+            child_els[
+                parent_ids.reshape(-1),
+                self._node_child_indices[igrp][leaf_nodes[merged_els]]
+                ] = merged_els
+
+            # }}}
+
+            # {{{ number new elements
+
+            # NOTE: parents take the place of their first child, so that the
+            # order of the elements is preserved as much as possible
+            kept_els, = np.where(~is_merged)
+            order = np.argsort(np.concatenate([
+                kept_els, np.min(child_els, axis=1)]), kind="stable")
+            new_nelements = len(order)
+
+            new_nrs = np.empty(new_nelements, dtype=np.int64)
+            new_nrs[order] = np.arange(new_nelements)
+            kept_new_els = new_nrs[:len(kept_els)]
+            parent_new_els = new_nrs[len(kept_els):]
+
+            grp_new_element_nrs = np.full(grp.nelements, -1, dtype=np.int64)
+            grp_new_element_nrs[kept_els] = kept_new_els
+            new_element_nrs.append(grp_new_element_nrs)
+
+            nold_elements = np.ones(new_nelements, dtype=np.int64)
+            nold_elements[parent_new_els] = nchildren
+            old_element_starts = np.concatenate([[0], np.cumsum(nold_elements)])
+
+            old_elements = np.empty(old_element_starts[-1], dtype=np.int64)
+            old_elements[old_element_starts[kept_new_els]] = kept_els
+            old_elements[
+                old_element_starts[parent_new_els][:, np.newaxis]
+                + np.arange(nchildren)] = child_els
+
+            group_coarsening_records.append(GroupRefinementRecord(
+                el_tess_info=info.el_tess_info,
+                child_element_starts=old_element_starts.astype(
+                    mesh.element_id_dtype),
+                child_elements=old_elements.astype(mesh.element_id_dtype)))
+
+            # }}}
+
+            # {{{ update tree
+
+            # NOTE: the merged children are leaves, so they can be removed
+            # from the tree without affecting any other nodes
+            is_kept_node = np.ones(nnodes, dtype=bool)
+            is_kept_node[leaf_nodes[merged_els]] = False
+            new_node_nrs = np.cumsum(is_kept_node) - 1
+
+            node_parents = self._node_parents[igrp][is_kept_node]
+            self._node_parents[igrp] = np.where(
+                node_parents >= 0, new_node_nrs[node_parents], -1)
+            self._node_child_indices[igrp] = \
+                self._node_child_indices[igrp][is_kept_node]
+            self._node_levels[igrp] = self._node_levels[igrp][is_kept_node]
+            self._node_vertex_indices[igrp] = \
+                self._node_vertex_indices[igrp][is_kept_node]
+
+            new_leaf_nodes = np.empty(new_nelements, dtype=np.int64)
+            new_leaf_nodes[kept_new_els] = new_node_nrs[leaf_nodes[kept_els]]
+            new_leaf_nodes[parent_new_els] = new_node_nrs[parent_nodes]
+            self._leaf_nodes[igrp] = new_leaf_nodes
+
+            # }}}
+
+            # {{{ build new group
+
+            vertex_indices = np.empty(
+                (new_nelements, grp.nvertices), dtype=mesh.vertex_id_dtype)
+            vertex_indices[kept_new_els] = grp.vertex_indices[kept_els]
+            vertex_indices[parent_new_els] = \
+                self._node_vertex_indices[igrp][new_leaf_nodes[parent_new_els]]
+
+            nodes = np.empty(
+                (mesh.ambient_dim, new_nelements, grp.nunit_nodes),
+                dtype=grp.nodes.dtype)
+            nodes[:, kept_new_els] = grp.nodes[:, kept_els]
+            nodes[:, parent_new_els] = np.einsum(
+                "ij,deij->dei",
+                info.parent_node_resampling,
+                grp.nodes[:, child_els[:, info.parent_node_child_indices]])
+
+            new_groups.append(grp.make_group(
+                order=grp.order,
+                vertex_indices=vertex_indices,
+                nodes=nodes,
+                unit_nodes=grp.unit_nodes))
+
+            parent_faces.append(_FaceArray(
+                groups=np.full(len(parent_new_els) * grp.nfaces, igrp,
+                               dtype=np.int64),
+                elements=np.repeat(parent_new_els, grp.nfaces),
+                faces=np.tile(np.arange(grp.nfaces), len(parent_new_els))))
+
+            # }}}
+
+        from meshmode.mesh import make_mesh
+        new_mesh = make_mesh(
+            mesh.vertices, new_groups,
+            vertex_id_dtype=mesh.vertex_id_dtype,
+            element_id_dtype=mesh.element_id_dtype,
+            face_id_dtype=mesh.face_id_dtype,
+            is_conforming=False,
+            skip_tests=True)
+
+        self._previous_mesh = mesh
+        self._current_mesh = self._update_adjacency(
+            new_mesh, new_element_nrs, _FaceArray.concatenate(parent_faces))
+        self.group_refinement_records = None
+        self.group_coarsening_records = group_coarsening_records
+
+        return self._current_mesh
+
+    # }}}
+
+    # {{{ adjacency
+
+    def _update_adjacency(self, new_mesh, new_element_nrs, new_faces):
+        """
+        :arg new_element_nrs: a list of arrays (one for each group) containing
+            the number in *new_mesh* of each element of the current mesh, or
+            -1 if the element was removed.
+        :arg new_faces: all faces of the elements of *new_mesh* that are not
+            in the current mesh.
+        :returns: *new_mesh* with the updated facial adjacency.
+        """
+
+        def renumber(faces):
+            elements = np.empty(len(faces), dtype=np.int64)
+            for igrp, grp_new_element_nrs in enumerate(new_element_nrs):
+                in_grp = faces.groups == igrp
+                elements[in_grp] = grp_new_element_nrs[faces.elements[in_grp]]
+
+            return _FaceArray(
+                groups=faces.groups, elements=elements, faces=faces.faces)
+
+        # {{{ update adjacency of unaffected faces
+
+        # NOTE: faces of elements that were adjacent to a removed element need
+        # to be matched up again along with the faces of the new elements
+
+        affected_faces = [new_faces]
+        interior_faces = renumber(self._interior_faces)
+        interior_neighbor_faces = renumber(self._interior_neighbor_faces)
+        is_kept = (
+            (interior_faces.elements >= 0)
+            & (interior_neighbor_faces.elements >= 0))
+        affected_faces.append(interior_faces[
+            (interior_faces.elements >= 0)
+            & (interior_neighbor_faces.elements < 0)])
+        interior_faces = interior_faces[is_kept]
+        interior_neighbor_faces = interior_neighbor_faces[is_kept]
+
+        hanging_faces = renumber(self._hanging_faces)
+        hanging_neighbor_faces = renumber(self._hanging_neighbor_faces)
+        is_kept = (
+            (hanging_faces.elements >= 0)
+            & (hanging_neighbor_faces.elements >= 0))
+        affected_faces.extend([
+            hanging_faces[
+                (hanging_faces.elements >= 0)
+                & (hanging_neighbor_faces.elements < 0)],
+            hanging_neighbor_faces[
+                (hanging_faces.elements < 0)
+                & (hanging_neighbor_faces.elements >= 0)],
+            ])
+        hanging_faces = hanging_faces[is_kept]
+        hanging_neighbor_faces = hanging_neighbor_faces[is_kept]
+        hanging_face_map_matrices = self._hanging_face_map_matrices[is_kept]
+        hanging_face_map_offsets = self._hanging_face_map_offsets[is_kept]
+
+        boundary_faces = renumber(self._boundary_faces)
+        is_kept = boundary_faces.elements >= 0
+        boundary_faces = boundary_faces[is_kept]
+        boundary_root_faces = self._boundary_root_faces[is_kept]
+
+        # }}}
+
+        # {{{ match affected faces
+
+        affected_faces = _FaceArray.concatenate(affected_faces)
+        max_nfaces = max(grp.nfaces for grp in new_mesh.groups)
+        _, idx = np.unique(
+            affected_faces.groups
+            + len(new_mesh.groups) * (
+                affected_faces.elements * max_nfaces + affected_faces.faces),
+            return_index=True)
+        affected_faces = affected_faces[idx]
+
+        (
+            (new_interior_faces, new_interior_neighbor_faces),
+            (new_hanging_faces, new_hanging_neighbor_faces,
+                new_face_map_matrices, new_face_map_offsets),
+            (new_boundary_faces, new_boundary_root_faces),
+        ) = self._match_faces(affected_faces)
+
+        self._interior_faces = _FaceArray.concatenate(
+            [interior_faces, new_interior_faces])
+        self._interior_neighbor_faces = _FaceArray.concatenate(
+            [interior_neighbor_faces, new_interior_neighbor_faces])
+
+        self._hanging_faces = _FaceArray.concatenate(
+            [hanging_faces, new_hanging_faces])
+        self._hanging_neighbor_faces = _FaceArray.concatenate(
+            [hanging_neighbor_faces, new_hanging_neighbor_faces])
+        self._hanging_face_map_matrices = np.concatenate(
+            [hanging_face_map_matrices, new_face_map_matrices])
+        self._hanging_face_map_offsets = np.concatenate(
+            [hanging_face_map_offsets, new_face_map_offsets])
+
+        self._boundary_faces = _FaceArray.concatenate(
+            [boundary_faces, new_boundary_faces])
+        self._boundary_root_faces = np.concatenate(
+            [boundary_root_faces, new_boundary_root_faces])
+
+        # }}}
+
+        return new_mesh.copy(
+            skip_tests=True,
+            is_conforming=not len(self._hanging_faces),
+            facial_adjacency_groups=self._make_facial_adjacency_groups(new_mesh))
+
+    def _make_facial_adjacency_groups(self, mesh):
+        from meshmode.mesh import _complete_facial_adjacency_groups
+        from meshmode.mesh.tools import AffineMap
+
+        def sort_faces(faces):
+            return np.lexsort((faces.faces, faces.elements))
+
+        facial_adjacency_groups = []
+        for igrp in range(len(mesh.groups)):
+            fagrp_list = []
+
+            for inb_grp in range(len(mesh.groups)):
+                is_grp_pair, = np.where(
+                    (self._interior_faces.groups == igrp)
+                    & (self._interior_neighbor_faces.groups == inb_grp))
+                if is_grp_pair.size:
+                    faces = self._interior_faces[is_grp_pair]
+                    neighbor_faces = self._interior_neighbor_faces[is_grp_pair]
+                    order = sort_faces(faces)
+
+                    fagrp_list.append(InteriorAdjacencyGroup(
+                        igroup=igrp,
+                        ineighbor_group=inb_grp,
+                        elements=faces.elements[order].astype(
+                            mesh.element_id_dtype),
+                        element_faces=faces.faces[order].astype(
+                            mesh.face_id_dtype),
+                        neighbors=neighbor_faces.elements[order].astype(
+                            mesh.element_id_dtype),
+                        neighbor_faces=neighbor_faces.faces[order].astype(
+                            mesh.face_id_dtype),
+                        aff_map=AffineMap()))
+
+            for inb_grp in range(len(mesh.groups)):
+                is_grp_pair, = np.where(
+                    (self._hanging_faces.groups == igrp)
+                    & (self._hanging_neighbor_faces.groups == inb_grp))
+                if is_grp_pair.size:
+                    faces = self._hanging_faces[is_grp_pair]
+                    neighbor_faces = self._hanging_neighbor_faces[is_grp_pair]
+                    order = sort_faces(faces)
+
+                    fagrp_list.append(NonconformingInteriorAdjacencyGroup(
+                        igroup=igrp,
+                        ineighbor_group=inb_grp,
+                        elements=faces.elements[order].astype(
+                            mesh.element_id_dtype),
+                        element_faces=faces.faces[order].astype(
+                            mesh.face_id_dtype),
+                        neighbors=neighbor_faces.elements[order].astype(
+                            mesh.element_id_dtype),
+                        neighbor_faces=neighbor_faces.faces[order].astype(
+                            mesh.face_id_dtype),
+                        aff_map=AffineMap(),
+                        face_map_matrices=(
+                            self._hanging_face_map_matrices[is_grp_pair][order]),
+                        face_map_offsets=(
+                            self._hanging_face_map_offsets[is_grp_pair][order])))
+
+            is_grp, = np.where(self._boundary_faces.groups == igrp)
+            for boundary_tag, root_faces in self._boundary_tag_root_faces[igrp]:
+                is_tagged = is_grp[
+                    np.isin(self._boundary_root_faces[is_grp], root_faces)]
+                faces = self._boundary_faces[is_tagged]
+                order = sort_faces(faces)
+
+                fagrp_list.append(BoundaryAdjacencyGroup(
+                    igroup=igrp,
+                    boundary_tag=boundary_tag,
+                    elements=faces.elements[order].astype(mesh.element_id_dtype),
+                    element_faces=faces.faces[order].astype(mesh.face_id_dtype)))
+
+            facial_adjacency_groups.append(fagrp_list)
+
+        return _complete_facial_adjacency_groups(
+            facial_adjacency_groups, mesh.element_id_dtype, mesh.face_id_dtype)
+
+    # }}}
+
+# }}}
+
+# vim: foldmethod=marker
@@ -0,0 +1,349 @@
+__copyright__ = "Copyright (C) 2024 Andreas Kloeckner"
+
+__license__ = """
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import logging
+
+import numpy as np
+import numpy.linalg as la
+
+import modepy as mp
+
+from meshmode.mesh import Mesh, MeshElementGroup
+from meshmode.mesh.refinement.tessellate import (
+    ElementTessellationInfo,
+    GroupRefinementRecord,
+    get_group_multilevel_tessellation_info,
+    get_group_tessellated_node_array,
+    get_group_tessellation_info,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# {{{ lattice helpers
+
+def _get_lattice_unit_nodes(
+        meg: MeshElementGroup, el_tess_info: ElementTessellationInfo,
+        ) -> np.ndarray:
+    ref_vertices = np.array(el_tess_info.ref_vertices, dtype=np.float64).T
+    return -1 + 2 * ref_vertices / np.max(ref_vertices)
+
+
+def _get_lattice_vertex_weights(
+        meg: MeshElementGroup, el_tess_info: ElementTessellationInfo,
+        nlevels: int) -> np.ndarray:
+    """
+    :returns: an integer array of shape ``(nref_vertices, nvertices)``
+        containing the (multi)linear weights of the element vertices for each
+        point in the reference lattice of *el_tess_info*, scaled by
+        :math:`2^{d n}` (where :math:`n` is *nlevels*). These are independent
+        of the orientation of the element, so equal weights on equal vertices
+        identify the same point on neighboring elements.
+    """
+    space = mp.space_for_shape(meg.shape, 1)
+    basis = mp.basis_for_space(space, meg.shape)
+
+    vertex_vdm = mp.vandermonde(basis.functions, meg.vertex_unit_coordinates().T)
+    lattice_vdm = mp.vandermonde(
+            basis.functions, _get_lattice_unit_nodes(meg, el_tess_info))
+
+    weights = lattice_vdm @ la.inv(vertex_vdm)
+    return np.rint(2**(meg.dim * nlevels) * weights).astype(np.int64)
+
+
+def _unique_rows(keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Like :func:`numpy.unique` with ``axis=0``, ``return_index=True`` and
+    ``return_inverse=True``, but the unique rows are in no particular order.
+
+    Rows are hashed into a single integer, so that a (much cheaper) sort of a
+    one-dimensional array is sufficient. Hash collisions are detected and
+    fall back to :func:`numpy.unique`.
+    """
+    multipliers = np.random.default_rng(seed=17).integers(
+        1, 2**62, size=keys.shape[1], dtype=np.uint64) | np.uint64(1)
+
+    with np.errstate(over="ignore"):
+        hashes = (keys.astype(np.uint64) * multipliers).sum(
+            axis=1, dtype=np.uint64)
+        hashes ^= hashes >> np.uint64(29)
+
+    order = np.argsort(hashes, kind="stable")
+    sorted_hashes = hashes[order]
+
+    is_first = np.empty(len(keys), dtype=bool)
+    is_first[:1] = True
+    np.not_equal(sorted_hashes[1:], sorted_hashes[:-1], out=is_first[1:])
+
+    group_indices = np.cumsum(is_first) - 1
+    first_occurrence = order[is_first]
+
+    if not np.array_equal(keys[order], keys[first_occurrence[group_indices]]):
+        _, first_occurrence, inverse = np.unique(
+            keys, axis=0, return_index=True, return_inverse=True)
+        return first_occurrence, inverse.reshape(-1)
+
+    inverse = np.empty(len(keys), dtype=np.int64)
+    inverse[order] = group_indices
+
+    return first_occurrence, inverse
+
+# }}}
+
+
+# {{{ mesh hierarchy
+
+class MeshHierarchy:
+    """A hierarchy of meshes obtained by repeated uniform refinement of a
+    coarse mesh, where level 0 is the coarse mesh itself.
+
+    Unlike repeated calls to
+    :meth:`~meshmode.mesh.refinement.RefinerWithoutAdjacency.refine_uniformly`,
+    each level is built directly from the coarse mesh in a single pass, using
+    a precomputed multi-level tessellation of the reference element. Levels are
+    only built once they are requested, and their adjacency is only computed
+    once it is used.
+
+    The elements of each level are ordered as if they were obtained by
+    successive refinement, i.e. the children of an element are numbered
+    contiguously. The vertex numbering is not the same, however.
+
+    .. attribute:: nlevels
+
+    .. automethod:: __init__
+    .. autoproperty:: coarse_mesh
+    .. automethod:: get_mesh
+    .. automethod:: get_group_refinement_records
+
+    .. versionadded:: 2024.1
+    """
+
+    def __init__(self, mesh: Mesh, nlevels: int) -> None:
+        """
+        :arg mesh: the coarse mesh at level 0.
+        :arg nlevels: the number of refinement levels above the coarse mesh.
+        """
+        if nlevels < 0:
+            raise ValueError(f"'nlevels' must be non-negative: {nlevels}")
+
+        self.nlevels = nlevels
+        self._meshes = {0: mesh}
+
+    @property
+    def coarse_mesh(self) -> Mesh:
+        return self._meshes[0]
+
+    def _check_level(self, level: int) -> None:
+        if not 0 <= level <= self.nlevels:
+            raise ValueError(
+                f"level {level} is not in the hierarchy of {self.nlevels} levels")
+
+    def get_mesh(self, level: int) -> Mesh:
+        """
+        :returns: the :class:`~meshmode.mesh.Mesh` obtained by refining
+            :attr:`coarse_mesh` uniformly *level* times.
+        """
+        self._check_level(level)
+
+        try:
+            return self._meshes[level]
+        except KeyError:
+            pass
+
+        mesh = self._build_level(level)
+        self._meshes[level] = mesh
+
+        return mesh
+
+    def get_group_refinement_records(
+            self, to_level: int, from_level: int = 0,
+            ) -> list[GroupRefinementRecord]:
+        """
+        :returns: a :class:`list` of
+            :class:`~meshmode.mesh.refinement.tessellate.GroupRefinementRecord`
+            (one for each group) that describe how the elements of the mesh
+            at *from_level* are refined into the ones at *to_level*. The
+            tessellations in the records cover ``to_level - from_level`` levels
+            of refinement at once.
+        """
+        self._check_level(to_level)
+        self._check_level(from_level)
+
+        if to_level <= from_level:
+            raise ValueError(
+                f"'to_level' ({to_level}) must be larger than "
+                f"'from_level' ({from_level})")
+
+        records = []
+        for grp in self.coarse_mesh.groups:
+            nchildren = len(get_group_tessellation_info(grp).children)
+            el_tess_info = get_group_multilevel_tessellation_info(
+                    grp, to_level - from_level)
+
+            nelements = grp.nelements * nchildren**from_level
+            nchild_elements = len(el_tess_info.children)
+
+            records.append(GroupRefinementRecord(
+                el_tess_info=el_tess_info,
+                child_element_starts=nchild_elements * np.arange(
+                    nelements + 1, dtype=self.coarse_mesh.element_id_dtype),
+                child_elements=np.arange(
+                    nelements * nchild_elements,
+                    dtype=self.coarse_mesh.element_id_dtype)))
+
+        return records
+
+    def _build_level(self, level: int) -> Mesh:
+        mesh = self.coarse_mesh
+        el_tess_infos = [
+            get_group_multilevel_tessellation_info(grp, level)
+            for grp in mesh.groups]
+
+        # {{{ get new vertices together
+
+        if mesh.vertices is not None:
+            max_nvertices = max(grp.nvertices for grp in mesh.groups)
+            full_weight = 2**(mesh.dim * level)
+
+            # NOTE: each point of the reference lattice of each element is
+            # identified by its nonzero vertex weights and the global indices
+            # of the corresponding vertices. Each (vertex index, weight) pair is
+            # packed into a single integer, sorted and padded to the same
+            # length for all groups.
+            if mesh.nvertices * (full_weight + 1) >= 2**62:
+                raise ValueError(
+                    f"too many vertices for {level} levels of refinement")
+
+            point_keys = []
+            for grp, el_tess_info in zip(mesh.groups, el_tess_infos, strict=True):
+                weights = _get_lattice_vertex_weights(grp, el_tess_info, level)
+                nelements, npoints = grp.nelements, len(weights)
+
+                grp_point_keys = np.full(
+                    (nelements, npoints, max_nvertices), -1, dtype=np.int64)
+                grp_point_keys[:, :, max_nvertices - grp.nvertices:] = np.sort(
+                    np.where(
+                        weights > 0,
+                        (full_weight + 1)
+                        * grp.vertex_indices[:, np.newaxis, :].astype(np.int64)
+                        + weights,
+                        -1),
+                    axis=-1)
+
+                point_keys.append(grp_point_keys.reshape(nelements * npoints, -1))
+
+            point_keys = np.concatenate(point_keys)
+
+            # points at a vertex keep the vertex index
+            last_vertex_indices, last_weights = np.divmod(
+                point_keys[:, -1], full_weight + 1)
+            is_vertex = last_weights == full_weight
+            point_vertex_indices = np.empty(len(point_keys), dtype=np.int64)
+            point_vertex_indices[is_vertex] = last_vertex_indices[is_vertex]
+
+            # all other points become new vertices, numbered in the order they
+            # first occur
+            new_point_indices, = np.where(~is_vertex)
+            first_occurrence, inverse = _unique_rows(
+                point_keys[new_point_indices])
+
+            order = np.argsort(first_occurrence)
+            key_to_number = np.empty(len(order), dtype=np.int64)
+            key_to_number[order] = np.arange(len(order))
+
+            point_vertex_indices[new_point_indices] = (
+                mesh.nvertices + key_to_number[inverse])
+
+            # {{{ compute new vertex coordinates
+
+            new_vertices = np.empty(
+                (mesh.ambient_dim, mesh.nvertices + len(order)),
+                dtype=mesh.vertices.dtype)
+            new_vertices[:, :mesh.nvertices] = mesh.vertices
+
+            new_vertex_points = new_point_indices[first_occurrence]
+            point_offset = 0
+            for grp, el_tess_info in zip(mesh.groups, el_tess_infos, strict=True):
+                npoints = len(el_tess_info.ref_vertices)
+                grp_npoints = grp.nelements * npoints
+
+                is_grp_point = (
+                    (point_offset <= new_vertex_points)
+                    & (new_vertex_points < point_offset + grp_npoints))
+                elements, points = np.divmod(
+                    new_vertex_points[is_grp_point] - point_offset, npoints)
+                point_offset += grp_npoints
+
+                resampling_mat = mp.resampling_matrix(
+                    mp.basis_for_space(grp.space, grp.shape).functions,
+                    _get_lattice_unit_nodes(grp, el_tess_info),
+                    grp.unit_nodes)
+
+                new_vertices[:, mesh.nvertices + key_to_number[is_grp_point]] = (
+                    np.einsum("deu,eu->de",
+                        grp.nodes[:, elements], resampling_mat[points]))
+
+            # }}}
+
+            point_vertex_indices = point_vertex_indices.astype(mesh.vertex_id_dtype)
+        else:
+            new_vertices = None
+
+        # }}}
+
+        new_el_groups = []
+        point_offset = 0
+        for grp, el_tess_info in zip(mesh.groups, el_tess_infos, strict=True):
+            nchildren = len(el_tess_info.children)
+            new_nelements = grp.nelements * nchildren
+
+            if new_vertices is not None:
+                npoints = len(el_tess_info.ref_vertices)
+                grp_point_vertex_indices = point_vertex_indices[
+                    point_offset:point_offset + grp.nelements * npoints
+                    ].reshape(grp.nelements, npoints)
+                point_offset += grp.nelements * npoints
+
+                new_vertex_indices = (
+                    grp_point_vertex_indices[:, el_tess_info.children]
+                    .reshape(new_nelements, -1))
+            else:
+                new_vertex_indices = None
+
+            new_nodes = get_group_tessellated_node_array(
+                grp, el_tess_info, np.arange(grp.nelements)
+                ).reshape(mesh.ambient_dim, new_nelements, grp.nunit_nodes)
+
+            new_el_groups.append(
+                grp.make_group(
+                    order=grp.order,
+                    vertex_indices=new_vertex_indices,
+                    nodes=new_nodes,
+                    unit_nodes=grp.unit_nodes))
+
+        from meshmode.mesh import make_mesh
+        return make_mesh(new_vertices, new_el_groups,
+                is_conforming=mesh.is_conforming)
+
+# }}}
+
+# vim: foldmethod=marker
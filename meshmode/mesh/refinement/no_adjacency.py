@@ -46,6 +46,13 @@ class RefinerWithoutAdjacency(Refiner):
         (I.e. two different numbers referring to the same geometric
         vertex.)
 
+    .. attribute:: group_refinement_records
+
+        A list of
+        :class:`~meshmode.mesh.refinement.tessellate.GroupRefinementRecord`
+        (one for each group of the previous mesh) describing the last
+        refinement.
+
     .. automethod:: __init__
     .. automethod:: refine
     .. automethod:: refine_uniformly
@@ -57,12 +64,100 @@ class RefinerWithoutAdjacency(Refiner):
         self._current_mesh = mesh
         self._previous_mesh = None
         self.group_refinement_records = None
-        self.global_vertex_pair_to_midpoint = {}
+
+        # NOTE: a table of all the edge midpoints created so far, so that
+        # midpoints are shared with elements that are refined later on. The
+        # edges are given by their (sorted) pair of vertex indices and are
+        # kept in lexicographic order.
+        self._midpoint_edges = np.empty((0, 2), dtype=np.int64)
+        self._midpoint_vertex_indices = np.empty(0, dtype=np.int64)
+
+    @property
+    def global_vertex_pair_to_midpoint(self):
+        """A :class:`dict` mapping (sorted) pairs of vertex indices to the
+        index of the vertex at their midpoint.
+        """
+        return {
+            (v1, v2): vm
+            for (v1, v2), vm in zip(
+                self._midpoint_edges.tolist(),
+                self._midpoint_vertex_indices.tolist(),
+                strict=True)}
 
     def refine_uniformly(self):
         flags = np.ones(self._current_mesh.nelements, dtype=bool)
         return self.refine(flags)
 
+    # {{{ midpoint vertices
+
+    def _get_midpoint_vertex_indices(self, nvertices, edges, midpoints):
+        """
+        :arg edges: an array of shape ``(nedges, 2)`` of sorted vertex index
+            pairs, possibly containing duplicates.
+        :arg midpoints: an array of shape ``(ambient_dim, nedges)`` containing
+            the midpoint of each edge.
+        :returns: a tuple ``(midpoint_vertex_indices, new_vertices)``, where
+            new midpoint vertices are numbered consecutively starting at
+            *nvertices* in the order of their first occurrence in *edges*.
+        """
+        # NOTE: all vertex indices are smaller than *nvertices*, so packing
+        # the pairs into a single key preserves the lexicographic order
+        def pack(pairs):
+            return pairs[:, 0] * nvertices + pairs[:, 1]
+
+        edge_keys = pack(edges)
+        known_keys = pack(self._midpoint_edges)
+
+        # {{{ look up midpoints created by previous refinements
+
+        midpoint_vertex_indices = np.empty(len(edges), dtype=np.int64)
+
+        if known_keys.size:
+            pos = np.minimum(
+                np.searchsorted(known_keys, edge_keys), len(known_keys) - 1)
+            is_known = known_keys[pos] == edge_keys
+            midpoint_vertex_indices[is_known] = \
+                self._midpoint_vertex_indices[pos[is_known]]
+        else:
+            is_known = np.zeros(len(edges), dtype=bool)
+
+        # }}}
+
+        # {{{ number new midpoints
+
+        new_edge_indices, = np.where(~is_known)
+        new_keys, first_occurrence, inverse = np.unique(
+                edge_keys[new_edge_indices],
+                return_index=True, return_inverse=True)
+
+        # number the new midpoints in the order they first occur
+        order = np.argsort(first_occurrence)
+        key_to_number = np.empty(len(new_keys), dtype=np.int64)
+        key_to_number[order] = np.arange(len(new_keys))
+
+        midpoint_vertex_indices[new_edge_indices] = (
+            nvertices + key_to_number[inverse.reshape(-1)])
+        new_vertices = midpoints[:, new_edge_indices[first_occurrence[order]]]
+
+        # }}}
+
+        # {{{ record new midpoints
+
+        all_edges = np.concatenate([
+            self._midpoint_edges, edges[new_edge_indices[first_occurrence]]])
+        all_vertex_indices = np.concatenate([
+            self._midpoint_vertex_indices, nvertices + key_to_number])
+
+        order = np.argsort(np.concatenate([known_keys, new_keys]), kind="stable")
+        self._midpoint_edges = all_edges[order]
+        self._midpoint_vertex_indices = all_vertex_indices[order]
+
+        # }}}
+
+        return midpoint_vertex_indices, new_vertices
+
+    # }}}
+
     # {{{ refinement top-level
 
     def refine(self, refine_flags):
@@ -81,18 +176,16 @@ class RefinerWithoutAdjacency(Refiner):
 
         perform_vertex_updates = mesh.vertices is not None
 
-        new_el_groups = []
-        group_refinement_records = []
-        additional_vertices = []
-        if perform_vertex_updates:
-            inew_vertex = mesh.nvertices
-
         from meshmode.mesh.refinement.tessellate import (
-            get_group_midpoints,
-            get_group_tessellated_nodes,
+            GroupRefinementRecord,
+            get_group_midpoint_array,
+            get_group_tessellated_node_array,
             get_group_tessellation_info,
         )
 
+        group_refinement_records = []
+        group_refinement_data = []
+
         for base_element_nr, grp in zip(mesh.base_element_nrs, mesh.groups,
                                         strict=True):
             el_tess_info = get_group_tessellation_info(grp)
@@ -114,23 +207,78 @@ class RefinerWithoutAdjacency(Refiner):
 
             new_nelements = child_el_indices[-1]
 
+            # new (group-relative) element indices of the children of each
+            # refined element, of shape (nrefining_elements, nchildren)
+            refining_el_new_indices = (
+                child_el_indices[refining_el_old_indices].reshape(-1, 1)
+                + np.arange(nchildren, dtype=mesh.element_id_dtype))
+
             # }}}
 
-            from meshmode.mesh.refinement.tessellate import GroupRefinementRecord
             group_refinement_records.append(
                     GroupRefinementRecord(
                         el_tess_info=el_tess_info,
-                        element_mapping=[
-                            list(range(
-                                child_el_indices[iel],
-                                child_el_indices[iel]+nchild_elements[iel]))
-                            for iel in range(grp.nelements)]))
+                        child_element_starts=child_el_indices,
+                        child_elements=np.arange(
+                            new_nelements, dtype=mesh.element_id_dtype)))
+
+            group_refinement_data.append((
+                grp, grp_flags, el_tess_info, new_nelements,
+                unrefined_el_new_indices, refining_el_old_indices,
+                refining_el_new_indices))
+
+        # {{{ get new vertices together
 
-            # {{{ get new vertices together
+        if perform_vertex_updates:
+            # gather the edges (as sorted pairs of vertex indices) of all
+            # midpoints of all refined elements in all groups
+            edges = []
+            edge_midpoints = []
+            for grp, _, el_tess_info, _, _, refining_el_old_indices, _ in (
+                    group_refinement_data):
+                midpoint_vertex_pairs = np.array(
+                    el_tess_info.midpoint_vertex_pairs, dtype=np.int64
+                    ).reshape(-1, 2)
+                refining_vertex_indices = grp.vertex_indices[refining_el_old_indices]
+
+                v1 = refining_vertex_indices[:, midpoint_vertex_pairs[:, 0]]
+                v2 = refining_vertex_indices[:, midpoint_vertex_pairs[:, 1]]
+                edges.append(np.stack([
+                    np.minimum(v1, v2).reshape(-1),
+                    np.maximum(v1, v2).reshape(-1)], axis=1).astype(np.int64))
+
+                # shape: (ambient_dim, nrefining_elements * nmidpoints)
+                edge_midpoints.append(get_group_midpoint_array(
+                    grp, el_tess_info, refining_el_old_indices
+                    ).reshape(mesh.ambient_dim, -1))
+
+            midpoint_vertex_indices, additional_vertices = \
+                self._get_midpoint_vertex_indices(
+                    mesh.nvertices,
+                    np.concatenate(edges),
+                    np.concatenate(edge_midpoints, axis=1))
+
+            new_vertices = np.empty(
+                    (mesh.ambient_dim,
+                        mesh.nvertices + additional_vertices.shape[1]),
+                    mesh.vertices.dtype)
+            new_vertices[:, :mesh.nvertices] = mesh.vertices
+            new_vertices[:, mesh.nvertices:] = additional_vertices
+        else:
+            new_vertices = None
+
+        # }}}
+
+        new_el_groups = []
+        midpoint_offset = 0
+        for (grp, grp_flags, el_tess_info, new_nelements,
+                unrefined_el_new_indices, refining_el_old_indices,
+                refining_el_new_indices) in group_refinement_data:
+            # {{{ get new vertex indices together
 
             if perform_vertex_updates:
-                midpoints = get_group_midpoints(
-                        grp, el_tess_info, refining_el_old_indices)
+                nrefining_elements = len(refining_el_old_indices)
+                nmidpoints = len(el_tess_info.midpoint_indices)
 
                 new_vertex_indices = np.empty(
                     (new_nelements, grp.vertex_indices.shape[1]),
@@ -141,45 +289,26 @@ class RefinerWithoutAdjacency(Refiner):
                 new_vertex_indices[unrefined_el_new_indices] = \
                         grp.vertex_indices[~grp_flags]
 
-                for old_iel in refining_el_old_indices:
-                    new_iel_base = child_el_indices[old_iel]
-
-                    refining_vertices = np.empty(len(el_tess_info.ref_vertices),
-                        dtype=mesh.vertex_id_dtype)
-                    refining_vertices.fill(-17)
-
-                    # carry over old vertices
-                    refining_vertices[el_tess_info.orig_vertex_indices] = \
-                            grp.vertex_indices[old_iel]
-
-                    for imidpoint, (iref_midpoint, (v1, v2)) in enumerate(zip(
-                            el_tess_info.midpoint_indices,
-                            el_tess_info.midpoint_vertex_pairs,
-                            strict=True)):
-
-                        global_v1 = grp.vertex_indices[old_iel, v1]
-                        global_v2 = grp.vertex_indices[old_iel, v2]
-
-                        if global_v1 > global_v2:
-                            global_v1, global_v2 = global_v2, global_v1
+                refining_vertices = np.empty(
+                    (nrefining_elements, len(el_tess_info.ref_vertices)),
+                    dtype=mesh.vertex_id_dtype)
+                refining_vertices.fill(-17)
 
-                        try:
-                            global_midpoint = self.global_vertex_pair_to_midpoint[
-                                    global_v1, global_v2]
-                        except KeyError:
-                            global_midpoint = inew_vertex
-                            additional_vertices.append(
-                                    midpoints[old_iel][:, imidpoint])
-                            self.global_vertex_pair_to_midpoint[
-                                    global_v1, global_v2] = global_midpoint
-                            inew_vertex += 1
+                # carry over old vertices
+                refining_vertices[:, el_tess_info.orig_vertex_indices] = \
+                        grp.vertex_indices[refining_el_old_indices]
 
-                        refining_vertices[iref_midpoint] = global_midpoint
+                refining_vertices[:, el_tess_info.midpoint_indices] = (
+                    midpoint_vertex_indices[
+                        midpoint_offset:
+                        midpoint_offset + nrefining_elements * nmidpoints]
+                    .reshape(nrefining_elements, nmidpoints))
+                midpoint_offset += nrefining_elements * nmidpoints
 
-                    assert (refining_vertices >= 0).all()
+                assert (refining_vertices >= 0).all()
 
-                    new_vertex_indices[new_iel_base:new_iel_base+nchildren] = \
-                            refining_vertices[el_tess_info.children]
+                new_vertex_indices[refining_el_new_indices] = \
+                        refining_vertices[:, el_tess_info.children]
 
                 assert (new_vertex_indices >= 0).all()
             else:
@@ -193,18 +322,15 @@ class RefinerWithoutAdjacency(Refiner):
                 (mesh.ambient_dim, new_nelements, grp.nunit_nodes),
                 dtype=grp.nodes.dtype)
 
-            new_nodes.fill(float("nan"))
+            if __debug__:
+                new_nodes.fill(float("nan"))
 
             # copy over unchanged nodes
             new_nodes[:, unrefined_el_new_indices] = grp.nodes[:, ~grp_flags]
 
-            tessellated_nodes = get_group_tessellated_nodes(
-                    grp, el_tess_info, refining_el_old_indices)
-
-            for old_iel in refining_el_old_indices:
-                new_iel_base = child_el_indices[old_iel]
-                new_nodes[:, new_iel_base:new_iel_base+nchildren, :] = \
-                        tessellated_nodes[old_iel]
+            new_nodes[:, refining_el_new_indices] = \
+                    get_group_tessellated_node_array(
+                        grp, el_tess_info, refining_el_old_indices)
 
             assert (~np.isnan(new_nodes)).all()
 
@@ -217,15 +343,6 @@ class RefinerWithoutAdjacency(Refiner):
                     nodes=new_nodes,
                     unit_nodes=grp.unit_nodes))
 
-        if perform_vertex_updates:
-            new_vertices = np.empty(
-                    (mesh.ambient_dim, mesh.nvertices + len(additional_vertices)),
-                    mesh.vertices.dtype)
-            new_vertices[:, :mesh.nvertices] = mesh.vertices
-            new_vertices[:, mesh.nvertices:] = np.array(additional_vertices).T
-        else:
-            new_vertices = None
-
         from meshmode.mesh import make_mesh
         new_mesh = make_mesh(new_vertices, new_el_groups, is_conforming=(
             mesh.is_conforming
@@ -87,14 +87,46 @@ class GroupRefinementRecord:
         An instance of :class:`ElementTessellationInfo` that describes the
         tessellation of a single element into multiple child elements.
 
-    .. attribute:: element_mapping
+    .. attribute:: child_element_starts
 
-        A mapping from the original elements to the refined child elements.
+        An array of shape ``(nelements + 1,)``. The (group-relative) child
+        elements of the original element *iel* are given by
+        ``child_elements[child_element_starts[iel]:child_element_starts[iel+1]]``.
+        Elements that were not refined have exactly one child, while refined
+        elements have one child for each entry in
+        :attr:`ElementTessellationInfo.children`, in the same order.
+
+    .. attribute:: child_elements
+
+        An array of (group-relative) element indices in the refined mesh,
+        see :attr:`child_element_starts`.
+
+    .. autoproperty:: element_mapping
     """
 
     el_tess_info: ElementTessellationInfo
-    # FIXME: This should really be a CSR data structure.
-    element_mapping: list[list[int]]
+    child_element_starts: np.ndarray
+    child_elements: np.ndarray
+
+    @property
+    def element_mapping(self) -> list[list[int]]:
+        """A list containing the list of child elements for each original
+        element.
+
+        .. deprecated:: 2024.1
+
+            Use :attr:`child_element_starts` and :attr:`child_elements` instead.
+        """
+        from warnings import warn
+        warn("GroupRefinementRecord.element_mapping is deprecated and will be "
+             "removed in 2025. Use 'child_element_starts' and 'child_elements' "
+             "instead.", DeprecationWarning, stacklevel=2)
+
+        return [
+            self.child_elements[start:end].tolist()
+            for start, end in zip(
+                self.child_element_starts[:-1],
+                self.child_element_starts[1:], strict=True)]
 
 
 @singledispatch
@@ -130,6 +162,44 @@ def get_group_tessellated_nodes(meg: MeshElementGroup, el_tess_info, elements):
     raise NotImplementedError(type(meg).__name__)
 
 
+@singledispatch
+def get_group_midpoint_array(meg: MeshElementGroup, el_tess_info, elements):
+    """Compute the midpoints of the vertices of the specified elements.
+
+    :arg elements: an array of (group-relative) element numbers.
+    :returns: an :class:`~numpy.ndarray` of shape
+        ``(ambient_dim, len(elements), nmidpoints)``, with the midpoints of
+        each element ordered as in the tessellation.
+    """
+    midpoints = get_group_midpoints(meg, el_tess_info, elements)
+    if len(elements) == 0:
+        return np.empty(
+                (meg.nodes.shape[0], 0, len(el_tess_info.midpoint_indices)),
+                dtype=meg.nodes.dtype)
+
+    return np.stack([midpoints[el] for el in elements], axis=1)
+
+
+@singledispatch
+def get_group_tessellated_node_array(
+        meg: MeshElementGroup, el_tess_info, elements):
+    """Compute the nodes of the child elements according to the tessellation.
+
+    :arg elements: an array of (group-relative) element numbers.
+    :returns: an :class:`~numpy.ndarray` of shape
+        ``(ambient_dim, len(elements), nchildren, nunit_nodes)``, with the
+        child elements of each element ordered as ``el_tess_info.children``.
+    """
+    nodes = get_group_tessellated_nodes(meg, el_tess_info, elements)
+    if len(elements) == 0:
+        return np.empty(
+                (meg.nodes.shape[0], 0, len(el_tess_info.children),
+                    meg.nunit_nodes),
+                dtype=meg.nodes.dtype)
+
+    return np.stack([nodes[el] for el in elements], axis=1)
+
+
 @singledispatch
 def get_group_tessellation_info(meg: MeshElementGroup):
     """
@@ -137,6 +207,20 @@ def get_group_tessellation_info(meg: MeshElementGroup):
     """
     raise NotImplementedError(type(meg).__name__)
 
+
+@singledispatch
+def get_group_multilevel_tessellation_info(meg: MeshElementGroup, nlevels):
+    """
+    :returns: a :class:`ElementTessellationInfo` describing *nlevels* uniform
+        refinements of an element of the group *meg* at once. The
+        :attr:`~ElementTessellationInfo.ref_vertices` are on
+        :math:`[0, 2^n]^d`, where :math:`n` is *nlevels*, and the children
+        are ordered as if the element was refined *nlevels* times in
+        sequence using :func:`get_group_tessellation_info`. The midpoint
+        information is not available.
+    """
+    raise NotImplementedError(type(meg).__name__)
+
 # }}}
 
 
@@ -183,8 +267,8 @@ def _get_ref_midpoints(shape, ref_vertices):
 
 # {{{ modepy.shape tessellation and resampling
 
-@get_group_midpoints.register(ModepyElementGroup)
-def _get_group_midpoints_modepy(
+@get_group_midpoint_array.register(ModepyElementGroup)
+def _get_group_midpoint_array_modepy(
         meg: ModepyElementGroup, el_tess_info, elements):
     shape = meg.shape
     space = meg.space
@@ -198,14 +282,18 @@ def _get_group_midpoints_modepy(
             midpoints.T,
             meg.unit_nodes)
 
-    resampled_midpoints = np.einsum("mu,deu->edm",
-            resampling_mat, meg.nodes[:, elements])
+    return np.einsum("mu,deu->dem", resampling_mat, meg.nodes[:, elements])
 
-    return dict(zip(elements, resampled_midpoints, strict=True))
 
+@get_group_midpoints.register(ModepyElementGroup)
+def _get_group_midpoints_modepy(
+        meg: ModepyElementGroup, el_tess_info, elements):
+    resampled_midpoints = get_group_midpoint_array(meg, el_tess_info, elements)
+    return dict(zip(elements, resampled_midpoints.transpose(1, 0, 2), strict=True))
 
-@get_group_tessellated_nodes.register(ModepyElementGroup)
-def _get_group_tessellated_nodes_modepy(
+
+@get_group_tessellated_node_array.register(ModepyElementGroup)
+def _get_group_tessellated_node_array_modepy(
         meg: ModepyElementGroup, el_tess_info, elements):
     shape = meg.shape
     space = meg.space
@@ -222,16 +310,23 @@ def _get_group_tessellated_nodes_modepy(
             child_unit_nodes,
             meg.unit_nodes)
 
-    resampled_unit_nodes = np.einsum("cu,deu->edc",
+    resampled_unit_nodes = np.einsum("cu,deu->dec",
             resampling_mat, meg.nodes[:, elements])
 
     ambient_dim = len(meg.nodes)
     nunit_nodes = len(meg.unit_nodes[0])
 
-    return {
-            el: resampled_unit_nodes[iel].reshape((ambient_dim, -1, nunit_nodes))
-            for iel, el in enumerate(elements)
-            }
+    return resampled_unit_nodes.reshape(
+            ambient_dim, len(elements), len(el_tess_info.children), nunit_nodes)
+
+
+@get_group_tessellated_nodes.register(ModepyElementGroup)
+def _get_group_tessellated_nodes_modepy(
+        meg: ModepyElementGroup, el_tess_info, elements):
+    resampled_nodes = get_group_tessellated_node_array(
+            meg, el_tess_info, elements)
+
+    return dict(zip(elements, resampled_nodes.transpose(1, 0, 2, 3), strict=True))
 
 
 @get_group_tessellation_info.register(ModepyElementGroup)
@@ -270,6 +365,63 @@ def _get_group_tessellation_info_modepy(meg: ModepyElementGroup):
             midpoint_vertex_pairs=midpoint_vertex_pairs,
             )
 
+
+@get_group_multilevel_tessellation_info.register(ModepyElementGroup)
+def _get_group_multilevel_tessellation_info_modepy(
+        meg: ModepyElementGroup, nlevels):
+    if nlevels < 1:
+        raise ValueError(f"'nlevels' must be positive: {nlevels}")
+
+    el_tess_info = get_group_tessellation_info(meg)
+    if nlevels == 1:
+        return el_tess_info
+
+    shape = meg.shape
+    vertex_tuples = mp.node_tuples_for_space(mp.space_for_shape(shape, 1))
+    vertex_tuple_to_index = {vt: i for i, vt in enumerate(vertex_tuples)}
+
+    # NOTE: children are mapped from their vertex with all-zero node tuple
+    # (the origin) along the edges to the vertices with unit node tuples,
+    # as in map_unit_nodes_to_children
+    origin_index = vertex_tuple_to_index[(0,) * meg.dim]
+    basis_indices = np.array([
+        vertex_tuple_to_index[tuple(int(i == j) for j in range(meg.dim))]
+        for i in range(meg.dim)])
+
+    # shape: (nref_vertices, dim), on [0, 2]^d
+    ref_vertices = np.array(el_tess_info.ref_vertices, dtype=np.int64)
+
+    # shape: (nchildren, nchild_vertices, dim), on [0, 2^level]^d
+    children = ref_vertices[el_tess_info.children]
+    for _ in range(nlevels - 1):
+        origin = children[:, origin_index]
+        basis = children[:, basis_indices] - origin[:, np.newaxis, :]
+
+        # map the children of a single refinement into each current child,
+        # so that the grandchildren of each child are contiguous
+        children = (
+            2 * origin[:, np.newaxis, np.newaxis, :]
+            + np.einsum("kvi,cij->ckvj", ref_vertices[el_tess_info.children], basis)
+            ).reshape(-1, children.shape[1], meg.dim)
+
+    nref_points_1d = 2**nlevels
+    ref_vertices = mp.node_tuples_for_space(
+        mp.space_for_shape(shape, nref_points_1d))
+    ref_vertices_to_index = {rv: i for i, rv in enumerate(ref_vertices)}
+
+    children = np.array([
+        [ref_vertices_to_index[tuple(v)] for v in child]
+        for child in children])
+
+    orig_vertex_indices = np.array([
+        ref_vertices_to_index[tuple(nref_points_1d * vi for vi in vt)]
+        for vt in vertex_tuples])
+
+    return ElementTessellationInfo(
+            ref_vertices=ref_vertices,
+            children=children,
+            orig_vertex_indices=orig_vertex_indices)
+
 # }}}
 
 # vim: foldmethod=marker
@@ -75,6 +75,14 @@ class Refiner(ABC):
 
 # {{{ map child unit nodes
 
+def _get_scaled_ref_vertices(el_tess_info):
+    ref_vertices = np.array(el_tess_info.ref_vertices, dtype=np.float64).T
+
+    # NOTE: the reference vertices of a multi-level tessellation are on
+    # [0, 2^nlevels], so they get scaled back to [0, 2]
+    return 2 * ref_vertices / np.max(ref_vertices)
+
+
 @singledispatch
 def map_unit_nodes_to_children(meg: MeshElementGroup,
         unit_nodes, el_tess_info) -> np.ndarray:
@@ -91,7 +99,7 @@ def map_unit_nodes_to_children(meg: MeshElementGroup,
 
 @map_unit_nodes_to_children.register(SimplexElementGroup)
 def _(meg: SimplexElementGroup, unit_nodes, el_tess_info):
-    ref_vertices = np.array(el_tess_info.ref_vertices, dtype=np.float64).T
+    ref_vertices = _get_scaled_ref_vertices(el_tess_info)
     assert len(unit_nodes.shape) == 2
 
     for child in el_tess_info.children:
@@ -104,7 +112,7 @@ def _(meg: SimplexElementGroup, unit_nodes, el_tess_info):
 
 @map_unit_nodes_to_children.register(TensorProductElementGroup)
 def _(meg: TensorProductElementGroup, unit_nodes, el_tess_info):
-    ref_vertices = np.array(el_tess_info.ref_vertices, dtype=np.float64).T
+    ref_vertices = _get_scaled_ref_vertices(el_tess_info)
     assert len(unit_nodes.shape) == 2
 
     # NOTE: nodes indices in the unit hypercube that form the `e_i` basis
@@ -20,6 +20,10 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 THE SOFTWARE.
 """
 
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
 import numpy as np
 import numpy.linalg as la
 
@@ -32,6 +36,13 @@ __doc__ = """
 .. currentmodule:: meshmode
 
 .. autoclass:: AffineMap
+
+.. currentmodule:: meshmode.mesh.tools
+
+.. autoclass:: ElementLookupIndex
+.. autofunction:: make_element_lookup_index
+.. autoclass:: PointLocationResult
+.. autofunction:: locate_points
 """
 
 
@@ -46,15 +57,446 @@ def make_element_lookup_tree(mesh, eps=1e-12):
     tree = SpatialBinaryTreeBucket(bbox_min, bbox_max)
 
     for igrp, grp in enumerate(mesh.groups):
+        # (ambient_dim, nelements, nvertices)
+        el_vertices = mesh.vertices[:, grp.vertex_indices]
+        el_bbox_min = np.min(el_vertices, axis=-1).T - eps
+        el_bbox_max = np.max(el_vertices, axis=-1).T + eps
+
         for iel_grp in range(grp.nelements):
-            el_vertices = mesh.vertices[:, grp.vertex_indices[iel_grp]]
+            tree.insert((igrp, iel_grp),
+                    (el_bbox_min[iel_grp], el_bbox_max[iel_grp]))
 
-            el_bbox_min = np.min(el_vertices, axis=-1) - eps
-            el_bbox_max = np.max(el_vertices, axis=-1) + eps
+    return tree
 
-            tree.insert((igrp, iel_grp), (el_bbox_min, el_bbox_max))
+# }}}
+
+
+# {{{ point location
+
+def _get_morton_codes(cells: np.ndarray, nbits: int) -> np.ndarray:
+    """
+    :arg cells: an array of shape ``(dim, n)`` of non-negative integer cell
+        coordinates, each of which fits in *nbits* bits.
+    :returns: an array of shape ``(n,)`` of Morton (Z-order) codes obtained
+        by interleaving the bits of the cell coordinates.
+    """
+    dim = cells.shape[0]
+    cells = cells.astype(np.uint64)
+
+    codes = np.zeros(cells.shape[1], dtype=np.uint64)
+    for ibit in range(nbits):
+        for iaxis in range(dim):
+            bit = (cells[iaxis] >> np.uint64(ibit)) & np.uint64(1)
+            codes |= bit << np.uint64(ibit * dim + iaxis)
+
+    return codes
+
+
+def _expand_ranges(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Concatenate ``np.arange(start, start + count)`` for all the given
+    ranges without a Python loop.
+    """
+    offsets = np.cumsum(counts) - counts
+    return (np.arange(np.sum(counts), dtype=np.int64)
+            - np.repeat(offsets - starts, counts))
+
+
+@dataclass(frozen=True)
+class ElementLookupIndex:
+    r"""A flat spatial index of the element bounding boxes of a
+    :class:`~meshmode.mesh.Mesh`.
+
+    The bounding boxes are binned on a uniform grid of cells. The
+    ``(cell, element)`` pairs are then sorted by the Morton code of the cell,
+    so that the elements overlapping a cell are stored contiguously in
+    :attr:`cell_elements`. Both building the index and querying it are
+    vectorized and take :math:`O(n \log n)` operations.
+
+    Instances are created with :func:`make_element_lookup_index`.
+
+    .. attribute:: mesh
+    .. attribute:: cell_size
+
+        Size of the (cubic) cells of the grid.
+
+    .. attribute:: cell_codes
+
+        A sorted array of the Morton codes of the non-empty cells.
+
+    .. attribute:: cell_starts
+
+        An array of shape ``(cell_codes.size + 1,)`` such that the elements
+        overlapping the cell ``cell_codes[i]`` are given by
+        ``cell_elements[cell_starts[i]:cell_starts[i + 1]]``.
+
+    .. attribute:: cell_elements
+
+        An array of global element indices (see
+        :attr:`~meshmode.mesh.Mesh.base_element_nrs`).
+
+    .. automethod:: find_candidates
+
+    .. versionadded:: 2024.1
+    """
+
+    mesh: Any
+
+    origin: np.ndarray
+    cell_size: float
+    ncells: np.ndarray
+    nbits: int
+
+    element_bbox_min: np.ndarray
+    element_bbox_max: np.ndarray
+
+    cell_codes: np.ndarray
+    cell_starts: np.ndarray
+    cell_elements: np.ndarray
+
+    def _get_cells(self, points: np.ndarray) -> np.ndarray:
+        return np.floor((points - self.origin.reshape(-1, 1))
+                / self.cell_size).astype(np.int64)
+
+    def find_candidates(
+            self, points: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Find the elements whose bounding box contains each point.
+
+        :arg points: an array of shape ``(ambient_dim, npoints)``.
+        :returns: a tuple ``(point_indices, element_indices)`` of arrays of
+            the same size, listing all the matching pairs. The element
+            indices are global element indices.
+        """
+        points = np.asarray(points, dtype=np.float64)
+        if points.ndim != 2 or points.shape[0] != self.mesh.ambient_dim:
+            raise ValueError(
+                "'points' must have shape (ambient_dim, npoints): "
+                f"got {points.shape}")
+
+        cells = self._get_cells(points)
+        in_grid, = np.nonzero(np.all(
+            (cells >= 0) & (cells < self.ncells.reshape(-1, 1)), axis=0))
+
+        codes = _get_morton_codes(cells[:, in_grid], self.nbits)
+        icell = np.searchsorted(self.cell_codes, codes)
+        icell = np.minimum(icell, self.cell_codes.size - 1)
+
+        found = self.cell_codes[icell] == codes
+        in_grid = in_grid[found]
+        icell = icell[found]
+
+        starts = self.cell_starts[icell]
+        counts = self.cell_starts[icell + 1] - starts
+
+        point_indices = np.repeat(in_grid, counts)
+        element_indices = self.cell_elements[_expand_ranges(starts, counts)]
+
+        candidate_points = points[:, point_indices]
+        in_bbox = np.all(
+            (self.element_bbox_min[:, element_indices] <= candidate_points)
+            & (candidate_points <= self.element_bbox_max[:, element_indices]),
+            axis=0)
+
+        return point_indices[in_bbox], element_indices[in_bbox]
+
+
+def make_element_lookup_index(
+        mesh, *,
+        eps: float = 1.0e-12,
+        element_margin: float = 0.1,
+        cell_size: float | None = None) -> ElementLookupIndex:
+    """Build an :class:`ElementLookupIndex` for the elements in *mesh*.
+
+    The bounding boxes are computed from the element nodes. Since curved
+    elements can extend beyond the bounding box of their nodes, the boxes
+    are grown by *element_margin*.
+
+    :arg eps: relative amount by which the element bounding boxes are grown,
+        with respect to the size of the mesh bounding box.
+    :arg element_margin: relative amount by which the element bounding boxes
+        are grown, with respect to their own size.
+    :arg cell_size: the size of the grid cells. By default, this is the
+        median size of the element bounding boxes, so that each element
+        overlaps only a few cells.
+
+    .. versionadded:: 2024.1
+    """
+    ambient_dim = mesh.ambient_dim
+    if mesh.nelements == 0:
+        raise ValueError("cannot build a lookup index for an empty mesh")
+
+    element_bbox_min = np.concatenate(
+        [np.min(grp.nodes, axis=-1) for grp in mesh.groups], axis=1)
+    element_bbox_max = np.concatenate(
+        [np.max(grp.nodes, axis=-1) for grp in mesh.groups], axis=1)
+
+    element_extent = element_margin * np.max(
+        element_bbox_max - element_bbox_min, axis=0)
+    element_bbox_min = element_bbox_min - element_extent
+    element_bbox_max = element_bbox_max + element_extent
+
+    origin = np.min(element_bbox_min, axis=1)
+    extent = np.max(element_bbox_max, axis=1) - origin
+    pad = eps * max(np.max(extent), 1.0)
+    element_bbox_min = element_bbox_min - pad
+    element_bbox_max = element_bbox_max + pad
+    origin = origin - 2 * pad
+    extent = extent + 4 * pad
+
+    # NOTE: the Morton codes are stored in 64 bits
+    nbits = min(64 // ambient_dim, 32)
+    max_ncells = 2**nbits
+
+    if cell_size is None:
+        cell_size = float(np.median(
+            np.max(element_bbox_max - element_bbox_min, axis=0)))
+    cell_size = max(cell_size, float(np.max(extent)) / max_ncells)
+
+    ncells = np.maximum(np.ceil(extent / cell_size).astype(np.int64), 1)
+
+    # {{{ expand elements into (cell, element) pairs
+
+    def get_cells(points):
+        cells = np.floor((points - origin.reshape(-1, 1)) / cell_size)
+        return np.clip(cells.astype(np.int64), 0, ncells.reshape(-1, 1) - 1)
+
+    cell_min = get_cells(element_bbox_min)
+    cell_extent = get_cells(element_bbox_max) - cell_min + 1
+    counts = np.prod(cell_extent, axis=0)
+
+    elements = np.repeat(np.arange(mesh.nelements), counts)
+    offsets = _expand_ranges(np.zeros_like(counts), counts)
+
+    cells = np.empty((ambient_dim, elements.size), dtype=np.int64)
+    for iaxis in range(ambient_dim):
+        axis_extent = cell_extent[iaxis, elements]
+        cells[iaxis] = cell_min[iaxis, elements] + offsets % axis_extent
+        offsets = offsets // axis_extent
+
+    # }}}
+
+    codes = _get_morton_codes(cells, nbits)
+    order = np.argsort(codes, kind="stable")
+    codes = codes[order]
+
+    cell_codes, cell_starts = np.unique(codes, return_index=True)
+    cell_starts = np.append(cell_starts, codes.size)
+
+    return ElementLookupIndex(
+        mesh=mesh,
+        origin=origin,
+        cell_size=cell_size,
+        ncells=ncells,
+        nbits=nbits,
+        element_bbox_min=element_bbox_min,
+        element_bbox_max=element_bbox_max,
+        cell_codes=cell_codes,
+        cell_starts=cell_starts,
+        cell_elements=elements[order])
 
-    return tree
+
+@dataclass(frozen=True)
+class PointLocationResult:
+    """The result of :func:`locate_points`. Points that were not found in
+    any element have a group and element index of *-1* and *NaN* unit
+    coordinates.
+
+    .. attribute:: group_indices
+
+        An array of shape ``(npoints,)`` with the index of the group that
+        contains each point.
+
+    .. attribute:: element_indices
+
+        An array of shape ``(npoints,)`` with the index of the element (in
+        its group) that contains each point.
+
+    .. attribute:: unit_nodes
+
+        An array of shape ``(dim, npoints)`` with the coordinates of each
+        point on the reference element.
+
+    .. attribute:: found
+
+        A boolean array of shape ``(npoints,)`` that is *True* for the points
+        that were located.
+
+    .. versionadded:: 2024.1
+    """
+
+    group_indices: np.ndarray
+    element_indices: np.ndarray
+    unit_nodes: np.ndarray
+
+    @property
+    def found(self) -> np.ndarray:
+        return self.group_indices >= 0
+
+
+def _is_in_reference_element(shape, unit_nodes: np.ndarray, tol: float):
+    import modepy as mp
+    if isinstance(shape, mp.Simplex):
+        return (np.all(unit_nodes >= -1 - tol, axis=0)
+                & (np.sum(unit_nodes, axis=0) <= -(shape.dim - 2) + tol))
+    elif isinstance(shape, mp.Hypercube):
+        return np.all(np.abs(unit_nodes) <= 1 + tol, axis=0)
+    else:
+        raise TypeError(f"unsupported shape: '{type(shape).__name__}'")
+
+
+def _invert_element_map(grp, elements: np.ndarray, points: np.ndarray, *,
+        tol: float, max_iterations: int) -> tuple[np.ndarray, np.ndarray]:
+    """Find the reference coordinates of *points* in the (possibly curved)
+    *elements* of *grp* by (Gauss-)Newton iteration, vectorized over all the
+    points.
+
+    :returns: a tuple ``(unit_nodes, residual)``, where the residual is the
+        distance between *points* and their image under the element map.
+    """
+    import modepy as mp
+    basis = mp.basis_for_space(grp.space, grp.shape)
+    vdm_inv = la.inv(mp.vandermonde(basis.functions, grp.unit_nodes))
+
+    # (ambient_dim, npoints, nbasis)
+    modal_nodes = np.einsum("bn,aen->aeb", vdm_inv, grp.nodes[:, elements])
+
+    def apply_map(unit_nodes, indices):
+        phi = np.array([f(unit_nodes) for f in basis.functions])
+        return np.einsum("aeb,be->ae", modal_nodes[:, indices], phi)
+
+    def get_map_jacobian(unit_nodes, indices):
+        dphi = np.array([
+            df(unit_nodes) for df in basis.gradients]).reshape(
+                    len(basis.gradients), grp.dim, -1)
+        return np.einsum("aeb,bre->ear", modal_nodes[:, indices], dphi)
+
+    initial_guess = np.mean(grp.vertex_unit_coordinates(), axis=0)
+    unit_nodes = np.empty((grp.dim, points.shape[1]))
+    unit_nodes[:] = initial_guess.reshape(-1, 1)
+
+    active = np.arange(points.shape[1])
+    for _ in range(max_iterations):
+        if active.size == 0:
+            break
+
+        resid = apply_map(unit_nodes[:, active], active) - points[:, active]
+        jac = get_map_jacobian(unit_nodes[:, active], active)
+
+        # NOTE: the normal equations also handle manifold elements
+        # (dim < ambient_dim). They are slightly regularized so that the
+        # (rare) degenerate Jacobians of points far outside the element do
+        # not make the whole batch fail.
+        jtj = np.einsum("ear,eas->ers", jac, jac)
+        jtr = np.einsum("ear,ae->er", jac, resid)
+        jtj += (1.0e-14 * np.trace(jtj, axis1=1, axis2=2).reshape(-1, 1, 1)
+                * np.eye(grp.dim))
+        step = np.linalg.solve(jtj, jtr[..., np.newaxis])[..., 0].T
+
+        # NOTE: points outside the element can make the iteration diverge,
+        # so keep the iterates in a neighborhood of the reference element
+        unit_nodes[:, active] = np.clip(unit_nodes[:, active] - step, -4, 4)
+
+        active = active[np.max(np.abs(step), axis=0) > tol]
+
+    residual = la.norm(
+        apply_map(unit_nodes, slice(None)) - points, axis=0)
+    return unit_nodes, residual
+
+
+def locate_points(
+        mesh, points: np.ndarray, *,
+        index: ElementLookupIndex | None = None,
+        tol: float = 1.0e-10,
+        max_iterations: int = 20) -> PointLocationResult:
+    """Find the elements of *mesh* that contain *points* and the reference
+    coordinates of the points in those elements. For curved elements, the
+    element maps are inverted by Newton iteration, vectorized over all the
+    candidate ``(point, element)`` pairs of each group.
+
+    For manifold meshes (with ``dim < ambient_dim``), a point is found if it
+    lies on an element, up to the tolerance.
+
+    :arg points: an array of shape ``(ambient_dim, npoints)``.
+    :arg index: an :class:`ElementLookupIndex` for *mesh*, which can be
+        reused for multiple calls. If not given, one is built by
+        :func:`make_element_lookup_index`.
+    :arg tol: tolerance, relative to the element sizes, used to decide if a
+        point is inside an element.
+
+    :returns: a :class:`PointLocationResult`. If a point is in multiple
+        elements (e.g. on a shared face), one of them is chosen arbitrarily.
+
+    .. versionadded:: 2024.1
+    """
+    if index is None:
+        index = make_element_lookup_index(mesh)
+    elif index.mesh is not mesh:
+        raise ValueError("'index' was not built for 'mesh'")
+
+    points = np.asarray(points, dtype=np.float64)
+    point_indices, element_indices = index.find_candidates(points)
+
+    npoints = points.shape[1]
+    group_indices = np.full(npoints, -1, dtype=np.int64)
+    result_element_indices = np.full(npoints, -1, dtype=np.int64)
+    unit_nodes = np.full((mesh.dim, npoints), np.nan)
+
+    base_element_nrs = np.array(mesh.base_element_nrs)
+    candidate_groups = np.searchsorted(
+            base_element_nrs, element_indices, side="right") - 1
+
+    el_bbox_min = index.element_bbox_min[:, element_indices]
+    el_bbox_max = index.element_bbox_max[:, element_indices]
+    el_size = np.max(el_bbox_max - el_bbox_min, axis=0)
+
+    # {{{ rank candidates by distance
+
+    # NOTE: the candidates of each point are tried in order of the
+    # (relative) distance to the center of their bounding box, so that most
+    # points only need a single Newton solve
+    distance = la.norm(
+        points[:, point_indices] - (el_bbox_min + el_bbox_max) / 2,
+        axis=0) / el_size
+
+    order = np.lexsort((distance, point_indices))
+    point_indices = point_indices[order]
+    element_indices = element_indices[order]
+    candidate_groups = candidate_groups[order]
+    el_size = el_size[order]
+
+    _, counts = np.unique(point_indices, return_counts=True)
+    ranks = _expand_ranges(np.zeros_like(counts), counts)
+
+    # }}}
+
+    for rank in range(np.max(counts, initial=0)):
+        is_rank = (ranks == rank) & (group_indices[point_indices] < 0)
+
+        for igrp, grp in enumerate(mesh.groups):
+            is_candidate = is_rank & (candidate_groups == igrp)
+            if not np.any(is_candidate):
+                continue
+
+            grp_points = point_indices[is_candidate]
+            grp_elements = (
+                element_indices[is_candidate] - base_element_nrs[igrp])
+
+            grp_unit_nodes, residual = _invert_element_map(
+                grp, grp_elements, points[:, grp_points],
+                tol=tol, max_iterations=max_iterations)
+
+            inside, = np.nonzero(
+                _is_in_reference_element(grp.shape, grp_unit_nodes, tol)
+                & (residual <= tol * el_size[is_candidate]))
+
+            found_points = grp_points[inside]
+            group_indices[found_points] = igrp
+            result_element_indices[found_points] = grp_elements[inside]
+            unit_nodes[:, found_points] = grp_unit_nodes[:, inside]
+
+    return PointLocationResult(
+        group_indices=group_indices,
+        element_indices=result_element_indices,
+        unit_nodes=unit_nodes)
 
 # }}}
 
@@ -77,6 +519,59 @@ def optional_array_equal(a: np.ndarray | None, b: np.ndarray | None) -> bool:
         return np.array_equal(a, b)
 
 
+# {{{ pickling with out-of-band arrays
+
+def _pickle_with_out_of_band_arrays(
+        obj: Any, min_nbytes: int = 4096) -> tuple[bytes, list[np.ndarray]]:
+    """Pickle *obj*, except for any (large enough) :class:`numpy.ndarray`
+    instances contained in it, which are replaced by references into a list
+    of arrays. This allows transferring the arrays by other means (e.g. shared
+    memory or raw MPI buffers) without copying them into the pickle.
+
+    :arg min_nbytes: arrays smaller than this are pickled in-band.
+    :returns: a tuple ``(pickled_obj, arrays)``.
+    """
+    import io
+    import pickle
+
+    arrays: list[np.ndarray] = []
+    array_ids: dict[int, int] = {}
+
+    class OutOfBandArrayPickler(pickle.Pickler):
+        def persistent_id(self, obj: Any) -> int | None:
+            if (type(obj) is not np.ndarray
+                    or obj.dtype.hasobject
+                    or obj.nbytes < min_nbytes):
+                return None
+
+            # NOTE: the arrays are kept alive by *arrays*, so the ids are unique
+            if id(obj) not in array_ids:
+                array_ids[id(obj)] = len(arrays)
+                arrays.append(obj)
+
+            return array_ids[id(obj)]
+
+    buf = io.BytesIO()
+    OutOfBandArrayPickler(buf, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+
+    return buf.getvalue(), arrays
+
+
+def _unpickle_with_out_of_band_arrays(
+        pickled_obj: bytes, arrays: Sequence[np.ndarray]) -> Any:
+    """Inverse of :func:`_pickle_with_out_of_band_arrays`."""
+    import io
+    import pickle
+
+    class OutOfBandArrayUnpickler(pickle.Unpickler):
+        def persistent_load(self, pid: Any) -> np.ndarray:
+            return arrays[pid]
+
+    return OutOfBandArrayUnpickler(io.BytesIO(pickled_obj)).load()
+
+# }}}
+
+
 # {{{ random rotation matrix
 
 def rand_rotation_matrix(ambient_dim, deflection=1.0, randnums=None, rng=None):
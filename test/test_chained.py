@@ -252,6 +252,59 @@ def test_chained_full_resample_matrix(actx_factory, ndim, visualize=False):
     assert np.allclose(f2, f3)
 
 
+@pytest.mark.parametrize("ndim", [2, 3])
+@pytest.mark.parametrize("sparse_format", ["csr", "bsr"])
+def test_chained_sparse_resample_matrix(actx_factory, ndim, sparse_format):
+    pytest.importorskip("scipy")
+
+    from meshmode.discretization.connection.chained import (
+        make_full_resample_matrix,
+        make_sparse_resample_matrix,
+    )
+
+    actx = actx_factory()
+
+    discr = create_discretization(actx, ndim, order=2, nelements=12)
+    connections = []
+    conn = create_refined_connection(actx, discr)
+    connections.append(conn)
+    conn = create_refined_connection(actx, conn.to_discr)
+    connections.append(conn)
+
+    from meshmode.discretization.connection import ChainedDiscretizationConnection
+    chained = ChainedDiscretizationConnection(connections)
+
+    # {{{ compare against dense matrices
+
+    for conn in [*connections, chained]:
+        sparse_mat = make_sparse_resample_matrix(
+                actx, conn, format=sparse_format)
+        assert sparse_mat.format == sparse_format
+
+        dense_mat = actx.to_numpy(make_full_resample_matrix(actx, conn))
+        assert np.allclose(sparse_mat.toarray(), dense_mat)
+
+    # }}}
+
+    # {{{ compare application
+
+    def f(x):
+        from functools import reduce
+        return 0.1 * reduce(lambda x, y: x * actx.np.sin(5 * y), x)
+
+    x = actx.thaw(connections[0].from_discr.nodes())
+    fx = f(x)
+
+    f1 = connections[1](connections[0](fx))
+    f2 = connections[1](
+            connections[0](fx, use_sparse_matrix=True),
+            use_sparse_matrix=True)
+
+    assert flat_norm(f1 - f2, np.inf) / flat_norm(f1) < 1.0e-13
+
+    # }}}
+
+
 @pytest.mark.parametrize(("ndim", "chain_type"), [
     (2, 1), (2, 2), (3, 1), (3, 3)])
 def test_chained_to_direct(actx_factory, ndim, chain_type,
@@ -23,6 +23,7 @@ THE SOFTWARE.
 import logging
 from functools import partial
 
+import numpy as np
 import pytest
 
 from arraycontext import pytest_generate_tests_for_array_contexts
@@ -96,6 +97,72 @@ def test_bdry_restriction_is_permutation(actx_factory, group_factory, dim, order
     assert not bdry_connection_upsample.is_permutation()
 
 
+@pytest.mark.parametrize("ambient_dim", [2, 3])
+@pytest.mark.parametrize("h", [1.0, 0.1, 0.01])
+def test_opposite_face_gauss_newton(actx_factory, ambient_dim, h):
+    """Check that the reference coordinates found by Gauss-Newton on curved
+    elements are accurate enough that elements with the same relative node
+    locations end up in a single interpolation batch.
+    """
+    actx = actx_factory()
+
+    import modepy as mp
+
+    from meshmode.discretization.connection.opposite_face import (
+        _find_src_unit_nodes_batches,
+        _find_src_unit_nodes_via_gauss_newton,
+    )
+    from meshmode.discretization.poly_element import default_simplex_group_factory
+
+    dim = ambient_dim - 1
+    order = 4
+
+    mesh = mgen.generate_regular_rect_mesh(
+            a=(0.0,)*dim, b=(h,)*dim,
+            nelements_per_axis={1: (400,), 2: (14, 14)}[dim],
+            order=order)
+    mesh_grp = mesh.groups[0]
+    grp = default_simplex_group_factory(dim, order)(mesh_grp)
+
+    # curve the elements into the ambient space
+    resampling_mat = mp.resampling_matrix(
+            mp.basis_for_space(mesh_grp.space, mesh_grp.shape).functions,
+            grp.unit_nodes, mesh_grp.unit_nodes)
+    nodes = np.einsum("ij,aej->aei", resampling_mat, mesh_grp.nodes)
+    src_bdry_nodes = np.concatenate([
+        nodes, 0.25 * h * np.prod(np.sin(np.pi * nodes / h), axis=0)[None]])
+
+    # the target nodes are not a permutation of the source nodes
+    centroid = np.mean(mesh_grp.vertex_unit_coordinates(), axis=0)
+    ref_unit_nodes = (
+        centroid[:, np.newaxis]
+        + 0.5 * (grp.unit_nodes - centroid[:, np.newaxis]))
+    tgt_bdry_nodes = np.einsum("ij,aej->aei",
+            mp.resampling_matrix(
+                grp.basis_obj().functions, ref_unit_nodes, grp.unit_nodes),
+            src_bdry_nodes)
+
+    tol = 1e4 * np.finfo(tgt_bdry_nodes.dtype).eps
+    src_unit_nodes = _find_src_unit_nodes_via_gauss_newton(
+            tgt_bdry_nodes=tgt_bdry_nodes,
+            src_bdry_nodes=src_bdry_nodes,
+            src_grp=grp, src_mesh_grp=mesh_grp,
+            tgt_bdry_discr=None, src_bdry_discr=None,
+            tol=tol)
+
+    error = np.max(np.abs(src_unit_nodes - ref_unit_nodes[:, np.newaxis, :]))
+    assert error < 1.0e-12
+
+    element_indices = np.arange(mesh.nelements)
+    batches = list(_find_src_unit_nodes_batches(
+            actx=actx, src_unit_nodes=src_unit_nodes,
+            i_src_grp=0,
+            tgt_bdry_element_indices=element_indices,
+            src_bdry_element_indices=element_indices,
+            tol=tol))
+    assert len(batches) == 1
+
+
 if __name__ == "__main__":
     import sys
     if len(sys.argv) > 1:
@@ -21,7 +21,9 @@ THE SOFTWARE.
 """
 
 import numpy as np
+import pytest
 
+import modepy as mp
 from arraycontext import pytest_generate_tests_for_array_contexts
 
 import meshmode.mesh.generation as mgen
@@ -29,8 +31,12 @@ from meshmode import _acf  # noqa: F401
 from meshmode.array_context import PytestPyOpenCLArrayContextFactory
 from meshmode.discretization import Discretization
 from meshmode.discretization.poly_element import (
+    GaussLegendreTensorProductGroupFactory,
     InterpolatoryQuadratureSimplexGroupFactory,
+    LegendreGaussLobattoTensorProductGroupFactory,
+    ModalTensorProductGroupFactory,
 )
+from meshmode.mesh import TensorProductElementGroup
 
 
 pytest_generate_tests = pytest_generate_tests_for_array_contexts(
@@ -54,6 +60,91 @@ def test_discr_nodes_caching(actx_factory):
     assert discr._cached_nodes is not None
 
 
+@pytest.mark.parametrize("dim", [1, 2, 3])
+@pytest.mark.parametrize("order", [1, 4])
+def test_tensor_product_sum_factorization(actx_factory, dim, order):
+    actx = actx_factory()
+
+    mesh = mgen.generate_regular_rect_mesh(
+            a=(-0.5,)*dim, b=(0.5,)*dim, nelements_per_axis=(3,)*dim,
+            order=order, group_cls=TensorProductElementGroup)
+
+    discr = Discretization(actx, mesh,
+            LegendreGaussLobattoTensorProductGroupFactory(order))
+    grp = discr.groups[0]
+
+    rng = np.random.default_rng(seed=42)
+    ary = rng.random((grp.nelements, grp.nunit_dofs))
+
+    from meshmode.dof_array import DOFArray
+    vec = DOFArray(actx, (actx.from_numpy(ary),))
+
+    # {{{ nodes
+
+    meg = grp.mesh_el_group
+    nodes = actx.to_numpy(discr.nodes()[0][0])
+    ref_nodes = np.einsum("ij,ej->ei",
+            mp.resampling_matrix(
+                mp.basis_for_space(meg.space, meg.shape).functions,
+                grp.unit_nodes, meg.unit_nodes),
+            meg.nodes[0])
+    assert np.allclose(nodes, ref_nodes)
+
+    # }}}
+
+    # {{{ reference derivatives
+
+    from meshmode.discretization import num_reference_derivative
+
+    diff_mats = mp.diff_matrices(grp.basis_obj(), grp.unit_nodes)
+    for ref_axes in [(0,), (dim - 1,), (0, dim - 1, dim - 1)]:
+        ref_mat = np.eye(grp.nunit_dofs)
+        for ref_axis in sorted(ref_axes):
+            ref_mat = diff_mats[ref_axis] @ ref_mat
+
+        result = actx.to_numpy(
+                num_reference_derivative(discr, ref_axes, vec)[0])
+        assert np.allclose(result, ary @ ref_mat.T)
+
+    # }}}
+
+    # {{{ modal connections
+
+    from meshmode.discretization.connection.modal import (
+        ModalToNodalDiscretizationConnection,
+        NodalToModalDiscretizationConnection,
+    )
+    modal_discr = Discretization(actx, mesh, ModalTensorProductGroupFactory(order))
+    vdm = mp.vandermonde(
+            modal_discr.groups[0].basis_obj().functions, grp.unit_nodes)
+
+    modal = NodalToModalDiscretizationConnection(discr, modal_discr)(vec)
+    assert np.allclose(
+            actx.to_numpy(modal[0]), ary @ np.linalg.inv(vdm).T)
+
+    nodal = ModalToNodalDiscretizationConnection(modal_discr, discr)(vec)
+    assert np.allclose(actx.to_numpy(nodal[0]), ary @ vdm.T)
+
+    # }}}
+
+    # {{{ same-mesh resampling
+
+    from meshmode.discretization.connection import make_same_mesh_connection
+
+    to_discr = Discretization(actx, mesh,
+            GaussLegendreTensorProductGroupFactory(order + 1))
+    conn = make_same_mesh_connection(actx, to_discr, discr)
+    assert conn._global_tensor_product_info(actx)[0] is not None
+
+    resample_mat = mp.resampling_matrix(grp.basis_obj().functions,
+            to_discr.groups[0].unit_nodes, grp.unit_nodes)
+    for kwargs in [{}, {"_force_use_loopy": True}]:
+        result = actx.to_numpy(conn(vec, **kwargs)[0])
+        assert np.allclose(result, ary @ resample_mat.T)
+
+    # }}}
+
+
 if __name__ == "__main__":
     import sys
     if len(sys.argv) > 1:
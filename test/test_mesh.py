@@ -285,6 +285,100 @@ def test_remove_unused_vertices():
                   mesh.groups[0].vertex_indices)
 
 
+# {{{ test_nodal_adjacency
+
+@pytest.mark.parametrize("group_cls", [SimplexElementGroup, TensorProductElementGroup])
+@pytest.mark.parametrize("max_chunk_pairs", [None, 1, 37])
+def test_nodal_adjacency(group_cls, max_chunk_pairs):
+    from meshmode.mesh import _compute_nodal_adjacency_from_vertices
+    mesh = mgen.generate_regular_rect_mesh(
+        a=(0, 0, 0), b=(1, 1, 1), nelements_per_axis=(3, 4, 5),
+        group_cls=group_cls)
+
+    # brute force reference: elements are adjacent if they share a vertex
+    vertex_indices, = (grp.vertex_indices for grp in mesh.groups)
+    shares_vertex = np.array([
+        [bool(set(vi_i) & set(vi_j)) for vi_j in vertex_indices]
+        for vi_i in vertex_indices])
+    np.fill_diagonal(shares_vertex, False)
+
+    adj = _compute_nodal_adjacency_from_vertices(
+        mesh, max_chunk_pairs=max_chunk_pairs)
+
+    assert adj.neighbors_starts.dtype == mesh.element_id_dtype
+    assert adj.neighbors.dtype == mesh.element_id_dtype
+    assert len(adj.neighbors_starts) == mesh.nelements + 1
+
+    for iel in range(mesh.nelements):
+        nbs = adj.neighbors[adj.neighbors_starts[iel]:adj.neighbors_starts[iel+1]]
+        assert np.array_equal(nbs, np.where(shares_vertex[iel])[0])
+
+# }}}
+
+
+# {{{ test_hashed_face_matching
+
+@pytest.mark.parametrize("group_cls", [SimplexElementGroup, TensorProductElementGroup])
+@pytest.mark.parametrize("dim", [2, 3])
+def test_hashed_face_matching(group_cls, dim):
+    from meshmode.mesh import (
+        _compute_facial_adjacency_from_vertices,
+        _FaceIDs,
+        _match_faces_by_vertices,
+        _match_faces_by_vertices_hashed,
+    )
+    mesh = mgen.generate_regular_rect_mesh(
+        a=(0,)*dim, b=(1,)*dim, nelements_per_axis=(3, 4, 5)[:dim],
+        group_cls=group_cls)
+    grp, = mesh.groups
+
+    indices = np.indices((grp.nfaces, grp.nelements))
+    face_ids = _FaceIDs(
+        groups=np.zeros(grp.nelements * grp.nfaces, dtype=np.int64),
+        elements=indices[1].flatten(),
+        faces=indices[0].flatten())
+
+    def normalize(face_index_pairs):
+        return sorted(map(tuple, face_index_pairs.T.tolist()))
+
+    ref_pairs = _match_faces_by_vertices(mesh.groups, face_ids)
+    for max_chunk_faces in [None, 1, 7]:
+        pairs = _match_faces_by_vertices_hashed(
+            mesh.groups, face_ids, max_chunk_faces=max_chunk_faces)
+        assert np.all(pairs[0] < pairs[1])
+        assert normalize(pairs) == normalize(ref_pairs)
+
+    ref_fagrps = _compute_facial_adjacency_from_vertices(
+        mesh.groups, mesh.element_id_dtype, mesh.face_id_dtype)
+    fagrps = _compute_facial_adjacency_from_vertices(
+        mesh.groups, mesh.element_id_dtype, mesh.face_id_dtype,
+        face_matching="hash")
+    assert fagrps == ref_fagrps
+
+    hashed_mesh = make_mesh(
+        mesh.vertices, mesh.groups, is_conforming=True, face_matching="hash")
+    assert hashed_mesh.facial_adjacency_groups == mesh.facial_adjacency_groups
+
+# }}}
+
+
+def test_pickle_with_out_of_band_arrays():
+    from meshmode.mesh.tools import (
+        _pickle_with_out_of_band_arrays,
+        _unpickle_with_out_of_band_arrays,
+    )
+    mesh = mgen.generate_box_mesh(3*(np.linspace(0, 1, 5),))
+    assert mesh.facial_adjacency_groups
+
+    pickled_mesh, arrays = _pickle_with_out_of_band_arrays(mesh, min_nbytes=0)
+    assert any(ary is mesh.vertices for ary in arrays)
+    assert len(pickled_mesh) < sum(ary.nbytes for ary in arrays)
+
+    mesh_2 = _unpickle_with_out_of_band_arrays(
+        pickled_mesh, [ary.copy() for ary in arrays])
+    assert mesh_2 == mesh
+
+
 # {{{ as_python stringification
 
 def test_mesh_as_python():
@@ -818,6 +912,74 @@ def test_lookup_tree(visualize=False):
 # }}}
 
 
+# {{{ test point location
+
+@pytest.mark.parametrize(("mesh_name", "dim"), [
+    ("warped", 2),
+    ("warped", 3),
+    ("tensor", 2),
+    ("curve", 2),
+    ("torus", 3),
+    ])
+def test_locate_points(mesh_name, dim):
+    order = 3
+    npoints = 500
+    if mesh_name == "warped":
+        mesh = mgen.generate_warped_rect_mesh(dim, order=order, nelements_side=6)
+    elif mesh_name == "tensor":
+        mesh = mgen.generate_regular_rect_mesh(
+            a=(0,)*dim, b=(1,)*dim, nelements_per_axis=(6,)*dim,
+            order=order, group_cls=TensorProductElementGroup)
+    elif mesh_name == "curve":
+        mesh = mgen.make_curve_mesh(
+            mgen.starfish, np.linspace(0, 1, 64), order=order)
+    elif mesh_name == "torus":
+        mesh = mgen.generate_torus(5.0, 1.0, order=order)
+    else:
+        raise ValueError(f"unknown mesh: '{mesh_name}'")
+
+    # {{{ sample random points in random elements
+
+    import modepy as mp
+    grp, = mesh.groups
+    rng = np.random.default_rng(seed=42)
+
+    elements = rng.integers(grp.nelements, size=npoints)
+    if isinstance(grp, TensorProductElementGroup):
+        unit_nodes = rng.uniform(-1, 1, size=(grp.dim, npoints))
+    else:
+        unit_nodes = 2 * rng.dirichlet(
+            np.ones(grp.dim + 1), size=npoints).T[:grp.dim] - 1
+
+    basis = mp.basis_for_space(grp.space, grp.shape)
+    vdm_inv = la.inv(mp.vandermonde(basis.functions, grp.unit_nodes))
+    basis_at_nodes = np.array([f(unit_nodes) for f in basis.functions])
+    points = np.einsum("bn,aen,be->ae",
+        vdm_inv, grp.nodes[:, elements], basis_at_nodes)
+
+    # }}}
+
+    from meshmode.mesh.tools import locate_points, make_element_lookup_index
+    index = make_element_lookup_index(mesh)
+    result = locate_points(mesh, points, index=index)
+
+    assert np.all(result.found)
+    assert np.all(result.group_indices == 0)
+
+    # NOTE: points on shared faces can be found in either element
+    same_element = result.element_indices == elements
+    assert np.mean(same_element) > 0.99
+    assert np.allclose(
+        result.unit_nodes[:, same_element], unit_nodes[:, same_element],
+        atol=1.0e-10)
+
+    # points outside the mesh are not found
+    far_points = np.full((mesh.ambient_dim, 8), 1.0e3)
+    assert not np.any(locate_points(mesh, far_points, index=index).found)
+
+# }}}
+
+
 # {{{ test boundary tags
 
 def test_boundary_tags():
@@ -879,6 +1041,214 @@ def test_volume_tags():
 # }}}
 
 
+# {{{ test gmsh 4.x reader
+
+def _convert_gmsh_v2_to_v41(v2_filename, v41_filename, binary):
+    from meshmode.mesh.io import GmshMeshReceiver
+    el_type_map = GmshMeshReceiver.gmsh_element_type_to_info_map
+
+    sections = {}
+    with open(v2_filename) as inf:
+        lines = [line.strip() for line in inf if line.strip()]
+    while lines:
+        name = lines.pop(0)[1:]
+        end = lines.index(f"$End{name}")
+        sections[name], lines = lines[:end], lines[end + 1:]
+
+    nodes = [line.split() for line in sections["Nodes"][1:]]
+    entity_to_physical_tags = {}
+    entity_type_to_elements = {}
+    for line in sections["Elements"][1:]:
+        el_tag, el_type_num, ntags, *rest = (int(v) for v in line.split())
+        tags, node_tags = rest[:ntags], rest[ntags:]
+
+        # physical tags belong to entities in v4, so use one entity for each
+        # set of physical tags
+        dim = el_type_map[el_type_num].dimensions
+        physical_tags = tuple(tag for tag in tags[:1] if tag != 0)
+        entity = next(
+            (entity for entity, entity_physical_tags
+             in entity_to_physical_tags.items()
+             if entity[0] == dim and entity_physical_tags == physical_tags),
+            (dim, len(entity_to_physical_tags) + 1))
+        entity_to_physical_tags[entity] = physical_tags
+        entity_type_to_elements.setdefault((entity, el_type_num), []).append(
+            [el_tag, *node_tags])
+
+    with open(v41_filename, "wb") as outf:
+        def write(dtype, values):
+            if binary:
+                outf.write(np.array(values, dtype=dtype).tobytes())
+            else:
+                outf.write((" ".join(
+                    repr(float(v)) if dtype == "f8" else str(v) for v in values)
+                    + "\n").encode())
+
+        outf.write(f"$MeshFormat\n4.1 {int(binary)} 8\n".encode())
+        if binary:
+            write("i4", [1])
+            outf.write(b"\n")
+        outf.write(b"$EndMeshFormat\n")
+
+        if "PhysicalNames" in sections:
+            outf.write("\n".join(
+                ["$PhysicalNames", *sections["PhysicalNames"], "$EndPhysicalNames",
+                 ""]).encode())
+
+        outf.write(b"$Entities\n")
+        write("u8", [
+            sum(1 for dim, _ in entity_to_physical_tags if dim == i)
+            for i in range(4)])
+        for (dim, entity_tag), physical_tags in sorted(
+                entity_to_physical_tags.items()):
+            write("i4", [entity_tag])
+            write("f8", [0.0] * (3 if dim == 0 else 6))
+            write("u8", [len(physical_tags)])
+            write("i4", physical_tags)
+            if dim > 0:
+                write("u8", [0])
+        outf.write(b"\n$EndEntities\n" if binary else b"$EndEntities\n")
+
+        # write the nodes in two blocks, in reverse order, followed by an
+        # empty block
+        node_blocks = [nodes[len(nodes) // 2:], nodes[:len(nodes) // 2], []]
+        outf.write(b"$Nodes\n")
+        write("u8", [len(node_blocks), len(nodes), 1, len(nodes)])
+        for block in node_blocks:
+            write("i4", [0, 1, 0])
+            write("u8", [len(block)])
+            for node in block:
+                write("u8", [int(node[0])])
+            for node in block:
+                write("f8", [float(x) for x in node[1:]])
+        outf.write(b"\n$EndNodes\n" if binary else b"$EndNodes\n")
+
+        # write boundary elements first, so that elements are not ordered by tag
+        outf.write(b"$Elements\n")
+        write("u8", [len(entity_type_to_elements),
+                     sum(len(els) for els in entity_type_to_elements.values()),
+                     1, sum(len(els) for els in entity_type_to_elements.values())])
+        for ((dim, entity_tag), el_type_num), elements in sorted(
+                entity_type_to_elements.items()):
+            write("i4", [dim, entity_tag, el_type_num])
+            write("u8", [len(elements)])
+            for element in elements:
+                write("u8", element)
+        outf.write(b"\n$EndElements\n" if binary else b"$EndElements\n")
+
+
+@pytest.mark.parametrize("filename", [
+    "annulus.msh",
+    "blob2d-order4-h8e-2.msh",
+    "cubed-cube.msh",
+    "gh-394.msh",
+    "testmesh_multivol.msh",
+    ])
+@pytest.mark.parametrize("binary", [False, True])
+def test_read_gmsh_v41(tmp_path, filename, binary):
+    v41_filename = str(tmp_path / filename)
+    _convert_gmsh_v2_to_v41(str(thisdir / filename), v41_filename, binary)
+
+    mesh, tag_to_elements = mio.read_gmsh(
+        str(thisdir / filename), return_tag_to_elements_map=True)
+    mesh_v41, tag_to_elements_v41 = mio.read_gmsh(
+        v41_filename, return_tag_to_elements_map=True)
+
+    assert np.array_equal(mesh_v41.vertices, mesh.vertices)
+    assert mesh_v41.groups == mesh.groups
+    assert mesh_v41.is_conforming == mesh.is_conforming
+
+    assert tag_to_elements_v41.keys() == tag_to_elements.keys()
+    for tag, elements in tag_to_elements.items():
+        assert np.array_equal(tag_to_elements_v41[tag], elements)
+
+    if mesh.is_conforming:
+        def get_bdry_elements(mesh):
+            return {
+                (igrp, fagrp.boundary_tag):
+                    set(zip(fagrp.elements, fagrp.element_faces, strict=True))
+                for igrp, fagrps in enumerate(mesh.facial_adjacency_groups)
+                for fagrp in fagrps
+                if isinstance(fagrp, BoundaryAdjacencyGroup)}
+
+        assert get_bdry_elements(mesh_v41) == get_bdry_elements(mesh)
+
+
+def test_read_gmsh_v41_empty_node_block():
+    # the node section has empty entity blocks in the middle and at the end
+    mesh, tag_to_elements = mio.read_gmsh(
+        str(thisdir / "gmsh-v41-empty-node-block.msh"),
+        force_ambient_dim=2, return_tag_to_elements_map=True)
+
+    assert mesh.nvertices == 4
+    assert mesh.nelements == 2
+    assert np.array_equal(
+        np.sort(mesh.vertices, axis=1),
+        np.array([[0, 0, 1, 1], [0, 0, 1, 1]], dtype=np.float64))
+    assert np.array_equal(tag_to_elements["domain"], np.arange(2))
+
+# }}}
+
+
+# {{{ test binary mesh format
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_write_read_mesh(tmp_path, mmap):
+    from meshmode.mesh import BTAG_PARTITION, InterPartAdjacencyGroup
+
+    mesh = mgen.generate_box_mesh(
+        3*(np.linspace(0, 1, 5),), order=2,
+        boundary_tag_to_face={"left": ["-x"], "right": ["+x"]})
+    assert mesh.nodal_adjacency is not None
+
+    part_id_to_part = mproc.partition_mesh(mesh, {
+        "left": np.arange(mesh.nelements // 2),
+        ("right", 1): np.arange(mesh.nelements // 2, mesh.nelements),
+        })
+    part = part_id_to_part["left"]
+    assert any(
+        isinstance(fagrp, InterPartAdjacencyGroup)
+        and fagrp.boundary_tag == BTAG_PARTITION(("right", 1))
+        for fagrp in part.facial_adjacency_groups[0])
+
+    for i, m in enumerate([mesh, part, mesh.copy(_facial_adjacency_groups=False)]):
+        mio.write_mesh(m, str(tmp_path / f"mesh{i}"))
+        m_read = mio.read_mesh(str(tmp_path / f"mesh{i}"), mmap=mmap)
+
+        assert m_read == m
+        assert isinstance(m_read.groups[0].nodes, np.memmap) == mmap
+
+    with pytest.raises(FileExistsError):
+        mio.write_mesh(mesh, str(tmp_path / "mesh0"))
+
+
+def test_write_read_mesh_unsupported(tmp_path):
+    import json
+
+    class CustomTag:
+        pass
+
+    mesh = mgen.generate_box_mesh(
+        2*(np.linspace(0, 1, 3),), order=1,
+        boundary_tag_to_face={CustomTag: ["-x"]})
+    with pytest.raises(TypeError):
+        mio.write_mesh(mesh, str(tmp_path / "custom_tag"))
+
+    # group types are not imported from arbitrary modules
+    mesh = mgen.generate_box_mesh(2*(np.linspace(0, 1, 3),), order=1)
+    mio.write_mesh(mesh, str(tmp_path / "mesh"))
+
+    manifest_filename = tmp_path / "mesh" / "manifest.json"
+    manifest = json.loads(manifest_filename.read_text())
+    manifest["groups"][0]["type"] = "os.system"
+    manifest_filename.write_text(json.dumps(manifest))
+
+    with pytest.raises(ValueError):
+        mio.read_mesh(str(tmp_path / "mesh"))
+
+# }}}
+
+
 # {{{ test custom boundary tags on box mesh
 
 @pytest.mark.parametrize(("dim", "nelem", "mesh_type"), [
@@ -1297,6 +1667,46 @@ def test_node_vertex_consistency_check(actx_factory):
 
 # {{{ mesh boundary gluing
 
+@pytest.mark.parametrize("method", ["dense", "tree", "grid"])
+@pytest.mark.parametrize("ambient_dim", [2, 3])
+def test_match_vertices(method, ambient_dim):
+    rng = np.random.default_rng(seed=42)
+    nvertices = 512
+    tol = 1.0e-12
+
+    # target vertices are a shifted, permuted and perturbed copy of the source
+    src_vertices = rng.random((ambient_dim, nvertices))
+    shift = rng.random(ambient_dim)
+    perm = rng.permutation(nvertices)
+    tgt_vertices = (
+        src_vertices[:, perm] + shift.reshape(-1, 1)
+        + rng.uniform(-0.1 * tol, 0.1 * tol, size=(ambient_dim, nvertices)))
+
+    # some vertices do not match anything
+    nunmatched = 8
+    tgt_vertices[:, :nunmatched] += 10 * tol
+
+    # NOTE: the elements are only needed to construct the mesh
+    vertices = np.concatenate([src_vertices, tgt_vertices], axis=1)
+    nvertices_per_element = ambient_dim + 1
+    vertex_indices = np.arange(
+        2 * nvertices // nvertices_per_element * nvertices_per_element
+        ).reshape(-1, nvertices_per_element)
+    mesh = make_mesh(
+        vertices,
+        [mgen.make_group_from_vertices(vertices, vertex_indices, 1)],
+        skip_tests=True)
+
+    matched = mproc._match_vertices(
+        mesh, np.arange(nvertices), nvertices + np.arange(nvertices),
+        aff_map=AffineMap(offset=shift), tol=tol, method=method)
+
+    expected = np.empty(nvertices, dtype=np.int64)
+    expected[perm] = nvertices + np.arange(nvertices)
+    expected[perm[:nunmatched]] = -1
+    assert np.array_equal(matched, expected)
+
+
 @pytest.mark.parametrize("use_tree", [False, True])
 def test_glued_mesh(use_tree):
     n = 4
@@ -1489,6 +1899,78 @@ def test_urchin():
     mgen.generate_urchin(3, 2, 4, 1e-4)
 
 
+# {{{ test setup instrumentation
+
+def test_setup_stage_instrumentation():
+    import io
+    import json
+    import tracemalloc
+
+    from meshmode.instrumentation import (
+        CollectingSink,
+        JSONLinesSink,
+        instrumentation_sinks,
+        setup_stage,
+    )
+
+    collector = CollectingSink()
+    outf = io.StringIO()
+
+    tracemalloc.start()
+    try:
+        with (instrumentation_sinks(collector, JSONLinesSink(outf)),
+                setup_stage("test_setup", order=1)):
+            mesh = mgen.generate_regular_rect_mesh(
+                    a=(0.0,)*2, b=(1.0,)*2, nelements_per_axis=(8,)*2)
+            assert mesh.facial_adjacency_groups
+
+        # peaks are not tracked off the main thread
+        from concurrent.futures import ThreadPoolExecutor
+        thread_collector = CollectingSink()
+
+        def run_stage():
+            with setup_stage("test_thread"):
+                pass
+
+        with (instrumentation_sinks(thread_collector),
+                ThreadPoolExecutor(max_workers=1) as executor):
+            executor.submit(run_stage).result()
+    finally:
+        tracemalloc.stop()
+
+    thread_record, = thread_collector.records
+    assert thread_record.name == "test_thread"
+    assert thread_record.peak_traced_memory is None
+
+    names = [record.name for record in collector.records]
+    assert names == [
+        "test_setup/make_mesh",
+        "test_setup/compute_facial_adjacency",
+        "test_setup"]
+
+    summary = collector.summary()
+    assert summary["test_setup/make_mesh"]["count"] == 1
+
+    outer_record = collector.records[-1]
+    assert outer_record.depth == 0
+    assert outer_record.metadata == {"order": 1}
+    assert collector.records[0].metadata["nelements"] == mesh.nelements
+    assert all(record.peak_traced_memory is not None
+               for record in collector.records)
+    assert outer_record.peak_traced_memory >= max(
+        record.peak_traced_memory for record in collector.records[:-1])
+
+    lines = outf.getvalue().splitlines()
+    assert [json.loads(line)["name"] for line in lines] == names
+
+    # no records once the sinks are gone
+    mgen.generate_regular_rect_mesh(
+            a=(0.0,)*2, b=(1.0,)*2, nelements_per_axis=(8,)*2)
+    assert len(collector.records) == len(names)
+
+# }}}
+
+
 if __name__ == "__main__":
     import sys
     if len(sys.argv) > 1:
@@ -355,6 +355,38 @@ def test_partition_mesh(mesh_size, num_parts, num_groups, dim, scramble_parts):
                 "part_mesh has the wrong number of BTAG_PARTITION boundaries"
 
 
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_partition_mesh_process_pool(max_workers):
+    rng = np.random.default_rng(seed=42)
+
+    from meshmode.mesh.generation import generate_regular_rect_mesh
+    from meshmode.mesh.processing import merge_disjoint_meshes
+    mesh = merge_disjoint_meshes([
+        generate_regular_rect_mesh(
+            a=(0 + i,) * 3, b=(1 + i,) * 3, nelements_per_axis=(5,) * 3)
+        for i in range(2)])
+
+    from meshmode.distributed import membership_list_to_map
+    part_num_to_elements = membership_list_to_map(
+        rng.integers(0, 7, size=mesh.nelements))
+
+    from meshmode.mesh.processing import generate_mesh_parts, partition_mesh
+    serial_part_meshes = partition_mesh(mesh, part_num_to_elements)
+    part_meshes = partition_mesh(
+        mesh, part_num_to_elements, max_workers=max_workers)
+
+    assert list(part_meshes) == list(serial_part_meshes)
+    for part_id, part_mesh in part_meshes.items():
+        assert part_mesh == serial_part_meshes[part_id]
+
+    return_parts = [5, 2]
+    generated_part_ids = [
+        part_id
+        for part_id, _ in generate_mesh_parts(
+            mesh, part_num_to_elements, return_parts, max_workers=max_workers)]
+    assert sorted(generated_part_ids) == sorted(return_parts)
+
+
 def count_tags(mesh, tag):
     num_bnds = 0
     for fagrp_list in mesh.facial_adjacency_groups:
@@ -371,7 +403,8 @@ def count_tags(mesh, tag):
 
 # {{{ MPI test boundary swap
 
-def _test_mpi_boundary_swap(dim, order, num_groups):
+def _test_mpi_boundary_swap(dim, order, num_groups, deterministic=True,
+        max_workers=None):
     from mpi4py import MPI
 
     from meshmode.distributed import MPIBoundaryCommSetupHelper, membership_list_to_map
@@ -426,23 +459,30 @@ def _test_mpi_boundary_swap(dim, order, num_groups):
         local_bdry_conns[i_remote_part] = make_face_restriction(
                 actx, vol_discr, group_factory, BTAG_PARTITION(i_remote_part))
 
+    expected_keys = list(range(mpi_comm.size))
+    expected_keys.remove(mpi_comm.rank)
+
     remote_to_local_bdry_conns = {}
     with MPIBoundaryCommSetupHelper(mpi_comm, actx, local_bdry_conns,
-            bdry_grp_factory=group_factory) as bdry_setup_helper:
+            bdry_grp_factory=group_factory,
+            deterministic=deterministic,
+            max_workers=max_workers) as bdry_setup_helper:
         from meshmode.discretization.connection import check_connection
         while True:
             conns = bdry_setup_helper.complete_some()
             if not conns:
                 break
 
-            expected_keys = list(range(mpi_comm.size))
-            expected_keys.remove(mpi_comm.rank)
-            assert list(conns.keys()) == expected_keys
+            if deterministic:
+                assert list(conns.keys()) == expected_keys
 
             for i_remote_part, conn in conns.items():
+                assert i_remote_part not in remote_to_local_bdry_conns
                 check_connection(actx, conn)
                 remote_to_local_bdry_conns[i_remote_part] = conn
 
+    assert sorted(remote_to_local_bdry_conns) == expected_keys
+
     _test_data_transfer(mpi_comm,
                         actx,
                         local_bdry_conns,
@@ -588,12 +628,149 @@ def _test_data_transfer(mpi_comm, actx, local_bdry_conns,
 # }}}
 
 
+# {{{ MPI test manager-free distribution
+
+def _test_mpi_distribute_mesh_slabs(dim, num_groups):
+    from mpi4py import MPI
+
+    from meshmode.distributed import (
+        distribute_mesh_slabs,
+        get_connected_parts,
+        membership_list_to_map,
+    )
+    from meshmode.mesh import BTAG_REALLY_ALL, make_mesh
+    from meshmode.mesh.generation import generate_regular_rect_mesh
+    from meshmode.mesh.processing import (
+        _filter_mesh_groups,
+        merge_disjoint_meshes,
+        partition_mesh,
+    )
+    mpi_comm = MPI.COMM_WORLD
+
+    # NOTE: the global mesh is only built here to cut out the slabs and to
+    # compare against partition_mesh
+    mesh = merge_disjoint_meshes([
+        generate_regular_rect_mesh(
+            a=(0 + i,) * dim, b=(1 + i,) * dim, nelements_per_axis=(4,) * dim)
+        for i in range(num_groups)])
+
+    rng = np.random.default_rng(seed=42)
+    part_per_element = rng.integers(0, mpi_comm.size, size=mesh.nelements)
+
+    slab_bounds = np.linspace(0, mesh.nelements, mpi_comm.size + 1).astype(int)
+    slab_elements = np.arange(
+        slab_bounds[mpi_comm.rank], slab_bounds[mpi_comm.rank + 1])
+    slab_groups, slab_vertex_ids = _filter_mesh_groups(
+        mesh, slab_elements, mesh.vertex_id_dtype)
+    slab_mesh = make_mesh(
+        mesh.vertices[:, slab_vertex_ids], slab_groups, is_conforming=True)
+
+    local_mesh = distribute_mesh_slabs(
+        mpi_comm, slab_mesh, slab_vertex_ids, part_per_element[slab_elements])
+
+    ref_local_mesh, = partition_mesh(
+        mesh,
+        membership_list_to_map(part_per_element),
+        return_parts=[mpi_comm.rank]).values()
+
+    assert np.array_equal(local_mesh.vertices, ref_local_mesh.vertices)
+    assert local_mesh.groups == ref_local_mesh.groups
+
+    def get_adjacency(mesh):
+        result = {}
+        for igrp, fagrp_list in enumerate(mesh.facial_adjacency_groups):
+            for fagrp in fagrp_list:
+                if isinstance(fagrp, InterPartAdjacencyGroup):
+                    key = (igrp, "part", fagrp.part_id)
+                elif isinstance(fagrp, InteriorAdjacencyGroup):
+                    key = (igrp, "interior", fagrp.ineighbor_group)
+                elif fagrp.boundary_tag is not BTAG_REALLY_ALL:
+                    key = (igrp, "boundary", fagrp.boundary_tag)
+                else:
+                    continue
+
+                entries = [fagrp.elements, fagrp.element_faces]
+                if hasattr(fagrp, "neighbors"):
+                    entries += [fagrp.neighbors, fagrp.neighbor_faces]
+
+                result.setdefault(key, set()).update(
+                    zip(*[entry.tolist() for entry in entries], strict=True))
+
+        return {key: value for key, value in result.items() if value}
+
+    assert get_adjacency(local_mesh) == get_adjacency(ref_local_mesh)
+
+    _test_connected_parts(mpi_comm, get_connected_parts(local_mesh))
+
+# }}}
+
+
+# {{{ MPI test parallel vtkhdf
+
+def _test_mpi_vtkhdf_time_series(aggregate):
+    import h5py
+    from mpi4py import MPI
+
+    from meshmode.array_context import PyOpenCLArrayContext
+    from meshmode.discretization import Discretization
+    from meshmode.discretization.visualization import make_visualizer
+    from meshmode.mesh.generation import generate_regular_rect_mesh
+    mpi_comm = MPI.COMM_WORLD
+
+    cl_ctx = cl.create_some_context()
+    queue = cl.CommandQueue(cl_ctx)
+    actx = PyOpenCLArrayContext(queue)
+
+    # NOTE: each rank has a different number of elements
+    dim = 2
+    rank = mpi_comm.rank
+    local_mesh = generate_regular_rect_mesh(
+        a=(rank, 0), b=(rank + 1, 1), nelements_per_axis=(2 + rank, 2))
+    discr = Discretization(actx, local_mesh,
+        default_simplex_group_factory(dim, order=2))
+    vis = make_visualizer(actx, discr, 2)
+
+    nsteps = 3
+    part_id = discr.zeros(actx) + rank
+    with vis.make_vtkhdf_time_series_writer("parallel-time-series.hdf",
+            comm=mpi_comm, aggregate=aggregate, overwrite=True) as writer:
+        for n in range(nsteps):
+            writer.write_step(n, [("part_id", part_id + n)])
+
+        file_name = writer.file_name
+
+    mpi_comm.Barrier()
+    if rank != 0:
+        return
+
+    with h5py.File(file_name, "r") as h5:
+        root = h5["VTKHDF"]
+        nparts = root["NumberOfPoints"].shape[0]
+        npoints = root["NumberOfPoints"][:]
+        assert npoints.sum() == root["Points"].shape[0]
+
+        steps = root["Steps"]
+        assert steps.attrs["NSteps"] == nsteps
+        assert np.all(steps["NumberOfParts"][:] == nparts)
+
+        offsets = steps["PointDataOffsets/part_id"][:]
+        assert np.array_equal(offsets, npoints.sum() * np.arange(nsteps))
+
+        data = root["PointData/part_id"]
+        for n in range(nsteps):
+            assert np.all(data[offsets[n]:offsets[n] + npoints[0]] == n)
+
+# }}}
+
+
 # {{{ MPI pytest entrypoint
 
 @pytest.mark.mpi
 @pytest.mark.parametrize("num_parts", [3, 4])
 @pytest.mark.parametrize("order", [2, 3])
-def test_mpi_communication(num_parts, order):
+@pytest.mark.parametrize("deterministic", [False, True])
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_mpi_communication(num_parts, order, deterministic, max_workers):
     pytest.importorskip("mpi4py")
 
     num_ranks = num_parts
@@ -605,6 +782,54 @@ def test_mpi_communication(num_parts, order):
         "-np", str(num_ranks),
         "-x", "RUN_WITHIN_MPI=1",
         "-x", "order=%d" % order,
+        "-x", "deterministic=%d" % deterministic,
+        "-x", f"max_workers={max_workers or ''}",
+
+        # https://mpi4py.readthedocs.io/en/stable/mpi4py.run.html
+        sys.executable, "-m", "mpi4py.run", __file__],
+        )
+
+
+@pytest.mark.mpi
+@pytest.mark.parametrize("num_parts", [2, 3, 5])
+@pytest.mark.parametrize("num_groups", [1, 2])
+def test_mpi_distribute_mesh_slabs(num_parts, num_groups):
+    pytest.importorskip("mpi4py")
+
+    num_ranks = num_parts
+    import sys
+    from subprocess import check_call
+    check_call([
+        "mpiexec",
+        "--oversubscribe",
+        "-np", str(num_ranks),
+        "-x", "RUN_WITHIN_MPI=1",
+        "-x", "MPI_TEST=distribute_mesh_slabs",
+        "-x", "num_groups=%d" % num_groups,
+
+        # https://mpi4py.readthedocs.io/en/stable/mpi4py.run.html
+        sys.executable, "-m", "mpi4py.run", __file__],
+        )
+
+
+@pytest.mark.mpi
+@pytest.mark.parametrize("aggregate", [None, "node"])
+def test_mpi_vtkhdf_time_series(aggregate):
+    pytest.importorskip("mpi4py")
+    h5py = pytest.importorskip("h5py")
+    if not h5py.get_config().mpi:
+        pytest.skip("h5py was built without MPI support")
+
+    num_ranks = 3
+    import sys
+    from subprocess import check_call
+    check_call([
+        "mpiexec",
+        "--oversubscribe",
+        "-np", str(num_ranks),
+        "-x", "RUN_WITHIN_MPI=1",
+        "-x", "MPI_TEST=vtkhdf_time_series",
+        "-x", f"aggregate={aggregate or ''}",
 
         # https://mpi4py.readthedocs.io/en/stable/mpi4py.run.html
         sys.executable, "-m", "mpi4py.run", __file__],
@@ -615,10 +840,23 @@ def test_mpi_communication(num_parts, order):
 
 if __name__ == "__main__":
     if "RUN_WITHIN_MPI" in os.environ:
-        dim = 2
-        order = int(os.environ["order"])
-        num_groups = 2
-        _test_mpi_boundary_swap(dim, order, num_groups)
+        mpi_test = os.environ.get("MPI_TEST", "boundary_swap")
+        if mpi_test == "boundary_swap":
+            dim = 2
+            order = int(os.environ["order"])
+            num_groups = 2
+            deterministic = bool(int(os.environ["deterministic"]))
+            max_workers = int(os.environ["max_workers"] or 0) or None
+            _test_mpi_boundary_swap(dim, order, num_groups, deterministic,
+                                    max_workers)
+        elif mpi_test == "distribute_mesh_slabs":
+            num_groups = int(os.environ["num_groups"])
+            for dim in [2, 3]:
+                _test_mpi_distribute_mesh_slabs(dim, num_groups)
+        elif mpi_test == "vtkhdf_time_series":
+            _test_mpi_vtkhdf_time_series(os.environ["aggregate"] or None)
+        else:
+            raise ValueError(f"unknown MPI test: '{mpi_test}'")
     else:
         import sys
         if len(sys.argv) > 1:
@@ -250,6 +250,47 @@ def test_refinement_connection(
             or eoc_rec.max_error() < 1e-14)
 
 
+@pytest.mark.parametrize("group_factory", [
+    InterpolatoryQuadratureSimplexGroupFactory,
+    LegendreGaussLobattoTensorProductGroupFactory,
+    ])
+@pytest.mark.parametrize("dim", [2, 3])
+def test_refinement_connection_merged_batches(actx_factory, group_factory, dim):
+    actx = actx_factory()
+
+    order = 3
+    mesh = mgen.generate_warped_rect_mesh(dim, order=order, nelements_side=4,
+            group_cls=group_factory.mesh_group_class)
+
+    from meshmode.discretization import Discretization
+    from meshmode.discretization.connection import make_refinement_connection
+
+    discr = Discretization(actx, mesh, group_factory(order))
+    refiner = RefinerWithoutAdjacency(mesh)
+    refiner.refine(even_refine_flags(2, mesh))
+    conn = make_refinement_connection(actx, refiner, discr, group_factory(order))
+
+    # the merged kernel applies several batches (with different resampling
+    # matrices) at once
+    cgrp, = conn.groups
+    assert len(cgrp.batches) > 1
+    assert conn._global_matrix_info(actx)[0] is not None
+
+    x = actx.thaw(discr.nodes())
+    f = actx.np.sin(3 * x[0]) * actx.np.exp(x[dim - 1])
+
+    f_fine = conn(f)
+    for force_loopy, force_no_merged_batches in [
+            (False, True),
+            (True, False),
+            (True, True),
+            ]:
+        f_fine_alt = conn(f,
+                _force_use_loopy=force_loopy,
+                _force_no_merged_batches=force_no_merged_batches)
+        assert actx.to_numpy(flat_norm(f_fine - f_fine_alt, np.inf)) < 1.0e-13
+
+
 @pytest.mark.parametrize(("group_cls", "with_adjacency"), [
     (SimplexElementGroup, True),
     (SimplexElementGroup, False),
@@ -267,6 +308,410 @@ def test_uniform_refinement(group_cls, with_adjacency):
     mesh = refine_uniformly(mesh, 1, with_adjacency=with_adjacency)
 
 
+@pytest.mark.parametrize("group_cls", [
+    SimplexElementGroup,
+    TensorProductElementGroup
+    ])
+def test_refinement_records(group_cls):
+    mesh = mgen.generate_regular_rect_mesh(
+            a=(0.0,)*2, b=(1.0,)*2, nelements_per_axis=(4,)*2,
+            group_cls=group_cls)
+
+    rng = np.random.default_rng(seed=42)
+    flags = rng.random(mesh.nelements) < 0.5
+
+    refiner = RefinerWithoutAdjacency(mesh)
+    half_mesh = refiner.refine(flags)
+
+    record, = refiner.group_refinement_records
+    nchildren = len(record.el_tess_info.children)
+    nchild_elements = np.diff(record.child_element_starts)
+
+    assert np.array_equal(nchild_elements, np.where(flags, nchildren, 1))
+    assert record.child_element_starts[-1] == half_mesh.nelements
+    assert np.array_equal(
+            np.sort(record.child_elements), np.arange(half_mesh.nelements))
+
+    # refine the remaining elements: midpoints created in the first round must
+    # be reused, resulting in the same mesh as a uniform refinement
+    half_flags = np.zeros(half_mesh.nelements, dtype=bool)
+    half_flags[record.child_element_starts[:-1][~flags]] = True
+    refined_mesh = refiner.refine(half_flags)
+
+    uniform_mesh = RefinerWithoutAdjacency(mesh).refine_uniformly()
+    assert refined_mesh.nelements == uniform_mesh.nelements
+    assert refined_mesh.nvertices == uniform_mesh.nvertices
+
+
+@pytest.mark.parametrize("group_cls", [
+    SimplexElementGroup,
+    TensorProductElementGroup
+    ])
+@pytest.mark.parametrize("dim", [1, 2, 3])
+def test_mesh_hierarchy(group_cls, dim):
+    if group_cls is TensorProductElementGroup and dim == 1:
+        pytest.skip("same as simplices in 1D")
+
+    mesh = mgen.generate_regular_rect_mesh(
+            a=(0.0,)*dim, b=(1.0,)*dim, nelements_per_axis=(3,)*dim,
+            order=2, group_cls=group_cls)
+
+    from meshmode.mesh.refinement import MeshHierarchy
+    nlevels = 2
+    hierarchy = MeshHierarchy(mesh, nlevels)
+    assert hierarchy.get_mesh(0) is mesh
+
+    refiner = RefinerWithoutAdjacency(mesh)
+    for level in range(1, nlevels + 1):
+        refined_mesh = refiner.refine_uniformly()
+        level_mesh = hierarchy.get_mesh(level)
+
+        assert level_mesh.is_conforming
+        assert level_mesh.nelements == refined_mesh.nelements
+        assert level_mesh.nvertices == refined_mesh.nvertices
+
+        # elements are in the same order, vertices are numbered differently
+        grp, refined_grp = level_mesh.groups[0], refined_mesh.groups[0]
+        assert np.allclose(grp.nodes, refined_grp.nodes)
+        assert np.allclose(
+                level_mesh.vertices[:, grp.vertex_indices],
+                refined_mesh.vertices[:, refined_grp.vertex_indices])
+
+        record, = hierarchy.get_group_refinement_records(level)
+        assert record.child_element_starts[-1] == level_mesh.nelements
+
+
+@pytest.mark.parametrize("group_factory", [
+    InterpolatoryQuadratureSimplexGroupFactory,
+    LegendreGaussLobattoTensorProductGroupFactory,
+    ])
+@pytest.mark.parametrize("dim", [2, 3])
+def test_mesh_hierarchy_connection(actx_factory, group_factory, dim):
+    actx = actx_factory()
+
+    order = 3
+    mesh = mgen.generate_regular_rect_mesh(
+            a=(-1.0,)*dim, b=(1.0,)*dim, nelements_per_axis=(3,)*dim,
+            group_cls=group_factory.mesh_group_class)
+
+    from meshmode.discretization import Discretization
+    from meshmode.discretization.connection import (
+        check_connection,
+        make_mesh_hierarchy_connection,
+    )
+    from meshmode.mesh.refinement import MeshHierarchy
+
+    hierarchy = MeshHierarchy(mesh, 2)
+    discr = Discretization(actx, mesh, group_factory(order))
+    level1_conn = make_mesh_hierarchy_connection(
+        actx, hierarchy, discr, group_factory(order), 1)
+    level2_conn = make_mesh_hierarchy_connection(
+        actx, hierarchy, discr, group_factory(order), 2)
+    level12_conn = make_mesh_hierarchy_connection(
+        actx, hierarchy, level1_conn.to_discr, group_factory(order), 2,
+        from_level=1)
+
+    check_connection(actx, level2_conn)
+
+    # polynomials of the discretization order are interpolated exactly
+    def f(x):
+        return sum(x[i]**order for i in range(dim))
+
+    x = actx.thaw(discr.nodes())
+    x_fine = actx.thaw(level2_conn.to_discr.nodes())
+
+    f_fine = level2_conn(f(x))
+    assert actx.to_numpy(flat_norm(f_fine - f(x_fine), np.inf)) < 1.0e-11
+
+    f_chained = level12_conn(level1_conn(f(x)))
+    assert actx.to_numpy(flat_norm(f_fine - f_chained, np.inf)) < 1.0e-11
+
+
+def check_adaptive_mesh_adjacency(mesh):
+    import modepy as mp
+
+    from meshmode.mesh import (
+        BTAG_REALLY_ALL,
+        BoundaryAdjacencyGroup,
+        InteriorAdjacencyGroup,
+        NonconformingInteriorAdjacencyGroup,
+    )
+
+    grp, = mesh.groups
+
+    basis = mp.basis_for_space(grp.space, grp.shape)
+    faces = grp._modepy_faces
+    face_vertex_indices = [np.array(fvi) for fvi in grp.face_vertex_indices()]
+    face_unit_nodes = mp.edge_clustered_nodes_for_space(
+            mp.space_for_shape(faces[0], 2), faces[0])
+
+    def get_face_vertices(elements, element_faces):
+        return np.array([
+            np.sort(grp.vertex_indices[iel, face_vertex_indices[iface]])
+            for iel, iface in zip(elements, element_faces, strict=True)])
+
+    def get_face_nodes(iel, iface, unit_nodes):
+        resampling_mat = mp.resampling_matrix(
+                basis.functions, faces[iface].map_to_volume(unit_nodes),
+                grp.unit_nodes)
+        return grp.nodes[:, iel] @ resampling_mat.T
+
+    # every face is either a conforming interior face, the fine side of
+    # a hanging face, the coarse side of a hanging face or on the boundary
+    face_counts = np.zeros((grp.nelements, grp.nfaces), dtype=np.int64)
+    for fagrp in mesh.facial_adjacency_groups[0]:
+        if isinstance(fagrp, NonconformingInteriorAdjacencyGroup):
+            face_counts[fagrp.elements, fagrp.element_faces] += 1
+            coarse_faces = set(zip(
+                fagrp.neighbors, fagrp.neighbor_faces, strict=True))
+            for iel, iface in coarse_faces:
+                face_counts[iel, iface] += 1
+
+            for i in range(fagrp.elements.size):
+                fine_nodes = get_face_nodes(
+                        fagrp.elements[i], fagrp.element_faces[i],
+                        face_unit_nodes)
+                coarse_nodes = get_face_nodes(
+                        fagrp.neighbors[i], fagrp.neighbor_faces[i],
+                        fagrp.face_map_matrices[i] @ face_unit_nodes
+                        + fagrp.face_map_offsets[i][:, np.newaxis])
+
+                assert np.allclose(fine_nodes, coarse_nodes)
+        elif isinstance(fagrp, InteriorAdjacencyGroup):
+            face_counts[fagrp.elements, fagrp.element_faces] += 1
+            assert np.array_equal(
+                    get_face_vertices(fagrp.elements, fagrp.element_faces),
+                    get_face_vertices(fagrp.neighbors, fagrp.neighbor_faces))
+        elif (isinstance(fagrp, BoundaryAdjacencyGroup)
+                and fagrp.boundary_tag is BTAG_REALLY_ALL):
+            face_counts[fagrp.elements, fagrp.element_faces] += 1
+
+    assert (face_counts == 1).all()
+
+
+@pytest.mark.parametrize("group_cls", [
+    SimplexElementGroup,
+    TensorProductElementGroup
+    ])
+@pytest.mark.parametrize("dim", [2, 3])
+def test_adaptive_refiner_adjacency(tmp_path, group_cls, dim):
+    from meshmode.mesh.refinement import AdaptiveRefiner
+
+    mesh = mgen.generate_regular_rect_mesh(
+            a=(0.0,)*dim, b=(1.0,)*dim, nelements_per_axis=(2,)*dim,
+            order=2, group_cls=group_cls)
+    refiner = AdaptiveRefiner(mesh)
+
+    rng = np.random.default_rng(seed=42)
+    for _ in range(3):
+        mesh = refiner.refine(
+                rng.random(refiner.get_current_mesh().nelements) < 0.3)
+        check_adaptive_mesh_adjacency(mesh)
+
+    levels, = refiner.get_element_levels()
+    assert levels.max() > 1
+    assert not mesh.is_conforming
+
+    import meshmode.mesh.io as mio
+    mio.write_mesh(mesh, str(tmp_path / "mesh"))
+    assert mio.read_mesh(str(tmp_path / "mesh")) == mesh
+
+    # hanging faces cannot be represented in the parts
+    from meshmode.mesh.processing import partition_mesh
+    with pytest.raises(NotImplementedError):
+        partition_mesh(mesh, {
+            0: np.arange(mesh.nelements // 2),
+            1: np.arange(mesh.nelements // 2, mesh.nelements)})
+
+
+@pytest.mark.parametrize("group_cls", [
+    SimplexElementGroup,
+    TensorProductElementGroup
+    ])
+@pytest.mark.parametrize("dim", [2, 3])
+def test_adaptive_refiner_coarsening(group_cls, dim):
+    from meshmode.mesh.refinement import AdaptiveRefiner
+
+    orig_mesh = mgen.generate_regular_rect_mesh(
+            a=(0.0,)*dim, b=(1.0,)*dim, nelements_per_axis=(2,)*dim,
+            order=2, group_cls=group_cls)
+    refiner = AdaptiveRefiner(orig_mesh)
+
+    rng = np.random.default_rng(seed=42)
+    for _ in range(2):
+        fine_mesh = refiner.refine(
+                rng.random(refiner.get_current_mesh().nelements) < 0.5)
+        mesh = refiner.coarsen(rng.random(fine_mesh.nelements) < 0.7)
+        check_adaptive_mesh_adjacency(mesh)
+
+        record, = refiner.group_coarsening_records
+        assert refiner.group_refinement_records is None
+        assert record.child_element_starts[-1] == fine_mesh.nelements
+        assert np.array_equal(
+                np.sort(record.child_elements), np.arange(fine_mesh.nelements))
+
+    # merging all elements recovers the original mesh
+    while mesh.nelements > orig_mesh.nelements:
+        mesh = refiner.coarsen(np.ones(mesh.nelements, dtype=bool))
+
+    check_adaptive_mesh_adjacency(mesh)
+    assert mesh.is_conforming
+    assert np.allclose(mesh.groups[0].nodes, orig_mesh.groups[0].nodes)
+    assert np.array_equal(
+            mesh.groups[0].vertex_indices, orig_mesh.groups[0].vertex_indices)
+
+
+@pytest.mark.parametrize("group_factory", [
+    InterpolatoryQuadratureSimplexGroupFactory,
+    LegendreGaussLobattoTensorProductGroupFactory,
+    ])
+@pytest.mark.parametrize("dim", [2, 3])
+def test_adaptive_refiner_opposite_face(actx_factory, group_factory, dim):
+    actx = actx_factory()
+
+    order = 3
+    mesh = mgen.generate_regular_rect_mesh(
+            a=(-1.0,)*dim, b=(1.0,)*dim, nelements_per_axis=(3,)*dim,
+            group_cls=group_factory.mesh_group_class)
+
+    from meshmode.mesh.refinement import AdaptiveRefiner
+    refiner = AdaptiveRefiner(mesh)
+    for _ in range(2):
+        mesh = refiner.refine(even_refine_flags(3, refiner.get_current_mesh()))
+
+    from meshmode.discretization import Discretization
+    from meshmode.discretization.connection import (
+        FACE_RESTR_INTERIOR,
+        make_face_restriction,
+        make_opposite_face_connection,
+    )
+
+    discr = Discretization(actx, mesh, group_factory(order))
+    bdry_conn = make_face_restriction(
+            actx, discr, group_factory(order), FACE_RESTR_INTERIOR)
+    with pytest.raises(ValueError):
+        make_opposite_face_connection(actx, bdry_conn)
+
+    opp_conn = make_opposite_face_connection(
+            actx, bdry_conn, allow_hanging_faces=True)
+    assert not opp_conn.is_surjective
+
+    def f(x):
+        return sum(x[i]**order for i in range(dim))
+
+    bdry_x = actx.thaw(bdry_conn.to_discr.nodes())
+    bdry_f = f(bdry_x)
+
+    # NOTE: the coarse sides of hanging faces do not receive any values
+    is_covered = opp_conn(bdry_conn.to_discr.zeros(actx) + 1)
+    error = opp_conn(bdry_f) - is_covered * bdry_f
+    assert actx.to_numpy(flat_norm(error, np.inf)) < 1.0e-11
+
+
+def integrate(actx, discr, f):
+    import modepy as mp
+
+    result = 0
+    for grp, f_i, x_i in zip(
+            discr.groups,
+            actx.to_numpy(f),
+            actx.to_numpy(actx.thaw(discr.nodes())),
+            strict=True):
+        diff_matrices = mp.diff_matrices(grp.basis_obj(), grp.unit_nodes)
+        jac = np.array([
+            [x_i[iaxis] @ diff_matrix.T for diff_matrix in diff_matrices]
+            for iaxis in range(discr.ambient_dim)])
+        jac_det = np.abs(np.linalg.det(jac.transpose(2, 3, 0, 1)))
+
+        result += np.sum(f_i * jac_det * grp.quadrature_rule().weights)
+
+    return result
+
+
+@pytest.mark.parametrize("group_factory", [
+    InterpolatoryQuadratureSimplexGroupFactory,
+    LegendreGaussLobattoTensorProductGroupFactory,
+    ])
+@pytest.mark.parametrize("dim", [2, 3])
+def test_coarsening_connection(actx_factory, group_factory, dim):
+    actx = actx_factory()
+
+    order = 3
+    mesh = mgen.generate_regular_rect_mesh(
+            a=(-1.0,)*dim, b=(1.0,)*dim, nelements_per_axis=(3,)*dim,
+            group_cls=group_factory.mesh_group_class)
+
+    from meshmode.mesh.refinement import AdaptiveRefiner
+    refiner = AdaptiveRefiner(mesh)
+    for _ in range(2):
+        refiner.refine(even_refine_flags(2, refiner.get_current_mesh()))
+    fine_mesh = refiner.get_current_mesh()
+    refiner.coarsen(np.ones(fine_mesh.nelements, dtype=bool))
+
+    from meshmode.discretization import Discretization
+    from meshmode.discretization.connection import make_coarsening_connection
+
+    fine_discr = Discretization(actx, fine_mesh, group_factory(order))
+    conn = make_coarsening_connection(
+            actx, refiner, fine_discr, group_factory(order))
+    coarse_discr = conn.to_discr
+
+    # constants are preserved
+    ones = conn(fine_discr.zeros(actx) + 1)
+    assert actx.to_numpy(flat_norm(ones - 1, np.inf)) < 1.0e-12
+
+    # the integral is preserved
+    x = actx.thaw(fine_discr.nodes())
+    f = actx.np.sin(3 * x[0]) * actx.np.exp(x[dim - 1])
+    assert abs(
+            integrate(actx, coarse_discr, conn(f))
+            - integrate(actx, fine_discr, f)) < 1.0e-12
+
+
+@pytest.mark.parametrize("group_factory", [
+    InterpolatoryQuadratureSimplexGroupFactory,
+    LegendreGaussLobattoTensorProductGroupFactory,
+    ])
+@pytest.mark.parametrize("dim", [2, 3])
+def test_l2_projection_inverse_refinement(actx_factory, group_factory, dim):
+    actx = actx_factory()
+
+    order = 3
+    mesh = mgen.generate_regular_rect_mesh(
+            a=(-1.0,)*dim, b=(1.0,)*dim, nelements_per_axis=(3,)*dim,
+            group_cls=group_factory.mesh_group_class)
+
+    from meshmode.discretization import Discretization
+    from meshmode.discretization.connection import (
+        L2ProjectionInverseDiscretizationConnection,
+        make_refinement_connection,
+    )
+
+    discr = Discretization(actx, mesh, group_factory(order))
+    refiner = RefinerWithoutAdjacency(mesh)
+    refiner.refine(even_refine_flags(2, mesh))
+    conn = make_refinement_connection(actx, refiner, discr, group_factory(order))
+
+    inverse = L2ProjectionInverseDiscretizationConnection(conn)
+    ones = inverse(conn.to_discr.zeros(actx) + 1)
+    assert actx.to_numpy(flat_norm(ones - 1, np.inf)) < 1.0e-12
+
+    # the integral is preserved
+    x = actx.thaw(conn.to_discr.nodes())
+    f = actx.np.sin(3 * x[0]) * actx.np.exp(x[dim - 1])
+    assert abs(
+            integrate(actx, discr, inverse(f))
+            - integrate(actx, conn.to_discr, f)) < 1.0e-12
+
+    # the projection matrices are shared by all connections between the
+    # same discretizations
+    other_inverse = L2ProjectionInverseDiscretizationConnection(conn)
+    matrices = inverse._batch_projection_matrices(actx)
+    other_matrices = other_inverse._batch_projection_matrices(actx)
+    assert matrices.keys() == other_matrices.keys()
+    assert all(matrices[key] is other_matrices[key] for key in matrices)
+
+
 @pytest.mark.parametrize("refinement_rounds", [0, 1, 2])
 def test_conformity_of_uniform_mesh(refinement_rounds):
     mesh = mgen.generate_sphere(r=1.0, order=4,
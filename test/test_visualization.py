@@ -294,6 +294,243 @@ def test_copy_visualizer(actx_factory, ambient_dim, visualize=True):
 # }}}
 
 
+# {{{ test_vtkhdf_time_series
+
+@pytest.mark.parametrize("ambient_dim", [2, 3])
+def test_vtkhdf_time_series(actx_factory, ambient_dim, tmp_path):
+    h5py = pytest.importorskip("h5py")
+
+    actx = actx_factory()
+    target_order = 3
+
+    if ambient_dim == 2:
+        mesh = mgen.make_curve_mesh(
+                partial(mgen.ellipse, 1.0),
+                np.linspace(0.0, 1.0, 32 + 1),
+                target_order)
+    else:
+        mesh = mgen.generate_torus(5.0, 1.0, order=target_order)
+
+    from meshmode.discretization import Discretization
+    from meshmode.mesh.processing import affine_map
+    grp_factory = default_simplex_group_factory(ambient_dim, target_order)
+    discr = Discretization(actx, mesh, grp_factory)
+
+    from meshmode.discretization.visualization import make_visualizer
+    vis = make_visualizer(actx, discr, target_order)
+
+    filename = str(tmp_path / f"visualizer_time_series_{ambient_dim}d.hdf")
+    nsteps = 4
+    with vis.make_vtkhdf_time_series_writer(filename, overwrite=True) as writer:
+        for n in range(nsteps):
+            if n == nsteps - 1:
+                # move the geometry in the last step
+                moved_discr = Discretization(actx,
+                        affine_map(mesh, b=np.array([1.0, 0.0, 0.0][:ambient_dim])),
+                        grp_factory)
+                step_vis = vis.copy_with_same_connectivity(actx, moved_discr)
+            else:
+                # same geometry, new visualizer
+                step_vis = vis.copy_with_same_connectivity(actx, discr)
+
+            nodes = actx.thaw(step_vis.discr.nodes())
+            writer.write_step(0.1 * n, [
+                ("f", (n + 1) * nodes[0]),
+                ("u", nodes),
+                ], vis=step_vis)
+
+        assert writer.nsteps == nsteps
+
+    with h5py.File(filename, "r") as h5:
+        root = h5["VTKHDF"]
+        steps = root["Steps"]
+        npoints = root["NumberOfPoints"][0]
+
+        assert steps.attrs["NSteps"] == nsteps
+        assert np.allclose(steps["Values"][:], 0.1 * np.arange(nsteps))
+
+        # geometry is written once more for the moved last step
+        assert root["Points"].shape == (2 * npoints, 3)
+        assert list(steps["PointOffsets"][:]) == [0, 0, 0, npoints]
+
+        assert root["PointData"]["f"].shape == (nsteps * npoints,)
+        assert root["PointData"]["u"].shape == (nsteps * npoints, 3)
+        assert list(steps["PointDataOffsets"]["f"][:]) == [
+                n * npoints for n in range(nsteps)]
+
+        f = root["PointData"]["f"]
+        assert np.allclose(f[npoints:2*npoints], 2 * f[:npoints])
+
+# }}}
+
+
+# {{{ test_async_visualizer
+
+def test_async_visualizer(actx_factory, tmp_path):
+    pytest.importorskip("pyvisfile")
+
+    actx = actx_factory()
+    target_order = 3
+
+    mesh = mgen.generate_torus(5.0, 1.0, order=target_order)
+
+    from meshmode.discretization import Discretization
+    discr = Discretization(actx, mesh,
+            InterpolatoryQuadratureSimplexGroupFactory(target_order))
+
+    from meshmode.discretization.visualization import (
+        AsyncVisualizer,
+        make_visualizer,
+    )
+    vis = make_visualizer(actx, discr, target_order)
+
+    nodes = actx.thaw(discr.nodes())
+    names_and_fields = [
+            ("f", actx.np.sqrt(sum(nodes**2)) + 1j*nodes[0]),
+            ("u", nodes),
+            ("c", 1.0),
+            ]
+
+    import filecmp
+    with AsyncVisualizer(vis, max_pending=2) as async_vis:
+        futures = []
+        for n in range(4):
+            filename = str(tmp_path / f"async_{n}.vtu")
+            futures.append(async_vis.write_vtk_file(filename, names_and_fields))
+
+        async_vis.flush()
+        assert all(future.done() for future in futures)
+
+        vis.write_vtk_file(str(tmp_path / "sync.vtu"), names_and_fields)
+        assert filecmp.cmp(
+                str(tmp_path / "sync.vtu"), str(tmp_path / "async_0.vtu"),
+                shallow=False)
+
+        # errors on the writer thread are raised on flush
+        async_vis.write_vtk_file(str(tmp_path / "async_0.vtu"), names_and_fields)
+        with pytest.raises(FileExistsError):
+            async_vis.flush()
+
+    with pytest.raises(RuntimeError):
+        async_vis.write_vtk_file(str(tmp_path / "closed.vtu"), names_and_fields)
+
+
+@pytest.mark.parametrize("element_shrink_factor", [None, 0.8])
+def test_batched_visualizer_resampling(
+        actx_factory, element_shrink_factor, tmp_path):
+    pytest.importorskip("pyvisfile")
+
+    actx = actx_factory()
+    target_order = 3
+
+    mesh = mgen.generate_regular_rect_mesh(
+            a=(-0.5,)*2, b=(0.5,)*2, nelements_per_axis=(4,)*2,
+            order=target_order)
+
+    from meshmode.discretization import Discretization
+    discr = Discretization(actx, mesh,
+            InterpolatoryQuadratureSimplexGroupFactory(target_order))
+
+    from meshmode.discretization.visualization import (
+        _resample_to_numpy,
+        make_visualizer,
+        preprocess_fields,
+    )
+    vis = make_visualizer(actx, discr, target_order + 1,
+            element_shrink_factor=element_shrink_factor)
+    assert vis._has_elementwise_connection()
+
+    nodes = actx.thaw(discr.nodes())
+    names_and_fields = preprocess_fields([
+            ("f", actx.np.sin(nodes[0]) + 1j*nodes[1]),
+            ("u", nodes),
+            ("g", actx.np.cos(nodes[1])),
+            ("c", 1.0),
+            ])
+
+    def assert_fields_equal(a, b):
+        if isinstance(a, np.ndarray) and a.dtype.char != "O":
+            assert np.allclose(a, b)
+        elif isinstance(a, np.ndarray | list | tuple):
+            assert len(a) == len(b)
+            for ai, bi in zip(a, b, strict=True):
+                assert_fields_equal(ai, bi)
+        else:
+            assert a == b
+
+    for stack, by_group in [(False, False), (True, True)]:
+        batched = vis._resample_fields_to_numpy(
+                names_and_fields, stack=stack, by_group=by_group)
+
+        for (name, field), (batched_name, batched_field) in zip(
+                names_and_fields, batched, strict=True):
+            assert name == batched_name
+
+            ref_field = _resample_to_numpy(
+                    vis.connection, vis.vis_discr, field,
+                    stack=stack, by_group=by_group)
+            assert_fields_equal(ref_field, batched_field)
+
+    # shrinking elements must not modify the cached nodes
+    nodes_before = vis._vis_nodes_numpy().copy()
+    vis.write_vtk_file(str(tmp_path / "batched.vtu"), names_and_fields)
+    assert np.array_equal(nodes_before, vis._vis_nodes_numpy())
+
+
+@pytest.mark.parametrize("lod", ["stride", "bbox", "boundary", "adaptive"])
+def test_lod_visualizer(actx_factory, lod, tmp_path):
+    pytest.importorskip("pyvisfile")
+
+    actx = actx_factory()
+    dim = 2
+    target_order = 3
+
+    mesh = mgen.generate_regular_rect_mesh(
+            a=(-0.5,)*dim, b=(0.5,)*dim, nelements_per_axis=(8,)*dim,
+            order=target_order)
+
+    from meshmode.discretization import Discretization
+    discr = Discretization(actx, mesh,
+            default_simplex_group_factory(dim, target_order))
+    nodes = actx.thaw(discr.nodes())
+
+    from meshmode.discretization.visualization import (
+        _resample_to_numpy,
+        make_lod_visualizer,
+    )
+    if lod == "stride":
+        vis = make_lod_visualizer(actx, discr, 2, element_stride=5)
+        assert vis.vis_discr.mesh.nelements == (mesh.nelements + 4) // 5
+    elif lod == "bbox":
+        vis = make_lod_visualizer(actx, discr, 2, bbox=((-0.5, -0.5), (0, 0)))
+        assert vis.vis_discr.mesh.nelements < mesh.nelements // 2
+    elif lod == "boundary":
+        from meshmode.mesh import BTAG_ALL
+        vis = make_lod_visualizer(actx, discr, 2, boundary_tag=BTAG_ALL)
+        assert vis.vis_discr.dim == dim - 1
+    elif lod == "adaptive":
+        vis = make_lod_visualizer(actx, discr,
+                adaptive_field=actx.np.exp(4 * nodes[0]),
+                adaptive_vis_orders=[1, 2, 4])
+        assert len(vis.vis_discr.groups) > 1
+    else:
+        raise ValueError(f"unknown level of detail: '{lod}'")
+
+    # linear functions are resampled exactly
+    vis_nodes = vis._vis_nodes_numpy()
+    for i in range(dim):
+        assert np.allclose(
+                _resample_to_numpy(vis.connection, vis.vis_discr, nodes[i]),
+                vis_nodes[i])
+
+    vis.write_vtk_file(str(tmp_path / f"lod_{lod}.vtu"), [
+        ("f", actx.np.sin(nodes[0])),
+        ("u", nodes),
+        ])
+
+# }}}
+
+
 # {{{ test_vtk_overwrite
 
 def test_vtk_overwrite(actx_factory):